@@ -13,6 +13,7 @@ SRC_DIR = os.path.join(BASE_DIR, 'src')
 # Banco de dados
 DATABASE_PATH = os.path.join(DATABASE_DIR, 'onibus_manaus.db')
 USE_MEMORY_DB = False  # True para usar banco em memória, False para arquivo
+SNAPSHOT_PATH = os.path.join(DATABASE_DIR, 'onibus_manaus.snap')  # gerado por src/snapshot_transporte.py
 
 # Interface gráfica
 WINDOW_WIDTH = 1200
@@ -46,16 +47,24 @@ SPEECH_RECOGNITION = {
 TEXT_TO_SPEECH = {
     'language': 'pt-BR',
     'slow': False,
+    'engines': ['espeak', 'gtts'],  # ordem de preferência; espeak-ng funciona offline
+    'espeak_voice': 'pt-br',
+    'espeak_speed': 160,  # palavras por minuto
     'cache_dir': os.path.join(DATA_DIR, 'tts_cache'),
+    'cache_max_mb': 50,  # limite do cache de áudios; os menos usados são apagados
+    'clips_dir': os.path.join(DATA_DIR, 'tts_clipes'),  # gerada por src/biblioteca_clipes.py
 }
 
 # Reconhecimento de Libras
 LIBRAS_RECOGNITION = {
-    'camera_index': 0,
+    'camera_index': 0,  # ou lista, ex. [0, 1, 2]: um quiosque por câmera (servidor_libras.py)
     'min_detection_confidence': 0.5,
     'min_tracking_confidence': 0.5,
     'max_num_hands': 2,
     'gesture_hold_time': 2.0,  # segundos
+    'server_host': '127.0.0.1',  # socket local de eventos do servidor multi-quiosque
+    'server_port': 8765,
+    'server_workers': None,  # processos MediaPipe; None = núcleos da CPU - 1
 }
 
 # Gestos de Libras reconhecidos
@@ -0,0 +1,97 @@
+"""
+Micro-benchmark do caminho de um frame da câmera até a superfície pygame.
+
+Compara o caminho antigo (BGR→RGB→BGR→RGB, rot90, make_surface, flip e
+redimensionamento na interface) com o atual (uma conversão para buffer
+pré-alocado, desenho em RGB e redução direto para o buffer da superfície).
+Não usa MediaPipe: mede só conversões, cópias e alocações.
+
+Uso:
+    python scripts/benchmark_frame_camera.py [--frames 300]
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import cv2
+import numpy as np
+import pygame
+
+LARGURA, ALTURA = 640, 480
+TAMANHO_EXIBICAO = (480, 360)
+
+
+def desenhar_overlay(frame, cor):
+    h, w = frame.shape[:2]
+    cv2.putText(frame, "MAOS DETECTADAS", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, cor, 2)
+    cv2.rectangle(frame, (w // 4, h // 4), (3 * w // 4, 3 * h // 4), cor, 2)
+
+
+def caminho_antigo(frame, tela):
+    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    frame_rgb.flags.writeable = False
+    frame_rgb.flags.writeable = True
+    frame_bgr = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
+    desenhar_overlay(frame_bgr, (0, 255, 255))
+    frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+    superficie = pygame.surfarray.make_surface(np.rot90(frame_rgb))
+    superficie = pygame.transform.flip(superficie, True, False)
+    tela.blit(pygame.transform.scale(superficie, TAMANHO_EXIBICAO), (0, 0))
+
+
+def preparar_caminho_novo():
+    frame_rgb = np.empty((ALTURA, LARGURA, 3), dtype=np.uint8)
+    saida = np.zeros((TAMANHO_EXIBICAO[1], TAMANHO_EXIBICAO[0], 3), dtype=np.uint8)
+    superficie = pygame.image.frombuffer(saida, TAMANHO_EXIBICAO, 'RGB')
+
+    def caminho_novo(frame, tela):
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame_rgb)
+        desenhar_overlay(frame_rgb, (255, 255, 0))
+        cv2.resize(frame_rgb, TAMANHO_EXIBICAO, dst=saida, interpolation=cv2.INTER_AREA)
+        tela.blit(superficie, (0, 0))
+
+    return caminho_novo
+
+
+def medir(nome, caminho, frames, tela):
+    # Aquecimento
+    for frame in frames[:10]:
+        caminho(frame, tela)
+
+    inicio = time.perf_counter()
+    for frame in frames:
+        caminho(frame, tela)
+    por_frame_ms = (time.perf_counter() - inicio) * 1000 / len(frames)
+
+    tracemalloc.start()
+    for frame in frames[:50]:
+        caminho(frame, tela)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{nome:<8} {por_frame_ms:8.3f} ms/frame   pico de alocação {pico / 1024:8.1f} KiB")
+    return por_frame_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--frames', type=int, default=300)
+    args = parser.parse_args()
+
+    gerador = np.random.default_rng(0)
+    frames = [gerador.integers(0, 256, (ALTURA, LARGURA, 3), dtype=np.uint8)
+              for _ in range(min(args.frames, 30))]
+    frames = (frames * (args.frames // len(frames) + 1))[:args.frames]
+    tela = pygame.Surface(TAMANHO_EXIBICAO)
+
+    print(f"📷 {args.frames} frames {LARGURA}x{ALTURA} → {TAMANHO_EXIBICAO[0]}x{TAMANHO_EXIBICAO[1]}")
+    antes = medir("antes", caminho_antigo, frames, tela)
+    depois = medir("depois", preparar_caminho_novo(), frames, tela)
+    print(f"⚡ {antes / depois:.1f}x mais rápido")
+
+
+if __name__ == '__main__':
+    main()
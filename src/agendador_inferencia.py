@@ -0,0 +1,106 @@
+"""
+Agendamento adaptativo da detecção de mãos.
+
+Sem mão à vista, a detecção roda só a cada poucos frames e numa cópia
+reduzida do quadro. Achada uma mão, todo frame é processado em resolução
+cheia, mas só num recorte em volta da caixa das mãos do frame anterior; se o
+recorte perder a mão, o frame seguinte volta a buscar no quadro inteiro. A
+latência dos gestos não muda (com mão à vista nenhum frame é pulado) e o
+custo cai nos dois estados.
+
+O Hands em modo vídeo (static_image_mode=False) rastreia a mão de um quadro
+para o seguinte e se perde se as imagens mudarem de tamanho e enquadramento
+a cada chamada. Por isso o plano diz se a imagem é um recorte: recortes vão
+para um modelo em modo imagem, e o de vídeo só recebe o quadro inteiro,
+sempre na mesma escala.
+"""
+import numpy as np
+
+
+class AgendadorInferencia:
+    """
+    Decide, frame a frame, se e onde rodar o detector de mãos.
+    """
+
+    def __init__(self, intervalo_busca=3, escala_busca=0.5, margem=0.4, tamanho_minimo=160):
+        """
+        Args:
+            intervalo_busca: Sem mão, roda a detecção 1 vez a cada N frames
+            escala_busca: Fator de redução do quadro inteiro durante a busca
+            margem: Folga em volta da caixa das mãos, em fração do seu tamanho
+            tamanho_minimo: Lado mínimo do recorte em pixels
+        """
+        self.intervalo_busca = max(1, intervalo_busca)
+        self.escala_busca = escala_busca
+        self.margem = margem
+        self.tamanho_minimo = tamanho_minimo
+        self.contadores = {'busca': 0, 'recorte': 0, 'pulados': 0, 'perdas': 0}
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Volta ao modo de busca, detectando já no próximo frame"""
+        self._caixa = None
+        self._espera = 0
+
+    @property
+    def acompanhando(self):
+        return self._caixa is not None
+
+    def planejar(self, largura, altura):
+        """
+        Plano de inferência para o próximo frame.
+
+        Returns:
+            None para pular o frame, ou dicionário com 'regiao'
+            (x0, y0, x1, y1) em pixels do quadro, 'escala' a aplicar
+            sobre a região antes da detecção e 'recorte' (True se a região
+            não é o quadro inteiro)
+        """
+        if self._caixa is not None:
+            self.contadores['recorte'] += 1
+            return {'regiao': self._regiao_recorte(largura, altura), 'escala': 1.0,
+                    'recorte': True}
+
+        if self._espera > 0:
+            self._espera -= 1
+            self.contadores['pulados'] += 1
+            return None
+
+        self.contadores['busca'] += 1
+        return {'regiao': (0, 0, largura, altura), 'escala': self.escala_busca,
+                'recorte': False}
+
+    def _regiao_recorte(self, largura, altura):
+        """Caixa das mãos ampliada pela margem e limitada ao quadro"""
+        x0, y0, x1, y1 = self._caixa
+        centro_x, centro_y = (x0 + x1) / 2, (y0 + y1) / 2
+        lado_x = max((x1 - x0) * (1 + 2 * self.margem), self.tamanho_minimo)
+        lado_y = max((y1 - y0) * (1 + 2 * self.margem), self.tamanho_minimo)
+
+        lado_x, lado_y = min(lado_x, largura), min(lado_y, altura)
+        x0 = int(min(max(centro_x - lado_x / 2, 0), largura - lado_x))
+        y0 = int(min(max(centro_y - lado_y / 2, 0), altura - lado_y))
+        return x0, y0, x0 + int(lado_x), y0 + int(lado_y)
+
+    def registrar(self, plano, landmarks):
+        """
+        Informa o resultado da detecção feita com o plano.
+
+        Args:
+            plano: Retorno de planejar (None se o frame foi pulado)
+            landmarks: Array (N_maos, 21, 2 ou 3) em pixels do quadro
+        """
+        if plano is None:
+            return
+
+        if len(landmarks):
+            pontos = np.asarray(landmarks)[..., :2].reshape(-1, 2)
+            x0, y0 = pontos.min(axis=0)
+            x1, y1 = pontos.max(axis=0)
+            self._caixa = (float(x0), float(y0), float(x1), float(y1))
+        elif self._caixa is not None:
+            # Recorte perdeu a mão: busca no quadro inteiro já no próximo frame
+            self.contadores['perdas'] += 1
+            self.reiniciar()
+        else:
+            self._espera = self.intervalo_busca - 1
@@ -0,0 +1,263 @@
+"""
+Benchmark sem tela do reconhecimento de Libras.
+
+Passa uma gravação (vídeo, diretório de imagens ou fluxo de landmarks, ver
+fontes_frames.py) pela detecção de mãos, pela classificação de gestos e
+pelo reconhecimento de sinais dinâmicos, e mede FPS, latência de cada etapa
+(percentis) e acurácia contra os rótulos da gravação. Não precisa de câmera
+nem de display; com fluxo de landmarks, nem de MediaPipe.
+
+A acurácia é medida por segmento (trecho contínuo de quadros com o mesmo
+rótulo): acerta quem reconhecer o sinal em algum quadro do trecho (ou logo
+depois dele, para sinais dinâmicos). Para os
+gestos estáticos também sai a acurácia quadro a quadro.
+
+Uso:
+    python src/benchmark_libras.py gravacoes/sinais.mp4 --acuracia-minima 0.9
+    python src/benchmark_libras.py data/gestos/fluxo.npz --json relatorio.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from agendador_inferencia import AgendadorInferencia
+from classificador_gestos import ClassificadorGestos
+from deteccao_maos import DeteccaoMaos
+from fontes_frames import abrir_fonte, FonteLandmarks, FonteGravacao
+from modelo_gestos import ModeloGestos, CAMINHO_MODELO_PADRAO
+from modelo_maos import criar_modelo_maos, criar_modelo_recortes
+from sequencia_gestos import ReconhecedorSequencias
+
+
+ETAPAS = ('deteccao', 'classificacao', 'sequencias', 'total')
+PERCENTIS = (50, 90, 99)
+
+# Sinais dinâmicos só são reportados depois do fim do movimento: o acerto
+# vale até alguns quadros depois do segmento rotulado
+TOLERANCIA_QUADROS = 5
+
+
+class DetectorMaos:
+    """
+    Detecção do MediaPipe com as mesmas opções e a mesma etapa agendada da
+    câmera (deteccao_maos.DeteccaoMaos): quadro BGR -> landmarks
+    (N_maos, 21, 3) em pixels do quadro.
+    """
+
+    def __init__(self, adaptativo=True):
+        import cv2
+
+        self._cv2 = cv2
+        self.hands = criar_modelo_maos()
+        self.hands_recortes = criar_modelo_recortes() if adaptativo else None
+        self.agendador = AgendadorInferencia() if adaptativo else None
+        self.deteccao = DeteccaoMaos(self.agendador)
+
+    def __call__(self, frame):
+        frame_rgb = self._cv2.cvtColor(frame, self._cv2.COLOR_BGR2RGB)
+        return self.deteccao.detectar(frame_rgb, self.hands, self.hands_recortes)[0]
+
+    def fechar(self):
+        self.hands.close()
+        if self.hands_recortes is not None:
+            self.hands_recortes.close()
+
+
+def executar_benchmark(fonte, detector=None, classificar=None, sequencias=None, limite=None):
+    """
+    Processa a gravação inteira, quadro a quadro.
+
+    Args:
+        fonte: Objeto com amostras() (ver fontes_frames)
+        detector: Chamável quadro BGR -> landmarks; sem ele, um DetectorMaos
+                  é criado no primeiro quadro com imagem
+        classificar: Chamável landmarks -> gesto de cada mão; padrão:
+                     ClassificadorGestos().classificar
+        sequencias: ReconhecedorSequencias; padrão: modelos padrão
+        limite: Número máximo de quadros
+
+    Returns:
+        Dicionário do relatório (ver montar_relatorio)
+    """
+    classificar = classificar or ClassificadorGestos().classificar
+    sequencias = sequencias or ReconhecedorSequencias()
+    criou_detector = False
+
+    latencias = {etapa: [] for etapa in ETAPAS}
+    rotulos, previsoes, estaticos = [], [], []
+    inicio_total = time.perf_counter()
+
+    try:
+        for amostra in fonte.amostras():
+            if limite is not None and len(rotulos) >= limite:
+                break
+
+            t0 = time.perf_counter()
+            if amostra['frame'] is not None:
+                if detector is None:
+                    detector = DetectorMaos()
+                    criou_detector = True
+                landmarks = detector(amostra['frame'])
+                latencias['deteccao'].append(time.perf_counter() - t0)
+            else:
+                landmarks = amostra['landmarks']
+
+            t1 = time.perf_counter()
+            gesto = None
+            for previsto in (classificar(landmarks) if len(landmarks) else ()):
+                if previsto:
+                    gesto = previsto
+            t2 = time.perf_counter()
+            dinamicos = sequencias.atualizar(landmarks[0] if len(landmarks) else None)
+            t3 = time.perf_counter()
+
+            latencias['classificacao'].append(t2 - t1)
+            latencias['sequencias'].append(t3 - t2)
+            latencias['total'].append(t3 - t0)
+            rotulos.append(amostra['rotulo'])
+            estaticos.append(gesto)
+            previsoes.append(dinamicos[0] if dinamicos else gesto)
+    finally:
+        if criou_detector:
+            detector.fechar()
+
+    duracao = time.perf_counter() - inicio_total
+    dinamicos = {casador.nome for casador in sequencias.casadores}
+    return montar_relatorio(rotulos, previsoes, estaticos, latencias, duracao, dinamicos)
+
+
+def montar_relatorio(rotulos, previsoes, estaticos, latencias, duracao, dinamicos=()):
+    """
+    Métricas do benchmark.
+
+    Args:
+        rotulos: Rótulo (ou None) de cada quadro
+        previsoes: Sinal reconhecido em cada quadro (dinâmico ou estático)
+        estaticos: Gesto estático classificado em cada quadro
+        latencias: {etapa: [segundos por quadro]}
+        duracao: Tempo total em segundos
+        dinamicos: Nomes dos sinais dinâmicos (fora da acurácia por quadro)
+    """
+    relatorio = {
+        'quadros': len(rotulos),
+        'segundos': round(duracao, 3),
+        'fps': round(len(rotulos) / duracao, 1) if duracao > 0 else None,
+        'latencias_ms': {},
+    }
+    for etapa, valores in latencias.items():
+        if valores:
+            ms = np.array(valores) * 1000.0
+            relatorio['latencias_ms'][etapa] = dict(
+                {f'p{p}': round(float(v), 3) for p, v in zip(PERCENTIS, np.percentile(ms, PERCENTIS))},
+                max=round(float(ms.max()), 3)
+            )
+
+    # Segmentos: trechos contínuos com o mesmo rótulo
+    por_sinal = {}
+    usados = set()
+    inicio = 0
+    for i in range(1, len(rotulos) + 1):
+        if i < len(rotulos) and rotulos[i] == rotulos[inicio]:
+            continue
+        rotulo = rotulos[inicio]
+        if rotulo:
+            contagem = por_sinal.setdefault(rotulo, {'segmentos': 0, 'acertos': 0})
+            contagem['segmentos'] += 1
+            janela = range(inicio, min(i + TOLERANCIA_QUADROS, len(previsoes)))
+            acerto = next((j for j in janela if previsoes[j] == rotulo), None)
+            if acerto is not None:
+                contagem['acertos'] += 1
+                usados.add(acerto)
+        inicio = i
+
+    segmentos = sum(c['segmentos'] for c in por_sinal.values())
+    acertos = sum(c['acertos'] for c in por_sinal.values())
+    quadros_estaticos = [(r, e) for r, e in zip(rotulos, estaticos) if r and r not in dinamicos]
+
+    relatorio.update({
+        'segmentos': segmentos,
+        'acuracia_segmentos': round(acertos / segmentos, 4) if segmentos else None,
+        'acuracia_quadros': (round(sum(r == e for r, e in quadros_estaticos) / len(quadros_estaticos), 4)
+                             if quadros_estaticos else None),
+        'falsos_positivos': sum(1 for i, (r, p) in enumerate(zip(rotulos, previsoes))
+                                if p and not r and i not in usados),
+        'por_sinal': por_sinal,
+    })
+    return relatorio
+
+
+def imprimir_relatorio(relatorio):
+    print(f"🎞️  {relatorio['quadros']} quadros em {relatorio['segundos']:.2f} s "
+          f"({relatorio['fps']} FPS)")
+    for etapa, valores in relatorio['latencias_ms'].items():
+        percentis = ' '.join(f"{chave}={valor:.2f}" for chave, valor in valores.items())
+        print(f"  ⏱️  {etapa}: {percentis} ms")
+
+    if relatorio['segmentos']:
+        print(f"🎯 Acurácia por segmento: {relatorio['acuracia_segmentos']:.1%} "
+              f"({relatorio['segmentos']} segmentos)")
+        if relatorio['acuracia_quadros'] is not None:
+            print(f"🎯 Acurácia por quadro (estáticos): {relatorio['acuracia_quadros']:.1%}")
+        for sinal, contagem in sorted(relatorio['por_sinal'].items()):
+            print(f"  • {sinal}: {contagem['acertos']}/{contagem['segmentos']}")
+        print(f"⚠️  Falsos positivos: {relatorio['falsos_positivos']} quadros")
+    else:
+        print("ℹ️  Gravação sem rótulos: acurácia não calculada")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sem tela do reconhecimento de Libras")
+    parser.add_argument('fonte', help="vídeo, diretório de imagens ou fluxo de landmarks (.npz/.json/.lmk)")
+    parser.add_argument('--modelo', default=CAMINHO_MODELO_PADRAO,
+                        help="modelo treinado (.npz); sem o arquivo, usa as regras")
+    parser.add_argument('--regras', action='store_true', help="ignora o modelo e usa as regras")
+    parser.add_argument('--sem-agendador', action='store_true',
+                        help="detecta em todo quadro, no quadro inteiro")
+    parser.add_argument('--limite', type=int, default=None, help="máximo de quadros")
+    parser.add_argument('--json', default=None, help="grava o relatório neste arquivo")
+    parser.add_argument('--acuracia-minima', type=float, default=None,
+                        help="falha (código 1) se a acurácia por segmento ficar abaixo")
+    parser.add_argument('--fps-minimo', type=float, default=None,
+                        help="falha (código 1) se o FPS ficar abaixo")
+    args = parser.parse_args()
+
+    classificar = None
+    if not args.regras and args.modelo and os.path.exists(args.modelo):
+        classificar = ModeloGestos.carregar(args.modelo).prever
+        print(f"✅ Modelo de gestos: {args.modelo}")
+
+    fonte = abrir_fonte(args.fonte)
+    detector = None
+    try:
+        if args.sem_agendador and not isinstance(fonte, (FonteLandmarks, FonteGravacao)):
+            detector = DetectorMaos(adaptativo=False)
+        relatorio = executar_benchmark(fonte, detector, classificar, limite=args.limite)
+    finally:
+        if detector is not None:
+            detector.fechar()
+        fonte.release()
+    imprimir_relatorio(relatorio)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+
+    falhou = False
+    acuracia = relatorio['acuracia_segmentos']
+    if args.acuracia_minima is not None and (acuracia is None or acuracia < args.acuracia_minima):
+        print(f"❌ Acurácia abaixo do mínimo de {args.acuracia_minima:.1%}")
+        falhou = True
+    if args.fps_minimo is not None and (relatorio['fps'] or 0) < args.fps_minimo:
+        print(f"❌ FPS abaixo do mínimo de {args.fps_minimo}")
+        falhou = True
+    return 1 if falhou else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
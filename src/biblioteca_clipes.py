@@ -0,0 +1,396 @@
+"""
+Biblioteca de clipes de fala para montar as respostas sem síntese.
+
+As respostas de PIAManaus.gerar_resposta seguem poucos modelos fixos
+("Ônibus {numero} - {nome}. De {origem} para {destino}. Horário:
+{horario}."). A etapa de construção sintetiza uma vez, com o mesmo motor
+da fala normal (motores_tts), cada trecho fixo dos modelos e cada número,
+nome, lugar e horário do banco. Os clipes em PCM têm o silêncio das
+pontas cortado e são gravados num único .npz. Em execução, a resposta é
+quebrada nos mesmos trechos e montada em memória: clipes colados com
+crossfade curto e pausas na pontuação. O primeiro som sai em
+milissegundos, sem rede e sem síntese. Uma resposta com algum trecho fora
+da biblioteca devolve None, e quem chamou sintetiza normalmente.
+
+Construção:
+    python src/biblioteca_clipes.py                  # usa o banco padrão
+    python src/biblioteca_clipes.py --listar         # só mostra os trechos
+"""
+import argparse
+import io
+import os
+import re
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config import TEXT_TO_SPEECH
+except ImportError:
+    TEXT_TO_SPEECH = {
+        'cache_dir': os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'tts_cache'),
+        'clips_dir': os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'tts_clipes'),
+    }
+
+
+TAXA_PADRAO = 22050
+ARQUIVO_BIBLIOTECA = 'clipes.npz'
+CROSSFADE = 0.012            # segundos de sobreposição entre clipes vizinhos
+MARGEM_CORTE = 0.01          # silêncio mantido nas pontas de cada clipe
+
+# Modelos das respostas de PIAManaus.gerar_resposta (manter em sincronia)
+MODELOS_RESPOSTA = [
+    "Ônibus {numero} - {nome}. De {origem} para {destino}. Horário: {horario}.",
+    "Ônibus {numero} - Informações disponíveis.",
+    "Para {destino}, pegue: {lista}.",
+    "Ônibus para {destino} disponíveis.",
+]
+
+# Frases ditas inteiras pela interface
+FRASES_FIXAS = [
+    "Pergunte sobre linhas de ônibus em Manaus. Exemplos: 'ônibus 640', 'para o terminal', 'linha aeroporto'.",
+    "Google Maps aberto",
+    "Modo Avatar Libras ativado",
+    "Sistema PIA Manaus com reconhecimento real de Libras por câmera",
+]
+
+# Destinos reconhecidos nas perguntas (entram em "Para {destino}")
+DESTINOS_PERGUNTA = ['terminal', 'centro', 'aeroporto', 'flores', 'cidade nova', 'japiim']
+
+# Pausa (segundos) no lugar de cada pontuação
+PAUSAS = {'.': 0.25, '!': 0.25, '?': 0.25, ',': 0.12, ':': 0.12, ';': 0.12, '-': 0.12}
+
+_PONTUACAO = re.compile(r"\s*([.,:;!?]|\s-\s)\s*")
+
+
+def chave_clipe(texto):
+    return ' '.join(texto.split()).casefold()
+
+
+def _compilar(modelo):
+    partes = re.split(r'\{(\w+)\}', modelo)
+    padrao = ''.join(re.escape(parte) if i % 2 == 0 else f'(?P<{parte}>.+?)'
+                     for i, parte in enumerate(partes))
+    return re.compile(padrao), partes
+
+
+_MODELOS = [_compilar(modelo) for modelo in MODELOS_RESPOSTA]
+
+
+def _segmentos_literais(texto):
+    """Trecho fixo de modelo: palavras viram clipes, pontuação vira pausa"""
+    segmentos = []
+    for i, parte in enumerate(_PONTUACAO.split(texto)):
+        if i % 2:
+            segmentos.append(('pausa', PAUSAS[parte.strip()]))
+        elif parte.strip():
+            segmentos.append(('clipe', parte.strip()))
+    return segmentos
+
+
+def segmentar(texto):
+    """
+    Quebra uma resposta nos trechos da biblioteca.
+
+    Returns:
+        Lista de ('clipe', texto) e ('pausa', segundos); a frase inteira
+        vira um único clipe se não seguir nenhum modelo
+    """
+    texto = ' '.join(texto.split())
+    for padrao, partes in _MODELOS:
+        encontrado = padrao.fullmatch(texto)
+        if not encontrado:
+            continue
+        segmentos = []
+        for i, parte in enumerate(partes):
+            if i % 2 == 0:
+                segmentos.extend(_segmentos_literais(parte))
+            elif parte == 'lista':
+                for j, item in enumerate(encontrado.group(parte).split(',')):
+                    if j:
+                        segmentos.append(('pausa', PAUSAS[',']))
+                    segmentos.append(('clipe', item.strip()))
+            else:
+                segmentos.append(('clipe', encontrado.group(parte)))
+        while segmentos and segmentos[-1][0] == 'pausa':
+            segmentos.pop()
+        return segmentos
+    return [('clipe', texto)]
+
+
+def _horario_sql(conn):
+    """Expressão do horário: o banco importado separa início e fim, o da interface não"""
+    colunas = {linha[1] for linha in conn.execute("PRAGMA table_info(linhas_onibus)")}
+    if 'horario_inicio' in colunas:
+        return "horario_inicio || '-' || horario_fim"
+    return "horario"
+
+
+def fragmentos(*conexoes):
+    """
+    Todos os trechos a sintetizar: partes fixas dos modelos, frases da
+    interface e, para cada conexão a um banco, números, nomes, lugares e
+    horários das linhas.
+    """
+    textos = set(FRASES_FIXAS) | set(DESTINOS_PERGUNTA)
+    for _, partes in _MODELOS:
+        for literal in partes[::2]:
+            textos.update(t for tipo, t in _segmentos_literais(literal) if tipo == 'clipe')
+    for conn in conexoes:
+        if conn is None:
+            continue
+        cursor = conn.execute(f'''
+            SELECT numero, nome, origem, destino, {_horario_sql(conn)}
+            FROM linhas_onibus
+        ''')
+        for linha in cursor:
+            textos.update(str(valor) for valor in linha if valor)
+
+    unicos = {}
+    for texto in textos:
+        unicos.setdefault(chave_clipe(texto), ' '.join(texto.split()))
+    return sorted(unicos.values(), key=chave_clipe)
+
+
+def cortar_silencio(pcm, taxa, limiar=0.02, margem=MARGEM_CORTE):
+    """Remove o silêncio do começo e do fim de um clipe int16"""
+    if len(pcm) == 0:
+        return pcm
+    amplitude = np.abs(pcm.astype(np.int32))
+    acima = np.flatnonzero(amplitude > limiar * max(int(amplitude.max()), 1))
+    folga = int(margem * taxa)
+    return pcm[max(0, acima[0] - folga):acima[-1] + 1 + folga]
+
+
+def reamostrar(pcm, taxa_origem, taxa_destino):
+    if taxa_origem == taxa_destino or len(pcm) == 0:
+        return pcm
+    n = int(round(len(pcm) * taxa_destino / taxa_origem))
+    posicoes = np.linspace(0, len(pcm) - 1, n)
+    return np.interp(posicoes, np.arange(len(pcm)), pcm).astype(pcm.dtype)
+
+
+def decodificar_mp3(dados, taxa=TAXA_PADRAO, mixer=None):
+    """
+    MP3 -> PCM int16 mono na taxa pedida (decodificado pelo pygame).
+
+    Usa o mixer já iniciado, na configuração que estiver. Sem mixer, inicia
+    um temporário com `mixer` (argumentos de pygame.mixer.init; padrão: mono
+    16 bits na taxa pedida) e o fecha no fim, deixando o pygame como estava.
+    """
+    import pygame
+
+    iniciado_aqui = not pygame.mixer.get_init()
+    if iniciado_aqui:
+        pygame.mixer.init(**(mixer or {'frequency': taxa, 'size': -16, 'channels': 1}))
+    try:
+        frequencia, _, canais = pygame.mixer.get_init()
+        pcm = np.frombuffer(pygame.mixer.Sound(file=io.BytesIO(dados)).get_raw(), dtype=np.int16)
+    finally:
+        if iniciado_aqui:
+            pygame.mixer.quit()
+    if canais > 1:
+        pcm = pcm.reshape(-1, canais).mean(axis=1).astype(np.int16)
+    return reamostrar(pcm, frequencia, taxa)
+
+
+def para_mixer(pcm, taxa):
+    """PCM int16 mono -> bytes no formato do pygame.mixer já iniciado"""
+    import pygame
+
+    frequencia, _, canais = pygame.mixer.get_init()
+    pcm = reamostrar(pcm, taxa, frequencia)
+    if canais > 1:
+        pcm = np.repeat(pcm[:, None], canais, axis=1)
+    return np.ascontiguousarray(pcm).tobytes()
+
+
+class BibliotecaClipes:
+    """
+    Clipes PCM em memória, indexados pelo texto, e a montagem das respostas.
+    """
+
+    def __init__(self, clipes=None, taxa=TAXA_PADRAO):
+        """
+        Args:
+            clipes: Dicionário {texto: PCM int16 mono}
+            taxa: Amostras por segundo dos clipes
+        """
+        self.taxa = taxa
+        self.clipes = {}
+        self._rampa = np.linspace(0.0, 1.0, max(1, int(CROSSFADE * taxa)), dtype=np.float32)
+        for texto, pcm in (clipes or {}).items():
+            self.adicionar(texto, pcm)
+
+    def adicionar(self, texto, pcm):
+        self.clipes[chave_clipe(texto)] = np.asarray(pcm, dtype=np.float32)
+
+    def __contains__(self, texto):
+        return chave_clipe(texto) in self.clipes
+
+    def __len__(self):
+        return len(self.clipes)
+
+    def faltantes(self, texto):
+        """Trechos da resposta que não estão na biblioteca"""
+        return [t for tipo, t in segmentar(texto) if tipo == 'clipe' and t not in self]
+
+    def montar(self, texto):
+        """
+        PCM int16 da resposta montada a partir dos clipes.
+
+        Returns:
+            Array int16, ou None se faltar algum trecho
+        """
+        partes = []
+        for tipo, valor in segmentar(texto):
+            if tipo == 'pausa':
+                partes.append(np.zeros(int(valor * self.taxa), dtype=np.float32))
+                continue
+            clipe = self.clipes.get(chave_clipe(valor))
+            if clipe is None:
+                return None
+            partes.append(clipe)
+        if not partes:
+            return None
+
+        # Cada emenda sobrepõe o fim de uma parte ao começo da seguinte
+        pedacos = [partes[0]]
+        for parte in partes[1:]:
+            anterior = pedacos[-1]
+            n = min(len(self._rampa), len(anterior), len(parte))
+            if n:
+                rampa = self._rampa if n == len(self._rampa) else np.linspace(0.0, 1.0, n, dtype=np.float32)
+                pedacos[-1] = anterior[:-n]
+                pedacos.append(anterior[-n:] * (1.0 - rampa) + parte[:n] * rampa)
+                parte = parte[n:]
+            pedacos.append(parte)
+        return np.clip(np.concatenate(pedacos), -32768, 32767).astype(np.int16)
+
+    def salvar(self, diretorio):
+        """Grava a biblioteca num único .npz, de forma atômica"""
+        os.makedirs(diretorio, exist_ok=True)
+        textos = sorted(self.clipes)
+        tamanhos = [len(self.clipes[t]) for t in textos]
+        pcm = (np.concatenate([self.clipes[t] for t in textos]).astype(np.int16)
+               if textos else np.empty(0, dtype=np.int16))
+        descritor, temporario = tempfile.mkstemp(prefix='.tmp-', suffix='.npz', dir=diretorio)
+        try:
+            with os.fdopen(descritor, 'wb') as arquivo:
+                np.savez(arquivo, pcm=pcm, textos=np.array(textos, dtype=str),
+                         limites=np.cumsum([0] + tamanhos), taxa=self.taxa)
+            os.replace(temporario, os.path.join(diretorio, ARQUIVO_BIBLIOTECA))
+        except BaseException:
+            if os.path.exists(temporario):
+                os.unlink(temporario)
+            raise
+
+    @classmethod
+    def carregar(cls, diretorio):
+        """Biblioteca gravada em diretorio, ou None se não houver"""
+        caminho = os.path.join(diretorio, ARQUIVO_BIBLIOTECA)
+        if not os.path.exists(caminho):
+            return None
+        try:
+            with np.load(caminho) as dados:
+                biblioteca = cls(taxa=int(dados['taxa']))
+                pcm, limites = dados['pcm'], dados['limites']
+                for i, texto in enumerate(dados['textos']):
+                    biblioteca.clipes[str(texto)] = pcm[limites[i]:limites[i + 1]].astype(np.float32)
+            return biblioteca
+        except Exception as e:
+            print(f"⚠️ Biblioteca de clipes inválida ({caminho}): {e}")
+            return None
+
+
+def construir_biblioteca(diretorio, textos, sintetizar, taxa=TAXA_PADRAO):
+    """
+    Sintetiza os trechos que ainda não estão na biblioteca e grava.
+
+    Args:
+        sintetizar: Função texto -> PCM int16 mono na taxa da biblioteca
+
+    Returns:
+        Dicionário com 'novos', 'existentes' e 'falhas'
+    """
+    biblioteca = BibliotecaClipes.carregar(diretorio)
+    if biblioteca is None or biblioteca.taxa != taxa:
+        biblioteca = BibliotecaClipes(taxa=taxa)
+
+    resultado = {'novos': 0, 'existentes': 0, 'falhas': []}
+    for texto in textos:
+        if texto in biblioteca:
+            resultado['existentes'] += 1
+            continue
+        try:
+            biblioteca.adicionar(texto, cortar_silencio(sintetizar(texto), taxa))
+            resultado['novos'] += 1
+        except Exception as e:
+            print(f"❌ Erro ao sintetizar '{texto}': {e}")
+            resultado['falhas'].append(texto)
+    biblioteca.salvar(diretorio)
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Constrói a biblioteca de clipes de fala do PIA Manaus")
+    parser.add_argument('--db', default=None,
+                        help="Caminho do banco SQLite (padrão: data/database/onibus_manaus.db)")
+    parser.add_argument('--diretorio', default=TEXT_TO_SPEECH.get('clips_dir'),
+                        help="Pasta da biblioteca (padrão: TEXT_TO_SPEECH['clips_dir'])")
+    parser.add_argument('--taxa', type=int, default=TAXA_PADRAO)
+    parser.add_argument('--motor', default=None, help="Motor de voz (padrão: TEXT_TO_SPEECH['engines'])")
+    parser.add_argument('--listar', action='store_true', help="Só lista os trechos, sem sintetizar")
+    args = parser.parse_args()
+
+    from database_module import BancoDadosOnibus
+    from database_module_enhanced import BancoDadosOnibusEnhanced
+
+    banco = BancoDadosOnibusEnhanced(args.db)
+    if not banco.conn:
+        return 1
+    try:
+        # O banco importado e o que a interface consulta em gerar_resposta
+        textos = fragmentos(banco.conn, BancoDadosOnibus().conn)
+    finally:
+        banco.fechar()
+
+    if args.listar:
+        for texto in textos:
+            print(texto)
+        print(f"📋 {len(textos)} trechos")
+        return 0
+
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    from motores_tts import cache_padrao, criar_motores
+
+    # Mesma voz da fala normal: o primeiro motor disponível da configuração
+    motores = criar_motores([args.motor] if args.motor else None, cache=cache_padrao())
+    if not motores:
+        print("❌ Nenhum motor de voz disponível")
+        return 1
+    motor = motores[0]
+    print(f"🔊 Sintetizando {len(textos)} trechos com {motor.nome}...")
+
+    def sintetizar(texto):
+        pcm = motor.sintetizar(texto)
+        return reamostrar(pcm, motor.taxa, args.taxa)
+
+    # Um mixer só para a construção toda, em vez de um por trecho decodificado
+    import pygame
+    pygame.mixer.init(frequency=args.taxa, size=-16, channels=1)
+    try:
+        resultado = construir_biblioteca(args.diretorio, textos, sintetizar, args.taxa)
+    finally:
+        pygame.mixer.quit()
+    print(f"✅ Biblioteca em {args.diretorio}: {resultado['novos']} novos, "
+          f"{resultado['existentes']} já existentes, {len(resultado['falhas'])} falhas")
+    return 1 if resultado['falhas'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,240 @@
 import sqlite3
 import os
+import threading
+import queue
+import atexit
+import weakref
+from datetime import datetime, timezone
+
+# Versão do esquema gravada em PRAGMA user_version; dados de exemplo só são
+# inseridos quando o banco está numa versão anterior
+SCHEMA_VERSION = 1
+
+# SQL fixo: o sqlite3 reaproveita o statement preparado de cada texto
+# idêntico no cache da conexão (cached_statements)
+SQL_BUS_INFO = '''
+    SELECT route_number, route_name, origin, destination, schedule, frequency_min
+    FROM bus_routes
+    WHERE route_number = ? AND active = TRUE
+'''
+
+SQL_BUSES_TO_DESTINATION = '''
+    SELECT route_number, route_name
+    FROM bus_routes
+    WHERE (destination LIKE ? OR origin LIKE ?) AND active = TRUE
+'''
+
+SQL_LOG_INTERACTION = '''
+    INSERT INTO user_interactions
+    (user_input, system_response, interaction_type, success)
+    VALUES (?, ?, ?, ?)
+'''
+
+SQL_LOG_INTERACTION_AT = '''
+    INSERT INTO user_interactions
+    (user_input, system_response, interaction_type, success, timestamp)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+
+class _ThreadConnection:
+    """Guarda a conexão no threading.local; coletado quando a thread termina"""
+
+    __slots__ = ('conn', '__weakref__')
+
+    def __init__(self, conn):
+        self.conn = conn
+
+
+class ConnectionPool:
+    """
+    Pool de conexões persistentes, uma por thread.
+
+    A conexão de uma thread é fechada quando a thread termina (pools de
+    threads criam e descartam threads o tempo todo); close_all fecha as
+    que ainda estiverem abertas.
+    """
+
+    def __init__(self, db_path, cached_statements=128):
+        self.db_path = db_path
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = set()
+        self._closed = False
+
+        # Cada conexão a ':memory:' abriria um banco vazio diferente: usar
+        # um banco em memória compartilhado, mantido vivo por uma conexão
+        self._uri = False
+        self._keepalive = None
+        if db_path == ':memory:':
+            self.db_path = f"file:bus_database_{id(self)}?mode=memory&cache=shared"
+            self._uri = True
+            self._keepalive = self._connect()
+
+    def _connect(self):
+        return sqlite3.connect(
+            self.db_path,
+            uri=self._uri,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+
+    def connection(self):
+        """Retorna a conexão da thread atual, abrindo-a na primeira vez"""
+        holder = getattr(self._local, 'holder', None)
+        if holder is not None:
+            return holder.conn
+
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Connection pool is closed")
+            conn = self._connect()
+            self._connections.add(conn)
+
+        holder = _ThreadConnection(conn)
+        weakref.finalize(holder, self._release, conn)
+        self._local.holder = holder
+        return conn
+
+    def _release(self, conn):
+        """Fecha a conexão de uma thread que terminou"""
+        with self._lock:
+            if conn not in self._connections:
+                return
+            self._connections.discard(conn)
+        conn.close()
+
+    def open_connections(self):
+        """Quantidade de conexões abertas pelo pool"""
+        with self._lock:
+            return len(self._connections)
+
+    def close_all(self):
+        """Fecha todas as conexões abertas pelo pool"""
+        with self._lock:
+            self._closed = True
+            connections, self._connections = self._connections, set()
+
+        for conn in connections:
+            conn.close()
+        if self._keepalive is not None:
+            self._keepalive.close()
+            self._keepalive = None
+
+
+class InteractionLogWriter:
+    """
+    Fila write-behind para user_interactions.
+
+    As interações entram numa fila limitada sem bloquear quem chama; uma
+    thread de fundo grava tudo o que estiver pendente numa única transação
+    a cada flush_interval segundos. Com a fila cheia, novas interações são
+    descartadas e contadas em dropped. Um lote que falha ao gravar (ex.:
+    banco travado) é guardado e tentado de novo no próximo flush.
+    """
+
+    def __init__(self, pool, flush_interval=1.0, max_pending=1000):
+        self.pool = pool
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.max_pending = max_pending
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._retry = []
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._closed = False
+
+        self._thread = threading.Thread(
+            target=self._run, name="interaction-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, user_input, system_response, interaction_type, success):
+        """Enfileira uma interação; nunca bloqueia"""
+        # CURRENT_TIMESTAMP registraria a hora da gravação, não a da interação
+        timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        try:
+            self._queue.put_nowait(
+                (user_input, system_response, interaction_type, success, timestamp))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def pending(self):
+        return self._queue.qsize() + len(self._retry)
+
+    def flush(self):
+        """Grava imediatamente todas as interações pendentes"""
+        with self._write_lock:
+            rows, self._retry = self._retry, []
+            while True:
+                try:
+                    rows.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if not rows:
+                return 0
+
+            conn = self.pool.connection()
+            try:
+                with conn:
+                    conn.executemany(SQL_LOG_INTERACTION_AT, rows)
+            except sqlite3.Error as e:
+                # O lote volta para o próximo flush, sem passar de max_pending
+                excess = len(rows) - self.max_pending
+                if excess > 0:
+                    self.dropped += excess
+                    rows = rows[excess:]
+                self._retry = rows
+                print(f"❌ Erro ao gravar interações ({len(rows)} aguardando nova tentativa): {e}")
+                return 0
+            return len(rows)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        """Para a thread de fundo e grava o que ainda estiver na fila"""
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+        if self._retry:
+            self.dropped += len(self._retry)
+            print(f"⚠️ {len(self._retry)} interações perdidas ao fechar o registro")
+            self._retry = []
+        atexit.unregister(self.close)
+
 
 class BusDatabase:
-    def __init__(self, db_path="data/database/bus_system.db"):
+    def __init__(self, db_path="data/database/bus_system.db",
+                 async_logging=False, flush_interval=1.0, max_pending=1000):
+        """
+        Args:
+            db_path: Caminho do banco SQLite
+            async_logging: Se True, log_interaction grava em lotes numa
+                thread de fundo em vez de fazer um commit por interação
+            flush_interval: Segundos entre gravações do registro assíncrono
+            max_pending: Máximo de interações aguardando gravação
+        """
         self.db_path = db_path
+        self.pool = ConnectionPool(db_path)
         self.init_database()
+
+        self.log_writer = None
+        if async_logging:
+            self.log_writer = InteractionLogWriter(
+                self.pool, flush_interval=flush_interval, max_pending=max_pending)
     
     def init_database(self):
         """Inicializa o banco de dados com tabelas e dados de exemplo"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.pool.connection()
         cursor = conn.cursor()
         
         # Tabela de linhas de ônibus
@@ -37,11 +263,13 @@ class BusDatabase:
             )
         ''')
         
-        # Inserir dados iniciais
-        self.insert_initial_data(cursor)
+        # Inserir dados iniciais apenas uma vez por versão do esquema
+        cursor.execute('PRAGMA user_version')
+        if cursor.fetchone()[0] < SCHEMA_VERSION:
+            self.insert_initial_data(cursor)
+            cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
         
         conn.commit()
-        conn.close()
     
     def insert_initial_data(self, cursor):
         """Insere dados iniciais de exemplo"""
@@ -61,46 +289,34 @@ class BusDatabase:
     
     def get_bus_info(self, route_number):
         """Obtém informações de uma linha de ônibus"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT route_number, route_name, origin, destination, schedule, frequency_min
-            FROM bus_routes 
-            WHERE route_number = ? AND active = TRUE
-        ''', (route_number,))
-        
-        result = cursor.fetchone()
-        conn.close()
-        
-        return result
+        cursor = self.pool.connection().execute(SQL_BUS_INFO, (route_number,))
+        return cursor.fetchone()
     
     def get_buses_to_destination(self, destination):
         """Obtém ônibus que vão para um destino"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT route_number, route_name
-            FROM bus_routes 
-            WHERE (destination LIKE ? OR origin LIKE ?) AND active = TRUE
-        ''', (f'%{destination}%', f'%{destination}%'))
-        
-        results = cursor.fetchall()
-        conn.close()
-        
-        return results
+        cursor = self.pool.connection().execute(
+            SQL_BUSES_TO_DESTINATION, (f'%{destination}%', f'%{destination}%'))
+        return cursor.fetchall()
     
     def log_interaction(self, user_input, system_response, interaction_type, success):
         """Registra interação do usuário"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO user_interactions 
-            (user_input, system_response, interaction_type, success)
-            VALUES (?, ?, ?, ?)
-        ''', (user_input, system_response, interaction_type, success))
-        
+        if self.log_writer is not None:
+            self.log_writer.submit(user_input, system_response, interaction_type, success)
+            return
+
+        conn = self.pool.connection()
+        conn.execute(SQL_LOG_INTERACTION,
+                     (user_input, system_response, interaction_type, success))
         conn.commit()
-        conn.close()
\ No newline at end of file
+
+    def flush_interactions(self):
+        """Grava as interações pendentes do registro assíncrono"""
+        if self.log_writer is not None:
+            return self.log_writer.flush()
+        return 0
+
+    def close(self):
+        """Grava interações pendentes e fecha todas as conexões do pool"""
+        if self.log_writer is not None:
+            self.log_writer.close()
+        self.pool.close_all()
@@ -0,0 +1,81 @@
+"""
+Cache em memória para consultas ao banco de dados do PIA Manaus.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+# Marca de ausência (None é um resultado válido: "linha não encontrada")
+AUSENTE = object()
+
+
+class CacheLRU:
+    """
+    Cache LRU com tempo de expiração e contadores de acertos/falhas.
+
+    Os valores guardados são compartilhados entre chamadas e não devem ser
+    modificados por quem os recebe.
+    """
+
+    def __init__(self, capacidade=256, ttl=300.0):
+        """
+        Args:
+            capacidade: Número máximo de entradas
+            ttl: Segundos até uma entrada expirar (None = nunca expira)
+        """
+        self.capacidade = capacidade
+        self.ttl = ttl
+        self.acertos = 0
+        self.falhas = 0
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave):
+        """Retorna o valor em cache ou AUSENTE"""
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None:
+                expira_em, valor = item
+                if expira_em is None or expira_em > time.monotonic():
+                    self._itens.move_to_end(chave)
+                    self.acertos += 1
+                    return valor
+                del self._itens[chave]
+
+            self.falhas += 1
+            return AUSENTE
+
+    def guardar(self, chave, valor):
+        """Guarda um valor, descartando o menos usado se necessário"""
+        expira_em = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._itens[chave] = (expira_em, valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.capacidade:
+                self._itens.popitem(last=False)
+
+    def invalidar(self):
+        """Descarta todas as entradas (usar após importar ou alterar dados)"""
+        with self._lock:
+            self._itens.clear()
+
+    def __len__(self):
+        return len(self._itens)
+
+    def __contains__(self, chave):
+        """Consulta sem contar acerto/falha nem mudar a ordem de uso"""
+        with self._lock:
+            item = self._itens.get(chave)
+            return item is not None and (item[0] is None or item[0] > time.monotonic())
+
+    def estatisticas(self):
+        """Retorna contadores de uso do cache"""
+        with self._lock:
+            total = self.acertos + self.falhas
+            return {
+                'entradas': len(self._itens),
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'taxa_acerto': self.acertos / total if total else 0.0,
+            }
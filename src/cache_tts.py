@@ -0,0 +1,232 @@
+"""
+Cache em disco dos áudios sintetizados do PIA Manaus.
+
+As respostas do quiosque são quase sempre as mesmas poucas dezenas de
+frases. Cada áudio é guardado com o nome igual ao sha256 de (texto,
+idioma, lento), então repetir uma resposta toca o arquivo já pronto, sem
+chamar a síntese. A escrita é atômica (arquivo temporário + os.replace):
+uma queda no meio nunca deixa um áudio pela metade no cache. O índice fica
+em memória, em ordem de uso; passando do limite de tamanho, os menos
+usados são apagados, exceto os que estiverem em uso (usando()): apagar um
+áudio aberto falha no Windows e pode cortar a leitura nos demais sistemas.
+A ordem de uso sobrevive a reinícios pela data de modificação dos arquivos.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+
+EXTENSAO = '.mp3'
+
+
+def chave_audio(texto, idioma='pt-br', lento=False):
+    """sha256 de (texto com espaços normalizados, idioma, lento)"""
+    conteudo = json.dumps([' '.join(texto.split()), idioma.lower(), bool(lento)], ensure_ascii=False)
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+
+class CacheAudio:
+    """
+    Áudios endereçados pelo conteúdo, com limite de tamanho e descarte LRU.
+    """
+
+    def __init__(self, diretorio, limite_bytes=50 * 1024 * 1024, extensao=EXTENSAO):
+        """
+        Args:
+            diretorio: Pasta do cache (criada se não existir)
+            limite_bytes: Tamanho máximo somado dos áudios
+            extensao: Extensão dos arquivos de áudio
+        """
+        self.diretorio = diretorio
+        self.limite_bytes = limite_bytes
+        self.extensao = extensao
+        self.acertos = 0
+        self.falhas = 0
+        self.total_bytes = 0
+        self._itens = OrderedDict()         # chave -> tamanho, do menos ao mais usado
+        self._em_sintese = {}               # chave -> Event de quem está sintetizando
+        self._em_uso = Counter()            # chave -> leitores; não são apagadas
+        self._lock = threading.Lock()
+        os.makedirs(diretorio, exist_ok=True)
+        self._carregar_indice()
+
+    def _carregar_indice(self):
+        """Monta o índice a partir da pasta, apagando temporários órfãos"""
+        encontrados = []
+        for nome in os.listdir(self.diretorio):
+            caminho = os.path.join(self.diretorio, nome)
+            try:
+                if nome.startswith('.tmp-'):
+                    os.unlink(caminho)
+                elif nome.endswith(self.extensao):
+                    info = os.stat(caminho)
+                    encontrados.append((info.st_mtime, nome[:-len(self.extensao)], info.st_size))
+            except OSError:
+                continue
+        for _, chave, tamanho in sorted(encontrados):
+            self._itens[chave] = tamanho
+            self.total_bytes += tamanho
+        self._despejar()
+
+    def caminho(self, chave):
+        return os.path.join(self.diretorio, chave + self.extensao)
+
+    def obter(self, texto, idioma='pt-br', lento=False, reservar=False):
+        """
+        Caminho do áudio em cache ou None.
+
+        Args:
+            reservar: Marca o áudio como em uso; quem reserva chama liberar()
+        """
+        chave = chave_audio(texto, idioma, lento)
+        with self._lock:
+            if chave not in self._itens:
+                self.falhas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            if reservar:
+                self._em_uso[chave] += 1
+        caminho = self.caminho(chave)
+        try:
+            os.utime(caminho)
+        except OSError:
+            # Apagado por fora: tira do índice e trata como falha
+            with self._lock:
+                self.total_bytes -= self._itens.pop(chave, 0)
+                self.acertos -= 1
+                self.falhas += 1
+            if reservar:
+                self.liberar(chave)
+            return None
+        return caminho
+
+    def liberar(self, chave):
+        """Desfaz uma reserva e apaga o que tenha passado do limite enquanto isso"""
+        with self._lock:
+            self._em_uso[chave] -= 1
+            if self._em_uso[chave] <= 0:
+                del self._em_uso[chave]
+                self._despejar()
+
+    @contextmanager
+    def usando(self, texto, sintetizar, idioma='pt-br', lento=False):
+        """
+        Como obter_ou_sintetizar, mas o áudio não é apagado pelo descarte
+        LRU até o fim do bloco with.
+        """
+        caminho = self.obter_ou_sintetizar(texto, sintetizar, idioma, lento, reservar=True)
+        try:
+            yield caminho
+        finally:
+            self.liberar(chave_audio(texto, idioma, lento))
+
+    def guardar(self, texto, dados, idioma='pt-br', lento=False, reservar=False):
+        """
+        Grava o áudio de forma atômica e descarta os menos usados.
+
+        Args:
+            reservar: Marca o áudio como em uso; quem reserva chama liberar()
+
+        Returns:
+            Caminho do áudio no cache
+        """
+        chave = chave_audio(texto, idioma, lento)
+        caminho = self.caminho(chave)
+        descritor, temporario = tempfile.mkstemp(prefix='.tmp-', dir=self.diretorio)
+        try:
+            with os.fdopen(descritor, 'wb') as arquivo:
+                arquivo.write(dados)
+                arquivo.flush()
+                os.fsync(arquivo.fileno())
+            os.replace(temporario, caminho)
+        except BaseException:
+            try:
+                os.unlink(temporario)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            self.total_bytes += len(dados) - self._itens.get(chave, 0)
+            self._itens[chave] = len(dados)
+            self._itens.move_to_end(chave)
+            if reservar:
+                self._em_uso[chave] += 1
+            self._despejar(manter=chave)
+        return caminho
+
+    def obter_ou_sintetizar(self, texto, sintetizar, idioma='pt-br', lento=False, reservar=False):
+        """
+        Caminho do áudio, sintetizando só se não estiver em cache. Pedidos
+        simultâneos da mesma frase esperam uma única síntese.
+
+        Args:
+            sintetizar: Função (texto, idioma, lento) -> bytes do áudio
+            reservar: Marca o áudio como em uso; quem reserva chama liberar()
+        """
+        chave = chave_audio(texto, idioma, lento)
+        while True:
+            caminho = self.obter(texto, idioma, lento, reservar)
+            if caminho is not None:
+                return caminho
+            with self._lock:
+                evento = self._em_sintese.get(chave)
+                if evento is None:
+                    evento = self._em_sintese[chave] = threading.Event()
+                    break
+            evento.wait()
+
+        try:
+            return self.guardar(texto, sintetizar(texto, idioma, lento), idioma, lento, reservar)
+        finally:
+            with self._lock:
+                del self._em_sintese[chave]
+            evento.set()
+
+    def _despejar(self, manter=None):
+        """Apaga os menos usados até caber no limite, pulando os em uso (com _lock)"""
+        for chave in list(self._itens):
+            if self.total_bytes <= self.limite_bytes:
+                break
+            if chave == manter or chave in self._em_uso:
+                continue
+            self.total_bytes -= self._itens.pop(chave)
+            try:
+                os.unlink(self.caminho(chave))
+            except OSError:
+                pass
+
+    def limpar(self):
+        """Apaga todos os áudios do cache que não estiverem em uso"""
+        with self._lock:
+            for chave in list(self._itens):
+                if chave in self._em_uso:
+                    continue
+                self.total_bytes -= self._itens.pop(chave)
+                try:
+                    os.unlink(self.caminho(chave))
+                except OSError:
+                    pass
+
+    def __len__(self):
+        return len(self._itens)
+
+    def __contains__(self, chave):
+        return chave in self._itens
+
+    def estatisticas(self):
+        """Retorna contadores de uso do cache"""
+        with self._lock:
+            total = self.acertos + self.falhas
+            return {
+                'entradas': len(self._itens),
+                'bytes': self.total_bytes,
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'taxa_acerto': self.acertos / total if total else 0.0,
+            }
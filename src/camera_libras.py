@@ -1,26 +1,46 @@
 import pygame
 import cv2
 import numpy as np
-import mediapipe as mp
 import time
 import math
+import dataclasses
+import os
+import sys
+import threading
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pipeline_frames import FilaDescarte, BufferTriplo
+from classificador_gestos import ClassificadorGestos
+from modelo_gestos import ModeloGestos, GravadorDataset, CAMINHO_MODELO_PADRAO
+from sequencia_gestos import ReconhecedorSequencias
+from agendador_inferencia import AgendadorInferencia
+from deteccao_maos import DeteccaoMaos
+from fontes_frames import abrir_fonte
+from gravador_landmarks import GravadorLandmarks
+from modelo_maos import gerenciador_padrao
+
+# Tamanho da área da câmera na interface (PIAManaus.desenhar_camera)
+TAMANHO_EXIBICAO = (480, 360)
+
+# Gravações contínuas de landmarks dos quiosques (iniciar_captura)
+DIRETORIO_CAPTURAS = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  '..', 'data', 'capturas')
 
 class ReconhecimentoLibras:
-    def __init__(self):
+    def __init__(self, tamanho_exibicao=TAMANHO_EXIBICAO, caminho_modelo=CAMINHO_MODELO_PADRAO,
+                 gerenciador_maos=None, gerenciador_recortes=None):
         print("✅ Inicializando sistema de reconhecimento de Libras...")
         
-        # Inicializar MediaPipe Hands
-        self.mp_hands = mp.solutions.hands
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.mp_drawing_styles = mp.solutions.drawing_styles
-        
-        # Configurar detecção de mãos
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5
-        )
+        # MediaPipe Hands só é carregado ao abrir a câmera (ou por aquecer()),
+        # e continua carregado quando a câmera é desligada. O modelo em modo
+        # vídeo só vê quadros inteiros; os recortes vão para o de modo imagem.
+        self.gerenciador_maos = gerenciador_maos or gerenciador_padrao()
+        self.gerenciador_recortes = gerenciador_recortes or gerenciador_padrao(recortes=True)
+        self.hands = None
+        self.hands_recortes = None
+        self.mp_hands = None
+        self.mp_drawing = None
         
         self.ativa = False
         self.cap = None
@@ -32,15 +52,103 @@ class ReconhecimentoLibras:
         # Histórico de gestos para melhor detecção
         self.historico_gestos = []
         self.max_historico = 10
-        
-        print("✅ Sistema MediaPipe Hands inicializado!")
+        self.classificador = ClassificadorGestos()
+        
+        # Sinais com movimento (ex.: "onde"), reconhecidos pela trajetória da mão
+        self.sequencias = ReconhecedorSequencias()
+        
+        # Modelo treinado (modelo_gestos.py); sem ele, vale a tabela de regras
+        self.modelo = None
+        if caminho_modelo and os.path.exists(caminho_modelo):
+            try:
+                self.modelo = ModeloGestos.carregar(caminho_modelo)
+                print(f"✅ Modelo de gestos carregado: {len(self.modelo.classes)} sinais")
+            except Exception as e:
+                print(f"❌ Erro ao carregar modelo de gestos: {e}")
+        
+        # Gravação de amostras para treino
+        self.gravador = None
+        self.rotulo_gravacao = None
+        
+        # Captura contínua de todas as mãos detectadas (.lmk)
+        self.captura = None
+        
+        # Pipeline: thread de captura -> thread de inferência -> interface.
+        # As filas descartam o item mais antigo, então a interface sempre
+        # recebe o frame anotado mais recente sem esperar pela câmera.
+        self._fila_frames = FilaDescarte(capacidade=2)
+        
+        # Buffers reaproveitados a cada frame: RGB no tamanho da câmera e
+        # três saídas no tamanho de exibição, cada uma com sua superfície
+        # pygame apontando para a mesma memória (sem cópias por frame)
+        self.tamanho_exibicao = tamanho_exibicao
+        self._frame_rgb = None
+        
+        # Detecção adaptativa: busca espaçada e reduzida sem mão,
+        # recorte em volta da mão enquanto ela estiver à vista
+        # (mesma etapa do benchmark_libras)
+        self.agendador = AgendadorInferencia()
+        self.deteccao = DeteccaoMaos(self.agendador)
+        largura, altura = tamanho_exibicao
+        self._saidas = BufferTriplo(lambda: self._criar_saida(largura, altura))
+        self.fila_sinais = FilaDescarte(capacidade=8)
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._threads = []
+        self.landmarks_atuais = np.empty((0, 21, 3), dtype=np.float32)
+        self.frames_capturados = 0
+        self.frames_processados = 0
+        
+        print("✅ Reconhecimento de Libras pronto (MediaPipe carregado sob demanda)")
+    
+    def aquecer(self):
+        """Carrega o MediaPipe em segundo plano, antes de a câmera ser aberta"""
+        self.gerenciador_maos.aquecer()
+        self.gerenciador_recortes.aquecer()
+    
+    def _preparar_mediapipe(self):
+        """
+        Pega os modelos compartilhados e os utilitários de desenho.
+        
+        As referências adquiridas aqui pertencem à thread de inferência do
+        pipeline que vai começar, e é ela que as devolve ao terminar.
+        """
+        self.hands = self.gerenciador_maos.adquirir()
+        try:
+            self.hands_recortes = self.gerenciador_recortes.adquirir()
+        except Exception:
+            self.gerenciador_maos.liberar()
+            raise
+        if self.mp_drawing is None:
+            import mediapipe as mp
+            
+            self.mp_hands = mp.solutions.hands
+            self.mp_drawing = mp.solutions.drawing_utils
+            # O frame é desenhado já em RGB: estilos do MediaPipe (BGR) convertidos uma vez
+            estilos = mp.solutions.drawing_styles
+            self._estilo_landmarks = self._estilo_rgb(estilos.get_default_hand_landmarks_style())
+            self._estilo_conexoes = self._estilo_rgb(estilos.get_default_hand_connections_style())
     
-    def iniciar_camera(self):
-        """Inicia a câmera real com reconhecimento de mãos"""
+    def iniciar_camera(self, fonte=None):
+        """
+        Inicia a câmera real com reconhecimento de mãos.
+        
+        Args:
+            fonte: Opcional, substitui a câmera: caminho de vídeo ou diretório
+                   de imagens (tocados em tempo real e em repetição) ou um
+                   objeto com a interface do cv2.VideoCapture
+        """
         try:
-            self.cap = cv2.VideoCapture(0)
-            if not self.cap.isOpened():
+            if fonte is None:
+                self.cap = cv2.VideoCapture(0)
+            elif isinstance(fonte, str):
+                self.cap = abrir_fonte(fonte, tempo_real=True, repetir=True)
+            else:
+                self.cap = fonte
+            
+            if not hasattr(self.cap, 'read') or not self.cap.isOpened():
                 print("❌ Não foi possível abrir a câmera")
+                self.cap = None
                 return self._iniciar_camera_simulada()
                 
             # Configurar câmera
@@ -48,12 +156,21 @@ class ReconhecimentoLibras:
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
             self.cap.set(cv2.CAP_PROP_FPS, 30)
             
+            # Instantâneo se o modelo já foi aquecido ou usado antes
+            self._preparar_mediapipe()
+            
             self.ativa = True
-            print("📷 Câmera real com reconhecimento de Libras iniciada!")
+            self._iniciar_pipeline()
+            if fonte is None:
+                print("📷 Câmera real com reconhecimento de Libras iniciada!")
+            else:
+                print(f"🎞️ Reconhecimento de Libras iniciado com fonte gravada: {fonte}")
             return True
             
         except Exception as e:
             print(f"❌ Erro ao iniciar câmera: {e}")
+            if self.cap is not None:
+                self.cap.release()
             return self._iniciar_camera_simulada()
     
     def _iniciar_camera_simulada(self):
@@ -64,180 +181,263 @@ class ReconhecimentoLibras:
         self.frame_atual = pygame.Surface((640, 480))
         return True
     
-    def _processar_frame_mediapipe(self, frame):
-        """Processa frame com MediaPipe para detectar mãos e gestos"""
-        # Converter BGR para RGB
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        frame_rgb.flags.writeable = False
-        
-        # Detectar mãos
-        resultados = self.hands.process(frame_rgb)
-        
-        # Converter de volta para BGR para desenhar
-        frame_rgb.flags.writeable = True
-        frame_bgr = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
+    @staticmethod
+    def _estilo_rgb(estilo):
+        """Copia um estilo de desenho do MediaPipe trocando as cores BGR por RGB"""
+        return {
+            chave: dataclasses.replace(spec, color=tuple(reversed(spec.color)))
+            for chave, spec in estilo.items()
+        }
+    
+    @staticmethod
+    def _criar_saida(largura, altura):
+        """Buffer RGB de saída e a superfície que lê diretamente dele"""
+        buffer = np.zeros((altura, largura, 3), dtype=np.uint8)
+        return buffer, pygame.image.frombuffer(buffer, (largura, altura), 'RGB')
+    
+    def _iniciar_pipeline(self):
+        """Inicia as threads de captura e de inferência"""
+        # Um evento por pipeline: threads antigas que ainda não terminaram
+        # (join com timeout) não voltam a rodar quando a câmera reabre
+        self._parar = threading.Event()
+        self._fila_frames.limpar()
+        self._saidas.limpar()
+        self.sequencias.reiniciar()
+        self.agendador.reiniciar()
+        self._threads = [
+            threading.Thread(target=self._loop_captura, args=(self.cap, self._parar),
+                             name="libras-captura", daemon=True),
+            threading.Thread(target=self._loop_inferencia, args=(self._parar,),
+                             name="libras-inferencia", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def _parar_pipeline(self):
+        """Sinaliza as threads e espera que terminem"""
+        self._parar.set()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=1.0)
+        self._threads = []
+    
+    def _loop_captura(self, cap, parar):
+        """
+        Lê frames da câmera o mais rápido possível.
         
-        gesto_detectado = None
-        landmarks = []
-        
-        if resultados.multi_hand_landmarks:
-            for hand_landmarks in resultados.multi_hand_landmarks:
-                # Desenhar landmarks das mãos
-                self.mp_drawing.draw_landmarks(
-                    frame_bgr,
-                    hand_landmarks,
-                    self.mp_hands.HAND_CONNECTIONS,
-                    self.mp_drawing_styles.get_default_hand_landmarks_style(),
-                    self.mp_drawing_styles.get_default_hand_connections_style()
-                )
+        Só esta thread usa a câmera, e é ela que a libera ao sair: liberar
+        de outra thread poderia acontecer no meio de um cap.read().
+        """
+        try:
+            while not parar.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    parar.wait(0.01)
+                    continue
+                self.frames_capturados += 1
+                self._fila_frames.colocar(frame)
+        finally:
+            cap.release()
+    
+    def _loop_inferencia(self, parar):
+        """
+        Processa o frame mais recente com MediaPipe e prepara a superfície.
+        
+        Só esta thread usa os modelos, e é ela que devolve as referências
+        ao sair: quem para a câmera pode desistir do join com um process()
+        em andamento.
+        """
+        try:
+            self._inferir(parar)
+        finally:
+            self.gerenciador_maos.liberar()
+            self.gerenciador_recortes.liberar()
+    
+    def _inferir(self, parar):
+        """Laço da thread de inferência, até o pipeline ser parado"""
+        while not parar.is_set():
+            frame = self._fila_frames.obter(timeout=0.1)
+            if frame is None:
+                continue
+            
+            try:
+                # Processar com MediaPipe (desenha os landmarks no próprio frame RGB)
+                frame_rgb, gesto, landmarks, gestos = self._processar_frame_mediapipe(frame)
+                
+                # Adicionar informações ao frame
+                self._adicionar_overlay(frame_rgb, gesto, landmarks)
                 
-                # Extrair coordenadas dos landmarks
-                landmarks_frame = []
-                for idx, landmark in enumerate(hand_landmarks.landmark):
-                    h, w, c = frame_bgr.shape
-                    x, y = int(landmark.x * w), int(landmark.y * h)
-                    landmarks_frame.append((x, y, landmark.z))
+                # Reduzir direto para um buffer de saída livre, já no tamanho de exibição
+                indice, (saida, _) = self._saidas.livre()
+                cv2.resize(frame_rgb, self.tamanho_exibicao, dst=saida,
+                           interpolation=cv2.INTER_AREA)
+                self._saidas.publicar(indice)
                 
-                landmarks.append(landmarks_frame)
+                with self._lock:
+                    self.landmarks_atuais = landmarks
+                    if self.rotulo_gravacao and len(landmarks):
+                        self.gravador.adicionar(self.rotulo_gravacao, landmarks)
+                    captura, rotulo = self.captura, self.rotulo_gravacao
+                if captura is not None and len(landmarks):
+                    captura.adicionar(landmarks, rotulo, gestos, quadro=self.frames_processados)
+                self.frames_processados += 1
                 
-                # Reconhecer gesto
-                gesto = self._reconhecer_gesto(landmarks_frame)
+                # Sinais dinâmicos: cada ocorrência é reportada uma única vez
+                for sinal in self.sequencias.atualizar(landmarks[0] if len(landmarks) else None):
+                    self._confirmar_sinal(sinal)
+                
+                # Detectar gesto
                 if gesto:
-                    gesto_detectado = gesto
+                    self._processar_gesto_detectado(gesto)
+            except Exception as e:
+                print(f"❌ Erro ao processar frame: {e}")
+    
+    def _processar_frame_mediapipe(self, frame):
+        """
+        Processa frame com MediaPipe para detectar mãos e gestos.
+        
+        O frame BGR da câmera é convertido uma única vez para o buffer RGB
+        reaproveitado, que recebe os desenhos. A detecção roda só onde e
+        quando o agendador indicar: quadro reduzido no modelo em modo vídeo,
+        recorte da mão no modelo em modo imagem.
+        """
+        if self._frame_rgb is None or self._frame_rgb.shape != frame.shape:
+            self._frame_rgb = np.empty_like(frame)
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._frame_rgb)
+        
+        # Mãos como array (N_maos, 21, 3) em pixels do quadro, classificadas de uma vez
+        landmarks, resultados, area = self.deteccao.detectar(
+            frame_rgb, self.hands, self.hands_recortes)
+        if resultados is None:
+            return frame_rgb, None, landmarks, []
+        
+        # Desenhar landmarks das mãos (normalizados em relação à região)
+        for hand_landmarks in resultados.multi_hand_landmarks or ():
+            self.mp_drawing.draw_landmarks(
+                area,
+                hand_landmarks,
+                self.mp_hands.HAND_CONNECTIONS,
+                self._estilo_landmarks,
+                self._estilo_conexoes
+            )
+        
+        # Reconhecer gesto (com duas mãos, vale o da última)
+        gestos = self._classificar(landmarks)
+        gesto_detectado = None
+        for gesto in gestos:
+            if gesto:
+                gesto_detectado = gesto
         
-        return frame_bgr, gesto_detectado, landmarks
+        return frame_rgb, gesto_detectado, landmarks, gestos
+    
+    def _classificar(self, maos):
+        """Gesto de cada mão pelo modelo treinado ou, sem ele, pelas regras"""
+        if self.modelo is not None:
+            return self.modelo.prever(maos)
+        return self.classificador.classificar(maos)
     
     def _reconhecer_gesto(self, landmarks):
-        """Reconhece gestos específicos de Libras baseado na posição dos dedos"""
+        """Reconhece o gesto de uma mão (21 landmarks)"""
         if len(landmarks) < 21:
             return None
         
-        # Extrair pontos importantes
-        punho = landmarks[0]
-        polegar_ponta = landmarks[4]
-        indicador_ponta = landmarks[8]
-        medio_ponta = landmarks[12]
-        anelar_ponta = landmarks[16]
-        mindinho_ponta = landmarks[20]
-        
-        indicador_base = landmarks[5]
-        medio_base = landmarks[9]
-        anelar_base = landmarks[13]
-        mindinho_base = landmarks[17]
-        
-        # Calcular distâncias entre dedos
-        def distancia(p1, p2):
-            return math.sqrt((p1[0]-p2[0])**2 + (p1[1]-p2[1])**2)
-        
-        # Gesto: POLEGAR PARA CIMA (Ônibus)
-        if (polegar_ponta[1] < indicador_base[1] and  # Polegar acima dos outros dedos
-            indicador_ponta[1] > indicador_base[1] and  # Outros dedos flexionados
-            medio_ponta[1] > medio_base[1] and
-            anelar_ponta[1] > anelar_base[1] and
-            mindinho_ponta[1] > mindinho_base[1]):
-            return "onibus"
-        
-        # Gesto: MÃO ABERTA (Terminal)
-        if (distancia(polegar_ponta, indicador_ponta) > 50 and
-            distancia(indicador_ponta, medio_ponta) > 30 and
-            distancia(medio_ponta, anelar_ponta) > 30 and
-            distancia(anelar_ponta, mindinho_ponta) > 30):
-            return "terminal"
-        
-        # Gesto: INDICADOR PARA CIMA (Qual)
-        if (indicador_ponta[1] < indicador_base[1] and  # Indicador estendido
-            polegar_ponta[1] < polegar_ponta[1] and     # Polegar não interfere
-            medio_ponta[1] > medio_base[1] and          # Outros dedos flexionados
-            anelar_ponta[1] > anelar_base[1] and
-            mindinho_ponta[1] > mindinho_base[1]):
-            return "qual"
-        
-        # Gesto: APONTAR PARA PULSO (Horas)
-        if (indicador_ponta[0] < punho[0] and          # Indicador apontando para pulso
-            distancia(indicador_ponta, punho) < 80):    # Perto do pulso
-            return "horas"
-        
-        # Gesto: APONTAR PARA CENTRO (Centro)
-        if (indicador_ponta[0] > punho[0] + 50 and     # Indicador apontando para centro
-            medio_ponta[1] > medio_base[1]):           # Mão fechada parcialmente
-            return "centro"
-        
-        # Gesto: MÃO PLANANDO (Aeroporto)
-        if (abs(polegar_ponta[1] - mindinho_ponta[1]) < 30 and  # Mão plana
-            abs(indicador_ponta[1] - medio_ponta[1]) < 20):
-            return "aeroporto"
-        
-        # Gesto: MÃO OSCILANDO (Onde)
-        if len(self.historico_gestos) > 3:
-            ultimos_gestos = self.historico_gestos[-3:]
-            if all(g == "movimento" for g in ultimos_gestos):
-                return "onde"
-        
-        return None
-    
-    def _detectar_movimento(self, landmarks):
-        """Detecta movimento geral da mão"""
-        if not hasattr(self, 'landmarks_anterior') or self.landmarks_anterior is None:
-            self.landmarks_anterior = landmarks
-            return "movimento"
-        
-        # Calcular movimento médio
-        movimento_total = 0
-        pontos_compare = min(len(landmarks), len(self.landmarks_anterior))
-        
-        for i in range(pontos_compare):
-            mov_x = abs(landmarks[i][0] - self.landmarks_anterior[i][0])
-            mov_y = abs(landmarks[i][1] - self.landmarks_anterior[i][1])
-            movimento_total += mov_x + mov_y
-        
-        self.landmarks_anterior = landmarks
-        
-        if movimento_total > 100:  # Threshold para movimento significativo
-            return "movimento"
-        
-        return None
+        mao = np.asarray(landmarks, dtype=np.float32)[None, :21]
+        return self._classificar(mao)[0]
     
     def obter_frame(self):
         """Obtém e processa o frame atual da câmera"""
         if not self.ativa:
             return None
             
-        if self.cap and self.cap.isOpened():
-            # Câmera real
-            ret, frame = self.cap.read()
-            if ret:
-                # Processar com MediaPipe
-                frame_processado, gesto, landmarks = self._processar_frame_mediapipe(frame)
-                
-                # Adicionar informações ao frame
-                frame_com_info = self._adicionar_overlay(frame_processado, gesto, landmarks)
-                
-                # Converter para superficie pygame
-                frame_rgb = cv2.cvtColor(frame_com_info, cv2.COLOR_BGR2RGB)
-                frame_surface = pygame.surfarray.make_surface(np.rot90(frame_rgb))
-                self.frame_atual = pygame.transform.flip(frame_surface, True, False)
-                
-                # Detectar gesto
-                if gesto:
-                    self._processar_gesto_detectado(gesto)
-                elif landmarks:
-                    movimento = self._detectar_movimento(landmarks[0])
-                    if movimento:
-                        self._processar_gesto_detectado(movimento)
+        if self.cap is not None:
+            # Câmera real: pegar o último frame pronto, sem bloquear
+            saida = self._saidas.obter_mais_recente()
+            if saida is not None:
+                self.frame_atual = saida[1]
         else:
             # Câmera simulada
             self._atualizar_frame_simulado()
             
         return self.frame_atual
     
+    def obter_landmarks(self):
+        """Landmarks das mãos no último frame processado"""
+        with self._lock:
+            return self.landmarks_atuais.copy()
+    
+    def iniciar_gravacao(self, rotulo):
+        """Passa a guardar as mãos de cada frame como amostras do gesto"""
+        with self._lock:
+            self.gravador = GravadorDataset()
+            self.rotulo_gravacao = rotulo
+    
+    def parar_gravacao(self, diretorio):
+        """
+        Encerra a gravação e salva as amostras em diretorio.
+        
+        Returns:
+            Caminho do arquivo gravado, ou None se não houve amostras
+        """
+        with self._lock:
+            gravador, rotulo = self.gravador, self.rotulo_gravacao
+            self.gravador = self.rotulo_gravacao = None
+        
+        if not gravador or not len(gravador):
+            return None
+        caminho = os.path.join(diretorio, f"{rotulo}_{time.strftime('%Y%m%d_%H%M%S')}.npz")
+        gravador.salvar(caminho)
+        return caminho
+    
+    def iniciar_captura(self, caminho=None):
+        """
+        Passa a gravar todas as mãos detectadas, com instante, gesto previsto
+        e o rótulo da gravação em andamento (iniciar_gravacao), se houver.
+        
+        Returns:
+            Caminho do arquivo .lmk
+        """
+        caminho = caminho or os.path.join(
+            DIRETORIO_CAPTURAS, f"captura_{time.strftime('%Y%m%d_%H%M%S')}.lmk")
+        captura = GravadorLandmarks(caminho)
+        with self._lock:
+            anterior, self.captura = self.captura, captura
+        if anterior is not None:
+            anterior.fechar()
+        print(f"💾 Capturando landmarks em {caminho}")
+        return caminho
+    
+    def parar_captura(self):
+        """
+        Encerra a captura contínua.
+        
+        Returns:
+            Dicionário com 'caminho', 'registros' e 'bytes', ou None
+        """
+        with self._lock:
+            captura, self.captura = self.captura, None
+        if captura is None:
+            return None
+        captura.fechar()
+        return {'caminho': captura.caminho, 'registros': captura.registros,
+                'bytes': captura.bytes_gravados}
+    
+    def obter_estatisticas(self):
+        """Contadores do pipeline"""
+        return {
+            'capturados': self.frames_capturados,
+            'processados': self.frames_processados,
+            'descartados': self._fila_frames.descartados + self._saidas.descartados,
+            'deteccoes': dict(self.agendador.contadores),
+        }
+    
     def _adicionar_overlay(self, frame, gesto, landmarks):
-        """Adiciona overlay informativo ao frame"""
+        """Adiciona overlay informativo ao frame (RGB, desenhado no lugar)"""
         h, w = frame.shape[:2]
         
         # Adicionar texto de status
-        status_text = "MAOS DETECTADAS" if landmarks else "FAÇA SINAIS DE LIBRAS"
+        status_text = "MAOS DETECTADAS" if len(landmarks) else "FAÇA SINAIS DE LIBRAS"
         cv2.putText(frame, status_text, (10, 30), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
         
         # Adicionar gesto detectado
         if gesto:
@@ -245,9 +445,9 @@ class ReconhecimentoLibras:
                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
         
         # Adicionar retângulo de detecção
-        cv2.rectangle(frame, (w//4, h//4), (3*w//4, 3*h//4), (255, 255, 0), 2)
+        cv2.rectangle(frame, (w//4, h//4), (3*w//4, 3*h//4), (0, 255, 255), 2)
         cv2.putText(frame, "ZONA DE SINAIS", (w//4, h//4 - 10), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
         
         # Instruções
         instrucoes = [
@@ -276,10 +476,15 @@ class ReconhecimentoLibras:
         # Só considerar gestos estáveis (aparecem múltiplas vezes)
         if len(self.historico_gestos) >= 3:
             ultimos_3 = self.historico_gestos[-3:]
-            if all(g == gesto for g in ultimos_3) and gesto != "movimento":
-                self.sinal_atual = gesto
-                self.ultimo_sinal_tempo = tempo_atual
-                print(f"👐 GESTO CONFIRMADO: {gesto}")
+            if all(g == gesto for g in ultimos_3):
+                self._confirmar_sinal(gesto)
+    
+    def _confirmar_sinal(self, sinal):
+        """Publica o sinal para a interface"""
+        self.sinal_atual = sinal
+        self.ultimo_sinal_tempo = time.time()
+        self.fila_sinais.colocar(sinal)
+        print(f"👐 GESTO CONFIRMADO: {sinal}")
     
     def _atualizar_frame_simulado(self):
         """Atualiza frame simulado com visualização de detecção"""
@@ -316,28 +521,41 @@ class ReconhecimentoLibras:
                 self.frame_atual.blit(sinal_texto, (largura//2 - 80, altura - 40))
     
     def obter_sinal_detectado(self):
-        """Retorna o sinal detectado e limpa para próxima detecção"""
-        if self.sinal_atual:
-            sinal = self.sinal_atual
-            self.sinal_atual = None
-            return sinal
-        return None
+        """Retorna o próximo sinal confirmado, sem bloquear, ou None"""
+        return self.fila_sinais.obter(timeout=0)
     
     def parar_camera(self):
         """Para a câmera e libera recursos"""
-        if self.cap and self.cap.isOpened():
-            self.cap.release()
-        if self.hands:
-            self.hands.close()
+        # A thread de captura libera a câmera e a de inferência devolve o
+        # modelo ao terminar, mesmo que o join tenha esgotado o tempo com
+        # elas presas num read() ou process()
+        self._parar_pipeline()
+        self.parar_captura()
+        self.cap = None
         self.ativa = False
         print("📷 Câmera e reconhecimento parados")
     
+    def encerrar(self):
+        """Para a câmera e fecha o MediaPipe (saída do aplicativo)"""
+        if self.ativa:
+            self.parar_camera()
+        # Com uma thread de inferência ainda rodando, os modelos ficam abertos
+        if self.gerenciador_maos.encerrar():
+            self.hands = None
+        if self.gerenciador_recortes.encerrar():
+            self.hands_recortes = None
+    
     def esta_ativa(self):
         return self.ativa
     
     def __del__(self):
-        """Destrutor"""
-        self.parar_camera()
+        """Destrutor: para a câmera, exceto no encerramento do interpretador"""
+        if sys.is_finalizing() or not getattr(self, 'ativa', False):
+            return
+        try:
+            self.parar_camera()
+        except Exception:
+            pass
 
 # Alias para compatibilidade
 ReconhecimentoLibrasCamera = ReconhecimentoLibras
\ No newline at end of file
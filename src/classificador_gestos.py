@@ -0,0 +1,199 @@
+"""
+Classificador de gestos de Libras sobre arrays de landmarks.
+
+As mãos chegam como um array (N_maos, 21, 3) em pixels. Todas as
+características (dedos estendidos, distâncias entre pontas, desvios e
+ângulos de flexão) são calculadas de uma vez com NumPy e divididas pelo
+tamanho da palma, então os limites valem para qualquer distância da câmera.
+Cada gesto é uma linha de uma tabela de intervalos por característica; a
+tabela inteira é avaliada numa única operação vetorizada.
+"""
+import numpy as np
+
+
+# Índices dos landmarks do MediaPipe Hands
+PUNHO = 0
+PONTAS = (4, 8, 12, 16, 20)             # polegar, indicador, médio, anelar, mínimo
+BASES = (5, 5, 9, 13, 17)               # referência de "estendido" de cada dedo
+ARTICULACOES = ((2, 3, 4), (5, 6, 8), (9, 10, 12), (13, 14, 16), (17, 18, 20))
+BASE_MEDIO = 9
+
+DEDOS = ('polegar', 'indicador', 'medio', 'anelar', 'minimo')
+
+CARACTERISTICAS = (
+    # 1.0 se a ponta do dedo está acima da base (y menor na imagem)
+    *(f'{dedo}_estendido' for dedo in DEDOS),
+    # Distâncias entre pontas de dedos vizinhos
+    'dist_polegar_indicador',
+    'dist_indicador_medio',
+    'dist_medio_anelar',
+    'dist_anelar_minimo',
+    # Posição do indicador em relação ao punho
+    'dist_indicador_punho',
+    'desvio_x_indicador',
+    # Alinhamento vertical entre pontas
+    'desnivel_polegar_minimo',
+    'desnivel_indicador_medio',
+    # Ângulo de flexão (graus) na articulação do meio de cada dedo
+    *(f'flexao_{dedo}' for dedo in DEDOS),
+)
+
+INDICE_CARACTERISTICA = {nome: i for i, nome in enumerate(CARACTERISTICAS)}
+
+SIM = (0.5, None)
+NAO = (None, 0.5)
+
+# Em ordem de prioridade: vence o primeiro gesto cujas condições batem.
+# Distâncias em múltiplos do tamanho da palma (punho até a base do médio).
+REGRAS_PADRAO = [
+    ('onibus', {                        # polegar para cima
+        'polegar_estendido': SIM,
+        'indicador_estendido': NAO,
+        'medio_estendido': NAO,
+        'anelar_estendido': NAO,
+        'minimo_estendido': NAO,
+    }),
+    ('terminal', {                      # mão aberta
+        'dist_polegar_indicador': (0.55, None),
+        'dist_indicador_medio': (0.33, None),
+        'dist_medio_anelar': (0.33, None),
+        'dist_anelar_minimo': (0.33, None),
+    }),
+    ('qual', {                          # indicador para cima
+        'indicador_estendido': SIM,
+        'polegar_estendido': NAO,
+        'medio_estendido': NAO,
+        'anelar_estendido': NAO,
+        'minimo_estendido': NAO,
+    }),
+    ('horas', {                         # apontar para o pulso
+        'desvio_x_indicador': (None, 0.0),
+        'dist_indicador_punho': (None, 0.9),
+    }),
+    ('centro', {                        # apontar para o centro
+        'desvio_x_indicador': (0.55, None),
+        'medio_estendido': NAO,
+    }),
+    ('aeroporto', {                     # mão plana
+        'desnivel_polegar_minimo': (None, 0.33),
+        'desnivel_indicador_medio': (None, 0.22),
+    }),
+]
+
+
+def landmarks_para_array(multi_hand_landmarks, largura, altura, saida=None):
+    """
+    Converte os landmarks do MediaPipe em array (N_maos, 21, 3) float32.
+
+    x e y vão para pixels; z segue a escala de x, como no MediaPipe.
+    """
+    n = len(multi_hand_landmarks) if multi_hand_landmarks else 0
+    if saida is None or saida.shape[0] != n:
+        saida = np.empty((n, 21, 3), dtype=np.float32)
+    for i, mao in enumerate(multi_hand_landmarks or ()):
+        saida[i] = [(p.x, p.y, p.z) for p in mao.landmark]
+    saida *= (largura, altura, largura)
+    return saida
+
+
+def calcular_caracteristicas(maos):
+    """
+    Características de todas as mãos numa passada vetorizada.
+
+    Args:
+        maos: Array (N_maos, 21, 2 ou 3)
+
+    Returns:
+        Array (N_maos, len(CARACTERISTICAS)) float32
+    """
+    pontos = np.asarray(maos, dtype=np.float32)[..., :2]
+    if pontos.shape[0] == 0:
+        return np.empty((0, len(CARACTERISTICAS)), dtype=np.float32)
+
+    punho = pontos[:, PUNHO]
+    palma = np.linalg.norm(pontos[:, BASE_MEDIO] - punho, axis=1)
+    palma = np.maximum(palma, 1e-6)[:, None]
+
+    pontas = pontos[:, PONTAS]                                  # (N, 5, 2)
+    estendidos = pontas[..., 1] < pontos[:, BASES, 1]           # (N, 5)
+
+    vizinhas = np.linalg.norm(pontas[:, 1:] - pontas[:, :-1], axis=2) / palma
+
+    indicador = pontas[:, 1]
+    dist_indicador_punho = np.linalg.norm(indicador - punho, axis=1)[:, None] / palma
+    desvio_x = (indicador[:, 0] - punho[:, 0])[:, None] / palma
+
+    desniveis = np.abs(np.stack([
+        pontas[:, 0, 1] - pontas[:, 4, 1],
+        pontas[:, 1, 1] - pontas[:, 2, 1],
+    ], axis=1)) / palma
+
+    articulacoes = pontos[:, ARTICULACOES]                      # (N, 5, 3, 2)
+    v1 = articulacoes[:, :, 1] - articulacoes[:, :, 0]
+    v2 = articulacoes[:, :, 2] - articulacoes[:, :, 1]
+    normas = np.maximum(np.linalg.norm(v1, axis=2) * np.linalg.norm(v2, axis=2), 1e-6)
+    cossenos = np.clip((v1 * v2).sum(axis=2) / normas, -1.0, 1.0)
+    flexoes = np.degrees(np.arccos(cossenos))
+
+    return np.concatenate([
+        estendidos.astype(np.float32), vizinhas, dist_indicador_punho,
+        desvio_x, desniveis, flexoes
+    ], axis=1).astype(np.float32)
+
+
+class ClassificadorGestos:
+    """
+    Classificador por tabela de intervalos: cada gesto exige que algumas
+    características fiquem entre um mínimo e um máximo.
+    """
+
+    def __init__(self, regras=None):
+        """
+        Args:
+            regras: Lista de (gesto, {característica: (mínimo, máximo)}) em
+                    ordem de prioridade; None em um limite deixa o intervalo
+                    aberto. Padrão: REGRAS_PADRAO
+        """
+        self.gestos = []
+        self._minimos = np.empty((0, len(CARACTERISTICAS)), dtype=np.float32)
+        self._maximos = np.empty((0, len(CARACTERISTICAS)), dtype=np.float32)
+        for gesto, condicoes in (REGRAS_PADRAO if regras is None else regras):
+            self.adicionar_regra(gesto, condicoes)
+
+    def adicionar_regra(self, gesto, condicoes):
+        """Acrescenta um gesto no fim da tabela (menor prioridade)"""
+        minimos = np.full(len(CARACTERISTICAS), -np.inf, dtype=np.float32)
+        maximos = np.full(len(CARACTERISTICAS), np.inf, dtype=np.float32)
+        for nome, (minimo, maximo) in condicoes.items():
+            if nome not in INDICE_CARACTERISTICA:
+                raise ValueError(f"Característica desconhecida: {nome}")
+            indice = INDICE_CARACTERISTICA[nome]
+            if minimo is not None:
+                minimos[indice] = minimo
+            if maximo is not None:
+                maximos[indice] = maximo
+
+        self.gestos.append(gesto)
+        self._minimos = np.vstack([self._minimos, minimos])
+        self._maximos = np.vstack([self._maximos, maximos])
+
+    def avaliar(self, caracteristicas):
+        """Matriz booleana (N_maos, N_gestos) de regras satisfeitas"""
+        valores = caracteristicas[:, None, :]
+        return ((valores >= self._minimos) & (valores <= self._maximos)).all(axis=2)
+
+    def classificar(self, maos):
+        """
+        Gesto de cada mão (ou None), respeitando a prioridade da tabela.
+
+        Args:
+            maos: Array (N_maos, 21, 3)
+        """
+        caracteristicas = calcular_caracteristicas(maos)
+        if not self.gestos or caracteristicas.shape[0] == 0:
+            return [None] * caracteristicas.shape[0]
+
+        satisfeitas = self.avaliar(caracteristicas)
+        primeira = satisfeitas.argmax(axis=1)
+        alguma = satisfeitas.any(axis=1)
+        return [self.gestos[i] if ok else None for i, ok in zip(primeira, alguma)]
@@ -1,14 +1,22 @@
 import sqlite3
 import os
+import threading
+
+from cache_consultas import CacheLRU, AUSENTE
 
 class BancoDadosOnibus:
-    def __init__(self):
+    def __init__(self, usar_cache=True, tamanho_cache=256, ttl_cache=300.0):
+        # A interface consulta pelo loop do pygame e pelo prefetch da fala
+        self._lock = threading.Lock()
+        # Perguntas repetidas ("ônibus para o centro") saem da memória; os
+        # resultados em cache são tuplas, compartilhadas sem cópia
+        self.cache = CacheLRU(tamanho_cache, ttl_cache) if usar_cache else None
         self.criar_banco_dados()
     
     def criar_banco_dados(self):
         """Cria banco de dados com informações de ônibus de Manaus"""
         try:
-            conn = sqlite3.connect(':memory:')  # Banco em memória
+            conn = sqlite3.connect(':memory:', check_same_thread=False)  # Banco em memória
             cursor = conn.cursor()
             
             # Criar tabela
@@ -44,23 +52,51 @@ class BancoDadosOnibus:
             print(f"❌ Erro ao criar banco: {e}")
             self.conn = None
     
+    def invalidar_cache(self):
+        """Descarta as consultas em cache (chamar após alterar linhas_onibus)"""
+        if self.cache is not None:
+            self.cache.invalidar()
+    
+    def estatisticas_cache(self):
+        """Retorna acertos, falhas e tamanho do cache de consultas"""
+        if self.cache is None:
+            return None
+        return self.cache.estatisticas()
+    
+    def _obter_do_cache(self, chave):
+        if self.cache is None:
+            return AUSENTE
+        return self.cache.obter(chave)
+    
+    def _guardar_no_cache(self, chave, valor):
+        if self.cache is not None:
+            self.cache.guardar(chave, valor)
+        return valor
+    
     def obter_info_linha(self, numero):
         """Obtém informações de uma linha específica"""
         if not self.conn:
             return [numero, f"Linha {numero}", "Terminal", "Centro", "06:00-22:00"]
+        
+        chave = ('info_linha', numero)
+        em_cache = self._obter_do_cache(chave)
+        if em_cache is not AUSENTE:
+            return em_cache
             
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                SELECT numero, nome, origem, destino, horario 
-                FROM linhas_onibus WHERE numero = ?
-            ''', (numero,))
+            with self._lock:
+                cursor = self.conn.cursor()
+                cursor.execute('''
+                    SELECT numero, nome, origem, destino, horario 
+                    FROM linhas_onibus WHERE numero = ?
+                ''', (numero,))
+                resultado = cursor.fetchone()
             
-            resultado = cursor.fetchone()
             if resultado:
-                return list(resultado)
+                return self._guardar_no_cache(chave, tuple(resultado))
             else:
-                return [numero, f"Linha {numero} não encontrada", "N/A", "N/A", "N/A"]
+                return self._guardar_no_cache(
+                    chave, (numero, f"Linha {numero} não encontrada", "N/A", "N/A", "N/A"))
                 
         except Exception as e:
             print(f"❌ Erro ao buscar linha: {e}")
@@ -70,19 +106,25 @@ class BancoDadosOnibus:
         """Obtém ônibus que vão para um destino"""
         if not self.conn:
             return [["640", "Linha 640"], ["306", "Linha 306"]]
+        
+        chave = ('destino', destino)
+        em_cache = self._obter_do_cache(chave)
+        if em_cache is not AUSENTE:
+            return em_cache
             
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                SELECT numero, nome FROM linhas_onibus 
-                WHERE destino LIKE ? OR origem LIKE ? OR nome LIKE ?
-            ''', (f'%{destino}%', f'%{destino}%', f'%{destino}%'))
+            with self._lock:
+                cursor = self.conn.cursor()
+                cursor.execute('''
+                    SELECT numero, nome FROM linhas_onibus 
+                    WHERE destino LIKE ? OR origem LIKE ? OR nome LIKE ?
+                ''', (f'%{destino}%', f'%{destino}%', f'%{destino}%'))
+                resultados = cursor.fetchall()
             
-            resultados = cursor.fetchall()
             if resultados:
-                return [list(item) for item in resultados]
+                return self._guardar_no_cache(chave, tuple(tuple(item) for item in resultados))
             else:
-                return [["640", f"Ônibus para {destino}"]]
+                return self._guardar_no_cache(chave, (("640", f"Ônibus para {destino}"),))
                 
         except Exception as e:
             print(f"❌ Erro ao buscar destino: {e}")
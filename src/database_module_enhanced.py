@@ -1,5 +1,12 @@
 import sqlite3
 import os
+import re
+import sys
+from types import MappingProxyType
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cache_consultas import CacheLRU, AUSENTE
 
 class BancoDadosOnibusEnhanced:
     """
@@ -7,13 +14,17 @@ class BancoDadosOnibusEnhanced:
     Inclui mais linhas de ônibus, pontos de parada e informações de acessibilidade.
     """
     
-    def __init__(self, db_path=None):
+    def __init__(self, db_path=None, usar_cache=True, tamanho_cache=256, ttl_cache=300.0):
         """
         Inicializa o banco de dados.
         
         Args:
             db_path: Caminho para o arquivo do banco de dados. 
                     Se None, usa banco em memória.
+            usar_cache: Se True, consultas de linhas e destinos passam por
+                    um cache LRU em memória
+            tamanho_cache: Número máximo de consultas em cache
+            ttl_cache: Segundos até uma consulta em cache expirar
         """
         if db_path is None:
             db_path = os.path.join(
@@ -23,6 +34,8 @@ class BancoDadosOnibusEnhanced:
         
         self.db_path = db_path
         self.conn = None
+        self.fts_ativo = False
+        self.cache = CacheLRU(tamanho_cache, ttl_cache) if usar_cache else None
         self.criar_banco_dados()
     
     def criar_banco_dados(self):
@@ -79,11 +92,30 @@ class BancoDadosOnibusEnhanced:
                 )
             ''')
             
+            # Relação N:N entre terminais e linhas atendidas
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS terminal_linhas (
+                    terminal_id INTEGER NOT NULL,
+                    linha_numero TEXT NOT NULL,
+                    ordem INTEGER,
+                    PRIMARY KEY (terminal_id, linha_numero),
+                    FOREIGN KEY (terminal_id) REFERENCES terminais(id),
+                    FOREIGN KEY (linha_numero) REFERENCES linhas_onibus(numero)
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_terminal_linhas_linha
+                ON terminal_linhas(linha_numero, terminal_id)
+            ''')
+            
             # Verificar se já existem dados
             cursor.execute('SELECT COUNT(*) FROM linhas_onibus')
             if cursor.fetchone()[0] == 0:
                 self.popular_dados_iniciais(cursor)
             
+            self.migrar_terminal_linhas(cursor)
+            self.criar_indice_busca(cursor)
+            
             self.conn.commit()
             print("✅ Banco de dados aprimorado criado com sucesso!")
             
@@ -123,18 +155,24 @@ class BancoDadosOnibusEnhanced:
             INSERT INTO linhas_onibus VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', linhas)
         
-        # Terminais
+        # Terminais e as linhas de cada um (só em terminal_linhas)
         terminais = [
-            ('Terminal 1 - T1', 'Av. Constantino Nery', -3.0952, -60.0217, '010,640,455,A001'),
-            ('Terminal 2 - T2', 'Av. Autaz Mirim', -3.1190, -59.9843, '510,670,A002'),
-            ('Terminal 3 - T3', 'Av. Grande Circular', -3.0744, -60.0589, '640,A003'),
-            ('Terminal 4 - T4', 'Av. Brasil', -3.1089, -60.0250, '201,300'),
+            ('Terminal 1 - T1', 'Av. Constantino Nery', -3.0952, -60.0217, ['010', '640', '455', 'A001']),
+            ('Terminal 2 - T2', 'Av. Autaz Mirim', -3.1190, -59.9843, ['510', '670', 'A002']),
+            ('Terminal 3 - T3', 'Av. Grande Circular', -3.0744, -60.0589, ['640', 'A003']),
+            ('Terminal 4 - T4', 'Av. Brasil', -3.1089, -60.0250, ['201', '300']),
         ]
         
-        cursor.executemany('''
-            INSERT INTO terminais (nome, endereco, latitude, longitude, linhas_atendidas)
-            VALUES (?, ?, ?, ?, ?)
-        ''', terminais)
+        for nome, endereco, latitude, longitude, numeros in terminais:
+            cursor.execute('''
+                INSERT INTO terminais (nome, endereco, latitude, longitude)
+                VALUES (?, ?, ?, ?)
+            ''', (nome, endereco, latitude, longitude))
+            terminal_id = cursor.lastrowid
+            cursor.executemany('''
+                INSERT INTO terminal_linhas (terminal_id, linha_numero, ordem)
+                VALUES (?, ?, ?)
+            ''', [(terminal_id, numero, ordem) for ordem, numero in enumerate(numeros, 1)])
         
         # Pontos de parada de exemplo para algumas linhas
         pontos = [
@@ -152,6 +190,178 @@ class BancoDadosOnibusEnhanced:
             VALUES (?, ?, ?, ?, ?, ?)
         ''', pontos)
     
+    def migrar_terminal_linhas(self, cursor):
+        """
+        Copia terminais.linhas_atendidas (texto separado por vírgulas) para
+        a tabela terminal_linhas e esvazia a coluna antiga.
+        
+        terminal_linhas é a única fonte das ligações: a coluna só tem valor
+        em bancos gravados por versões anteriores, que sempre gravam a lista
+        completa do terminal. Sempre que aparecer, inclusive depois da
+        primeira migração, ela substitui as ligações daquele terminal.
+        """
+        cursor.execute('''
+            SELECT id, linhas_atendidas FROM terminais
+            WHERE linhas_atendidas IS NOT NULL AND linhas_atendidas != ''
+        ''')
+        
+        relacoes = []
+        migrados = []
+        for terminal_id, linhas_atendidas in cursor.fetchall():
+            migrados.append((terminal_id,))
+            numeros = [n.strip() for n in linhas_atendidas.split(',') if n.strip()]
+            relacoes.extend(
+                (terminal_id, numero, ordem)
+                for ordem, numero in enumerate(dict.fromkeys(numeros), 1)
+            )
+        
+        cursor.executemany('DELETE FROM terminal_linhas WHERE terminal_id = ?', migrados)
+        cursor.executemany('''
+            INSERT OR IGNORE INTO terminal_linhas (terminal_id, linha_numero, ordem)
+            VALUES (?, ?, ?)
+        ''', relacoes)
+        cursor.execute('''
+            UPDATE terminais SET linhas_atendidas = NULL
+            WHERE linhas_atendidas IS NOT NULL
+        ''')
+    
+    def criar_indice_busca(self, cursor):
+        """
+        Cria o índice de texto completo (FTS5) sobre as linhas de ônibus.
+        
+        O índice usa o tokenizador unicode61 com remoção de acentos, de modo
+        que "sao jose" encontra "São José". Triggers mantêm o índice
+        sincronizado com a tabela linhas_onibus. Se o SQLite não tiver
+        suporte a FTS5, as buscas continuam usando LIKE.
+        """
+        try:
+            cursor.execute('''
+                SELECT COUNT(*) FROM sqlite_master
+                WHERE type = 'table' AND name = 'linhas_busca'
+            ''')
+            indice_existente = cursor.fetchone()[0] > 0
+            
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS linhas_busca USING fts5(
+                    numero, nome, origem, destino,
+                    content='linhas_onibus',
+                    content_rowid='rowid',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            ''')
+            
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS linhas_busca_ai
+                AFTER INSERT ON linhas_onibus BEGIN
+                    INSERT INTO linhas_busca(rowid, numero, nome, origem, destino)
+                    VALUES (new.rowid, new.numero, new.nome, new.origem, new.destino);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS linhas_busca_ad
+                AFTER DELETE ON linhas_onibus BEGIN
+                    INSERT INTO linhas_busca(linhas_busca, rowid, numero, nome, origem, destino)
+                    VALUES ('delete', old.rowid, old.numero, old.nome, old.origem, old.destino);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS linhas_busca_au
+                AFTER UPDATE ON linhas_onibus BEGIN
+                    INSERT INTO linhas_busca(linhas_busca, rowid, numero, nome, origem, destino)
+                    VALUES ('delete', old.rowid, old.numero, old.nome, old.origem, old.destino);
+                    INSERT INTO linhas_busca(rowid, numero, nome, origem, destino)
+                    VALUES (new.rowid, new.numero, new.nome, new.origem, new.destino);
+                END
+            ''')
+            
+            # Bancos antigos já têm linhas cadastradas: indexar o que existe
+            if not indice_existente:
+                cursor.execute("INSERT INTO linhas_busca(linhas_busca) VALUES('rebuild')")
+            
+            self.fts_ativo = True
+            
+        except sqlite3.OperationalError as e:
+            print(f"⚠️  Busca de texto completo indisponível, usando LIKE: {e}")
+            self.fts_ativo = False
+    
+    def reconstruir_indice_busca(self):
+        """
+        Reconstrói o índice de texto completo a partir de linhas_onibus.
+        
+        Deve ser chamado após cargas em massa feitas com os triggers
+        desativados ou quando o índice estiver inconsistente.
+        
+        Returns:
+            True se o índice foi reconstruído, False caso contrário
+        """
+        if not self.conn or not self.fts_ativo:
+            return False
+        
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("INSERT INTO linhas_busca(linhas_busca) VALUES('rebuild')")
+            cursor.execute("INSERT INTO linhas_busca(linhas_busca) VALUES('optimize')")
+            self.conn.commit()
+            self.invalidar_cache()
+            return True
+        except Exception as e:
+            print(f"❌ Erro ao reconstruir índice de busca: {e}")
+            return False
+    
+    def invalidar_cache(self):
+        """
+        Descarta as consultas em cache.
+        
+        Deve ser chamado sempre que linhas_onibus for importada ou alterada.
+        """
+        if self.cache is not None:
+            self.cache.invalidar()
+    
+    def estatisticas_cache(self):
+        """Retorna acertos, falhas e tamanho do cache de consultas"""
+        if self.cache is None:
+            return None
+        return self.cache.estatisticas()
+    
+    # Resultados são entregues somente leitura (tuplas de mapeamentos): o
+    # mesmo objeto em cache serve a todas as consultas sem cópias
+    @staticmethod
+    def _congelar(valor):
+        if isinstance(valor, dict):
+            return MappingProxyType(valor)
+        if isinstance(valor, list):
+            return tuple(BancoDadosOnibusEnhanced._congelar(item) for item in valor)
+        return valor
+    
+    def _obter_do_cache(self, chave):
+        if self.cache is None:
+            return AUSENTE
+        return self.cache.obter(chave)
+    
+    def _guardar_no_cache(self, chave, valor):
+        valor = self._congelar(valor)
+        if self.cache is not None:
+            self.cache.guardar(chave, valor)
+        return valor
+    
+    @staticmethod
+    def _consulta_fts(termo, colunas=None):
+        """
+        Converte um termo digitado em consulta FTS5.
+        
+        Cada palavra vira um prefixo entre aspas ("centr"* encontra "Centro"),
+        e todas as palavras precisam aparecer. Retorna None se o termo não
+        tiver nenhuma palavra pesquisável.
+        """
+        palavras = re.findall(r'\w+', termo)
+        if not palavras:
+            return None
+        
+        consulta = ' '.join(f'"{palavra}"*' for palavra in palavras)
+        if colunas:
+            consulta = f"{{{' '.join(colunas)}}} : ({consulta})"
+        return consulta
+    
     def obter_info_linha(self, numero):
         """
         Obtém informações completas de uma linha específica.
@@ -164,6 +374,11 @@ class BancoDadosOnibusEnhanced:
         """
         if not self.conn:
             return None
+        
+        chave = ('info_linha', numero)
+        em_cache = self._obter_do_cache(chave)
+        if em_cache is not AUSENTE:
+            return em_cache
             
         try:
             cursor = self.conn.cursor()
@@ -177,7 +392,7 @@ class BancoDadosOnibusEnhanced:
             
             resultado = cursor.fetchone()
             if resultado:
-                return {
+                return self._guardar_no_cache(chave, {
                     'numero': resultado[0],
                     'nome': resultado[1],
                     'origem': resultado[2],
@@ -188,8 +403,8 @@ class BancoDadosOnibusEnhanced:
                     'ar_condicionado': bool(resultado[7]),
                     'tipo': resultado[8],
                     'intervalo': resultado[9]
-                }
-            return None
+                })
+            return self._guardar_no_cache(chave, None)
                 
         except Exception as e:
             print(f"❌ Erro ao buscar linha: {e}")
@@ -199,6 +414,9 @@ class BancoDadosOnibusEnhanced:
         """
         Obtém ônibus que vão para um destino específico.
         
+        Usa o índice de texto completo quando disponível (resultados
+        ordenados por relevância); caso contrário, recorre a LIKE.
+        
         Args:
             destino: Nome do destino
             
@@ -207,20 +425,36 @@ class BancoDadosOnibusEnhanced:
         """
         if not self.conn:
             return []
+        
+        chave = ('destino', destino.lower())
+        em_cache = self._obter_do_cache(chave)
+        if em_cache is not AUSENTE:
+            return em_cache
             
         try:
             cursor = self.conn.cursor()
-            cursor.execute('''
-                SELECT numero, nome, origem, destino, tarifa, acessivel, tipo
-                FROM linhas_onibus 
-                WHERE LOWER(destino) LIKE ? 
-                   OR LOWER(origem) LIKE ? 
-                   OR LOWER(nome) LIKE ?
-                ORDER BY numero
-            ''', (f'%{destino.lower()}%', f'%{destino.lower()}%', f'%{destino.lower()}%'))
+            consulta = self._consulta_fts(destino, ('nome', 'origem', 'destino'))
+            
+            if self.fts_ativo and consulta:
+                cursor.execute('''
+                    SELECT l.numero, l.nome, l.origem, l.destino, l.tarifa, l.acessivel, l.tipo
+                    FROM linhas_busca
+                    JOIN linhas_onibus l ON l.rowid = linhas_busca.rowid
+                    WHERE linhas_busca MATCH ?
+                    ORDER BY linhas_busca.rank, l.numero
+                ''', (consulta,))
+            else:
+                cursor.execute('''
+                    SELECT numero, nome, origem, destino, tarifa, acessivel, tipo
+                    FROM linhas_onibus 
+                    WHERE LOWER(destino) LIKE ? 
+                       OR LOWER(origem) LIKE ? 
+                       OR LOWER(nome) LIKE ?
+                    ORDER BY numero
+                ''', (f'%{destino.lower()}%', f'%{destino.lower()}%', f'%{destino.lower()}%'))
             
             resultados = cursor.fetchall()
-            return [
+            return self._guardar_no_cache(chave, [
                 {
                     'numero': r[0],
                     'nome': r[1],
@@ -231,7 +465,7 @@ class BancoDadosOnibusEnhanced:
                     'tipo': r[6]
                 }
                 for r in resultados
-            ]
+            ])
                 
         except Exception as e:
             print(f"❌ Erro ao buscar destino: {e}")
@@ -295,29 +529,129 @@ class BancoDadosOnibusEnhanced:
         try:
             cursor = self.conn.cursor()
             cursor.execute('''
-                SELECT nome, endereco, latitude, longitude, linhas_atendidas
+                SELECT terminal_id, linha_numero
+                FROM terminal_linhas
+                ORDER BY terminal_id, ordem
+            ''')
+            
+            linhas_por_terminal = {}
+            for terminal_id, numero in cursor.fetchall():
+                linhas_por_terminal.setdefault(terminal_id, []).append(numero)
+            
+            cursor.execute('''
+                SELECT id, nome, endereco, latitude, longitude
                 FROM terminais
                 ORDER BY nome
             ''')
             
             return [
+                {
+                    'nome': r[1],
+                    'endereco': r[2],
+                    'latitude': r[3],
+                    'longitude': r[4],
+                    'linhas': linhas_por_terminal.get(r[0], [])
+                }
+                for r in cursor.fetchall()
+            ]
+        except Exception as e:
+            print(f"❌ Erro ao buscar terminais: {e}")
+            return []
+    
+    def obter_terminais_da_linha(self, numero):
+        """
+        Retorna os terminais que atendem uma linha.
+        
+        Args:
+            numero: Número da linha
+            
+        Returns:
+            Lista de dicionários com nome, endereço e coordenadas
+        """
+        if not self.conn:
+            return []
+        
+        chave = ('terminais_da_linha', numero)
+        em_cache = self._obter_do_cache(chave)
+        if em_cache is not AUSENTE:
+            return em_cache
+        
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+                SELECT t.nome, t.endereco, t.latitude, t.longitude
+                FROM terminal_linhas tl
+                JOIN terminais t ON t.id = tl.terminal_id
+                WHERE tl.linha_numero = ?
+                ORDER BY t.nome
+            ''', (numero,))
+            
+            return self._guardar_no_cache(chave, [
                 {
                     'nome': r[0],
                     'endereco': r[1],
                     'latitude': r[2],
-                    'longitude': r[3],
-                    'linhas': r[4].split(',') if r[4] else []
+                    'longitude': r[3]
                 }
                 for r in cursor.fetchall()
-            ]
+            ])
         except Exception as e:
-            print(f"❌ Erro ao buscar terminais: {e}")
+            print(f"❌ Erro ao buscar terminais da linha: {e}")
+            return []
+    
+    def obter_linhas_do_terminal(self, nome_terminal):
+        """
+        Retorna as linhas que atendem um terminal.
+        
+        Args:
+            nome_terminal: Nome completo ("Terminal 1 - T1") ou a parte
+                    antes do sufixo ("Terminal 1")
+            
+        Returns:
+            Lista de dicionários com informações das linhas
+        """
+        if not self.conn:
+            return []
+        
+        chave = ('linhas_do_terminal', nome_terminal)
+        em_cache = self._obter_do_cache(chave)
+        if em_cache is not AUSENTE:
+            return em_cache
+        
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+                SELECT l.numero, l.nome, l.origem, l.destino, l.tarifa, l.acessivel, l.tipo
+                FROM terminais t
+                JOIN terminal_linhas tl ON tl.terminal_id = t.id
+                JOIN linhas_onibus l ON l.numero = tl.linha_numero
+                WHERE t.nome = ? OR t.nome LIKE ?
+                ORDER BY t.nome, tl.ordem
+            ''', (nome_terminal, f'{nome_terminal} %'))
+            
+            return self._guardar_no_cache(chave, [
+                {
+                    'numero': r[0],
+                    'nome': r[1],
+                    'origem': r[2],
+                    'destino': r[3],
+                    'tarifa': r[4],
+                    'acessivel': bool(r[5]),
+                    'tipo': r[6]
+                }
+                for r in cursor.fetchall()
+            ])
+        except Exception as e:
+            print(f"❌ Erro ao buscar linhas do terminal: {e}")
             return []
     
     def buscar_linhas(self, termo):
         """
         Busca linhas por termo (número, nome, origem ou destino).
         
+        Com o índice FTS5 ativo, a busca ignora acentos, casa prefixos de
+        palavras e ordena os resultados por relevância.
+        
         Args:
             termo: Termo de busca
             
@@ -326,20 +660,36 @@ class BancoDadosOnibusEnhanced:
         """
         if not self.conn:
             return []
+        
+        chave = ('busca', termo.lower())
+        em_cache = self._obter_do_cache(chave)
+        if em_cache is not AUSENTE:
+            return em_cache
             
         try:
             cursor = self.conn.cursor()
-            cursor.execute('''
-                SELECT numero, nome, origem, destino, tarifa, tipo
-                FROM linhas_onibus 
-                WHERE LOWER(numero) LIKE ? 
-                   OR LOWER(nome) LIKE ?
-                   OR LOWER(origem) LIKE ?
-                   OR LOWER(destino) LIKE ?
-                ORDER BY numero
-            ''', tuple([f'%{termo.lower()}%'] * 4))
+            consulta = self._consulta_fts(termo)
             
-            return [
+            if self.fts_ativo and consulta:
+                cursor.execute('''
+                    SELECT l.numero, l.nome, l.origem, l.destino, l.tarifa, l.tipo
+                    FROM linhas_busca
+                    JOIN linhas_onibus l ON l.rowid = linhas_busca.rowid
+                    WHERE linhas_busca MATCH ?
+                    ORDER BY linhas_busca.rank, l.numero
+                ''', (consulta,))
+            else:
+                cursor.execute('''
+                    SELECT numero, nome, origem, destino, tarifa, tipo
+                    FROM linhas_onibus 
+                    WHERE LOWER(numero) LIKE ? 
+                       OR LOWER(nome) LIKE ?
+                       OR LOWER(origem) LIKE ?
+                       OR LOWER(destino) LIKE ?
+                    ORDER BY numero
+                ''', tuple([f'%{termo.lower()}%'] * 4))
+            
+            return self._guardar_no_cache(chave, [
                 {
                     'numero': r[0],
                     'nome': r[1],
@@ -349,7 +699,7 @@ class BancoDadosOnibusEnhanced:
                     'tipo': r[5]
                 }
                 for r in cursor.fetchall()
-            ]
+            ])
         except Exception as e:
             print(f"❌ Erro ao buscar linhas: {e}")
             return []
@@ -0,0 +1,83 @@
+"""
+Detecção de mãos agendada, comum à câmera e ao benchmark.
+
+Cada quadro RGB passa pelo agendador (agendador_inferencia.py), que decide
+se ele é pulado, buscado inteiro e reduzido no modelo em modo vídeo ou
+recortado em volta da mão e entregue ao modelo em modo imagem. A câmera
+(camera_libras.py) e o benchmark sem tela (benchmark_libras.py) usam esta
+mesma etapa: o benchmark mede o caminho que roda no quiosque.
+
+OpenCV só é importado quando um quadro precisa ser reduzido.
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from classificador_gestos import landmarks_para_array
+
+
+class DeteccaoMaos:
+    """
+    Quadro RGB -> landmarks (N_maos, 21, 3) em pixels do quadro.
+    """
+
+    def __init__(self, agendador=None):
+        """
+        Args:
+            agendador: AgendadorInferencia; sem ele, todo quadro é detectado
+                       inteiro, em resolução cheia, no modelo em modo vídeo
+        """
+        self.agendador = agendador
+        self.sem_maos = np.empty((0, 21, 3), dtype=np.float32)
+        self._entrada_reduzida = None
+
+    def detectar(self, frame_rgb, modelo, modelo_recortes=None):
+        """
+        Roda a detecção onde e quando o agendador indicar.
+
+        Args:
+            frame_rgb: Quadro RGB (altura, largura, 3) uint8
+            modelo: Hands em modo vídeo, para o quadro inteiro
+            modelo_recortes: Hands em modo imagem, para os recortes
+
+        Returns:
+            (landmarks, resultados, area): resultados do MediaPipe (None se
+            o quadro foi pulado) e a vista do quadro em que a detecção
+            rodou, onde os landmarks normalizados podem ser desenhados
+        """
+        h, w = frame_rgb.shape[:2]
+        plano = {'regiao': (0, 0, w, h), 'escala': 1.0, 'recorte': False}
+        if self.agendador is not None:
+            plano = self.agendador.planejar(w, h)
+            if plano is None:
+                return self.sem_maos, None, None
+
+        x0, y0, x1, y1 = plano['regiao']
+        area = frame_rgb[y0:y1, x0:x1]
+        entrada = self._entrada(area, plano['escala'])
+        entrada.flags.writeable = False
+        resultados = (modelo_recortes if plano['recorte'] else modelo).process(entrada)
+        entrada.flags.writeable = True
+
+        landmarks = landmarks_para_array(resultados.multi_hand_landmarks, x1 - x0, y1 - y0)
+        landmarks[..., :2] += (x0, y0)
+        if self.agendador is not None:
+            self.agendador.registrar(plano, landmarks)
+        return landmarks, resultados, area
+
+    def _entrada(self, area, escala):
+        """Imagem contígua entregue ao MediaPipe: a região, reduzida se pedido"""
+        if escala == 1.0:
+            return np.ascontiguousarray(area)
+
+        import cv2
+
+        h, w = area.shape[:2]
+        tamanho = (max(1, int(w * escala)), max(1, int(h * escala)))
+        if self._entrada_reduzida is None or self._entrada_reduzida.shape[1::-1] != tamanho:
+            self._entrada_reduzida = np.empty((tamanho[1], tamanho[0], 3), dtype=np.uint8)
+        return cv2.resize(area, tamanho, dst=self._entrada_reduzida,
+                          interpolation=cv2.INTER_AREA)
@@ -0,0 +1,192 @@
+"""
+Fila de fala com prioridade do PIA Manaus.
+
+Uma única thread fala tudo, em ordem de prioridade (respostas antes de
+avisos de status) e, na mesma prioridade, por ordem de chegada. Nenhum
+texto é descartado por a voz estar ocupada:
+
+- Preempção: um pedido de prioridade maior interrompe o que está sendo
+  falado (uma resposta nova corta "Google Maps aberto").
+- Coalescência: o mesmo texto já na fila, ou sendo falado, não é
+  enfileirado de novo; quem pediu recebe o token do pedido existente.
+- Validade: avisos ficam velhos. Um aviso que esperou mais que a validade
+  é pulado em vez de ser falado fora de hora.
+- Cancelamento: cada pedido devolve um TokenCancelamento. Cancelar antes
+  da vez tira o pedido da fila; durante a fala, interrompe o áudio.
+"""
+import heapq
+import itertools
+import threading
+import time
+
+
+# Menor número = mais prioritário
+PRIORIDADE_RESPOSTA = 0
+PRIORIDADE_AVISO = 1
+
+VALIDADE_AVISO = 5.0         # segundos que um aviso pode esperar na fila
+
+
+class TokenCancelamento:
+    """
+    Cancela um pedido de fala; evento serve de sinal de parada para a voz.
+    """
+
+    def __init__(self):
+        self.evento = threading.Event()
+
+    def cancelar(self):
+        self.evento.set()
+
+    @property
+    def cancelado(self):
+        return self.evento.is_set()
+
+
+class FilaFala:
+    """
+    Thread de fala única com fila de prioridade.
+    """
+
+    def __init__(self, falar, capacidade=16):
+        """
+        Args:
+            falar: Função (texto, parar) que fala e só retorna ao terminar;
+                   parar é um threading.Event que deve interromper a fala
+            capacidade: Pedidos pendentes; cheia, sai o menos prioritário
+        """
+        self.falar = falar
+        self.capacidade = capacidade
+        self.falados = 0
+        self.pulados = 0
+        self.interrompidos = 0
+        self._fila = []                     # heap de (prioridade, ordem, pedido)
+        self._ordem = itertools.count()
+        self._atual = None
+        self._ativa = True
+        self._condicao = threading.Condition()
+        self._thread = threading.Thread(target=self._loop, name="fila-fala", daemon=True)
+        self._thread.start()
+
+    def dizer(self, texto, prioridade=PRIORIDADE_RESPOSTA, validade=None):
+        """
+        Enfileira um texto para ser falado.
+
+        Args:
+            prioridade: PRIORIDADE_RESPOSTA ou PRIORIDADE_AVISO
+            validade: Segundos que o pedido pode esperar (padrão: só avisos
+                      expiram, em VALIDADE_AVISO)
+
+        Returns:
+            TokenCancelamento do pedido (o já existente, se coalescido)
+        """
+        texto = ' '.join(texto.split())
+        if validade is None and prioridade >= PRIORIDADE_AVISO:
+            validade = VALIDADE_AVISO
+
+        with self._condicao:
+            atual = self._atual
+            if atual is not None and atual['texto'] == texto and not atual['token'].cancelado:
+                return atual['token']
+
+            for i, (prioridade_fila, ordem, pedido) in enumerate(self._fila):
+                if pedido['texto'] == texto and not pedido['token'].cancelado:
+                    # Pedido repetido: renova a validade e herda a maior prioridade
+                    pedido['criado'] = time.monotonic()
+                    if prioridade < prioridade_fila:
+                        pedido['prioridade'] = prioridade
+                        self._fila[i] = (prioridade, ordem, pedido)
+                        heapq.heapify(self._fila)
+                    return pedido['token']
+
+            pedido = {
+                'texto': texto,
+                'prioridade': prioridade,
+                'validade': validade,
+                'criado': time.monotonic(),
+                'token': TokenCancelamento(),
+            }
+            heapq.heappush(self._fila, (prioridade, next(self._ordem), pedido))
+            if len(self._fila) > self.capacidade:
+                descartado = max(self._fila)
+                descartado[2]['token'].cancelar()
+                self._fila.remove(descartado)
+                heapq.heapify(self._fila)
+                self.pulados += 1
+
+            if atual is not None and prioridade < atual['prioridade']:
+                atual['token'].cancelar()
+                self.interrompidos += 1
+            self._condicao.notify_all()
+            return pedido['token']
+
+    def _proximo(self):
+        """Próximo pedido válido, esperando se a fila estiver vazia (com _condicao)"""
+        while self._ativa:
+            if not self._fila:
+                self._condicao.wait()
+                continue
+            _, _, pedido = heapq.heappop(self._fila)
+            expirado = (pedido['validade'] is not None
+                        and time.monotonic() - pedido['criado'] > pedido['validade'])
+            if pedido['token'].cancelado or expirado:
+                self.pulados += 1
+                continue
+            return pedido
+        return None
+
+    def _loop(self):
+        while True:
+            with self._condicao:
+                pedido = self._atual = self._proximo()
+            if pedido is None:
+                return
+            try:
+                self.falar(pedido['texto'], pedido['token'].evento)
+                if not pedido['token'].cancelado:
+                    self.falados += 1
+            except Exception as e:
+                print(f"❌ Erro na síntese de voz: {e}")
+            finally:
+                with self._condicao:
+                    self._atual = None
+                    self._condicao.notify_all()
+
+    @property
+    def falando(self):
+        return self._atual is not None
+
+    def __len__(self):
+        return len(self._fila)
+
+    def esperar(self, timeout=None):
+        """Espera a fila esvaziar e a fala atual terminar"""
+        with self._condicao:
+            return self._condicao.wait_for(lambda: not self._fila and self._atual is None, timeout)
+
+    def cancelar_tudo(self):
+        """Descarta os pendentes e interrompe a fala atual"""
+        with self._condicao:
+            for _, _, pedido in self._fila:
+                pedido['token'].cancelar()
+            self.pulados += len(self._fila)
+            self._fila.clear()
+            if self._atual is not None:
+                self._atual['token'].cancelar()
+            self._condicao.notify_all()
+
+    def parar(self, timeout=2.0):
+        """Cancela tudo e encerra a thread de fala"""
+        self.cancelar_tudo()
+        with self._condicao:
+            self._ativa = False
+            self._condicao.notify_all()
+        self._thread.join(timeout)
+
+    def estatisticas(self):
+        return {
+            'pendentes': len(self._fila),
+            'falados': self.falados,
+            'pulados': self.pulados,
+            'interrompidos': self.interrompidos,
+        }
@@ -0,0 +1,317 @@
+"""
+Fontes gravadas para o reconhecimento de Libras.
+
+Vídeos e diretórios de imagens imitam a interface do cv2.VideoCapture
+(isOpened, read, set, release) e podem substituir a câmera em
+ReconhecimentoLibras.iniciar_camera. Fluxos de landmarks gravados (.npz,
+.json ou .lmk) pulam a detecção e servem ao benchmark sem MediaPipe. Toda fonte
+oferece amostras(), que percorre a gravação uma vez com o rótulo de cada
+quadro, e release().
+
+Rótulos de vídeos ficam num arquivo '<video>.rotulos.json' ao lado do
+vídeo: uma lista com um rótulo (ou null) por quadro, ou uma lista de
+intervalos [inicio, fim, rotulo] com quadros inclusivos. Em diretórios de
+imagens, 'rotulos.json' mapeia o nome de cada arquivo ao seu rótulo.
+Gravações .lmk dos quiosques (gravador_landmarks.py) trazem o rótulo do
+operador em cada registro.
+
+OpenCV só é importado pelas fontes de imagem.
+"""
+import glob
+import json
+import os
+import sys
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from gravador_landmarks import LeitorLandmarks
+
+
+EXTENSOES_IMAGEM = ('.png', '.jpg', '.jpeg', '.bmp')
+EXTENSOES_LANDMARKS = ('.npz', '.json', '.lmk')
+
+
+def carregar_rotulos(caminho):
+    """
+    Lê rótulos por quadro de um arquivo JSON.
+
+    Returns:
+        Dicionário {índice do quadro: rótulo}
+    """
+    with open(caminho, encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+
+    rotulos = {}
+    for indice, item in enumerate(dados):
+        if isinstance(item, list):
+            inicio, fim, rotulo = item
+            for quadro in range(inicio, fim + 1):
+                rotulos[quadro] = rotulo
+        elif item:
+            rotulos[indice] = item
+    return rotulos
+
+
+class FonteQuadros(ABC):
+    """
+    Base das fontes de imagem, com a interface usada do cv2.VideoCapture.
+    """
+
+    def __init__(self, fps=30.0, tempo_real=False, repetir=False, rotulos=None):
+        """
+        Args:
+            fps: Ritmo de entrega quando tempo_real
+            tempo_real: Entrega os quadros no ritmo do fps, como uma câmera
+            repetir: Volta ao início ao fim da gravação (só em read)
+            rotulos: Dicionário {índice do quadro: rótulo}
+        """
+        self.fps = fps or 30.0
+        self.tempo_real = tempo_real
+        self.repetir = repetir
+        self.rotulos = rotulos or {}
+        self.quadro = 0
+        self._proxima_entrega = None
+
+    @abstractmethod
+    def _ler(self):
+        """Próximo quadro BGR, ou None no fim (implementado pelas fontes)"""
+
+    @abstractmethod
+    def _voltar_inicio(self):
+        """Volta ao primeiro quadro (implementado pelas fontes)"""
+
+    def isOpened(self):
+        return True
+
+    def set(self, propriedade, valor):
+        """Resolução e FPS de câmera não se aplicam a gravações"""
+        return False
+
+    def read(self):
+        """Mesmo contrato do cv2.VideoCapture.read: (ok, quadro)"""
+        if self.tempo_real:
+            agora = time.perf_counter()
+            if self._proxima_entrega is not None and self._proxima_entrega > agora:
+                time.sleep(self._proxima_entrega - agora)
+            self._proxima_entrega = max(agora, self._proxima_entrega or agora) + 1.0 / self.fps
+
+        frame = self._ler()
+        if frame is None and self.repetir:
+            self._voltar_inicio()
+            self.quadro = 0
+            frame = self._ler()
+        if frame is None:
+            return False, None
+        self.quadro += 1
+        return True, frame
+
+    def release(self):
+        pass
+
+    def amostras(self):
+        """Percorre a gravação uma vez: {'frame', 'landmarks': None, 'rotulo'}"""
+        while True:
+            frame = self._ler()
+            if frame is None:
+                return
+            indice = self.quadro
+            self.quadro += 1
+            yield {'frame': frame, 'landmarks': None, 'rotulo': self.rotulos.get(indice)}
+
+
+class FonteVideo(FonteQuadros):
+    """Arquivo de vídeo lido como se fosse a câmera"""
+
+    def __init__(self, caminho, tempo_real=False, repetir=False, rotulos=None):
+        import cv2
+
+        self.cap = cv2.VideoCapture(caminho)
+        self._cv2 = cv2
+        if rotulos is None and os.path.exists(caminho + '.rotulos.json'):
+            rotulos = carregar_rotulos(caminho + '.rotulos.json')
+        super().__init__(self.cap.get(cv2.CAP_PROP_FPS), tempo_real, repetir, rotulos)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def _ler(self):
+        ret, frame = self.cap.read()
+        return frame if ret else None
+
+    def _voltar_inicio(self):
+        self.cap.set(self._cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def release(self):
+        self.cap.release()
+
+
+class FonteImagens(FonteQuadros):
+    """Diretório de imagens, em ordem alfabética, como quadros de vídeo"""
+
+    def __init__(self, diretorio, fps=30.0, tempo_real=False, repetir=False):
+        import cv2
+
+        self._cv2 = cv2
+        self.arquivos = sorted(
+            caminho for caminho in glob.glob(os.path.join(diretorio, '*'))
+            if caminho.lower().endswith(EXTENSOES_IMAGEM)
+        )
+
+        rotulos = {}
+        caminho_rotulos = os.path.join(diretorio, 'rotulos.json')
+        if os.path.exists(caminho_rotulos):
+            with open(caminho_rotulos, encoding='utf-8') as arquivo:
+                por_nome = json.load(arquivo)
+            rotulos = {i: por_nome[os.path.basename(caminho)]
+                       for i, caminho in enumerate(self.arquivos)
+                       if por_nome.get(os.path.basename(caminho))}
+        super().__init__(fps, tempo_real, repetir, rotulos)
+        self._indice = 0
+
+    def isOpened(self):
+        return bool(self.arquivos)
+
+    def _ler(self):
+        while self._indice < len(self.arquivos):
+            frame = self._cv2.imread(self.arquivos[self._indice])
+            self._indice += 1
+            if frame is not None:
+                return frame
+        return None
+
+    def _voltar_inicio(self):
+        self._indice = 0
+
+
+class FonteLandmarks:
+    """
+    Fluxo de landmarks gravado, sem imagens (dispensa a detecção).
+
+    Formatos aceitos:
+      - .npz de fluxo: 'landmarks' (M, 21, 3), 'quadro' (M,) com o quadro de
+        cada mão, 'total_quadros' (F) e, opcional, 'rotulos' (F,) por
+        quadro ('' = sem rótulo)
+      - .npz do GravadorDataset ('landmarks' e 'rotulos' por mão): cada mão
+        vira um quadro
+      - .json: lista de {"maos": [[[x, y, z] * 21], ...], "rotulo": ...}
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        if caminho.endswith('.json'):
+            with open(caminho, encoding='utf-8') as arquivo:
+                quadros = json.load(arquivo)
+            self.quadros = [np.asarray(q.get('maos') or np.empty((0, 21, 3)),
+                                       dtype=np.float32).reshape(-1, 21, 3)
+                            for q in quadros]
+            self.rotulos = [q.get('rotulo') or None for q in quadros]
+            return
+
+        with np.load(caminho) as dados:
+            landmarks = dados['landmarks'].astype(np.float32)
+            rotulos = dados['rotulos'].astype(str) if 'rotulos' in dados else None
+            quadro = dados['quadro'] if 'quadro' in dados else None
+            total = int(dados['total_quadros']) if 'total_quadros' in dados else None
+
+        if quadro is None:
+            self.quadros = [mao[None] for mao in landmarks]
+            self.rotulos = list(rotulos) if rotulos is not None else [None] * len(landmarks)
+        else:
+            if total is None:
+                total = len(rotulos) if rotulos is not None else int(quadro.max(initial=-1)) + 1
+            limites = np.searchsorted(quadro, np.arange(total + 1))
+            self.quadros = [landmarks[limites[i]:limites[i + 1]] for i in range(total)]
+            self.rotulos = ([r or None for r in rotulos] if rotulos is not None
+                            else [None] * total)
+
+    def __len__(self):
+        return len(self.quadros)
+
+    def amostras(self):
+        """Percorre o fluxo: {'frame': None, 'landmarks', 'rotulo'}"""
+        for maos, rotulo in zip(self.quadros, self.rotulos):
+            yield {'frame': None, 'landmarks': maos, 'rotulo': rotulo}
+
+    def release(self):
+        """Nada fica aberto: o arquivo foi lido por inteiro"""
+
+
+class FonteGravacao:
+    """
+    Gravação .lmk lida em lotes, sem carregar o arquivo inteiro.
+
+    Só quadros com mão são gravados; os intervalos sem mão voltam como
+    quadros vazios (até lacuna_maxima seguidos), para que o reconhecimento
+    de sinais dinâmicos veja a mão sair e voltar como na câmera.
+    """
+
+    def __init__(self, caminho, lacuna_maxima=30):
+        self.caminho = caminho
+        self.leitor = LeitorLandmarks(caminho)
+        self.lacuna_maxima = lacuna_maxima
+        self._sem_maos = np.empty((0, 21, 3), dtype=np.float32)
+
+    def _quadros(self):
+        """(quadro, registros) com as mãos de cada quadro, mesmo entre lotes"""
+        pendente = None
+        for lote in self.leitor.lotes():
+            quebras = np.flatnonzero(np.diff(lote['quadro'])) + 1
+            for grupo in np.split(lote, quebras):
+                quadro = int(grupo['quadro'][0])
+                if pendente is not None and pendente[0] == quadro:
+                    pendente = (quadro, np.concatenate([pendente[1], grupo]))
+                    continue
+                if pendente is not None:
+                    yield pendente
+                pendente = (quadro, grupo)
+        if pendente is not None:
+            yield pendente
+
+    def amostras(self):
+        """Percorre a gravação: {'frame': None, 'landmarks', 'rotulo'}"""
+        anterior = None
+        for quadro, registros in self._quadros():
+            if anterior is not None:
+                # Quadro menor que o anterior: começo de outra sessão
+                lacuna = quadro - anterior - 1 if quadro > anterior else 1
+                for _ in range(min(lacuna, self.lacuna_maxima)):
+                    yield {'frame': None, 'landmarks': self._sem_maos, 'rotulo': None}
+            rotulo = registros['rotulo'][0].decode('utf-8', 'replace') or None
+            yield {'frame': None, 'landmarks': registros['landmarks'], 'rotulo': rotulo}
+            anterior = quadro
+
+    def release(self):
+        """Nada fica aberto: o leitor abre o arquivo a cada passagem"""
+
+
+def salvar_fluxo_landmarks(caminho, quadros, rotulos=None):
+    """
+    Grava um fluxo de landmarks no formato .npz lido por FonteLandmarks.
+
+    Args:
+        quadros: Sequência de arrays (N_maos, 21, 3), um por quadro
+        rotulos: Rótulo (ou None) de cada quadro
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    maos = [np.asarray(q, dtype=np.float32).reshape(-1, 21, 3) for q in quadros]
+    landmarks = np.concatenate(maos) if maos else np.empty((0, 21, 3), dtype=np.float32)
+    quadro = np.repeat(np.arange(len(maos)), [len(m) for m in maos])
+    dados = {'landmarks': landmarks, 'quadro': quadro, 'total_quadros': len(maos)}
+    if rotulos is not None:
+        dados['rotulos'] = np.array([r or '' for r in rotulos], dtype=str)
+    np.savez_compressed(caminho, **dados)
+
+
+def abrir_fonte(caminho, **opcoes):
+    """Fonte adequada ao caminho: diretório, landmarks (.npz/.json/.lmk) ou vídeo"""
+    if os.path.isdir(caminho):
+        return FonteImagens(caminho, **opcoes)
+    if caminho.lower().endswith('.lmk'):
+        return FonteGravacao(caminho)
+    if caminho.lower().endswith(EXTENSOES_LANDMARKS):
+        return FonteLandmarks(caminho)
+    return FonteVideo(caminho, **opcoes)
@@ -1,7 +1,17 @@
 import webbrowser
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from indice_espacial import IndiceEspacial
 
 class GoogleMapsIntegration:
-    def __init__(self):
+    def __init__(self, banco=None):
+        # Banco opcional (BancoDadosOnibusEnhanced) com pontos de parada extras
+        self.banco = banco
+        self.indice_paradas = None
+        
         self.paradas_manaus = {
             # Terminais Principais
             "Terminal 1 (T1)": "-3.1190,-60.0217",
@@ -114,9 +124,73 @@ class GoogleMapsIntegration:
         
         return linhas_paradas.get(numero_linha, [])
     
-    def obter_paradas_proximas(self, localizacao):
-        """Retorna paradas próximas a uma localização (para futuras expansões)"""
-        # Para implementação com GPS/geolocalização futura
-        paradas_ordenadas = []
-        # Lógica para ordenar paradas por proximidade...
-        return paradas_ordenadas
\ No newline at end of file
+    def _construir_indice(self):
+        """Monta o índice espacial na primeira consulta"""
+        if self.banco is not None:
+            indice = IndiceEspacial.de_banco_dados(self.banco)
+        else:
+            indice = IndiceEspacial()
+        
+        paradas = []
+        for nome, coordenadas in self.paradas_manaus.items():
+            latitude, longitude = (float(c) for c in coordenadas.split(','))
+            paradas.append({
+                'nome': nome,
+                'latitude': latitude,
+                'longitude': longitude,
+                'linhas': self.linhas_por_parada.get(nome, [])
+            })
+        indice.adicionar_varias(paradas)
+        self.indice_paradas = indice
+    
+    def resolver_localizacao(self, localizacao):
+        """
+        Converte a localização em (latitude, longitude).
+        
+        Aceita tupla (lat, lon), texto "lat,lon" ou o nome (ou parte do
+        nome) de uma parada conhecida. Retorna None se não reconhecer.
+        """
+        if isinstance(localizacao, (tuple, list)) and len(localizacao) == 2:
+            return float(localizacao[0]), float(localizacao[1])
+        
+        texto = str(localizacao).strip()
+        try:
+            latitude, longitude = (float(c) for c in texto.split(','))
+            return latitude, longitude
+        except ValueError:
+            pass
+        
+        texto = texto.lower()
+        if not texto:
+            return None
+        for nome, coordenadas in self.paradas_manaus.items():
+            if texto in nome.lower():
+                latitude, longitude = (float(c) for c in coordenadas.split(','))
+                return latitude, longitude
+        return None
+    
+    def obter_paradas_proximas(self, localizacao, quantidade=5, raio_km=None):
+        """
+        Retorna paradas próximas a uma localização, da mais próxima para a
+        mais distante.
+        
+        Args:
+            localizacao: (lat, lon), "lat,lon" ou nome de uma parada
+            quantidade: Número máximo de paradas
+            raio_km: Se informado, limita a busca a esse raio
+            
+        Returns:
+            Lista de dicionários com nome, latitude, longitude, linhas e
+            distancia_km
+        """
+        coordenadas = self.resolver_localizacao(localizacao)
+        if coordenadas is None:
+            return []
+        
+        if self.indice_paradas is None:
+            self._construir_indice()
+        
+        latitude, longitude = coordenadas
+        if raio_km is not None:
+            return self.indice_paradas.dentro_do_raio(latitude, longitude, raio_km, quantidade)
+        return self.indice_paradas.mais_proximas(latitude, longitude, quantidade)
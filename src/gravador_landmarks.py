@@ -0,0 +1,259 @@
+"""
+Gravação compacta de fluxos de landmarks (.lmk).
+
+Cada mão detectada vira um registro de tamanho fixo (dtype REGISTRO):
+instante, número do quadro, índice da mão, rótulo informado pelo operador,
+gesto previsto pelo classificador e os 21 landmarks em float32. Os
+registros são acumulados em blocos; cada bloco é gravado no fim do arquivo
+comprimido com zlib, depois de reorganizar os bytes por coluna (o mesmo
+"shuffle" do Blosc/HDF5, que agrupa bytes parecidos dos floats e melhora
+muito a compressão).
+
+Formato:
+    MAGICA (8 bytes)
+    bloco*: CABECALHO_BLOCO ('BLOC', registros, bytes comprimidos, crc32)
+            + dados comprimidos
+
+O arquivo só cresce; um bloco cortado no meio (queda de energia no
+quiosque) ou corrompido é ignorado na leitura, junto com o que vier depois.
+Ao continuar uma gravação, o gravador corta o arquivo no fim do último
+bloco íntegro antes de acrescentar, para os blocos novos não ficarem atrás
+do corrompido.
+"""
+import os
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+
+
+MAGICA = b'PIALMK01'
+CABECALHO_BLOCO = struct.Struct('<4sIII')
+MARCA_BLOCO = b'BLOC'
+
+TAMANHO_ROTULO = 16
+
+REGISTRO = np.dtype([
+    ('tempo', '<f8'),                       # time.time() da captura
+    ('quadro', '<u4'),                      # número do quadro na sessão
+    ('mao', 'u1'),                          # índice da mão no quadro
+    ('rotulo', f'S{TAMANHO_ROTULO}'),       # rótulo do operador ('' = nenhum)
+    ('previsto', f'S{TAMANHO_ROTULO}'),     # gesto previsto ('' = nenhum)
+    ('landmarks', '<f4', (21, 3)),          # pixels, como landmarks_para_array
+])
+
+
+def _embaralhar(registros):
+    """Bytes do bloco agrupados por posição dentro do registro"""
+    bytes_registros = registros.view(np.uint8).reshape(len(registros), REGISTRO.itemsize)
+    return np.ascontiguousarray(bytes_registros.T).tobytes()
+
+
+def _desembaralhar(dados, quantidade):
+    colunas = np.frombuffer(dados, dtype=np.uint8).reshape(REGISTRO.itemsize, quantidade)
+    return np.ascontiguousarray(colunas.T).view(REGISTRO).reshape(quantidade)
+
+
+def _codificar(texto):
+    """UTF-8 cortado em TAMANHO_ROTULO bytes sem partir um caractere"""
+    cortado = (texto or '').encode('utf-8')[:TAMANHO_ROTULO]
+    return cortado.decode('utf-8', 'ignore').encode('utf-8')
+
+
+def _indexar_blocos(arquivo):
+    """
+    Percorre os blocos a partir da posição atual até o primeiro cortado ou
+    corrompido (o CRC é conferido sem descomprimir).
+
+    Returns:
+        Tupla (índice [(posição dos dados, registros, bytes, crc)], posição
+        do fim do último bloco íntegro)
+    """
+    indice = []
+    fim = arquivo.tell()
+    while True:
+        cabecalho = arquivo.read(CABECALHO_BLOCO.size)
+        if len(cabecalho) < CABECALHO_BLOCO.size:
+            break
+        marca, registros, tamanho, crc = CABECALHO_BLOCO.unpack(cabecalho)
+        if marca != MARCA_BLOCO:
+            break
+        posicao = arquivo.tell()
+        dados = arquivo.read(tamanho)
+        if len(dados) < tamanho or zlib.crc32(dados) != crc:
+            break
+        indice.append((posicao, registros, tamanho, crc))
+        fim = posicao + tamanho
+    return indice, fim
+
+
+class GravadorLandmarks:
+    """
+    Grava registros de mãos em blocos comprimidos, só acrescentando ao arquivo.
+
+    Seguro para uma thread produtora e outra que chame fechar().
+    """
+
+    def __init__(self, caminho, tamanho_bloco=1024, nivel_compressao=6):
+        """
+        Args:
+            caminho: Arquivo .lmk (criado, ou continuado se já existir)
+            tamanho_bloco: Registros por bloco comprimido
+            nivel_compressao: Nível do zlib (1 = rápido, 9 = menor)
+        """
+        self.caminho = caminho
+        self.tamanho_bloco = tamanho_bloco
+        self.nivel_compressao = nivel_compressao
+        self.registros = 0
+        self.bytes_gravados = 0
+        self._buffer = np.zeros(tamanho_bloco, dtype=REGISTRO)
+        self._ocupados = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        novo = not os.path.exists(caminho) or os.path.getsize(caminho) == 0
+        if not novo:
+            with open(caminho, 'r+b') as arquivo:
+                if arquivo.read(len(MAGICA)) != MAGICA:
+                    raise ValueError(f"{caminho} não é uma gravação de landmarks")
+                # Rabo cortado ou corrompido: os blocos novos iriam para
+                # depois dele, onde a leitura nunca chega
+                _, fim = _indexar_blocos(arquivo)
+                descartados = os.fstat(arquivo.fileno()).st_size - fim
+                if descartados:
+                    print(f"⚠️ {caminho}: {descartados} bytes corrompidos no fim removidos")
+                    arquivo.truncate(fim)
+        self._arquivo = open(caminho, 'ab')
+        if novo:
+            self._arquivo.write(MAGICA)
+
+    def adicionar(self, maos, rotulo=None, previstos=None, quadro=0, tempo=None):
+        """
+        Acrescenta as mãos de um quadro.
+
+        Args:
+            maos: Array (N_maos, 21, 3)
+            rotulo: Rótulo do operador para o quadro
+            previstos: Gesto previsto para cada mão (ou None)
+            quadro: Número do quadro
+            tempo: Instante da captura (padrão: agora)
+        """
+        maos = np.asarray(maos, dtype=np.float32).reshape(-1, 21, 3)
+        tempo = time.time() if tempo is None else tempo
+        rotulo = _codificar(rotulo)
+        with self._lock:
+            if self._arquivo is None:
+                return
+            for i, mao in enumerate(maos):
+                registro = self._buffer[self._ocupados]
+                registro['tempo'] = tempo
+                registro['quadro'] = quadro
+                registro['mao'] = i
+                registro['rotulo'] = rotulo
+                registro['previsto'] = _codificar(previstos[i] if previstos else None)
+                registro['landmarks'] = mao
+                self._ocupados += 1
+                self.registros += 1
+                if self._ocupados == self.tamanho_bloco:
+                    self._gravar_bloco()
+
+    def _gravar_bloco(self):
+        if not self._ocupados:
+            return
+        dados = zlib.compress(_embaralhar(self._buffer[:self._ocupados]), self.nivel_compressao)
+        cabecalho = CABECALHO_BLOCO.pack(MARCA_BLOCO, self._ocupados, len(dados), zlib.crc32(dados))
+        self._arquivo.write(cabecalho + dados)
+        self._arquivo.flush()
+        self.bytes_gravados += len(cabecalho) + len(dados)
+        self._ocupados = 0
+
+    def descarregar(self):
+        """Grava o bloco parcial pendente"""
+        with self._lock:
+            if self._arquivo is not None:
+                self._gravar_bloco()
+
+    def fechar(self):
+        with self._lock:
+            if self._arquivo is None:
+                return
+            self._gravar_bloco()
+            self._arquivo.close()
+            self._arquivo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+
+class LeitorLandmarks:
+    """
+    Leitura de arquivos .lmk por blocos ou em lotes de tamanho fixo.
+
+    O índice de blocos é montado pelos cabeçalhos e CRCs, sem descomprimir
+    nada; só blocos íntegros entram nele (e em len()).
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        with open(caminho, 'rb') as arquivo:
+            if arquivo.read(len(MAGICA)) != MAGICA:
+                raise ValueError(f"{caminho} não é uma gravação de landmarks")
+            # (posição dos dados, registros, bytes, crc)
+            self.indice, _ = _indexar_blocos(arquivo)
+
+    def __len__(self):
+        return sum(registros for _, registros, _, _ in self.indice)
+
+    def blocos(self):
+        """Cada bloco íntegro como array estruturado (dtype REGISTRO)"""
+        with open(self.caminho, 'rb') as arquivo:
+            for posicao, registros, tamanho, crc in self.indice:
+                arquivo.seek(posicao)
+                dados = arquivo.read(tamanho)
+                if zlib.crc32(dados) != crc:
+                    return
+                yield _desembaralhar(zlib.decompress(dados), registros)
+
+    def lotes(self, tamanho=4096):
+        """Registros em lotes de `tamanho` (o último pode ser menor)"""
+        pendentes, quantidade = [], 0
+        for bloco in self.blocos():
+            pendentes.append(bloco)
+            quantidade += len(bloco)
+            while quantidade >= tamanho:
+                todos = np.concatenate(pendentes) if len(pendentes) > 1 else pendentes[0]
+                yield todos[:tamanho]
+                pendentes, quantidade = [todos[tamanho:]], quantidade - tamanho
+        if quantidade:
+            yield np.concatenate(pendentes)
+
+    def ler_tudo(self):
+        blocos = list(self.blocos())
+        return np.concatenate(blocos) if blocos else np.empty(0, dtype=REGISTRO)
+
+    def amostras_rotuladas(self, usar_previstos=False):
+        """
+        Mãos com rótulo, para treino (ver GravadorDataset.carregar).
+
+        Args:
+            usar_previstos: Sem rótulo do operador, usa o gesto previsto
+
+        Returns:
+            Tupla (landmarks (M, 21, 3), rotulos (M,))
+        """
+        landmarks, rotulos = [], []
+        for lote in self.lotes():
+            nomes = lote['rotulo']
+            if usar_previstos:
+                nomes = np.where(nomes == b'', lote['previsto'], nomes)
+            validos = nomes != b''
+            landmarks.append(lote['landmarks'][validos])
+            rotulos.append(np.char.decode(nomes[validos], 'utf-8', 'replace'))
+        if not landmarks:
+            return np.empty((0, 21, 3), dtype=np.float32), np.array([], dtype=str)
+        return np.concatenate(landmarks), np.concatenate(rotulos).astype(str)
@@ -0,0 +1,205 @@
+"""
+Previsão das próximas partidas de cada linha.
+
+As partidas de um dia de serviço são calculadas uma vez (a partir de
+horario_inicio, horario_fim e intervalo_minutos, ou dos horários GTFS
+importados) e guardadas em arrays ordenados; cada consulta é uma busca
+binária. O dia de serviço pode passar da meia-noite: uma linha que vai até
+'00:00' tem a última partida às 24:00 do mesmo dia de serviço.
+
+Com horários GTFS, cada sentido (direction_id) da linha tem a sua tabela;
+sem sentido informado vale o menor, o mesmo que deu origem e destino à
+linha em linhas_onibus.
+"""
+import os
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from importador_gtfs import tabelas_gtfs_disponiveis, segundos_para_horario
+
+
+SEGUNDOS_DIA = 24 * 3600
+
+# Dias de serviço mantidos em memória (ontem, hoje e amanhã bastam)
+DIAS_EM_CACHE = 3
+
+
+def horario_em_segundos(horario):
+    """Converte 'HH:MM' em segundos desde a meia-noite"""
+    horas, minutos = horario.strip().split(':')[:2]
+    return int(horas) * 3600 + int(minutos) * 60
+
+
+class MotorPartidas:
+    """
+    Tabelas de partidas por linha e dia de serviço.
+    """
+
+    def __init__(self, banco):
+        """
+        Args:
+            banco: Instância de BancoDadosOnibusEnhanced
+        """
+        self.banco = banco
+        self._lock = threading.Lock()
+        self.recarregar()
+
+    def recarregar(self):
+        """Relê as linhas do banco e descarta as tabelas calculadas"""
+        with self._lock:
+            self._tabelas = OrderedDict()
+            self._calendario = {}
+            self._partidas_por_servico = {}
+            self.linhas = {}
+
+            cursor = self.banco.conn.cursor()
+            cursor.execute('''
+                SELECT numero, nome, horario_inicio, horario_fim, intervalo_minutos
+                FROM linhas_onibus
+            ''')
+            for numero, nome, inicio, fim, intervalo in cursor.fetchall():
+                self.linhas[numero] = {
+                    'nome': nome, 'inicio': inicio, 'fim': fim, 'intervalo': intervalo
+                }
+
+            self.usa_gtfs = tabelas_gtfs_disponiveis(self.banco.conn)
+            if self.usa_gtfs:
+                self._carregar_gtfs(cursor)
+
+    def _carregar_gtfs(self, cursor):
+        """Partidas do primeiro ponto de cada viagem, por sentido e serviço"""
+        cursor.execute('''
+            SELECT service_id, segunda, terca, quarta, quinta, sexta, sabado,
+                   domingo, data_inicio, data_fim
+            FROM gtfs_calendario
+        ''')
+        for linha in cursor.fetchall():
+            dias = frozenset(i for i, ativo in enumerate(linha[1:8]) if ativo)
+            self._calendario[linha[0]] = (dias, linha[8], linha[9])
+
+        # Coluna solta com MIN(): o SQLite devolve a partida da menor sequência
+        cursor.execute('''
+            SELECT r.numero, COALESCE(v.sentido, 0), v.service_id, h.partida
+            FROM (
+                SELECT trip_id, partida, MIN(sequencia)
+                FROM gtfs_horarios
+                GROUP BY trip_id
+            ) h
+            JOIN gtfs_viagens v ON v.trip_id = h.trip_id
+            JOIN gtfs_rotas r ON r.route_id = v.route_id
+            WHERE h.partida IS NOT NULL
+        ''')
+        for numero, sentido, servico, partida in cursor.fetchall():
+            (self._partidas_por_servico.setdefault(numero, {}).setdefault(sentido, {})
+             .setdefault(servico, []).append(partida))
+
+    def _servico_ativo(self, servico, dia):
+        """Indica se o service_id GTFS roda no dia (sem calendário: sempre)"""
+        if servico not in self._calendario:
+            return True
+        dias, inicio, fim = self._calendario[servico]
+        data_texto = dia.strftime('%Y%m%d')
+        return (dia.weekday() in dias and (not inicio or inicio <= data_texto)
+                and (not fim or data_texto <= fim))
+
+    def sentidos(self, numero):
+        """Sentidos com tabela própria (sem GTFS, só o sentido 0)"""
+        if self.usa_gtfs:
+            return sorted(self._partidas_por_servico.get(numero, {}))
+        return [0] if numero in self.linhas else []
+
+    def _calcular_tabela(self, dia):
+        """Partidas (segundos do dia de serviço) de cada (linha, sentido) no dia"""
+        tabela = {}
+        if self.usa_gtfs:
+            for numero, por_sentido in self._partidas_por_servico.items():
+                for sentido, servicos in por_sentido.items():
+                    partidas = [p for servico, lista in servicos.items()
+                                if self._servico_ativo(servico, dia) for p in lista]
+                    tabela[numero, sentido] = array('i', sorted(partidas))
+            return tabela
+
+        for numero, linha in self.linhas.items():
+            if not (linha['inicio'] and linha['fim'] and linha['intervalo']):
+                tabela[numero, 0] = array('i')
+                continue
+            primeira = horario_em_segundos(linha['inicio'])
+            ultima = horario_em_segundos(linha['fim'])
+            if ultima <= primeira:
+                ultima += SEGUNDOS_DIA
+            tabela[numero, 0] = array('i', range(primeira, ultima + 1, linha['intervalo'] * 60))
+        return tabela
+
+    def tabela_do_dia(self, dia):
+        """Tabela de partidas do dia de serviço, calculada uma vez por dia"""
+        with self._lock:
+            tabela = self._tabelas.get(dia)
+            if tabela is None:
+                tabela = self._calcular_tabela(dia)
+                self._tabelas[dia] = tabela
+                while len(self._tabelas) > DIAS_EM_CACHE:
+                    self._tabelas.popitem(last=False)
+            else:
+                self._tabelas.move_to_end(dia)
+            return tabela
+
+    def proximas_partidas(self, numero, quantidade=3, agora=None, sentido=None):
+        """
+        Próximas partidas da linha a partir de agora.
+
+        Considera também o dia de serviço anterior, cujas viagens podem
+        continuar depois da meia-noite.
+
+        Args:
+            sentido: direction_id GTFS (padrão: o menor sentido da linha)
+
+        Returns:
+            Lista de dicionários com 'horario' ('HH:MM') e 'minutos'
+            (minutos até a partida)
+        """
+        sentidos = self.sentidos(numero)
+        if not sentidos:
+            return []
+        chave = (numero, sentidos[0] if sentido is None else sentido)
+
+        agora = agora or datetime.now()
+        hoje = agora.date()
+        segundos = agora.hour * 3600 + agora.minute * 60 + agora.second
+
+        resultado = []
+        for dia, deslocamento in ((hoje - timedelta(days=1), SEGUNDOS_DIA), (hoje, 0)):
+            partidas = self.tabela_do_dia(dia).get(chave)
+            if not partidas:
+                continue
+            instante = segundos + deslocamento
+            inicio = bisect_left(partidas, instante)
+            for partida in partidas[inicio:inicio + quantidade]:
+                resultado.append((partida - instante, partida))
+
+        # Nada mais hoje: primeiras partidas de amanhã
+        if len(resultado) < quantidade:
+            partidas = self.tabela_do_dia(hoje + timedelta(days=1)).get(chave) or []
+            for partida in partidas[:quantidade - len(resultado)]:
+                resultado.append((partida + SEGUNDOS_DIA - segundos, partida))
+
+        resultado.sort()
+        return [
+            {'horario': segundos_para_horario(partida), 'minutos': espera // 60}
+            for espera, partida in resultado[:quantidade]
+        ]
+
+    def proxima_partida_por_linha(self, agora=None):
+        """Próxima partida de cada linha, da mais próxima para a mais distante"""
+        proximas = []
+        for numero in self.linhas:
+            partidas = self.proximas_partidas(numero, 1, agora)
+            if partidas:
+                proximas.append(dict(partidas[0], numero=numero))
+        proximas.sort(key=lambda p: (p['minutos'], p['numero']))
+        return proximas
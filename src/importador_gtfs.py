@@ -0,0 +1,596 @@
+"""
+Importador de feeds GTFS para o banco de dados do PIA Manaus.
+
+Lê routes.txt, stops.txt, trips.txt, stop_times.txt e calendar.txt de um
+diretório ou arquivo .zip e preenche as tabelas linhas_onibus, pontos_parada
+e terminais de BancoDadosOnibusEnhanced. Os arquivos são lidos em streaming
+e gravados em lotes com executemany dentro de uma única transação; os índices
+das tabelas GTFS só são criados depois da carga.
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+import zipfile
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database_module_enhanced import BancoDadosOnibusEnhanced
+
+
+TAMANHO_LOTE = 50000
+
+# Tabelas auxiliares com os dados brutos do feed (horários em segundos
+# desde a meia-noite do dia de serviço; podem passar de 24h)
+ESQUEMA_GTFS = [
+    '''
+    CREATE TABLE IF NOT EXISTS gtfs_rotas (
+        route_id TEXT PRIMARY KEY,
+        numero TEXT NOT NULL,
+        nome TEXT,
+        tipo TEXT
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS gtfs_paradas (
+        stop_id TEXT PRIMARY KEY,
+        nome TEXT,
+        descricao TEXT,
+        latitude REAL,
+        longitude REAL,
+        tipo_local INTEGER,
+        estacao_pai TEXT,
+        acessivel INTEGER
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS gtfs_viagens (
+        trip_id TEXT PRIMARY KEY,
+        route_id TEXT NOT NULL,
+        service_id TEXT,
+        sentido INTEGER,
+        acessivel INTEGER
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS gtfs_horarios (
+        trip_id TEXT NOT NULL,
+        stop_id TEXT NOT NULL,
+        sequencia INTEGER NOT NULL,
+        chegada INTEGER,
+        partida INTEGER
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS gtfs_calendario (
+        service_id TEXT PRIMARY KEY,
+        segunda INTEGER,
+        terca INTEGER,
+        quarta INTEGER,
+        quinta INTEGER,
+        sexta INTEGER,
+        sabado INTEGER,
+        domingo INTEGER,
+        data_inicio TEXT,
+        data_fim TEXT
+    )
+    ''',
+]
+
+# Índices criados só depois da carga em massa
+INDICES_GTFS = {
+    'idx_gtfs_horarios_viagem': 'gtfs_horarios(trip_id, sequencia)',
+    'idx_gtfs_horarios_parada': 'gtfs_horarios(stop_id, partida)',
+    'idx_gtfs_viagens_rota': 'gtfs_viagens(route_id)',
+    'idx_pontos_parada_linha': 'pontos_parada(linha_numero, ordem)',
+}
+
+TIPOS_ROTA = {
+    '0': 'VLT',
+    '1': 'Metrô',
+    '2': 'Trem',
+    '3': 'Convencional',
+    '4': 'Balsa',
+    '11': 'Trólebus',
+}
+
+
+def tabelas_gtfs_disponiveis(conn):
+    """Indica se o banco já recebeu uma importação GTFS com horários"""
+    try:
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM gtfs_horarios')
+        return cursor.fetchone()[0] > 0
+    except Exception:
+        return False
+
+
+def horario_para_segundos(horario):
+    """Converte 'HH:MM:SS' (hora pode passar de 23) em segundos"""
+    if not horario:
+        return None
+    h, m, s = horario.strip().split(':')
+    return int(h) * 3600 + int(m) * 60 + int(s)
+
+
+def segundos_para_horario(segundos):
+    """Converte segundos do dia de serviço em 'HH:MM' (24h → 00h)"""
+    if segundos is None:
+        return None
+    minutos = segundos // 60
+    return f"{(minutos // 60) % 24:02d}:{minutos % 60:02d}"
+
+
+class ImportadorGTFS:
+    """
+    Importa um feed GTFS para BancoDadosOnibusEnhanced.
+    """
+
+    def __init__(self, banco, tamanho_lote=TAMANHO_LOTE, tarifa_padrao=4.50):
+        """
+        Args:
+            banco: Instância de BancoDadosOnibusEnhanced já conectada
+            tamanho_lote: Quantidade de linhas por chamada de executemany
+            tarifa_padrao: Tarifa usada nas linhas (GTFS não a exige)
+        """
+        self.banco = banco
+        self.conn = banco.conn
+        self.tamanho_lote = tamanho_lote
+        self.tarifa_padrao = tarifa_padrao
+        self.estatisticas = {}
+        self._descartados = 0
+
+    # ------------------------------------------------------------------
+    # Leitura do feed
+    # ------------------------------------------------------------------
+
+    def _abrir_feed(self, caminho):
+        """Retorna função que abre um arquivo do feed (diretório ou .zip)"""
+        if zipfile.is_zipfile(caminho):
+            arquivo_zip = zipfile.ZipFile(caminho)
+            nomes = {os.path.basename(n): n for n in arquivo_zip.namelist()}
+
+            def abrir(nome):
+                if nome not in nomes:
+                    return None
+                return io.TextIOWrapper(
+                    arquivo_zip.open(nomes[nome]), encoding='utf-8-sig', newline='')
+
+            return abrir, arquivo_zip.close
+
+        def abrir(nome):
+            caminho_arquivo = os.path.join(caminho, nome)
+            if not os.path.exists(caminho_arquivo):
+                return None
+            return open(caminho_arquivo, encoding='utf-8-sig', newline='')
+
+        return abrir, lambda: None
+
+    def _ler_registros(self, arquivo, colunas):
+        """
+        Gera tuplas com as colunas pedidas, na ordem pedida.
+
+        Colunas ausentes no cabeçalho viram string vazia. Registros curtos
+        demais para as colunas presentes são pulados e contados em
+        self._descartados.
+        """
+        leitor = csv.reader(arquivo)
+        cabecalho = [c.strip() for c in next(leitor, [])]
+        posicoes = [cabecalho.index(c) if c in cabecalho else None for c in colunas]
+
+        if None not in posicoes:
+            # Caminho rápido: todas as colunas presentes, extração em C
+            extrair = itemgetter(*posicoes)
+            minimo = max(posicoes) + 1
+            for registro in leitor:
+                if len(registro) >= minimo:
+                    valores = extrair(registro)
+                    yield valores if len(posicoes) > 1 else (valores,)
+                elif registro:
+                    self._descartados += 1
+            return
+
+        for registro in leitor:
+            if not registro:
+                continue
+            yield tuple(
+                registro[p] if p is not None and p < len(registro) else ''
+                for p in posicoes
+            )
+
+    def _inserir_em_lotes(self, nome_arquivo, sql, registros):
+        """Executa executemany em lotes e registra a vazão do arquivo"""
+        cursor = self.conn.cursor()
+        total = 0
+        self._descartados = 0
+        inicio = time.perf_counter()
+
+        while True:
+            lote = list(islice(registros, self.tamanho_lote))
+            if not lote:
+                break
+            cursor.executemany(sql, lote)
+            total += len(lote)
+
+        duracao = time.perf_counter() - inicio
+        self.estatisticas[nome_arquivo] = {
+            'linhas': total,
+            'segundos': duracao,
+            'linhas_por_segundo': total / duracao if duracao > 0 else float(total),
+            'descartadas': self._descartados,
+        }
+        print(f"   {nome_arquivo}: {total} linhas em {duracao:.2f}s "
+              f"({self.estatisticas[nome_arquivo]['linhas_por_segundo']:.0f} linhas/s)")
+        if self._descartados:
+            print(f"⚠️ {nome_arquivo}: {self._descartados} registros com colunas faltando ignorados")
+        return total
+
+    # ------------------------------------------------------------------
+    # Conversão de cada arquivo
+    # ------------------------------------------------------------------
+
+    def _rotas(self, arquivo):
+        for route_id, curto, longo, tipo in self._ler_registros(
+                arquivo, ('route_id', 'route_short_name', 'route_long_name', 'route_type')):
+            numero = curto.strip() or route_id
+            yield (route_id, numero, longo.strip() or numero,
+                   TIPOS_ROTA.get(tipo.strip(), 'Convencional'))
+
+    def _paradas(self, arquivo):
+        for stop_id, nome, desc, lat, lon, tipo, pai, cadeira in self._ler_registros(
+                arquivo, ('stop_id', 'stop_name', 'stop_desc', 'stop_lat', 'stop_lon',
+                          'location_type', 'parent_station', 'wheelchair_boarding')):
+            yield (stop_id, nome, desc or None,
+                   float(lat) if lat else None, float(lon) if lon else None,
+                   int(tipo) if tipo else 0, pai or None, 1 if cadeira == '1' else 0)
+
+    def _viagens(self, arquivo):
+        for trip_id, route_id, service_id, sentido, cadeira in self._ler_registros(
+                arquivo, ('trip_id', 'route_id', 'service_id', 'direction_id',
+                          'wheelchair_accessible')):
+            yield (trip_id, route_id, service_id,
+                   int(sentido) if sentido else 0, 1 if cadeira == '1' else 0)
+
+    def _horarios(self, arquivo):
+        # Os mesmos horários se repetem milhões de vezes em stop_times.txt
+        converter = lru_cache(maxsize=200000)(horario_para_segundos)
+        for trip_id, stop_id, sequencia, chegada, partida in self._ler_registros(
+                arquivo, ('trip_id', 'stop_id', 'stop_sequence', 'arrival_time',
+                          'departure_time')):
+            chegada_s = converter(chegada)
+            partida_s = converter(partida)
+            yield (trip_id, stop_id, int(sequencia),
+                   chegada_s if chegada_s is not None else partida_s,
+                   partida_s if partida_s is not None else chegada_s)
+
+    def _calendario(self, arquivo):
+        dias = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday',
+                'saturday', 'sunday')
+        for registro in self._ler_registros(
+                arquivo, ('service_id',) + dias + ('start_date', 'end_date')):
+            yield ((registro[0],) + tuple(int(d or 0) for d in registro[1:8])
+                   + registro[8:])
+
+    # ------------------------------------------------------------------
+    # Importação
+    # ------------------------------------------------------------------
+
+    def _preparar_tabelas(self, cursor, substituir):
+        for sql in ESQUEMA_GTFS:
+            cursor.execute(sql)
+
+        # Índices só atrasam a carga: recriados ao final
+        for nome in INDICES_GTFS:
+            cursor.execute(f'DROP INDEX IF EXISTS {nome}')
+
+        if substituir:
+            for tabela in ('gtfs_rotas', 'gtfs_paradas', 'gtfs_viagens',
+                           'gtfs_horarios', 'gtfs_calendario',
+                           'pontos_parada', 'linhas_onibus'):
+                cursor.execute(f'DELETE FROM {tabela}')
+
+    def _criar_indices(self, cursor):
+        for nome, definicao in INDICES_GTFS.items():
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {nome} ON {definicao}')
+
+    def _derivar_linhas(self, cursor):
+        """Preenche linhas_onibus a partir das rotas e viagens importadas"""
+        # Viagem representativa de cada rota: menor sentido, menor trip_id
+        cursor.execute('DROP TABLE IF EXISTS temp.viagem_representativa')
+        cursor.execute('''
+            CREATE TEMP TABLE viagem_representativa AS
+            SELECT route_id, trip_id, service_id, sentido FROM (
+                SELECT route_id, trip_id, service_id, sentido,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY route_id ORDER BY sentido, trip_id
+                       ) AS posicao
+                FROM gtfs_viagens
+            ) WHERE posicao = 1
+        ''')
+
+        # Primeira e última parada da viagem representativa
+        cursor.execute('''
+            SELECT vr.route_id,
+                   (SELECT p.nome FROM gtfs_horarios h
+                    JOIN gtfs_paradas p ON p.stop_id = h.stop_id
+                    WHERE h.trip_id = vr.trip_id ORDER BY h.sequencia LIMIT 1),
+                   (SELECT p.nome FROM gtfs_horarios h
+                    JOIN gtfs_paradas p ON p.stop_id = h.stop_id
+                    WHERE h.trip_id = vr.trip_id ORDER BY h.sequencia DESC LIMIT 1)
+            FROM viagem_representativa vr
+        ''')
+        extremos = {route_id: (origem, destino) for route_id, origem, destino in cursor.fetchall()}
+
+        # Horário de operação e intervalo médio no sentido/serviço representativos
+        cursor.execute('''
+            SELECT v.route_id, MIN(s.saida), MAX(s.saida), COUNT(*)
+            FROM (
+                SELECT trip_id, MIN(partida) AS saida
+                FROM gtfs_horarios GROUP BY trip_id
+            ) s
+            JOIN gtfs_viagens v ON v.trip_id = s.trip_id
+            JOIN viagem_representativa vr
+              ON vr.route_id = v.route_id
+             AND vr.sentido = v.sentido
+             AND vr.service_id IS v.service_id
+            GROUP BY v.route_id
+        ''')
+        operacao = {route_id: (inicio, fim, viagens)
+                    for route_id, inicio, fim, viagens in cursor.fetchall()}
+
+        # Rotas com o mesmo route_short_name viram uma só linha: fica a rota
+        # com mais viagens (pontos_parada usa a mesma escolha)
+        cursor.execute('''
+            SELECT r.route_id, r.numero, r.nome, r.tipo,
+                   MAX(COALESCE(v.acessivel, 0)), COUNT(v.trip_id)
+            FROM gtfs_rotas r
+            LEFT JOIN gtfs_viagens v ON v.route_id = r.route_id
+            GROUP BY r.route_id
+            ORDER BY r.numero, COUNT(v.trip_id) DESC, r.route_id
+        ''')
+        rotas_por_numero = {}
+        for rota in cursor.fetchall():
+            rotas_por_numero.setdefault(rota[1], []).append(rota)
+
+        cursor.execute('SELECT numero FROM linhas_onibus')
+        existentes = {numero for numero, in cursor.fetchall()}
+
+        escolhidas = []
+        for numero, rotas in rotas_por_numero.items():
+            if len(rotas) > 1:
+                print(f"⚠️ Linha {numero}: rotas {', '.join(r[0] for r in rotas)} com o mesmo "
+                      f"número; usando {rotas[0][0]} para a linha e seus pontos de parada")
+            if numero in existentes:
+                print(f"⚠️ Linha {numero} já existe no banco: mantida sem alterações")
+                continue
+            escolhidas.append(rotas[0])
+
+        cursor.execute('DROP TABLE IF EXISTS temp.rota_da_linha')
+        cursor.execute('CREATE TEMP TABLE rota_da_linha (numero TEXT PRIMARY KEY, route_id TEXT)')
+        cursor.executemany('INSERT INTO rota_da_linha VALUES (?, ?)',
+                           [(rota[1], rota[0]) for rota in escolhidas])
+
+        linhas = []
+        for route_id, numero, nome, tipo, acessivel, _ in escolhidas:
+            origem, destino = extremos.get(route_id, (None, None))
+            inicio, fim, viagens = operacao.get(route_id, (None, None, 0))
+            intervalo = None
+            if viagens > 1:
+                intervalo = max(1, round((fim - inicio) / 60 / (viagens - 1)))
+            linhas.append((
+                numero, nome, origem or nome, destino or nome,
+                segundos_para_horario(inicio), segundos_para_horario(fim),
+                intervalo, self.tarifa_padrao, bool(acessivel), False, tipo
+            ))
+
+        cursor.executemany('''
+            INSERT INTO linhas_onibus VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', linhas)
+        return len(linhas)
+
+    def _derivar_pontos_parada(self, cursor):
+        """
+        Preenche pontos_parada com a sequência da viagem representativa,
+        só para as rotas que viraram linhas em _derivar_linhas
+        """
+        cursor.execute('''
+            INSERT INTO pontos_parada
+                (linha_numero, nome_ponto, endereco, latitude, longitude, ordem)
+            SELECT rl.numero, p.nome, p.descricao, p.latitude, p.longitude,
+                   ROW_NUMBER() OVER (PARTITION BY vr.route_id ORDER BY h.sequencia)
+            FROM viagem_representativa vr
+            JOIN rota_da_linha rl ON rl.route_id = vr.route_id
+            JOIN gtfs_horarios h ON h.trip_id = vr.trip_id
+            JOIN gtfs_paradas p ON p.stop_id = h.stop_id
+        ''')
+        return cursor.rowcount
+
+    def _derivar_terminais(self, cursor):
+        """Estações (location_type = 1) do feed viram terminais"""
+        cursor.execute('SELECT COUNT(*) FROM gtfs_paradas WHERE tipo_local = 1')
+        if cursor.fetchone()[0] == 0:
+            print("   Feed sem estações (location_type=1): terminais mantidos")
+            return 0
+
+        cursor.execute('DELETE FROM terminal_linhas')
+        cursor.execute('DELETE FROM terminais')
+
+        cursor.execute('''
+            SELECT stop_id, nome, descricao, latitude, longitude
+            FROM gtfs_paradas
+            WHERE tipo_local = 1
+            ORDER BY stop_id
+        ''')
+        estacoes = cursor.fetchall()
+
+        cursor.execute('DROP TABLE IF EXISTS temp.estacao_terminal')
+        cursor.execute('CREATE TEMP TABLE estacao_terminal (stop_id TEXT, terminal_id INTEGER)')
+        for stop_id, nome, descricao, latitude, longitude in estacoes:
+            cursor.execute('''
+                INSERT INTO terminais (nome, endereco, latitude, longitude)
+                VALUES (?, ?, ?, ?)
+            ''', (nome, descricao, latitude, longitude))
+            cursor.execute('INSERT INTO estacao_terminal VALUES (?, ?)',
+                           (stop_id, cursor.lastrowid))
+
+        # Linhas com viagens parando na estação ou em suas plataformas
+        cursor.execute('''
+            INSERT INTO terminal_linhas (terminal_id, linha_numero, ordem)
+            SELECT terminal_id, numero,
+                   ROW_NUMBER() OVER (PARTITION BY terminal_id ORDER BY numero)
+            FROM (
+                SELECT DISTINCT et.terminal_id AS terminal_id, r.numero AS numero
+                FROM estacao_terminal et
+                JOIN gtfs_paradas p
+                  ON p.stop_id = et.stop_id OR p.estacao_pai = et.stop_id
+                JOIN gtfs_horarios h ON h.stop_id = p.stop_id
+                JOIN gtfs_viagens v ON v.trip_id = h.trip_id
+                JOIN gtfs_rotas r ON r.route_id = v.route_id
+            )
+        ''')
+        return len(estacoes)
+
+    def _remover_ligacoes_orfas(self, cursor):
+        """
+        Apaga de terminal_linhas as linhas que não existem mais (terminais
+        mantidos por um feed sem estações apontariam para linhas apagadas)
+        """
+        cursor.execute('''
+            DELETE FROM terminal_linhas
+            WHERE linha_numero NOT IN (SELECT numero FROM linhas_onibus)
+        ''')
+        if cursor.rowcount > 0:
+            print(f"   {cursor.rowcount} ligações terminal-linha removidas (linhas fora do feed)")
+        return cursor.rowcount
+
+    def importar(self, caminho_feed, substituir=True):
+        """
+        Importa o feed GTFS.
+
+        Args:
+            caminho_feed: Diretório com os arquivos .txt ou arquivo .zip
+            substituir: Se True, apaga linhas e pontos de parada existentes
+
+        Returns:
+            Dicionário com linhas, segundos e linhas_por_segundo por arquivo
+            e o total da importação na chave 'total'
+        """
+        if not self.conn:
+            raise RuntimeError("Banco de dados não conectado")
+
+        abrir, fechar_feed = self._abrir_feed(caminho_feed)
+        self.estatisticas = {}
+        inicio = time.perf_counter()
+
+        nivel_isolamento = self.conn.isolation_level
+        self.conn.commit()
+        sincronismo = self.conn.execute('PRAGMA synchronous').fetchone()[0]
+        modo_journal = self.conn.execute('PRAGMA journal_mode').fetchone()[0]
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self.conn.execute('PRAGMA synchronous = OFF')
+        self.conn.isolation_level = None
+        cursor = self.conn.cursor()
+
+        print(f"📥 Importando feed GTFS: {caminho_feed}")
+
+        try:
+            cursor.execute('BEGIN')
+            self._preparar_tabelas(cursor, substituir)
+
+            arquivos = [
+                ('routes.txt', 'INSERT OR REPLACE INTO gtfs_rotas VALUES (?, ?, ?, ?)',
+                 self._rotas, True),
+                ('stops.txt', 'INSERT OR REPLACE INTO gtfs_paradas VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                 self._paradas, True),
+                ('trips.txt', 'INSERT OR REPLACE INTO gtfs_viagens VALUES (?, ?, ?, ?, ?)',
+                 self._viagens, True),
+                ('stop_times.txt', 'INSERT INTO gtfs_horarios VALUES (?, ?, ?, ?, ?)',
+                 self._horarios, True),
+                ('calendar.txt', 'INSERT OR REPLACE INTO gtfs_calendario VALUES '
+                 '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', self._calendario, False),
+            ]
+
+            for nome, sql, conversor, obrigatorio in arquivos:
+                arquivo = abrir(nome)
+                if arquivo is None:
+                    if obrigatorio:
+                        raise FileNotFoundError(f"Arquivo obrigatório ausente no feed: {nome}")
+                    continue
+                with arquivo:
+                    self._inserir_em_lotes(nome, sql, conversor(arquivo))
+
+            inicio_indices = time.perf_counter()
+            self._criar_indices(cursor)
+            print(f"   índices criados em {time.perf_counter() - inicio_indices:.2f}s")
+
+            total_linhas = self._derivar_linhas(cursor)
+            total_pontos = self._derivar_pontos_parada(cursor)
+            total_terminais = self._derivar_terminais(cursor)
+            self._remover_ligacoes_orfas(cursor)
+
+            cursor.execute('COMMIT')
+
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+
+        finally:
+            self.conn.isolation_level = nivel_isolamento
+            self.conn.execute(f'PRAGMA synchronous = {sincronismo}')
+            self.conn.execute(f'PRAGMA journal_mode = {modo_journal}')
+            fechar_feed()
+
+        self.conn.execute('ANALYZE')
+        self.banco.reconstruir_indice_busca()
+        self.banco.invalidar_cache()
+
+        duracao = time.perf_counter() - inicio
+        registros = sum(e['linhas'] for e in self.estatisticas.values())
+        self.estatisticas['total'] = {
+            'linhas': registros,
+            'segundos': duracao,
+            'linhas_por_segundo': registros / duracao if duracao > 0 else float(registros),
+            'linhas_onibus': total_linhas,
+            'pontos_parada': total_pontos,
+            'terminais': total_terminais,
+        }
+
+        print(f"✅ GTFS importado: {total_linhas} linhas, {total_pontos} pontos de parada, "
+              f"{total_terminais} terminais")
+        print(f"   {registros} registros em {duracao:.2f}s "
+              f"({self.estatisticas['total']['linhas_por_segundo']:.0f} registros/s)")
+
+        return self.estatisticas
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Importa um feed GTFS para o banco de dados do PIA Manaus")
+    parser.add_argument('feed', help="Diretório ou arquivo .zip do feed GTFS")
+    parser.add_argument('--db', default=None,
+                        help="Caminho do banco SQLite (padrão: data/database/onibus_manaus.db)")
+    parser.add_argument('--manter', action='store_true',
+                        help="Não apagar as linhas existentes antes de importar")
+    parser.add_argument('--lote', type=int, default=TAMANHO_LOTE,
+                        help="Linhas por lote de executemany")
+    args = parser.parse_args()
+
+    banco = BancoDadosOnibusEnhanced(args.db)
+    if not banco.conn:
+        return 1
+
+    try:
+        ImportadorGTFS(banco, tamanho_lote=args.lote).importar(
+            args.feed, substituir=not args.manter)
+    finally:
+        banco.fechar()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Índice espacial para busca de paradas próximas.
+
+Usa o módulo R*Tree do SQLite (num banco em memória próprio) para filtrar
+candidatos por caixa envolvente e a fórmula de haversine para as distâncias
+exatas.
+"""
+import math
+import sqlite3
+import threading
+
+
+RAIO_TERRA_KM = 6371.0088
+# Mesma esfera da fórmula de haversine: a caixa não pode ser menor que o círculo
+KM_POR_GRAU_LATITUDE = math.pi * RAIO_TERRA_KM / 180
+# Folga em graus (~0,1 m) contra arredondamentos nas bordas da caixa
+MARGEM_GRAUS = 1e-6
+
+
+def distancia_haversine(lat1, lon1, lat2, lon2):
+    """Distância em km entre dois pontos (graus decimais)"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * RAIO_TERRA_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class IndiceEspacial:
+    """
+    Índice de paradas com consultas de k mais próximas e dentro de um raio.
+    """
+
+    def __init__(self):
+        self.conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self.conn.execute('''
+            CREATE VIRTUAL TABLE paradas_rtree USING rtree(
+                id, lat_min, lat_max, lon_min, lon_max
+            )
+        ''')
+        self.paradas = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.paradas)
+
+    def adicionar_varias(self, paradas):
+        """
+        Adiciona paradas ao índice.
+
+        Args:
+            paradas: Iterável de dicionários com ao menos 'nome',
+                    'latitude' e 'longitude'; as demais chaves são
+                    devolvidas junto com os resultados
+        """
+        with self._lock:
+            registros = []
+            for parada in paradas:
+                if parada.get('latitude') is None or parada.get('longitude') is None:
+                    continue
+                identificador = len(self.paradas)
+                self.paradas.append(dict(parada))
+                lat, lon = parada['latitude'], parada['longitude']
+                registros.append((identificador, lat, lat, lon, lon))
+
+            self.conn.executemany(
+                'INSERT INTO paradas_rtree VALUES (?, ?, ?, ?, ?)', registros)
+            self.conn.commit()
+            return len(registros)
+
+    def adicionar(self, nome, latitude, longitude, **dados):
+        """Adiciona uma única parada ao índice"""
+        return self.adicionar_varias([dict(dados, nome=nome, latitude=latitude,
+                                           longitude=longitude)])
+
+    @classmethod
+    def de_banco_dados(cls, banco):
+        """
+        Cria um índice com os pontos de parada e terminais do banco.
+
+        Pontos de parada repetidos em várias linhas (mesmo nome e mesmas
+        coordenadas) entram uma única vez, com a lista de linhas.
+        """
+        indice = cls()
+        cursor = banco.conn.cursor()
+        cursor.execute('''
+            SELECT nome_ponto, endereco, latitude, longitude,
+                   GROUP_CONCAT(DISTINCT linha_numero)
+            FROM pontos_parada
+            WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+            GROUP BY nome_ponto, latitude, longitude
+        ''')
+        paradas = [
+            {
+                'nome': nome, 'endereco': endereco, 'latitude': lat,
+                'longitude': lon, 'tipo': 'parada',
+                'linhas': linhas.split(',') if linhas else []
+            }
+            for nome, endereco, lat, lon, linhas in cursor.fetchall()
+        ]
+        paradas.extend(
+            dict(terminal, tipo='terminal') for terminal in banco.obter_todos_terminais()
+        )
+        indice.adicionar_varias(paradas)
+        return indice
+
+    def _candidatos(self, latitude, longitude, raio_km):
+        """Ids das paradas dentro da caixa envolvente do círculo"""
+        delta_lat = raio_km / KM_POR_GRAU_LATITUDE
+        # Um grau de longitude encolhe longe do equador: usar a latitude da
+        # caixa mais afastada dele para que a caixa cubra o círculo todo
+        lat_extrema = abs(latitude) + delta_lat
+        if lat_extrema >= 90:
+            delta_lon = 180.0
+        else:
+            delta_lon = min(raio_km / (KM_POR_GRAU_LATITUDE * math.cos(math.radians(lat_extrema))),
+                            180.0)
+        delta_lat += MARGEM_GRAUS
+        delta_lon += MARGEM_GRAUS
+
+        with self._lock:
+            cursor = self.conn.execute('''
+                SELECT id FROM paradas_rtree
+                WHERE lat_max >= ? AND lat_min <= ?
+                  AND lon_max >= ? AND lon_min <= ?
+            ''', (latitude - delta_lat, latitude + delta_lat,
+                  longitude - delta_lon, longitude + delta_lon))
+            return [r[0] for r in cursor.fetchall()]
+
+    def _resultado(self, identificador, distancia):
+        parada = dict(self.paradas[identificador])
+        parada['distancia_km'] = distancia
+        return parada
+
+    def _medir(self, latitude, longitude, identificadores, raio_km):
+        """Pares (distância, id) dentro do raio, em ordem crescente"""
+        medidas = []
+        for identificador in identificadores:
+            parada = self.paradas[identificador]
+            distancia = distancia_haversine(
+                latitude, longitude, parada['latitude'], parada['longitude'])
+            if distancia <= raio_km:
+                medidas.append((distancia, identificador))
+        medidas.sort()
+        return medidas
+
+    def dentro_do_raio(self, latitude, longitude, raio_km, limite=None):
+        """
+        Paradas a até raio_km do ponto, da mais próxima para a mais distante.
+
+        Returns:
+            Lista de dicionários da parada com a chave extra 'distancia_km'
+        """
+        medidas = self._medir(latitude, longitude,
+                              self._candidatos(latitude, longitude, raio_km), raio_km)
+        if limite is not None:
+            medidas = medidas[:limite]
+        return [self._resultado(i, d) for d, i in medidas]
+
+    def mais_proximas(self, latitude, longitude, k=5, raio_inicial_km=0.5, raio_maximo_km=50.0):
+        """
+        As k paradas mais próximas do ponto (até raio_maximo_km).
+
+        A busca começa num raio pequeno e dobra até encontrar k paradas
+        dentro do círculo, o que garante que nenhuma mais próxima ficou de
+        fora da caixa consultada.
+        """
+        raio = raio_inicial_km
+        while True:
+            medidas = self._medir(latitude, longitude,
+                                  self._candidatos(latitude, longitude, raio), raio)
+            if len(medidas) >= k or raio >= raio_maximo_km:
+                return [self._resultado(i, d) for d, i in medidas[:k]]
+            raio = min(raio * 2, raio_maximo_km)
+
+    def fechar(self):
+        self.conn.close()
@@ -3,7 +3,13 @@ import re
 from datetime import datetime
 
 class LibrasLibrary:
-    def __init__(self):
+    def __init__(self, motor_partidas=None):
+        """
+        Args:
+            motor_partidas: MotorPartidas opcional; com ele, perguntas de
+                    horário são respondidas com as próximas partidas
+        """
+        self.motor_partidas = motor_partidas
         self.carregar_banco_libras()
         self.carregar_banco_transportes()
         
@@ -123,6 +129,9 @@ class LibrasLibrary:
         if self.contem_todas_linhas(pergunta):
             return self.gerar_resposta_todas_linhas()
         
+        elif self.contem_horario(pergunta) and self.motor_partidas:
+            return self.gerar_resposta_horario(pergunta)
+        
         elif self.contem_linha_especifica(pergunta):
             return self.gerar_resposta_linha_especifica(pergunta)
         
@@ -182,6 +191,21 @@ class LibrasLibrary:
     def gerar_resposta_horario(self, pergunta):
         """Gera resposta sobre horários"""
         hora_atual = datetime.now().strftime("%H:%M")
+        
+        if self.motor_partidas:
+            numeros = re.findall(r'\b([a-z]?\d{3})\b', pergunta.lower())
+            for numero in (n.upper() for n in numeros):
+                partidas = self.motor_partidas.proximas_partidas(numero, 3)
+                if partidas:
+                    horarios = ", ".join(
+                        f"{p['horario']} ({p['minutos']} min)" for p in partidas)
+                    return f"⏰ LINHA {numero}:\nAgora são {hora_atual}\nPróximas partidas: {horarios}"
+            
+            proximas = self.motor_partidas.proxima_partida_por_linha()[:5]
+            if proximas:
+                linhas_info = [f"• {p['numero']} às {p['horario']} ({p['minutos']} min)" for p in proximas]
+                return f"⏰ PRÓXIMAS PARTIDAS:\nAgora são {hora_atual}\n" + "\n".join(linhas_info)
+        
         return f"⏰ HORÁRIOS:\nAgora são {hora_atual}\nÔnibus operam das 5h às 23h\nFrequência: 15-40min\nPergunte por uma linha específica!"
     
     def gerar_resposta_tarifa(self):
@@ -3,7 +3,7 @@ import sys
 import os
 import webbrowser
 import time
-import threading
+import re
 
 # Adicionar nossos próprios módulos
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -27,6 +27,15 @@ except ImportError as e:
     class SinteseVoz:
         def falar(self, texto): 
             print(f"🔊 TTS: {texto}")
+        def avisar(self, texto):
+            print(f"🔊 TTS: {texto}")
+
+try:
+    from prefetch_tts import PrefetcherRespostas, SINAIS_PADRAO
+except ImportError as e:
+    print(f"❌ Módulo de prefetch de fala não carregado: {e}")
+    PrefetcherRespostas = None
+    SINAIS_PADRAO = []
 
 try:
     from database_module import BancoDadosOnibus
@@ -40,6 +49,28 @@ except ImportError as e:
         def obter_onibus_para_destino(self, dest): 
             return [["640", "Linha 640"], ["306", "Linha 306"]]
 
+try:
+    from database_module_enhanced import BancoDadosOnibusEnhanced
+    from horarios_partida import MotorPartidas
+    print("✅ Módulo horários de partida carregado")
+except ImportError as e:
+    print(f"❌ Módulo horários de partida não carregado: {e}")
+    MotorPartidas = None
+
+try:
+    from bus_database import BusDatabase
+    print("✅ Módulo registro de interações carregado")
+except ImportError as e:
+    print(f"❌ Módulo registro de interações não carregado: {e}")
+    # Criar fallback
+    class BusDatabase:
+        def __init__(self, *args, **kwargs):
+            pass
+        def log_interaction(self, *args):
+            pass
+        def close(self):
+            pass
+
 try:
     from avatar_libras import AvatarLibras
     print("✅ Módulo avatar carregado")
@@ -80,6 +111,12 @@ except ImportError as e:
         def obter_sinal_detectado(self): 
             return None
 
+CAMINHO_REGISTRO_INTERACOES = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'database', 'bus_system.db'
+)
+
+PALAVRAS_HORARIO = ["horário", "horario", "que horas", "quando passa", "que hora"]
+
 class PIAManaus:
     def __init__(self):
         pygame.init()
@@ -91,10 +128,35 @@ class PIAManaus:
         self.reconhecimento_voz = ReconhecimentoVoz()
         self.sintese_voz = SinteseVoz()
         self.banco_dados = BancoDadosOnibus()
+        self.motor_partidas = None
+        if MotorPartidas:
+            try:
+                self.motor_partidas = MotorPartidas(BancoDadosOnibusEnhanced())
+            except Exception as e:
+                print(f"❌ Horários de partida indisponíveis: {e}")
         self.avatar_libras = AvatarLibras()
         self.camera_libras = ReconhecimentoLibrasCamera()
         self.modulos_ativos = True
         
+        # Respostas prováveis sintetizadas enquanto o usuário ainda pergunta
+        self.prefetcher = None
+        if PrefetcherRespostas and hasattr(self.sintese_voz, 'preparar'):
+            self.prefetcher = PrefetcherRespostas(self.sintese_voz.preparar, self.sintese_voz.pronto)
+        
+        # MediaPipe carregado em segundo plano: a janela abre sem esperar por
+        # ele e a câmera já o encontra pronto
+        if hasattr(self.camera_libras, 'aquecer'):
+            self.camera_libras.aquecer()
+        
+        # Registro de interações gravado em lotes fora do loop principal
+        try:
+            self.registro_interacoes = BusDatabase(
+                CAMINHO_REGISTRO_INTERACOES, async_logging=True, flush_interval=2.0
+            )
+        except Exception as e:
+            print(f"❌ Registro de interações indisponível: {e}")
+            self.registro_interacoes = None
+        
         self.running = True
         self.mensagem_status = "PIA Manaus - Sistema Carregado! Clique em CÂMERA LIBRAS."
         self.cor_status = (255, 255, 0)
@@ -134,9 +196,20 @@ class PIAManaus:
             self.clock.tick(60)
         
         # Limpar recursos
-        if hasattr(self.camera_libras, 'esta_ativa') and self.camera_libras.esta_ativa():
+        if hasattr(self.camera_libras, 'encerrar'):
+            self.camera_libras.encerrar()
+        elif hasattr(self.camera_libras, 'esta_ativa') and self.camera_libras.esta_ativa():
             self.camera_libras.parar_camera()
         
+        if self.registro_interacoes:
+            self.registro_interacoes.close()
+        
+        if self.prefetcher:
+            self.prefetcher.encerrar()
+        
+        if hasattr(self.sintese_voz, 'encerrar'):
+            self.sintese_voz.encerrar()
+        
         pygame.quit()
         sys.exit()
     
@@ -283,10 +356,32 @@ class PIAManaus:
         if len(self.sinais_detectados) >= 2:
             pergunta = self.formar_pergunta_libras()
             self.processar_pergunta_libras(pergunta)
+            return
+        
+        # Preparar a fala das perguntas que o próximo gesto pode formar
+        self.antecipar_respostas()
     
-    def formar_pergunta_libras(self):
-        """Forma uma pergunta a partir dos sinais detectados"""
-        sinais = " ".join(self.sinais_detectados)
+    def antecipar_respostas(self):
+        """Envia ao prefetcher as respostas prováveis para a entrada atual"""
+        if not self.prefetcher:
+            return
+        
+        perguntas = []
+        if self.sinais_detectados:
+            base = self.sinais_detectados[-4:]
+            perguntas += [self.formar_pergunta_libras(base + [sinal])
+                          for sinal in SINAIS_PADRAO if sinal != base[-1]]
+        if self.ultima_pergunta:
+            # Perguntar por uma das linhas da resposta
+            perguntas += [f"ônibus {numero}" for numero in re.findall(r'\b\d{3}\b', self.resposta_atual)]
+        
+        # As respostas são geradas no pool do prefetcher, fora do loop da interface;
+        # a que acabou de ser falada não conta como antecipada
+        self.prefetcher.antecipar_perguntas(perguntas, self.gerar_resposta, descartar=[self.resposta_atual])
+    
+    def formar_pergunta_libras(self, sinais=None):
+        """Forma uma pergunta a partir dos sinais detectados (ou dos informados)"""
+        sinais = " ".join(self.sinais_detectados if sinais is None else sinais)
         
         # Mapear combinações de sinais para perguntas
         if "qual" in sinais and "onibus" in sinais and "terminal" in sinais:
@@ -324,11 +419,14 @@ class PIAManaus:
         
         resposta = self.gerar_resposta(pergunta)
         self.resposta_atual = resposta
+        self.registrar_interacao(pergunta, resposta, "libras")
         
         # Ativar avatar para responder em Libras
         self.mostrar_avatar = True
         self.avatar_libras.iniciar_sequencia(resposta)
         self.sintese_voz.falar(resposta)
+        if self.prefetcher:
+            self.prefetcher.registrar_escolha(resposta)
         
         self.mensagem_status = "💡 RESPOSTA EM LIBRAS!"
         self.cor_status = (0, 255, 0)
@@ -365,6 +463,7 @@ class PIAManaus:
                     self.cor_status = (0, 255, 0)
                     self.informacoes_extras = ""
                     self.mostrar_avatar = False
+                    self.antecipar_respostas()
                 else:
                     self.mensagem_status = "❌ Sistema de voz ocupado"
                     self.cor_status = (255, 100, 0)
@@ -387,11 +486,14 @@ class PIAManaus:
         
         resposta = self.gerar_resposta(pergunta)
         self.resposta_atual = resposta
+        self.registrar_interacao(pergunta, resposta, "voz")
         
         # Ativar avatar para resposta em Libras
         self.mostrar_avatar = True
         self.avatar_libras.iniciar_sequencia(resposta)
         self.sintese_voz.falar(resposta)
+        if self.prefetcher:
+            self.prefetcher.registrar_escolha(resposta)
         
         self.estado_voz = "parado"
         self.mensagem_status = "💡 RESPOSTA PRONTA!"
@@ -421,7 +523,7 @@ class PIAManaus:
             webbrowser.open("https://www.google.com/maps/place/Manaus,+AM/")
             self.mensagem_status = "🗺️ Google Maps aberto!"
             
-            threading.Thread(target=lambda: self.sintese_voz.falar("Google Maps aberto"), daemon=True).start()
+            self.sintese_voz.avisar("Google Maps aberto")
                 
             self.informacoes_extras = """
 📍 MAPA DE MANAUS ABERTO!
@@ -448,7 +550,7 @@ class PIAManaus:
         if self.camera_libras.esta_ativa():
             self.camera_libras.parar_camera()
         
-        threading.Thread(target=lambda: self.sintese_voz.falar("Modo Avatar Libras ativado"), daemon=True).start()
+        self.sintese_voz.avisar("Modo Avatar Libras ativado")
         
         if self.ultima_pergunta:
             self.avatar_libras.iniciar_sequencia(self.resposta_atual)
@@ -478,7 +580,7 @@ class PIAManaus:
         if self.camera_libras.esta_ativa():
             self.camera_libras.parar_camera()
         
-        threading.Thread(target=lambda: self.sintese_voz.falar("Sistema PIA Manaus com reconhecimento real de Libras por câmera"), daemon=True).start()
+        self.sintese_voz.avisar("Sistema PIA Manaus com reconhecimento real de Libras por câmera")
         
         self.informacoes_extras = """
 🔧 PIA MANAUS - RECONHECIMENTO REAL DE LIBRAS
@@ -504,10 +606,25 @@ class PIAManaus:
 • Interface universal inclusiva
 """
     
+    def registrar_interacao(self, pergunta, resposta, tipo):
+        """Enfileira a interação para gravação em segundo plano"""
+        if not self.registro_interacoes:
+            return
+        
+        sucesso = not resposta.startswith("Pergunte sobre linhas")
+        self.registro_interacoes.log_interaction(pergunta, resposta, tipo, sucesso)
+    
     def gerar_resposta(self, pergunta):
         """Gera resposta para perguntas"""
         pergunta = pergunta.lower()
         
+        # Perguntas de horário respondidas com as próximas partidas reais
+        motor = getattr(self, 'motor_partidas', None)
+        if motor and any(termo in pergunta for termo in PALAVRAS_HORARIO):
+            resposta = self.gerar_resposta_partidas(motor, pergunta)
+            if resposta:
+                return resposta
+        
         # Busca por números de ônibus
         for numero in ['640', '306', '120', '815', '611']:
             if numero in pergunta:
@@ -528,6 +645,23 @@ class PIAManaus:
         
         return "Pergunte sobre linhas de ônibus em Manaus. Exemplos: 'ônibus 640', 'para o terminal', 'linha aeroporto'."
     
+    @staticmethod
+    def gerar_resposta_partidas(motor, pergunta):
+        """Próximas partidas da linha citada, ou a próxima de cada linha"""
+        for numero in re.findall(r'\b([a-z]?\d{3})\b', pergunta):
+            partidas = motor.proximas_partidas(numero.upper(), 3)
+            if partidas:
+                horarios = [p['horario'] for p in partidas]
+                lista = horarios[0] if len(horarios) == 1 else \
+                    ", ".join(horarios[:-1]) + f" e {horarios[-1]}"
+                return f"Ônibus {numero.upper()}: próximas partidas às {lista}."
+        
+        proximas = motor.proxima_partida_por_linha()[:3]
+        if proximas:
+            lista = ", ".join(f"{p['numero']} às {p['horario']}" for p in proximas)
+            return f"Próximas partidas: {lista}."
+        return None
+    
     def criar_botoes(self):
         return {
             "voz": pygame.Rect(50, 200, 200, 50),
@@ -614,9 +748,10 @@ class PIAManaus:
         # Frame da câmera
         frame = self.camera_libras.frame_atual
         if frame:
-            # Redimensionar frame para caber na área
-            frame_redimensionado = pygame.transform.scale(frame, (480, 360))
-            self.screen.blit(frame_redimensionado, (310, 160))
+            # Frames da câmera real já chegam no tamanho da área
+            if frame.get_size() != (480, 360):
+                frame = pygame.transform.scale(frame, (480, 360))
+            self.screen.blit(frame, (310, 160))
         else:
             # Placeholder se não há frame
             pygame.draw.rect(self.screen, (50, 50, 100), (310, 160, 480, 360))
@@ -1,6 +1,19 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from google_maps_integration import GoogleMapsIntegration
+from database_module_enhanced import BancoDadosOnibusEnhanced
+from planejador_rotas import PlanejadorRotas, formatar_itinerario
+
 class PIAManausSistema:
     def __init__(self):
         print("🚀 PIA Manaus - Sistema Inicializado")
+        # Um banco para o planejador e para o índice de paradas próximas
+        self.banco = BancoDadosOnibusEnhanced()
+        self.mapas = GoogleMapsIntegration(self.banco if self.banco.conn else None)
+        self.planejador = None
     
     def executar_no_console(self):
         print("=" * 50)
@@ -43,16 +56,35 @@ class PIAManausSistema:
         print("\n🗺️ SISTEMA DE ROTAS:")
         origem = input("Digite a origem (ex: Terminal 1): ")
         destino = input("Digite o destino (ex: Centro): ")
+        acessivel = input("Somente ônibus acessíveis? (s/N): ").strip().lower() == "s"
         print(f"📍 Calculando rota de {origem} para {destino}...")
-        print("⏳ Integração com Google Maps em desenvolvimento!")
+        
+        try:
+            if self.planejador is None:
+                self.planejador = PlanejadorRotas(self.banco)
+            itinerario = self.planejador.planejar(origem, destino, somente_acessivel=acessivel)
+        except Exception as e:
+            print(f"❌ Erro ao calcular rota: {e}")
+            return
+        
+        if itinerario is None:
+            print("❌ Nenhuma rota encontrada nas próximas horas.")
+            return
+        
+        print(formatar_itinerario(itinerario))
     
     def mostrar_pontos_proximos(self):
         print("\n📍 PONTOS PRÓXIMOS:")
         localizacao = input("Digite sua localização (ex: Terminal 3): ")
         print(f"🔍 Buscando pontos de ônibus próximos a {localizacao}...")
-        print("• Terminal 3 - 0.2km")
-        print("• Parada Flores - 0.5km") 
-        print("• Terminal 2 - 1.2km")
+        
+        paradas = self.mapas.obter_paradas_proximas(localizacao, quantidade=3)
+        if not paradas:
+            print("❌ Localização não encontrada. Use o nome de uma parada ou 'latitude,longitude'.")
+            return
+        
+        for parada in paradas:
+            print(f"• {parada['nome']} - {parada['distancia_km']:.1f}km")
 
 if __name__ == "__main__":
     sistema = PIAManausSistema()
@@ -0,0 +1,362 @@
+"""
+Modelo treinável de gestos de Libras.
+
+Uma rede MLP pequena em NumPy puro sobre vetores de landmarks normalizados
+(posição relativa ao punho dividida pelo tamanho da palma, mais as
+características de classificador_gestos). Inclui o gravador de amostras, o
+treino offline e a serialização em .npz.
+
+Uso:
+    python src/modelo_gestos.py gravar --rotulo onibus --segundos 10
+    python src/modelo_gestos.py treinar data/gestos --saida data/models/modelo_gestos.npz
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from classificador_gestos import calcular_caracteristicas, BASE_MEDIO, PUNHO
+from gravador_landmarks import LeitorLandmarks
+
+
+DIRETORIO_DADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+CAMINHO_MODELO_PADRAO = os.path.join(DIRETORIO_DADOS, 'models', 'modelo_gestos.npz')
+DIRETORIO_DATASET_PADRAO = os.path.join(DIRETORIO_DADOS, 'gestos')
+
+
+def vetor_caracteristicas(maos):
+    """
+    Vetores de entrada do modelo para um lote de mãos.
+
+    Args:
+        maos: Array (N_maos, 21, 3) em pixels
+
+    Returns:
+        Array (N_maos, 63 + len(CARACTERISTICAS)) float32
+    """
+    maos = np.asarray(maos, dtype=np.float32)
+    if maos.shape[0] == 0:
+        return np.empty((0, 63 + calcular_caracteristicas(maos).shape[1]), dtype=np.float32)
+
+    palma = np.linalg.norm(maos[:, BASE_MEDIO, :2] - maos[:, PUNHO, :2], axis=1)
+    palma = np.maximum(palma, 1e-6)[:, None, None]
+    coordenadas = ((maos - maos[:, PUNHO:PUNHO + 1]) / palma).reshape(len(maos), -1)
+
+    extras = calcular_caracteristicas(maos)
+    extras[:, -5:] /= 180.0        # ângulos de flexão em [0, 1]
+    return np.concatenate([coordenadas, extras], axis=1)
+
+
+class GravadorDataset:
+    """
+    Acumula amostras rotuladas de landmarks e grava em .npz
+    (arrays 'landmarks' (M, 21, 3) e 'rotulos' (M,)).
+    """
+
+    def __init__(self):
+        self.landmarks = []
+        self.rotulos = []
+
+    def adicionar(self, rotulo, maos):
+        """Adiciona cada mão do lote (N_maos, 21, 3) como uma amostra"""
+        for mao in np.asarray(maos, dtype=np.float32).reshape(-1, 21, 3):
+            self.landmarks.append(mao.copy())
+            self.rotulos.append(rotulo)
+
+    def __len__(self):
+        return len(self.rotulos)
+
+    def contagem(self):
+        """Número de amostras por rótulo"""
+        return dict(Counter(self.rotulos))
+
+    def salvar(self, caminho):
+        """Grava as amostras; retorna o número de amostras gravadas"""
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        landmarks = (np.stack(self.landmarks) if self.landmarks
+                     else np.empty((0, 21, 3), dtype=np.float32))
+        np.savez_compressed(caminho, landmarks=landmarks, rotulos=np.array(self.rotulos, dtype=str))
+        return len(self)
+
+    @staticmethod
+    def carregar(caminhos):
+        """
+        Lê um ou mais arquivos .npz ou .lmk (ou diretórios com eles).
+
+        Das gravações .lmk (gravador_landmarks.py) entram só as mãos com
+        rótulo do operador.
+
+        Returns:
+            Tupla (landmarks (M, 21, 3), rotulos (M,))
+        """
+        if isinstance(caminhos, str):
+            caminhos = [caminhos]
+
+        arquivos = []
+        for caminho in caminhos:
+            if os.path.isdir(caminho):
+                arquivos.extend(sorted(glob.glob(os.path.join(caminho, '*.npz')) +
+                                       glob.glob(os.path.join(caminho, '*.lmk'))))
+            else:
+                arquivos.append(caminho)
+
+        landmarks, rotulos = [], []
+        for arquivo in arquivos:
+            if arquivo.endswith('.lmk'):
+                maos, nomes = LeitorLandmarks(arquivo).amostras_rotuladas()
+                landmarks.append(maos)
+                rotulos.append(nomes)
+                continue
+            with np.load(arquivo) as dados:
+                landmarks.append(dados['landmarks'].astype(np.float32))
+                rotulos.append(dados['rotulos'].astype(str))
+
+        if not landmarks:
+            return np.empty((0, 21, 3), dtype=np.float32), np.array([], dtype=str)
+        return np.concatenate(landmarks), np.concatenate(rotulos)
+
+
+class ModeloGestos:
+    """
+    Classificador MLP (ReLU + softmax) treinado com Adam.
+    """
+
+    def __init__(self, classes, camadas_ocultas=(64,), semente=0):
+        """
+        Args:
+            classes: Nomes dos gestos
+            camadas_ocultas: Número de neurônios de cada camada oculta
+            semente: Semente da inicialização dos pesos
+        """
+        self.classes = list(classes)
+        self.camadas_ocultas = tuple(camadas_ocultas)
+        self.entradas = vetor_caracteristicas(np.zeros((1, 21, 3))).shape[1]
+        self.media = np.zeros(self.entradas, dtype=np.float32)
+        self.desvio = np.ones(self.entradas, dtype=np.float32)
+
+        gerador = np.random.default_rng(semente)
+        tamanhos = (self.entradas, *self.camadas_ocultas, len(self.classes))
+        self.pesos = [
+            (gerador.standard_normal((a, b)) * np.sqrt(2.0 / a)).astype(np.float32)
+            for a, b in zip(tamanhos, tamanhos[1:])
+        ]
+        self.vieses = [np.zeros(b, dtype=np.float32) for b in tamanhos[1:]]
+
+    def _propagar(self, x):
+        """Ativações de todas as camadas (a última são os logits)"""
+        ativacoes = [x]
+        for i, (pesos, vies) in enumerate(zip(self.pesos, self.vieses)):
+            z = ativacoes[-1] @ pesos + vies
+            ativacoes.append(z if i == len(self.pesos) - 1 else np.maximum(z, 0))
+        return ativacoes
+
+    @staticmethod
+    def _softmax(logits):
+        logits = logits - logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def _normalizar(self, maos):
+        return (vetor_caracteristicas(maos) - self.media) / self.desvio
+
+    def treinar(self, landmarks, rotulos, epocas=200, taxa=0.01, tamanho_lote=64,
+                regularizacao=1e-4, validacao=0.2, semente=0, verbose=False):
+        """
+        Treina o modelo.
+
+        Args:
+            landmarks: Array (M, 21, 3) de mãos
+            rotulos: Nome do gesto de cada mão
+            validacao: Fração das amostras separada para validação
+
+        Returns:
+            Dicionário com perda final e acurácias de treino e validação
+        """
+        indice_classe = {classe: i for i, classe in enumerate(self.classes)}
+        y = np.array([indice_classe[r] for r in rotulos])
+        x = vetor_caracteristicas(landmarks)
+
+        gerador = np.random.default_rng(semente)
+        ordem = gerador.permutation(len(x))
+        n_validacao = int(len(x) * validacao)
+        validar, treinar = ordem[:n_validacao], ordem[n_validacao:]
+
+        self.media = x[treinar].mean(axis=0)
+        self.desvio = np.maximum(x[treinar].std(axis=0), 1e-6)
+        x = ((x - self.media) / self.desvio).astype(np.float32)
+
+        parametros = self.pesos + self.vieses
+        momento = [np.zeros_like(p) for p in parametros]
+        velocidade = [np.zeros_like(p) for p in parametros]
+        beta1, beta2, passo = 0.9, 0.999, 0
+
+        perda = 0.0
+        for epoca in range(epocas):
+            gerador.shuffle(treinar)
+            perdas = []
+            for inicio in range(0, len(treinar), tamanho_lote):
+                lote = treinar[inicio:inicio + tamanho_lote]
+                ativacoes = self._propagar(x[lote])
+                probabilidades = self._softmax(ativacoes[-1])
+                perdas.append(-np.log(probabilidades[np.arange(len(lote)), y[lote]] + 1e-9).mean())
+
+                # Retropropagação da entropia cruzada
+                delta = probabilidades
+                delta[np.arange(len(lote)), y[lote]] -= 1
+                delta /= len(lote)
+                gradientes_pesos, gradientes_vieses = [], []
+                for camada in range(len(self.pesos) - 1, -1, -1):
+                    gradientes_pesos.insert(
+                        0, ativacoes[camada].T @ delta + regularizacao * self.pesos[camada])
+                    gradientes_vieses.insert(0, delta.sum(axis=0))
+                    if camada:
+                        delta = (delta @ self.pesos[camada].T) * (ativacoes[camada] > 0)
+
+                passo += 1
+                for i, gradiente in enumerate(gradientes_pesos + gradientes_vieses):
+                    momento[i] = beta1 * momento[i] + (1 - beta1) * gradiente
+                    velocidade[i] = beta2 * velocidade[i] + (1 - beta2) * gradiente ** 2
+                    corrigido = momento[i] / (1 - beta1 ** passo)
+                    escala = np.sqrt(velocidade[i] / (1 - beta2 ** passo)) + 1e-8
+                    parametros[i] -= (taxa * corrigido / escala).astype(np.float32)
+
+            perda = float(np.mean(perdas))
+            if verbose and (epoca + 1) % max(1, epocas // 10) == 0:
+                print(f"  época {epoca + 1}/{epocas} - perda {perda:.4f}")
+
+        def acuracia(indices):
+            if len(indices) == 0:
+                return None
+            previstos = self._propagar(x[indices])[-1].argmax(axis=1)
+            return float((previstos == y[indices]).mean())
+
+        return {
+            'perda': perda,
+            'acuracia_treino': acuracia(treinar),
+            'acuracia_validacao': acuracia(validar),
+        }
+
+    def prever_probabilidades(self, maos):
+        """Probabilidades (N_maos, N_classes) para um lote de mãos"""
+        maos = np.asarray(maos, dtype=np.float32)
+        if maos.shape[0] == 0:
+            return np.empty((0, len(self.classes)), dtype=np.float32)
+        return self._softmax(self._propagar(self._normalizar(maos))[-1])
+
+    def prever(self, maos, confianca_minima=0.6):
+        """Gesto de cada mão, ou None quando a confiança é baixa"""
+        probabilidades = self.prever_probabilidades(maos)
+        melhores = probabilidades.argmax(axis=1)
+        return [
+            self.classes[c] if probabilidades[i, c] >= confianca_minima else None
+            for i, c in enumerate(melhores)
+        ]
+
+    def salvar(self, caminho):
+        """Grava pesos, normalização e classes em .npz"""
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        arrays = {f'peso_{i}': p for i, p in enumerate(self.pesos)}
+        arrays.update({f'vies_{i}': v for i, v in enumerate(self.vieses)})
+        np.savez(caminho, classes=np.array(self.classes, dtype=str),
+                 camadas_ocultas=np.array(self.camadas_ocultas, dtype=np.int64),
+                 media=self.media, desvio=self.desvio, **arrays)
+
+    @classmethod
+    def carregar(cls, caminho):
+        """Lê um modelo gravado por salvar"""
+        with np.load(caminho) as dados:
+            modelo = cls(dados['classes'].astype(str), tuple(int(n) for n in dados['camadas_ocultas']))
+            camadas = len(modelo.pesos)
+            modelo.pesos = [dados[f'peso_{i}'].astype(np.float32) for i in range(camadas)]
+            modelo.vieses = [dados[f'vies_{i}'].astype(np.float32) for i in range(camadas)]
+            modelo.media = dados['media'].astype(np.float32)
+            modelo.desvio = dados['desvio'].astype(np.float32)
+        return modelo
+
+
+def comando_gravar(args):
+    """Grava amostras de um gesto a partir da câmera"""
+    from camera_libras import ReconhecimentoLibras
+
+    camera = ReconhecimentoLibras(caminho_modelo=None)
+    if not camera.iniciar_camera() or camera.cap is None:
+        print("❌ É preciso uma câmera real para gravar amostras")
+        return 1
+
+    print(f"👐 Faça o gesto '{args.rotulo}' por {args.segundos} segundos...")
+    camera.iniciar_gravacao(args.rotulo)
+    time.sleep(args.segundos)
+    caminho = camera.parar_gravacao(args.diretorio)
+    camera.parar_camera()
+
+    if caminho is None:
+        print("❌ Nenhuma mão detectada")
+        return 1
+    print(f"✅ Amostras gravadas em {caminho}")
+    return 0
+
+
+def comando_treinar(args):
+    """Treina e grava um modelo a partir dos arquivos de amostras"""
+    landmarks, rotulos = GravadorDataset.carregar(args.dados)
+    if len(rotulos) == 0:
+        print("❌ Nenhuma amostra encontrada")
+        return 1
+
+    contagem = Counter(rotulos)
+    print(f"📚 {len(rotulos)} amostras em {len(contagem)} gestos:")
+    for rotulo, quantidade in sorted(contagem.items()):
+        print(f"  • {rotulo}: {quantidade}")
+
+    modelo = ModeloGestos(sorted(contagem), camadas_ocultas=args.ocultas, semente=args.semente)
+    resultado = modelo.treinar(landmarks, rotulos, epocas=args.epocas, taxa=args.taxa,
+                               validacao=args.validacao, semente=args.semente, verbose=True)
+    print(f"🎯 Acurácia treino: {resultado['acuracia_treino']:.1%}")
+    if resultado['acuracia_validacao'] is not None:
+        print(f"🎯 Acurácia validação: {resultado['acuracia_validacao']:.1%}")
+
+    lote = landmarks[:256]
+    inicio = time.perf_counter()
+    for _ in range(20):
+        modelo.prever(lote)
+    por_mao = (time.perf_counter() - inicio) / (20 * len(lote))
+    print(f"⚡ Inferência: {por_mao * 1e6:.1f} µs por mão")
+
+    modelo.salvar(args.saida)
+    print(f"✅ Modelo gravado em {args.saida}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Modelo treinável de gestos de Libras")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    gravar = subcomandos.add_parser('gravar', help="grava amostras de um gesto pela câmera")
+    gravar.add_argument('--rotulo', required=True, help="nome do gesto")
+    gravar.add_argument('--segundos', type=float, default=10.0)
+    gravar.add_argument('--diretorio', default=DIRETORIO_DATASET_PADRAO)
+    gravar.set_defaults(funcao=comando_gravar)
+
+    treinar = subcomandos.add_parser('treinar', help="treina o modelo com amostras gravadas")
+    treinar.add_argument('dados', nargs='*', default=[DIRETORIO_DATASET_PADRAO],
+                         help="arquivos .npz/.lmk ou diretórios de amostras")
+    treinar.add_argument('--saida', default=CAMINHO_MODELO_PADRAO)
+    treinar.add_argument('--ocultas', type=int, nargs='+', default=[64])
+    treinar.add_argument('--epocas', type=int, default=200)
+    treinar.add_argument('--taxa', type=float, default=0.01)
+    treinar.add_argument('--validacao', type=float, default=0.2)
+    treinar.add_argument('--semente', type=int, default=0)
+    treinar.set_defaults(funcao=comando_treinar)
+
+    args = parser.parse_args()
+    return args.funcao(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Ciclo de vida do modelo MediaPipe Hands.
+
+Importar o MediaPipe e montar o grafo do Hands leva segundos, e nada disso
+é necessário até alguém abrir a câmera. O gerenciador cria o modelo sob
+demanda, ou em segundo plano com aquecer() logo depois da interface abrir,
+conta quem o está usando e o mantém vivo entre um liga-desliga e outro da
+câmera: reabrir a câmera não recria nada. Só encerrar() fecha o grafo.
+
+O grafo guarda estado de rastreamento entre quadros; cada processo deve
+ter uma única câmera usando o mesmo gerenciador de cada vez. Os recortes em
+volta da mão (agendador_inferencia) não servem para esse rastreamento e vão
+para um segundo modelo, em modo imagem: gerenciador_padrao(recortes=True).
+"""
+import threading
+
+import numpy as np
+
+
+OPCOES_PADRAO = {
+    'static_image_mode': False,
+    'max_num_hands': 2,
+    'min_detection_confidence': 0.7,
+    'min_tracking_confidence': 0.5,
+}
+
+
+def criar_modelo_maos(**opcoes):
+    """Fábrica padrão: mp.solutions.hands.Hands com as opções do quiosque"""
+    import mediapipe as mp
+
+    return mp.solutions.hands.Hands(**dict(OPCOES_PADRAO, **opcoes))
+
+
+def criar_modelo_recortes(**opcoes):
+    """Modelo em modo imagem, sem rastreamento, para os recortes da mão"""
+    return criar_modelo_maos(**dict({'static_image_mode': True}, **opcoes))
+
+
+class GerenciadorModeloMaos:
+    """
+    Modelo de mãos criado uma vez, compartilhado e com contagem de referências.
+    """
+
+    def __init__(self, fabrica=criar_modelo_maos, tamanho_aquecimento=(480, 640)):
+        """
+        Args:
+            fabrica: Função sem argumentos que cria o modelo (com process e
+                     close); padrão criar_modelo_maos
+            tamanho_aquecimento: (altura, largura) da imagem usada para a
+                     primeira inferência, que inicializa o grafo
+        """
+        self.fabrica = fabrica
+        self.tamanho_aquecimento = tamanho_aquecimento
+        self.referencias = 0
+        self.erro = None
+        self._modelo = None
+        self._thread_aquecimento = None
+        self._lock = threading.Lock()           # contagem e thread de aquecimento
+        self._lock_carga = threading.Lock()     # criação e fechamento do modelo
+
+    @property
+    def carregado(self):
+        return self._modelo is not None
+
+    def _carregar(self):
+        """Cria e aquece o modelo se ainda não existir (com _lock_carga)"""
+        if self._modelo is None:
+            modelo = self.fabrica()
+            modelo.process(np.zeros((*self.tamanho_aquecimento, 3), dtype=np.uint8))
+            self._modelo = modelo
+            self.erro = None
+        return self._modelo
+
+    def aquecer(self):
+        """
+        Carrega o modelo numa thread em segundo plano, sem bloquear.
+
+        Returns:
+            A thread de aquecimento (None se o modelo já estava carregado)
+        """
+        with self._lock:
+            if self._modelo is not None:
+                return None
+            if self._thread_aquecimento is None or not self._thread_aquecimento.is_alive():
+                self._thread_aquecimento = threading.Thread(
+                    target=self._aquecer, name="maos-aquecimento", daemon=True)
+                self._thread_aquecimento.start()
+            return self._thread_aquecimento
+
+    def _aquecer(self):
+        try:
+            with self._lock_carga:
+                self._carregar()
+            print("✅ Modelo de mãos carregado em segundo plano")
+        except Exception as e:
+            self.erro = e
+            print(f"❌ Erro ao carregar o modelo de mãos: {e}")
+
+    def adquirir(self):
+        """
+        Modelo pronto para uso; espera o aquecimento em andamento ou carrega
+        na hora. Cada adquirir() deve ter um liberar().
+
+        Raises:
+            Exception: Se o modelo não puder ser criado (ex.: sem MediaPipe)
+        """
+        with self._lock_carga:
+            modelo = self._carregar()
+            with self._lock:
+                self.referencias += 1
+            return modelo
+
+    def liberar(self):
+        """Devolve uma referência; o modelo continua carregado"""
+        with self._lock:
+            self.referencias = max(0, self.referencias - 1)
+
+    def encerrar(self):
+        """
+        Fecha o modelo se ninguém o estiver usando.
+
+        Returns:
+            True se o modelo foi fechado (ou não estava carregado)
+        """
+        with self._lock_carga:
+            with self._lock:
+                if self.referencias:
+                    return False
+            if self._modelo is not None:
+                self._modelo.close()
+                self._modelo = None
+            return True
+
+
+_gerenciadores_padrao = {}
+_lock_padrao = threading.Lock()
+
+
+def gerenciador_padrao(recortes=False):
+    """
+    Gerenciador compartilhado pelas câmeras do processo.
+
+    Args:
+        recortes: Se True, o do modelo em modo imagem usado nos recortes
+    """
+    with _lock_padrao:
+        if recortes not in _gerenciadores_padrao:
+            fabrica = criar_modelo_recortes if recortes else criar_modelo_maos
+            _gerenciadores_padrao[recortes] = GerenciadorModeloMaos(fabrica)
+        return _gerenciadores_padrao[recortes]
@@ -0,0 +1,445 @@
+"""
+Motores de síntese de voz do PIA Manaus e reprodução em fluxo.
+
+Todo motor entrega PCM int16 mono em blocos (sintetizar_fluxo). O
+ReprodutorFluxo enfileira cada bloco num canal reservado do pygame.mixer,
+e a fala começa assim que o primeiro bloco fica pronto. Motores:
+
+- MotorEspeak: espeak-ng (ou espeak) em subprocesso, offline. O WAV sai
+  pelo stdout enquanto é sintetizado e é lido em blocos.
+- MotorGTTS: gTTS, online, passando pelo cache de áudio. O MP3 chega
+  inteiro e vira um único bloco.
+
+O Locutor junta a biblioteca de clipes e os motores em ordem de
+preferência: se um motor falha antes do primeiro som (sem rede, sem
+executável), tenta o próximo. SinteseVoz e TextToSpeech falam por ele.
+Falas preparadas de antemão (preparar, usado pelo prefetch_tts) ficam em
+memória, já em PCM, e tocam sem síntese.
+"""
+import io
+import importlib.util
+import itertools
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from biblioteca_clipes import BibliotecaClipes, decodificar_mp3, para_mixer, TAXA_PADRAO
+from cache_consultas import CacheLRU, AUSENTE
+
+try:
+    from config import TEXT_TO_SPEECH
+except ImportError:
+    TEXT_TO_SPEECH = {
+        'slow': False,
+        'engines': ['espeak', 'gtts'],
+        'espeak_voice': 'pt-br',
+        'espeak_speed': 160,
+        'cache_dir': None,
+        'clips_dir': None,
+    }
+
+
+DURACAO_BLOCO = 0.25         # segundos de áudio por bloco lido do motor
+
+
+class MotorTTS(ABC):
+    """
+    Interface dos motores: nome, taxa e sintetizar_fluxo.
+    """
+
+    nome = 'motor'
+
+    def __init__(self, taxa=TAXA_PADRAO):
+        self.taxa = taxa
+
+    def disponivel(self):
+        return True
+
+    @abstractmethod
+    def sintetizar_fluxo(self, texto):
+        """Gera blocos PCM int16 mono na taxa self.taxa (implementado pelos motores)"""
+
+    def sintetizar(self, texto):
+        """Áudio inteiro, PCM int16 mono"""
+        blocos = list(self.sintetizar_fluxo(texto))
+        return np.concatenate(blocos) if blocos else np.empty(0, dtype=np.int16)
+
+
+def ler_cabecalho_wav(arquivo):
+    """
+    Lê o cabeçalho de um WAV em fluxo até o início dos dados.
+
+    Returns:
+        (taxa, canais, bits)
+    """
+    riff = arquivo.read(12)
+    if len(riff) < 12 or riff[:4] != b'RIFF' or riff[8:12] != b'WAVE':
+        raise ValueError("saída do motor não é WAV")
+    formato = None
+    while True:
+        cabecalho = arquivo.read(8)
+        if len(cabecalho) < 8:
+            raise ValueError("WAV sem bloco de dados")
+        nome, tamanho = struct.unpack('<4sI', cabecalho)
+        if nome == b'data':
+            break
+        conteudo = arquivo.read(tamanho + (tamanho & 1))
+        if nome == b'fmt ':
+            _, canais, taxa, _, _, bits = struct.unpack('<HHIIHH', conteudo[:16])
+            formato = (taxa, canais, bits)
+    if formato is None or formato[2] != 16:
+        raise ValueError("WAV sem formato PCM de 16 bits")
+    return formato
+
+
+class MotorEspeak(MotorTTS):
+    """
+    espeak-ng em subprocesso: offline e em fluxo.
+    """
+
+    nome = 'espeak'
+
+    def __init__(self, voz='pt-br', velocidade=160, comando=None):
+        """
+        Args:
+            voz: Voz do espeak (-v)
+            velocidade: Palavras por minuto (-s)
+            comando: Lista com o executável (padrão: espeak-ng ou espeak no PATH)
+        """
+        super().__init__()
+        self.voz = voz
+        self.velocidade = velocidade
+        executavel = shutil.which('espeak-ng') or shutil.which('espeak')
+        self.comando = comando or ([executavel] if executavel else None)
+
+    def disponivel(self):
+        return self.comando is not None
+
+    def sintetizar_fluxo(self, texto):
+        if not self.comando:
+            raise RuntimeError("espeak-ng não encontrado")
+        processo = subprocess.Popen(
+            self.comando + ['-v', self.voz, '-s', str(self.velocidade), '--stdout'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        # Texto pela entrada padrão: nunca é lido como opção de linha de comando.
+        # Escrito por outra thread: o espeak fala enquanto lê, e com texto longo
+        # os dois pipes encheriam ao mesmo tempo se a escrita bloqueasse a leitura
+        escritor = threading.Thread(target=self._escrever_entrada,
+                                    args=(processo.stdin, texto.encode('utf-8')), daemon=True)
+        escritor.start()
+        try:
+            taxa, canais, _ = ler_cabecalho_wav(processo.stdout)
+            self.taxa = taxa
+            tamanho_bloco = int(DURACAO_BLOCO * taxa) * 2 * canais
+            resto = b''
+            while True:
+                dados = processo.stdout.read1(tamanho_bloco)
+                if not dados:
+                    break
+                dados = resto + dados
+                util = len(dados) - len(dados) % (2 * canais)
+                resto = dados[util:]
+                if util:
+                    pcm = np.frombuffer(dados[:util], dtype=np.int16)
+                    if canais > 1:
+                        pcm = pcm.reshape(-1, canais).mean(axis=1).astype(np.int16)
+                    yield pcm
+        finally:
+            processo.stdout.close()
+            if processo.poll() is None:
+                processo.kill()
+            processo.wait()
+            escritor.join()
+
+    @staticmethod
+    def _escrever_entrada(entrada, dados):
+        try:
+            entrada.write(dados)
+            entrada.close()
+        except OSError:
+            pass                    # processo encerrado antes de ler tudo
+
+
+def mp3_gtts(texto, idioma='pt-br', lento=False):
+    """MP3 do gTTS (importado só quando usado)"""
+    from gtts import gTTS
+
+    buffer = io.BytesIO()
+    gTTS(text=texto, lang=idioma, slow=lento).write_to_fp(buffer)
+    return buffer.getvalue()
+
+
+class MotorGTTS(MotorTTS):
+    """
+    gTTS pela internet, com o MP3 guardado no cache de áudio.
+    """
+
+    nome = 'gtts'
+
+    def __init__(self, idioma='pt-br', lento=False, cache=None, taxa=TAXA_PADRAO):
+        super().__init__(taxa)
+        self.idioma = idioma
+        self.lento = lento
+        self.cache = cache
+
+    def disponivel(self):
+        return importlib.util.find_spec('gtts') is not None
+
+    def mp3(self, texto):
+        if self.cache is None:
+            return mp3_gtts(texto, self.idioma, self.lento)
+        with self.cache.usando(texto, mp3_gtts, self.idioma, self.lento) as caminho:
+            with open(caminho, 'rb') as arquivo:
+                return arquivo.read()
+
+    def sintetizar_fluxo(self, texto):
+        yield decodificar_mp3(self.mp3(texto), self.taxa)
+
+
+class ReprodutorFluxo:
+    """
+    Toca blocos PCM em sequência num canal reservado do pygame.mixer.
+    """
+
+    def __init__(self, canal=None, criar_som=None):
+        """
+        Args:
+            canal: Canal do mixer (padrão: canal 0, reservado para a fala)
+            criar_som: Função (pcm, taxa) -> som com play (para testes)
+        """
+        self._canal = canal
+        self._criar_som = criar_som
+
+    @property
+    def canal(self):
+        if self._canal is None:
+            import pygame
+
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            pygame.mixer.set_reserved(1)
+            self._canal = pygame.mixer.Channel(0)
+        return self._canal
+
+    def _som(self, pcm, taxa):
+        if self._criar_som is not None:
+            return self._criar_som(pcm, taxa)
+        import pygame
+
+        return pygame.mixer.Sound(buffer=para_mixer(pcm, taxa))
+
+    def tocar(self, blocos, taxa, parar=None, espera=0.005):
+        """
+        Toca os blocos, enfileirando cada um assim que o anterior começa.
+
+        Args:
+            blocos: Iterável de PCM int16 mono (pode ser um gerador)
+            parar: threading.Event que interrompe a fala
+
+        Returns:
+            True se tocou até o fim, False se foi interrompido
+        """
+        canal = self.canal
+        for pcm in blocos:
+            if len(pcm) == 0:
+                continue
+            som = self._som(pcm, taxa)
+            if not canal.get_busy():
+                canal.play(som)
+                continue
+            # O mixer guarda um único som na fila: espera a vaga
+            while canal.get_queue() is not None:
+                if self._esperar(parar, espera):
+                    canal.stop()
+                    return False
+            canal.queue(som)
+
+        while canal.get_busy():
+            if self._esperar(parar, espera * 4):
+                canal.stop()
+                return False
+        return True
+
+    @staticmethod
+    def _esperar(parar, segundos):
+        """Dorme um pouco; True se a fala foi interrompida"""
+        if parar is None:
+            time.sleep(segundos)
+            return False
+        return parar.wait(segundos)
+
+    def parar(self):
+        if self._canal is not None:
+            self._canal.stop()
+
+
+def criar_motores(nomes=None, cache=None):
+    """Motores na ordem de TEXT_TO_SPEECH['engines'] (os indisponíveis ficam de fora)"""
+    disponiveis = {
+        'espeak': lambda: MotorEspeak(TEXT_TO_SPEECH.get('espeak_voice', 'pt-br'),
+                                      TEXT_TO_SPEECH.get('espeak_speed', 160)),
+        'gtts': lambda: MotorGTTS(lento=TEXT_TO_SPEECH.get('slow', False), cache=cache),
+    }
+    motores = []
+    for nome in nomes or TEXT_TO_SPEECH.get('engines', ['espeak', 'gtts']):
+        if nome not in disponiveis:
+            print(f"⚠️ Motor de voz desconhecido: {nome}")
+            continue
+        motor = disponiveis[nome]()
+        if motor.disponivel():
+            motores.append(motor)
+    return motores
+
+
+class Locutor:
+    """
+    Fala um texto com a biblioteca de clipes ou o primeiro motor que funcionar.
+    """
+
+    def __init__(self, motores=None, biblioteca=None, reprodutor=None, capacidade_preparadas=32):
+        self.motores = motores if motores is not None else []
+        self.biblioteca = biblioteca
+        self.reprodutor = reprodutor or ReprodutorFluxo()
+        self.preparadas = CacheLRU(capacidade_preparadas, ttl=600.0)
+        self._preparando = {}               # texto -> Event da síntese em andamento
+        self._lock = threading.Lock()
+
+    def pronto(self, texto):
+        """True se o texto toca sem síntese (clipes ou preparado)"""
+        texto = ' '.join(texto.split())
+        if self.biblioteca is not None and not self.biblioteca.faltantes(texto):
+            return True
+        return texto in self.preparadas
+
+    def preparar(self, texto):
+        """
+        Sintetiza o texto agora, com o mesmo motor que falar usaria, e guarda
+        o áudio para a fala instantânea depois.
+
+        Returns:
+            True se o texto ficou pronto
+        """
+        texto = ' '.join(texto.split())
+        if self.pronto(texto):
+            return True
+        with self._lock:
+            if texto in self._preparando:
+                return False
+            evento = self._preparando[texto] = threading.Event()
+        try:
+            for motor in self.motores:
+                try:
+                    pcm = motor.sintetizar(texto)
+                except Exception as e:
+                    print(f"⚠️ Motor de voz {motor.nome} falhou ao preparar: {e}")
+                    continue
+                if len(pcm):
+                    self.preparadas.guardar(texto, (motor.nome, motor.taxa, pcm))
+                    return True
+            return False
+        finally:
+            with self._lock:
+                del self._preparando[texto]
+            evento.set()
+
+    def falar(self, texto, parar=None, espera_preparo=5.0):
+        """
+        Fala o texto e só retorna quando terminar (ou for interrompido).
+
+        Args:
+            parar: threading.Event que interrompe a fala
+            espera_preparo: Segundos máximos esperando um preparar() do
+                    mesmo texto que já esteja em andamento
+
+        Returns:
+            Nome do que falou ('clipes' ou o nome do motor), ou None
+        """
+        if self.biblioteca is not None:
+            pcm = self.biblioteca.montar(texto)
+            if pcm is not None:
+                self.reprodutor.tocar([pcm], self.biblioteca.taxa, parar)
+                return 'clipes'
+
+        # Preparação em andamento: esperar sai mais cedo que sintetizar de novo
+        chave = ' '.join(texto.split())
+        with self._lock:
+            evento = self._preparando.get(chave)
+        if evento is not None:
+            evento.wait(espera_preparo)
+        preparada = self.preparadas.obter(chave)
+        if preparada is not AUSENTE:
+            nome, taxa, pcm = preparada
+            self.reprodutor.tocar([pcm], taxa, parar)
+            return nome
+
+        for motor in self.motores:
+            try:
+                fluxo = motor.sintetizar_fluxo(texto)
+                # Falhas de rede ou de executável aparecem antes do primeiro bloco
+                primeiro = next(fluxo, None)
+            except Exception as e:
+                print(f"⚠️ Motor de voz {motor.nome} falhou: {e}")
+                continue
+            if primeiro is None:
+                continue
+            self.reprodutor.tocar(itertools.chain([primeiro], fluxo), motor.taxa, parar)
+            return motor.nome
+        return None
+
+    def interromper(self):
+        self.reprodutor.parar()
+
+
+_cache_padrao = AUSENTE
+_cache_lock = threading.Lock()
+
+
+def cache_padrao():
+    """
+    O CacheAudio de TEXT_TO_SPEECH['cache_dir'], um só por processo.
+
+    SinteseVoz e TextToSpeech criam cada um seu Locutor: com dois CacheAudio
+    na mesma pasta, cada índice contaria só os próprios arquivos e um
+    apagaria os áudios que o outro ainda usa.
+
+    Returns:
+        CacheAudio, ou None se o cache estiver desativado
+    """
+    global _cache_padrao
+    with _cache_lock:
+        if _cache_padrao is AUSENTE:
+            _cache_padrao = None
+            if TEXT_TO_SPEECH.get('cache_dir'):
+                try:
+                    from cache_tts import CacheAudio
+
+                    _cache_padrao = CacheAudio(TEXT_TO_SPEECH['cache_dir'],
+                                               TEXT_TO_SPEECH.get('cache_max_mb', 50) * 1024 * 1024)
+                except OSError as e:
+                    print(f"⚠️ Cache de áudio desativado: {e}")
+        return _cache_padrao
+
+
+def criar_locutor():
+    """Locutor configurado por TEXT_TO_SPEECH: cache, clipes e motores"""
+    cache = cache_padrao()
+
+    # Clipes gravados em velocidade normal
+    biblioteca = None
+    if TEXT_TO_SPEECH.get('clips_dir') and not TEXT_TO_SPEECH.get('slow', False):
+        biblioteca = BibliotecaClipes.carregar(TEXT_TO_SPEECH['clips_dir'])
+
+    motores = criar_motores(cache=cache)
+    if not motores and biblioteca is None:
+        print("⚠️ Nenhum motor de voz disponível (instale espeak-ng ou gTTS)")
+    return Locutor(motores, biblioteca)
@@ -0,0 +1,106 @@
+"""
+Estruturas de passagem de dados entre as threads do pipeline da câmera.
+"""
+import threading
+from collections import deque
+
+
+class FilaDescarte:
+    """
+    Fila limitada que nunca bloqueia quem produz: cheia, descarta o item
+    mais antigo. Serve para passar frames entre threads sem acumular atraso.
+    """
+
+    def __init__(self, capacidade=2):
+        self.capacidade = capacidade
+        self.descartados = 0
+        self._itens = deque()
+        self._condicao = threading.Condition()
+
+    def colocar(self, item):
+        """Enfileira o item; retorna False se outro precisou ser descartado"""
+        with self._condicao:
+            descartou = False
+            while len(self._itens) >= self.capacidade:
+                self._itens.popleft()
+                self.descartados += 1
+                descartou = True
+            self._itens.append(item)
+            self._condicao.notify()
+            return not descartou
+
+    def obter(self, timeout=None):
+        """
+        Retira o item mais antigo, esperando até timeout segundos
+        (0 = não espera). Retorna None se a fila continuar vazia.
+        """
+        with self._condicao:
+            if not self._itens and timeout != 0:
+                self._condicao.wait_for(lambda: self._itens, timeout)
+            if not self._itens:
+                return None
+            return self._itens.popleft()
+
+    def obter_mais_recente(self):
+        """Retira o item mais novo e descarta os demais, sem bloquear"""
+        with self._condicao:
+            if not self._itens:
+                return None
+            item = self._itens.pop()
+            self.descartados += len(self._itens)
+            self._itens.clear()
+            return item
+
+    def limpar(self):
+        with self._condicao:
+            self._itens.clear()
+
+    def __len__(self):
+        return len(self._itens)
+
+
+class BufferTriplo:
+    """
+    Três buffers reutilizados entre produtor e interface: um sendo escrito,
+    um publicado aguardando a interface e um em exibição. O produtor nunca
+    escreve no buffer que a interface está mostrando, então nada precisa ser
+    copiado ou alocado por frame.
+    """
+
+    def __init__(self, fabrica):
+        """
+        Args:
+            fabrica: Função que cria cada um dos três buffers
+        """
+        self.buffers = [fabrica() for _ in range(3)]
+        self.descartados = 0
+        self._publicado = None
+        self._exibido = None
+        self._lock = threading.Lock()
+
+    def livre(self):
+        """Retorna (índice, buffer) que pode ser escrito agora"""
+        with self._lock:
+            ocupados = (self._publicado, self._exibido)
+            indice = next(i for i in range(3) if i not in ocupados)
+            return indice, self.buffers[indice]
+
+    def publicar(self, indice):
+        """Marca o buffer escrito como o mais recente"""
+        with self._lock:
+            if self._publicado is not None:
+                self.descartados += 1
+            self._publicado = indice
+
+    def obter_mais_recente(self):
+        """Buffer publicado mais recente (passa a ser o exibido) ou None"""
+        with self._lock:
+            if self._publicado is None:
+                return None
+            self._exibido, self._publicado = self._publicado, None
+            return self.buffers[self._exibido]
+
+    def limpar(self):
+        with self._lock:
+            self._publicado = None
+            self._exibido = None
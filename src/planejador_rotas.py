@@ -0,0 +1,470 @@
+"""
+Planejador de viagens offline do PIA Manaus.
+
+Implementa o Connection Scan Algorithm (CSA) sobre os dados de
+BancoDadosOnibusEnhanced. Se o banco recebeu uma importação GTFS, as conexões
+vêm de gtfs_horarios; caso contrário são geradas a partir do horário e do
+intervalo de cada linha, percorrendo os pontos de parada (ou origem e
+destino) nos dois sentidos.
+
+As conexões ficam ordenadas por horário de partida e as caminhadas entre
+paradas próximas (tabela de transferências) são calculadas uma única vez na
+carga, então cada consulta é uma única varredura em memória.
+"""
+import os
+import sys
+import time
+import unicodedata
+from bisect import bisect_left
+from datetime import date, datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from indice_espacial import IndiceEspacial, distancia_haversine
+from importador_gtfs import tabelas_gtfs_disponiveis, segundos_para_horario
+from horarios_partida import horario_em_segundos
+
+
+# Tempo mínimo para trocar de ônibus na mesma parada
+TEMPO_BALDEACAO = 180
+
+# Caminhadas entre paradas próximas
+DISTANCIA_MAXIMA_CAMINHADA_KM = 0.5
+VELOCIDADE_CAMINHADA_KMH = 4.5
+
+# Estimativa de tempo de percurso quando não há horários por parada
+VELOCIDADE_ONIBUS_KMH = 20.0
+FATOR_SINUOSIDADE = 1.3
+TEMPO_PADRAO_TRECHO = 15 * 60
+
+# Janela máxima de busca a partir do horário de partida
+HORIZONTE_BUSCA = 4 * 3600
+
+INFINITO = float('inf')
+
+
+def normalizar_nome(nome):
+    """
+    Chave de comparação de nomes de parada: sem acentos, minúsculas e sem
+    o sufixo de terminal ("Terminal 1 - T1" → "terminal 1").
+    """
+    texto = unicodedata.normalize('NFKD', nome or '')
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    texto = ' '.join(texto.lower().split())
+    if texto.startswith('terminal ') and ' - ' in texto:
+        texto = texto.split(' - ', 1)[0]
+    return texto
+
+
+class PlanejadorRotas:
+    """
+    Planejador de viagens com baldeações e filtro de acessibilidade.
+    """
+
+    def __init__(self, banco):
+        """
+        Args:
+            banco: Instância de BancoDadosOnibusEnhanced
+        """
+        self.banco = banco
+        self.recarregar()
+
+    def recarregar(self):
+        """Reconstrói paradas, conexões e transferências a partir do banco"""
+        inicio = time.perf_counter()
+
+        self.paradas = []           # [{'nome', 'latitude', 'longitude'}]
+        self._por_nome = {}         # nome normalizado -> [índices de parada]
+        self._por_chave = {}        # chave da fonte (stop_id ou nome) -> índice
+        self.viagens = []           # [(numero da linha, acessível, service_id)]
+        self.linhas = {}            # numero -> nome da linha
+        self._calendario = {}       # service_id -> (dias da semana, início, fim)
+        conexoes = []
+
+        if tabelas_gtfs_disponiveis(self.banco.conn):
+            self.fonte = 'gtfs'
+            self._carregar_gtfs(conexoes)
+        else:
+            self.fonte = 'linhas'
+            self._carregar_linhas(conexoes)
+
+        # Conexões em ordem de partida, em listas paralelas
+        conexoes.sort()
+        self.partidas = [c[0] for c in conexoes]
+        self.chegadas = [c[1] for c in conexoes]
+        self.origens = [c[2] for c in conexoes]
+        self.destinos = [c[3] for c in conexoes]
+        self.viagem_da_conexao = [c[4] for c in conexoes]
+
+        self.transferencias = self._calcular_transferencias()
+        self.tempo_carga = time.perf_counter() - inicio
+
+    # ------------------------------------------------------------------
+    # Carga dos dados
+    # ------------------------------------------------------------------
+
+    def _adicionar_parada(self, chave, nome, latitude=None, longitude=None):
+        """Registra uma parada (uma vez por chave) e devolve seu índice"""
+        indice = self._por_chave.get(chave)
+        if indice is not None:
+            parada = self.paradas[indice]
+            if parada['latitude'] is None and latitude is not None:
+                parada['latitude'], parada['longitude'] = latitude, longitude
+            return indice
+
+        indice = len(self.paradas)
+        self.paradas.append({'nome': nome, 'latitude': latitude, 'longitude': longitude})
+        self._por_chave[chave] = indice
+        self._por_nome.setdefault(normalizar_nome(nome), []).append(indice)
+        return indice
+
+    def _carregar_gtfs(self, conexoes):
+        """Conexões a partir dos horários GTFS importados"""
+        cursor = self.banco.conn.cursor()
+
+        cursor.execute('''
+            SELECT stop_id, nome, latitude, longitude, estacao_pai
+            FROM gtfs_paradas
+            WHERE tipo_local IS NULL OR tipo_local = 0
+        ''')
+        self._estacao_pai = {}
+        for stop_id, nome, latitude, longitude, estacao_pai in cursor.fetchall():
+            indice = self._adicionar_parada(stop_id, nome or stop_id, latitude, longitude)
+            if estacao_pai:
+                self._estacao_pai[indice] = estacao_pai
+
+        cursor.execute('SELECT numero, nome FROM linhas_onibus')
+        self.linhas = dict(cursor.fetchall())
+
+        cursor.execute('''
+            SELECT v.trip_id, r.numero, COALESCE(v.acessivel, 0), v.service_id
+            FROM gtfs_viagens v
+            JOIN gtfs_rotas r ON r.route_id = v.route_id
+        ''')
+        indice_viagem = {}
+        for trip_id, numero, acessivel, service_id in cursor.fetchall():
+            indice_viagem[trip_id] = len(self.viagens)
+            self.viagens.append((numero, acessivel == 1, service_id))
+
+        cursor.execute('''
+            SELECT service_id, segunda, terca, quarta, quinta, sexta, sabado,
+                   domingo, data_inicio, data_fim
+            FROM gtfs_calendario
+        ''')
+        for linha in cursor.fetchall():
+            dias = frozenset(i for i, ativo in enumerate(linha[1:8]) if ativo)
+            self._calendario[linha[0]] = (dias, linha[8], linha[9])
+
+        cursor.execute('''
+            SELECT trip_id, stop_id, chegada, partida
+            FROM gtfs_horarios
+            ORDER BY trip_id, sequencia
+        ''')
+        anterior = (None, None, None)
+        for trip_id, stop_id, chegada, partida in cursor:
+            if anterior[0] != trip_id:
+                anterior = (trip_id, None, None)
+            if chegada is None and partida is None:
+                # Parada sem horário (interpolada): liga a anterior à seguinte
+                continue
+
+            viagem = indice_viagem.get(trip_id)
+            parada = self._por_chave.get(stop_id)
+            if viagem is None or parada is None:
+                continue
+
+            _, parada_anterior, partida_anterior = anterior
+            if parada_anterior is not None:
+                conexoes.append((partida_anterior, chegada if chegada is not None else partida,
+                                 parada_anterior, parada, viagem))
+            anterior = (trip_id, parada, partida if partida is not None else chegada)
+
+    def _carregar_linhas(self, conexoes):
+        """Conexões geradas a partir de horário e intervalo das linhas"""
+        cursor = self.banco.conn.cursor()
+        self._estacao_pai = {}
+
+        # Coordenadas conhecidas: terminais e pontos de parada
+        for terminal in self.banco.obter_todos_terminais():
+            chave = normalizar_nome(terminal['nome'])
+            self._adicionar_parada(chave, terminal['nome'],
+                                   terminal['latitude'], terminal['longitude'])
+
+        cursor.execute('''
+            SELECT linha_numero, nome_ponto, latitude, longitude
+            FROM pontos_parada
+            ORDER BY linha_numero, ordem
+        ''')
+        sequencias = {}
+        for numero, nome, latitude, longitude in cursor.fetchall():
+            indice = self._adicionar_parada(normalizar_nome(nome), nome, latitude, longitude)
+            sequencias.setdefault(numero, []).append(indice)
+
+        cursor.execute('''
+            SELECT numero, nome, origem, destino, horario_inicio, horario_fim,
+                   intervalo_minutos, acessivel
+            FROM linhas_onibus
+        ''')
+        for (numero, nome, origem, destino, horario_inicio, horario_fim,
+             intervalo, acessivel) in cursor.fetchall():
+            self.linhas[numero] = nome
+
+            sequencia = sequencias.get(numero)
+            if not sequencia or len(sequencia) < 2:
+                sequencia = [
+                    self._adicionar_parada(normalizar_nome(origem), origem),
+                    self._adicionar_parada(normalizar_nome(destino), destino),
+                ]
+            if len(set(sequencia)) < 2 or not (horario_inicio and horario_fim and intervalo):
+                # Circulares sem pontos cadastrados não ligam paradas diferentes
+                continue
+
+            primeira = horario_em_segundos(horario_inicio)
+            ultima = horario_em_segundos(horario_fim)
+            if ultima <= primeira:
+                ultima += 24 * 3600
+
+            for sentido in (sequencia, sequencia[::-1]):
+                duracoes = [self._duracao_trecho(a, b) for a, b in zip(sentido, sentido[1:])]
+                for saida in range(primeira, ultima + 1, intervalo * 60):
+                    viagem = len(self.viagens)
+                    self.viagens.append((numero, bool(acessivel), None))
+                    horario = saida
+                    for (a, b), duracao in zip(zip(sentido, sentido[1:]), duracoes):
+                        conexoes.append((horario, horario + duracao, a, b, viagem))
+                        horario += duracao
+
+    def _duracao_trecho(self, origem, destino):
+        """Tempo estimado de ônibus entre duas paradas, em segundos"""
+        a, b = self.paradas[origem], self.paradas[destino]
+        if None in (a['latitude'], b['latitude']):
+            return TEMPO_PADRAO_TRECHO
+        distancia = distancia_haversine(a['latitude'], a['longitude'],
+                                        b['latitude'], b['longitude'])
+        segundos = distancia * FATOR_SINUOSIDADE / VELOCIDADE_ONIBUS_KMH * 3600
+        return max(60, int(round(segundos / 60)) * 60)
+
+    def _calcular_transferencias(self):
+        """
+        Tabela de caminhadas: para cada parada, as paradas a até
+        DISTANCIA_MAXIMA_CAMINHADA_KM e a da mesma estação (GTFS).
+        """
+        transferencias = [[] for _ in self.paradas]
+
+        indice = IndiceEspacial()
+        indice.adicionar_varias(
+            {'latitude': p['latitude'], 'longitude': p['longitude'], 'indice': i}
+            for i, p in enumerate(self.paradas)
+        )
+        for i, parada in enumerate(self.paradas):
+            if parada['latitude'] is None:
+                continue
+            for vizinha in indice.dentro_do_raio(parada['latitude'], parada['longitude'],
+                                                 DISTANCIA_MAXIMA_CAMINHADA_KM):
+                j = vizinha['indice']
+                if j == i:
+                    continue
+                segundos = vizinha['distancia_km'] / VELOCIDADE_CAMINHADA_KMH * 3600
+                transferencias[i].append((j, max(60, int(segundos))))
+        indice.fechar()
+
+        estacoes = {}
+        for i, estacao in self._estacao_pai.items():
+            estacoes.setdefault(estacao, []).append(i)
+        for membros in estacoes.values():
+            for i in membros:
+                ja_ligadas = {j for j, _ in transferencias[i]}
+                transferencias[i].extend(
+                    (j, TEMPO_BALDEACAO) for j in membros if j != i and j not in ja_ligadas)
+
+        return transferencias
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def resolver_parada(self, nome):
+        """
+        Índices das paradas que correspondem ao nome (exato ou parcial,
+        sem diferenciar acentos e maiúsculas).
+        """
+        chave = normalizar_nome(nome)
+        if not chave:
+            return []
+        if chave in self._por_nome:
+            return list(self._por_nome[chave])
+        return [i for nome_parada, indices in self._por_nome.items()
+                if chave in nome_parada for i in indices]
+
+    def _servicos_ativos(self, data):
+        """service_ids válidos na data (None = sem calendário, tudo ativo)"""
+        if not self._calendario:
+            return None
+        dia = data.weekday()
+        data_texto = data.strftime('%Y%m%d')
+        return {
+            service_id for service_id, (dias, inicio, fim) in self._calendario.items()
+            if dia in dias and (not inicio or inicio <= data_texto)
+            and (not fim or data_texto <= fim)
+        }
+
+    def planejar(self, origem, destino, horario=None, somente_acessivel=False, data=None):
+        """
+        Calcula a viagem que chega mais cedo ao destino.
+
+        Args:
+            origem: Nome da parada, terminal ou bairro de origem
+            destino: Nome da parada, terminal ou bairro de destino
+            horario: 'HH:MM' ou segundos desde a meia-noite (padrão: agora)
+            somente_acessivel: Usar apenas viagens acessíveis
+            data: Data da viagem para o calendário GTFS (padrão: hoje)
+
+        Returns:
+            Dicionário com partida, chegada, duracao_min, baldeacoes e
+            trechos, ou None se não houver rota na janela de busca
+        """
+        paradas_origem = self.resolver_parada(origem)
+        paradas_destino = set(self.resolver_parada(destino))
+        if not paradas_origem or not paradas_destino:
+            return None
+
+        if horario is None:
+            agora = datetime.now()
+            horario = agora.hour * 3600 + agora.minute * 60
+        elif isinstance(horario, str):
+            horario = horario_em_segundos(horario)
+
+        servicos = self._servicos_ativos(data or date.today())
+
+        total = len(self.paradas)
+        chegada = [INFINITO] * total     # chegada mais cedo em cada parada
+        pronto = [INFINITO] * total      # a partir de quando dá para embarcar
+        ligacao = [None] * total         # como se chegou à parada
+        embarque = {}                    # viagem -> conexão onde embarcou
+
+        melhor = INFINITO
+        for parada in paradas_origem:
+            chegada[parada] = pronto[parada] = horario
+            if parada in paradas_destino:
+                melhor = horario
+        for parada in paradas_origem:
+            for vizinha, duracao in self.transferencias[parada]:
+                if horario + duracao < chegada[vizinha]:
+                    chegada[vizinha] = pronto[vizinha] = horario + duracao
+                    ligacao[vizinha] = ('caminhada', parada, duracao)
+                    if vizinha in paradas_destino:
+                        melhor = min(melhor, chegada[vizinha])
+
+        limite = horario + HORIZONTE_BUSCA
+        partidas, chegadas = self.partidas, self.chegadas
+        origens, destinos = self.origens, self.destinos
+        viagem_da_conexao, viagens = self.viagem_da_conexao, self.viagens
+
+        for i in range(bisect_left(partidas, horario), len(partidas)):
+            partida = partidas[i]
+            if partida >= melhor or partida > limite:
+                break
+
+            viagem = viagem_da_conexao[i]
+            if viagem not in embarque:
+                if pronto[origens[i]] > partida:
+                    continue
+                _, acessivel, servico = viagens[viagem]
+                if somente_acessivel and not acessivel:
+                    continue
+                if servicos is not None and servico not in servicos:
+                    continue
+                embarque[viagem] = i
+
+            parada = destinos[i]
+            horario_chegada = chegadas[i]
+            if horario_chegada >= chegada[parada]:
+                continue
+
+            chegada[parada] = horario_chegada
+            pronto[parada] = horario_chegada + TEMPO_BALDEACAO
+            ligacao[parada] = ('onibus', embarque[viagem], i)
+            if parada in paradas_destino:
+                melhor = min(melhor, horario_chegada)
+
+            for vizinha, duracao in self.transferencias[parada]:
+                if horario_chegada + duracao < chegada[vizinha]:
+                    chegada[vizinha] = pronto[vizinha] = horario_chegada + duracao
+                    ligacao[vizinha] = ('caminhada', parada, duracao)
+                    if vizinha in paradas_destino:
+                        melhor = min(melhor, chegada[vizinha])
+
+        if melhor == INFINITO:
+            return None
+
+        parada_final = min(paradas_destino, key=lambda p: chegada[p])
+        return self._montar_itinerario(parada_final, ligacao, melhor, horario)
+
+    def _montar_itinerario(self, parada, ligacao, horario_chegada, horario):
+        """Percorre as ligações de trás para frente montando os trechos"""
+        trechos = []
+        while ligacao[parada] is not None:
+            if ligacao[parada][0] == 'onibus':
+                _, primeira, ultima = ligacao[parada]
+                numero = self.viagens[self.viagem_da_conexao[primeira]][0]
+                anterior = self.origens[primeira]
+                trechos.append({
+                    'tipo': 'onibus',
+                    'linha': numero,
+                    'nome_linha': self.linhas.get(numero, ''),
+                    'de': self.paradas[anterior]['nome'],
+                    'para': self.paradas[parada]['nome'],
+                    'partida': self.partidas[primeira],
+                    'chegada': self.chegadas[ultima],
+                })
+            else:
+                _, anterior, duracao = ligacao[parada]
+                trechos.append({
+                    'tipo': 'caminhada',
+                    'de': self.paradas[anterior]['nome'],
+                    'para': self.paradas[parada]['nome'],
+                    'duracao': duracao,
+                })
+            parada = anterior
+        trechos.reverse()
+
+        # Sair de casa só a tempo de caminhar até o primeiro ônibus
+        partida = horario
+        caminhada_inicial = 0
+        for trecho in trechos:
+            if trecho['tipo'] == 'onibus':
+                partida = trecho['partida'] - caminhada_inicial
+                break
+            caminhada_inicial += trecho['duracao']
+
+        for trecho in trechos:
+            if trecho['tipo'] == 'onibus':
+                trecho['partida'] = segundos_para_horario(trecho['partida'])
+                trecho['chegada'] = segundos_para_horario(trecho['chegada'])
+            else:
+                trecho['duracao_min'] = max(1, round(trecho.pop('duracao') / 60))
+
+        return {
+            'partida': segundos_para_horario(partida),
+            'chegada': segundos_para_horario(horario_chegada),
+            'duracao_min': round((horario_chegada - partida) / 60),
+            'baldeacoes': max(0, sum(t['tipo'] == 'onibus' for t in trechos) - 1),
+            'trechos': trechos,
+        }
+
+
+def formatar_itinerario(itinerario):
+    """Texto do itinerário para o console"""
+    linhas = [
+        f"🕐 Saída {itinerario['partida']} → chegada {itinerario['chegada']} "
+        f"({itinerario['duracao_min']} min, {itinerario['baldeacoes']} baldeação(ões))"
+    ]
+    for trecho in itinerario['trechos']:
+        if trecho['tipo'] == 'onibus':
+            linhas.append(
+                f"🚌 {trecho['partida']} Linha {trecho['linha']}: "
+                f"{trecho['de']} → {trecho['para']} (chega {trecho['chegada']})")
+        else:
+            linhas.append(
+                f"🚶 Caminhe {trecho['duracao_min']} min: {trecho['de']} → {trecho['para']}")
+    return "\n".join(linhas)
@@ -0,0 +1,197 @@
+"""
+Preparação antecipada das respostas faladas do PIA Manaus.
+
+Enquanto o usuário ainda sinaliza ou fala, a entrada parcial já restringe
+as respostas possíveis. A interface entrega as perguntas que a próxima
+entrada pode formar e a sua função gerar_resposta; as respostas
+candidatas são geradas no pool, fora do loop do pygame. O prefetcher
+ordena as candidatas, descarta as que já tocam sem síntese e sintetiza as
+k mais prováveis num pool pequeno de threads de baixa prioridade. Quando
+gerar_resposta devolve uma delas, a fala começa na hora.
+
+Cada rodada substitui a anterior: candidatas que ainda não começaram a ser
+geradas ou sintetizadas são canceladas.
+"""
+import os
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config import LIBRAS_GESTURES
+except ImportError:
+    LIBRAS_GESTURES = {
+        'onibus': 'Polegar para cima',
+        'terminal': 'Mão aberta',
+        'qual': 'Indicador para cima',
+        'horas': 'Apontar para pulso',
+        'centro': 'Apontar para centro',
+        'aeroporto': 'Mão plana',
+        'onde': 'Movimento oscilatório',
+    }
+
+
+# Sinais que a câmera pode confirmar (continuações da pergunta em curso)
+SINAIS_PADRAO = list(LIBRAS_GESTURES)
+
+# Peso de cada escolha anterior da mesma resposta na ordenação
+PESO_HISTORICO = 2
+
+
+def _baixar_prioridade():
+    """Inicializador do pool: threads com prioridade baixa no escalonador"""
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+    except (AttributeError, OSError):
+        pass        # sem suporte por thread (ex.: Windows)
+
+
+class PrefetcherRespostas:
+    """
+    Sintetiza em segundo plano as respostas mais prováveis.
+    """
+
+    def __init__(self, preparar, pronto=None, k=3, trabalhadores=2):
+        """
+        Args:
+            preparar: Função texto -> bool que sintetiza e guarda o áudio
+                      (Locutor.preparar)
+            pronto: Função texto -> bool; True se o texto já toca sem
+                    síntese (Locutor.pronto)
+            k: Respostas preparadas por rodada
+            trabalhadores: Threads do pool
+        """
+        self.preparar = preparar
+        self.pronto = pronto or (lambda texto: False)
+        self.k = k
+        self.historico = Counter()
+        self.antecipados = set()
+        self.acertos = 0
+        self.falhas = 0
+        self._pendentes = []
+        self._rodada = 0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix="prefetch-tts",
+                                        initializer=_baixar_prioridade)
+
+    def ordenar(self, candidatas):
+        """
+        Candidatas da mais para a menos provável: quantas continuações
+        levam à mesma resposta, mais o peso das escolhas anteriores.
+        """
+        contagem = Counter(' '.join(c.split()) for c in candidatas if c and c.strip())
+        for texto in contagem:
+            contagem[texto] += self.historico[texto] * PESO_HISTORICO
+        ordem = {texto: i for i, texto in enumerate(contagem)}
+        return sorted(contagem, key=lambda texto: (-contagem[texto], ordem[texto]))
+
+    def antecipar(self, candidatas):
+        """
+        Começa a preparar as k candidatas mais prováveis.
+
+        Returns:
+            Textos enviados ao pool nesta rodada
+        """
+        with self._lock:
+            self._nova_rodada()
+            return self._enviar(candidatas)
+
+    def antecipar_perguntas(self, perguntas, gerar_resposta, descartar=()):
+        """
+        Como antecipar, mas as respostas candidatas são geradas no pool:
+        quem chama (o loop da interface) não espera as consultas ao banco.
+
+        Args:
+            perguntas: Perguntas que a próxima entrada pode formar
+            gerar_resposta: Função pergunta -> resposta
+            descartar: Respostas que não entram na rodada (ex.: a que
+                       acabou de ser falada)
+        """
+        with self._lock:
+            rodada = self._nova_rodada()
+            self._pendentes.append(self._pool.submit(
+                self._gerar_e_enviar, rodada, list(perguntas), gerar_resposta, descartar))
+
+    def _nova_rodada(self):
+        """Cancela o que ainda não começou (chamado com o lock)"""
+        for futuro in self._pendentes:
+            futuro.cancel()
+        self._pendentes = []
+        self._rodada += 1
+        return self._rodada
+
+    def _enviar(self, candidatas):
+        """Envia as k mais prováveis ao pool (chamado com o lock)"""
+        enviados = []
+        for texto in self.ordenar(candidatas):
+            if len(enviados) >= self.k:
+                break
+            self.antecipados.add(texto)
+            if self.pronto(texto):
+                continue
+            self._pendentes.append(self._pool.submit(self._preparar, texto))
+            enviados.append(texto)
+        return enviados
+
+    def _gerar_e_enviar(self, rodada, perguntas, gerar_resposta, descartar):
+        descartar = {' '.join(texto.split()) for texto in descartar if texto}
+        candidatas = []
+        for pergunta in perguntas:
+            if self._rodada != rodada:
+                return []                   # substituída por uma rodada nova
+            try:
+                resposta = gerar_resposta(pergunta)
+            except Exception as e:
+                print(f"⚠️ Erro ao antecipar respostas: {e}")
+                continue
+            if resposta and ' '.join(resposta.split()) not in descartar:
+                candidatas.append(resposta)
+        with self._lock:
+            if self._rodada != rodada:
+                return []
+            return self._enviar(candidatas)
+
+    def _preparar(self, texto):
+        try:
+            return self.preparar(texto)
+        except Exception as e:
+            print(f"⚠️ Erro ao preparar fala: {e}")
+            return False
+
+    def registrar_escolha(self, resposta):
+        """Registra a resposta realmente dada (aprende e conta acertos)"""
+        resposta = ' '.join(resposta.split())
+        with self._lock:
+            if resposta in self.antecipados:
+                self.acertos += 1
+            else:
+                self.falhas += 1
+            self.historico[resposta] += 1
+            self.antecipados.clear()
+
+    def esperar(self, timeout=None):
+        """Espera a rodada atual terminar (usado em testes e no encerramento)"""
+        while True:
+            with self._lock:
+                pendentes = list(self._pendentes)
+            for futuro in pendentes:
+                if not futuro.cancelled():
+                    futuro.result(timeout)
+            # A geração das candidatas envia as sínteses ao terminar
+            with self._lock:
+                if self._pendentes == pendentes:
+                    return
+
+    def encerrar(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def estatisticas(self):
+        total = self.acertos + self.falhas
+        return {
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'taxa_acerto': self.acertos / total if total else 0.0,
+        }
@@ -0,0 +1,194 @@
+"""
+Reconhecimento de sinais dinâmicos de Libras (com movimento).
+
+Cada frame vira um vetor de movimento da mão (deslocamento do centro da
+palma dividido pelo tamanho da palma, portanto independente da distância da
+câmera). Os vetores vão para um buffer circular e, ao mesmo tempo, para um
+casador DTW em fluxo (algoritmo SPRING): cada modelo de sinal mantém só uma
+coluna da matriz DTW, atualizada em O(tamanho do modelo) por frame, então o
+custo por frame não depende do tamanho da janela nem do tempo de uso.
+"""
+import numpy as np
+
+
+# Landmarks que formam o centro da palma: punho e bases dos dedos
+PONTOS_PALMA = (0, 5, 9, 13, 17)
+PUNHO, BASE_MEDIO = 0, 9
+
+INFINITO = float('inf')
+
+
+class TrajetoriaCircular:
+    """
+    Buffer circular de vetores por frame, com capacidade fixa.
+    """
+
+    def __init__(self, capacidade=90, dimensao=2):
+        self.capacidade = capacidade
+        self.dados = np.zeros((capacidade, dimensao), dtype=np.float32)
+        self.total = 0
+
+    def adicionar(self, vetor):
+        """Grava o vetor do frame sobre o mais antigo (O(1))"""
+        self.dados[self.total % self.capacidade] = vetor
+        self.total += 1
+
+    def __len__(self):
+        return min(self.total, self.capacidade)
+
+    def ultimos(self, quantidade=None):
+        """Cópia dos últimos vetores em ordem cronológica"""
+        quantidade = len(self) if quantidade is None else min(quantidade, len(self))
+        fim = self.total % self.capacidade
+        indices = (np.arange(fim - quantidade, fim)) % self.capacidade
+        return self.dados[indices]
+
+    def limpar(self):
+        self.total = 0
+
+
+class CasadorSpring:
+    """
+    DTW de subsequência em fluxo (SPRING) para um modelo de sinal.
+
+    Reporta cada ocorrência uma única vez, no melhor alinhamento, assim que
+    nenhum alinhamento em andamento puder melhorá-la.
+    """
+
+    def __init__(self, nome, modelo, limiar):
+        """
+        Args:
+            nome: Nome do sinal
+            modelo: Array (m, dimensao) com a sequência de referência
+            limiar: Custo médio máximo por frame do alinhamento
+        """
+        self.nome = nome
+        self.modelo = np.asarray(modelo, dtype=np.float32)
+        self.epsilon = limiar * len(self.modelo)
+        self.reiniciar()
+
+    def reiniciar(self):
+        m = len(self.modelo)
+        self.custos = [INFINITO] * m
+        self.inicios = [0] * m
+        self.melhor = INFINITO
+        self.melhor_inicio = self.melhor_fim = 0
+
+    def atualizar(self, vetor, t):
+        """
+        Processa o frame t.
+
+        Returns:
+            (início, fim, custo médio) se uma ocorrência foi confirmada
+        """
+        distancias = np.abs(self.modelo - vetor).sum(axis=1).tolist()
+        anteriores, inicios_anteriores = self.custos, self.inicios
+        custos, inicios = [0.0] * len(distancias), [0] * len(distancias)
+
+        # Primeira linha: um alinhamento pode começar em qualquer frame
+        custos[0], inicios[0] = distancias[0], t
+        for i in range(1, len(distancias)):
+            candidatos = (
+                (custos[i - 1], inicios[i - 1]),
+                (anteriores[i], inicios_anteriores[i]),
+                (anteriores[i - 1], inicios_anteriores[i - 1]),
+            )
+            custo, inicio = min(candidatos)
+            custos[i], inicios[i] = distancias[i] + custo, inicio
+
+        ocorrencia = None
+        if self.melhor <= self.epsilon:
+            pendente = any(c < self.melhor and s <= self.melhor_fim
+                           for c, s in zip(custos, inicios))
+            if not pendente:
+                ocorrencia = (self.melhor_inicio, self.melhor_fim,
+                              self.melhor / len(distancias))
+                self.melhor = INFINITO
+                for i, s in enumerate(inicios):
+                    if s <= ocorrencia[1]:
+                        custos[i] = INFINITO
+
+        if custos[-1] <= self.epsilon and custos[-1] < self.melhor:
+            self.melhor = custos[-1]
+            self.melhor_inicio, self.melhor_fim = inicios[-1], t
+
+        self.custos, self.inicios = custos, inicios
+        return ocorrencia
+
+
+def oscilacao_horizontal(ciclos=1.5, frames_por_ciclo=10, amplitude=0.6):
+    """Modelo de movimento de vai e vem lateral (sinal "onde")"""
+    t = np.arange(int(ciclos * frames_por_ciclo) + 1)
+    x = amplitude * np.sin(2 * np.pi * t / frames_por_ciclo)
+    movimento = np.zeros((len(t) - 1, 2), dtype=np.float32)
+    movimento[:, 0] = np.diff(x)
+    return movimento
+
+
+MODELOS_PADRAO = {
+    'onde': (oscilacao_horizontal(), 0.12),
+}
+
+
+class ReconhecedorSequencias:
+    """
+    Reconhece sinais dinâmicos frame a frame a partir dos landmarks.
+    """
+
+    def __init__(self, modelos=None, capacidade=90):
+        """
+        Args:
+            modelos: {nome: (sequência (m, 2), limiar)}; padrão MODELOS_PADRAO
+            capacidade: Frames guardados na trajetória circular
+        """
+        self.trajetoria = TrajetoriaCircular(capacidade, 2)
+        self.casadores = []
+        self._centro_anterior = None
+        for nome, (sequencia, limiar) in (MODELOS_PADRAO if modelos is None else modelos).items():
+            self.adicionar_modelo(nome, sequencia, limiar)
+
+    def adicionar_modelo(self, nome, sequencia, limiar=0.12):
+        """Acrescenta um sinal dinâmico (ex.: gravado com trajetoria.ultimos)"""
+        self.casadores.append(CasadorSpring(nome, sequencia, limiar))
+
+    def reiniciar(self):
+        """Esquece o movimento em andamento (ex.: a mão saiu do quadro)"""
+        self._centro_anterior = None
+        for casador in self.casadores:
+            casador.reiniciar()
+
+    @staticmethod
+    def vetor_movimento(mao, centro_anterior):
+        """Deslocamento do centro da palma em tamanhos de palma"""
+        pontos = np.asarray(mao, dtype=np.float32)[:, :2]
+        centro = pontos[list(PONTOS_PALMA)].mean(axis=0)
+        palma = max(float(np.linalg.norm(pontos[BASE_MEDIO] - pontos[PUNHO])), 1e-6)
+        if centro_anterior is None:
+            return centro, None
+        return centro, (centro - centro_anterior) / palma
+
+    def atualizar(self, mao):
+        """
+        Processa um frame.
+
+        Args:
+            mao: Landmarks (21, 3) da mão acompanhada, ou None sem mão
+
+        Returns:
+            Lista de nomes dos sinais concluídos neste frame
+        """
+        if mao is None:
+            self.reiniciar()
+            return []
+
+        self._centro_anterior, movimento = self.vetor_movimento(mao, self._centro_anterior)
+        if movimento is None:
+            return []
+
+        t = self.trajetoria.total
+        self.trajetoria.adicionar(movimento)
+        reconhecidos = []
+        for casador in self.casadores:
+            if casador.atualizar(movimento, t):
+                reconhecidos.append(casador.nome)
+        return reconhecidos
@@ -0,0 +1,506 @@
+"""
+Servidor de reconhecimento de Libras para vários quiosques.
+
+Um PC de terminal costuma atender vários quiosques. Neste modo um único
+processo lê N fontes (câmeras ou gravações) e distribui os quadros, em
+rodízio, para um pool de processos com MediaPipe, um por núcleo. Os quadros
+passam por memória compartilhada (nenhuma imagem é serializada) e de volta
+vêm só os landmarks. Classificação, histórico de gestos e sinal atual ficam
+no processo principal, separados por quiosque. Os sinais confirmados saem
+por quiosque numa fila (obter_evento) ou num socket TCP local, uma linha
+JSON por evento.
+
+Quadros seguidos de um quiosque caem em processos diferentes, então cada
+processo usa o modelo em modo de imagem estática (sem rastreamento), e os
+resultados de cada quiosque são reordenados pelo número do quadro antes de
+chegarem ao filtro de gestos.
+
+Uso:
+    python src/servidor_libras.py                     # câmeras de LIBRAS_RECOGNITION
+    python src/servidor_libras.py --fontes 0 1 gravacoes/quiosque3.mp4
+    nc localhost 8765                                 # eventos de todos os quiosques
+    (echo 1; cat) | nc localhost 8765                 # só do quiosque 1
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classificador_gestos import ClassificadorGestos, landmarks_para_array
+from fontes_frames import abrir_fonte
+from modelo_maos import criar_modelo_maos
+from pipeline_frames import FilaDescarte
+from sequencia_gestos import ReconhecedorSequencias
+
+try:
+    from config import LIBRAS_RECOGNITION
+except ImportError:
+    LIBRAS_RECOGNITION = {
+        'camera_index': 0,
+        'gesture_hold_time': 2.0,
+        'server_host': '127.0.0.1',
+        'server_port': 8765,
+        'server_workers': None,
+    }
+
+
+# Maior quadro aceito sem redução (quadros maiores são reduzidos por salto)
+LARGURA_MAXIMA, ALTURA_MAXIMA = 1280, 720
+# Quadros em voo por processo: um sendo processado e um esperando
+SLOTS_POR_TRABALHADOR = 2
+
+
+def indices_cameras(valor=None):
+    """
+    Fontes configuradas em LIBRAS_RECOGNITION['camera_index'].
+
+    Aceita um índice, uma lista ou texto separado por vírgulas ('0,1,2').
+    """
+    valor = LIBRAS_RECOGNITION.get('camera_index', 0) if valor is None else valor
+    if isinstance(valor, str):
+        valor = [parte.strip() for parte in valor.split(',') if parte.strip()]
+    if not isinstance(valor, (list, tuple)):
+        valor = [valor]
+    return [int(v) if isinstance(v, str) and v.isdigit() else v for v in valor]
+
+
+def criar_modelo_estatico():
+    """Modelo dos processos do pool: sem rastreamento entre quadros"""
+    return criar_modelo_maos(static_image_mode=True)
+
+
+def _trabalhador(indice, nomes_memoria, entrada, saida, fabrica):
+    """Processo do pool: detecta as mãos dos quadros deixados nos slots"""
+    memorias = [shared_memory.SharedMemory(name=nome) for nome in nomes_memoria]
+    slots = [np.ndarray((ALTURA_MAXIMA * LARGURA_MAXIMA * 3,), dtype=np.uint8, buffer=m.buf)
+             for m in memorias]
+    modelo = fabrica()
+    try:
+        while True:
+            tarefa = entrada.get()
+            if tarefa is None:
+                break
+            fonte, quadro, slot, (altura, largura) = tarefa
+            inicio = time.perf_counter()
+            imagem = slots[slot][:altura * largura * 3].reshape(altura, largura, 3)
+            rgb = np.ascontiguousarray(imagem[..., ::-1])
+            try:
+                resultados = modelo.process(rgb)
+                landmarks = landmarks_para_array(resultados.multi_hand_landmarks, largura, altura)
+            except Exception as e:
+                print(f"❌ Erro no processo {indice}: {e}")
+                landmarks = np.empty((0, 21, 3), dtype=np.float32)
+            saida.put((indice, fonte, quadro, slot, landmarks, time.perf_counter() - inicio))
+    finally:
+        modelo.close()
+        del slots
+        for memoria in memorias:
+            memoria.close()
+
+
+class EstadoQuiosque:
+    """
+    Histórico de gestos, sinal atual e sinais dinâmicos de um quiosque,
+    com o mesmo filtro temporal da câmera (ReconhecimentoLibras).
+    """
+
+    def __init__(self, quiosque, tempo_confirmacao=2.0, max_historico=10,
+                 primeiro_quadro=1, max_pendentes=16):
+        """
+        Args:
+            primeiro_quadro: Número do primeiro quadro da fonte
+            max_pendentes: Resultados guardados à espera de um quadro que
+                    não chegou; passando disso, o quadro que falta é dado
+                    como perdido
+        """
+        self.quiosque = quiosque
+        self.tempo_confirmacao = tempo_confirmacao
+        self.max_historico = max_historico
+        self.max_pendentes = max_pendentes
+        self.historico_gestos = []
+        self.sinal_atual = None
+        self.ultimo_sinal_tempo = 0
+        self.proximo_quadro = primeiro_quadro
+        self.sequencias = ReconhecedorSequencias()
+        self.eventos = FilaDescarte(capacidade=16)
+        self._pendentes = {}        # quadro -> (landmarks, gestos), None se descartado
+        self._lock = threading.Lock()
+
+    def processar(self, quadro, landmarks, gestos, agora=None):
+        """
+        Entrega o resultado de um quadro.
+
+        Processos diferentes do pool terminam fora de ordem: o resultado
+        fica guardado até os quadros anteriores chegarem (ou serem
+        descartados), e o filtro vê os quadros sempre em ordem.
+
+        Returns:
+            Lista de sinais confirmados pelos quadros liberados
+        """
+        agora = time.time() if agora is None else agora
+        with self._lock:
+            if quadro >= self.proximo_quadro:
+                self._pendentes[quadro] = (landmarks, gestos)
+            return self._liberar(agora)
+
+    def descartar(self, quadro):
+        """Quadro lido mas não enviado ao pool: não há resultado a esperar"""
+        with self._lock:
+            if quadro >= self.proximo_quadro:
+                self._pendentes[quadro] = None
+
+    def _liberar(self, agora):
+        """Processa, em ordem, os quadros seguidos já disponíveis"""
+        if len(self._pendentes) > self.max_pendentes:
+            self.proximo_quadro = min(self._pendentes)
+        confirmados = []
+        while self.proximo_quadro in self._pendentes:
+            resultado = self._pendentes.pop(self.proximo_quadro)
+            self.proximo_quadro += 1
+            if resultado is not None:
+                confirmados.extend(self._atualizar(*resultado, agora))
+        return confirmados
+
+    def _atualizar(self, landmarks, gestos, agora):
+        """Aplica o filtro temporal a um quadro"""
+        confirmados = self.sequencias.atualizar(landmarks[0] if len(landmarks) else None)
+
+        gesto = None
+        for previsto in gestos:
+            if previsto:
+                gesto = previsto
+        if gesto and agora - self.ultimo_sinal_tempo >= self.tempo_confirmacao:
+            self.historico_gestos.append(gesto)
+            if len(self.historico_gestos) > self.max_historico:
+                self.historico_gestos.pop(0)
+            if self.historico_gestos[-3:] == [gesto] * 3:
+                confirmados.append(gesto)
+
+        for sinal in confirmados:
+            self.sinal_atual = sinal
+            self.ultimo_sinal_tempo = agora
+        return confirmados
+
+
+class _ManipuladorEventos(socketserver.StreamRequestHandler):
+    """
+    Conexão do socket de eventos. O cliente pode mandar, logo ao conectar,
+    uma linha com os quiosques de interesse ('0' ou '0,2').
+    """
+
+    def handle(self):
+        servidor = self.server.servidor_libras
+        quiosques = None
+        self.request.settimeout(0.3)
+        try:
+            linha = self.rfile.readline().decode('utf-8').strip()
+            if linha:
+                quiosques = {int(q) for q in linha.split(',') if q.strip().isdigit()}
+        except (socket.timeout, OSError, ValueError):
+            pass
+        self.request.settimeout(None)
+
+        fila = servidor.assinar()
+        try:
+            while not servidor._parar.is_set():
+                evento = fila.obter(timeout=0.5)
+                if evento is None or (quiosques and evento['quiosque'] not in quiosques):
+                    continue
+                self.wfile.write((json.dumps(evento, ensure_ascii=False) + '\n').encode('utf-8'))
+                self.wfile.flush()
+        except OSError:
+            pass            # cliente desconectou
+        finally:
+            servidor.cancelar_assinatura(fila)
+
+
+class _ServidorTCP(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class ServidorLibras:
+    """
+    N fontes, um pool de processos MediaPipe e estado separado por quiosque.
+    """
+
+    def __init__(self, fontes=None, trabalhadores=None, fabrica=criar_modelo_estatico,
+                 classificar=None, tempo_confirmacao=None):
+        """
+        Args:
+            fontes: Índices de câmera, caminhos de gravação ou objetos com a
+                    interface do cv2.VideoCapture; padrão: indices_cameras()
+            trabalhadores: Processos do pool; padrão: núcleos da CPU - 1
+            fabrica: Função (de módulo) que cria o modelo em cada processo
+            classificar: landmarks -> gesto de cada mão; padrão: regras
+            tempo_confirmacao: Intervalo mínimo entre sinais de um quiosque
+        """
+        self.fontes = list(fontes) if fontes is not None else indices_cameras()
+        self.n_trabalhadores = (trabalhadores or LIBRAS_RECOGNITION.get('server_workers')
+                                or max(1, (os.cpu_count() or 2) - 1))
+        self.fabrica = fabrica
+        self.classificar = classificar or ClassificadorGestos().classificar
+        tempo_confirmacao = (LIBRAS_RECOGNITION.get('gesture_hold_time', 2.0)
+                             if tempo_confirmacao is None else tempo_confirmacao)
+        # Cabem na espera pelo menos todos os quadros em voo no pool
+        max_pendentes = max(16, 2 * self.n_trabalhadores * SLOTS_POR_TRABALHADOR)
+        self.quiosques = [EstadoQuiosque(i, tempo_confirmacao, max_pendentes=max_pendentes)
+                          for i in range(len(self.fontes))]
+
+        self.quadros_lidos = [0] * len(self.fontes)
+        self.quadros_processados = 0
+        self.descartados = 0
+        self.tempo_deteccao = 0.0
+
+        self._parar = threading.Event()
+        self._lock = threading.Lock()
+        self._assinantes = []
+        self._caps = []
+        self._threads = []
+        self._processos = []
+        self._memorias = []
+        self._entradas = []
+        self._slots_livres = []
+        self._buffers = []
+        self._proximo = 0
+        self._servidor_tcp = None
+
+    # ---- ciclo de vida ----
+
+    def iniciar(self):
+        """Abre as fontes, sobe o pool e começa a distribuir quadros"""
+        contexto = multiprocessing.get_context()
+        self._saida = contexto.Queue()
+        tamanho_slot = ALTURA_MAXIMA * LARGURA_MAXIMA * 3
+
+        for indice in range(self.n_trabalhadores):
+            memorias = [shared_memory.SharedMemory(create=True, size=tamanho_slot)
+                        for _ in range(SLOTS_POR_TRABALHADOR)]
+            entrada = contexto.Queue()
+            processo = contexto.Process(
+                target=_trabalhador, name=f"libras-trabalhador-{indice}", daemon=True,
+                args=(indice, [m.name for m in memorias], entrada, self._saida, self.fabrica))
+            processo.start()
+            self._memorias.append(memorias)
+            self._buffers.append([np.ndarray((tamanho_slot,), dtype=np.uint8, buffer=m.buf)
+                                  for m in memorias])
+            self._entradas.append(entrada)
+            self._slots_livres.append(list(range(SLOTS_POR_TRABALHADOR)))
+            self._processos.append(processo)
+
+        self._threads.append(threading.Thread(
+            target=self._loop_resultados, name="libras-resultados", daemon=True))
+        for quiosque, fonte in enumerate(self.fontes):
+            cap = self._abrir(fonte)
+            self._caps.append(cap)
+            self._threads.append(threading.Thread(
+                target=self._loop_captura, args=(quiosque, cap),
+                name=f"libras-captura-{quiosque}", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+        print(f"✅ Servidor de Libras: {len(self.fontes)} quiosques, "
+              f"{self.n_trabalhadores} processos MediaPipe")
+
+    @staticmethod
+    def _abrir(fonte):
+        if isinstance(fonte, int):
+            import cv2
+
+            cap = cv2.VideoCapture(fonte)
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+            return cap
+        if isinstance(fonte, str):
+            return abrir_fonte(fonte, tempo_real=True, repetir=True)
+        return fonte
+
+    def parar(self):
+        """Para captura, pool e socket e libera a memória compartilhada"""
+        with self._lock:
+            self._parar.set()
+        if self._servidor_tcp is not None:
+            self._servidor_tcp.shutdown()
+            self._servidor_tcp.server_close()
+            self._servidor_tcp = None
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        for entrada in self._entradas:
+            entrada.put(None)
+        for processo in self._processos:
+            processo.join(timeout=5.0)
+            if processo.is_alive():
+                processo.terminate()
+        with self._lock:
+            self._buffers = []
+            for memorias in self._memorias:
+                for memoria in memorias:
+                    memoria.close()
+                    memoria.unlink()
+        self._threads, self._processos, self._memorias, self._caps = [], [], [], []
+        print("🛑 Servidor de Libras parado")
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, *args):
+        self.parar()
+
+    # ---- distribuição dos quadros ----
+
+    def _loop_captura(self, quiosque, cap):
+        # A própria thread libera a fonte: parar() não pode soltá-la no
+        # meio de um cap.read() se o join esgotar o tempo
+        try:
+            while not self._parar.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    self._parar.wait(0.01)
+                    continue
+                self.quadros_lidos[quiosque] += 1
+                self._despachar(quiosque, self.quadros_lidos[quiosque], frame)
+        finally:
+            cap.release()
+
+    def _despachar(self, quiosque, quadro, frame):
+        """Próximo processo do rodízio com slot livre; sem nenhum, descarta"""
+        with self._lock:
+            if self._parar.is_set():
+                return False
+            for _ in range(self.n_trabalhadores):
+                trabalhador = self._proximo
+                self._proximo = (self._proximo + 1) % self.n_trabalhadores
+                if self._slots_livres[trabalhador]:
+                    slot = self._slots_livres[trabalhador].pop()
+                    break
+            else:
+                self.descartados += 1
+                self.quiosques[quiosque].descartar(quadro)
+                return False
+
+        while frame.shape[0] > ALTURA_MAXIMA or frame.shape[1] > LARGURA_MAXIMA:
+            frame = frame[::2, ::2]
+        altura, largura = frame.shape[:2]
+        with self._lock:
+            # parar() libera a memória compartilhada com o lock; depois
+            # disso nenhuma thread de captura atrasada escreve nos slots
+            if self._parar.is_set():
+                return False
+            destino = self._buffers[trabalhador][slot][:altura * largura * 3]
+            np.copyto(destino.reshape(altura, largura, 3), frame)
+            self._entradas[trabalhador].put((quiosque, quadro, slot, (altura, largura)))
+        return True
+
+    def _loop_resultados(self):
+        while not self._parar.is_set():
+            try:
+                trabalhador, quiosque, quadro, slot, landmarks, duracao = self._saida.get(timeout=0.1)
+            except Exception:
+                continue
+            with self._lock:
+                self._slots_livres[trabalhador].append(slot)
+            self.quadros_processados += 1
+            self.tempo_deteccao += duracao
+
+            try:
+                gestos = self.classificar(landmarks) if len(landmarks) else []
+                for sinal in self.quiosques[quiosque].processar(quadro, landmarks, gestos):
+                    self._publicar(quiosque, sinal)
+            except Exception as e:
+                print(f"❌ Erro ao classificar quadro do quiosque {quiosque}: {e}")
+
+    # ---- eventos ----
+
+    def _publicar(self, quiosque, sinal):
+        evento = {'quiosque': quiosque, 'sinal': sinal, 'tempo': time.time()}
+        self.quiosques[quiosque].eventos.colocar(evento)
+        with self._lock:
+            assinantes = list(self._assinantes)
+        for fila in assinantes:
+            fila.colocar(evento)
+        print(f"👐 Quiosque {quiosque}: {sinal}")
+
+    def obter_evento(self, quiosque, timeout=0):
+        """Próximo sinal confirmado do quiosque (dicionário) ou None"""
+        return self.quiosques[quiosque].eventos.obter(timeout=timeout)
+
+    def sinal_atual(self, quiosque):
+        return self.quiosques[quiosque].sinal_atual
+
+    def assinar(self):
+        """Fila com os eventos de todos os quiosques a partir de agora"""
+        fila = FilaDescarte(capacidade=64)
+        with self._lock:
+            self._assinantes.append(fila)
+        return fila
+
+    def cancelar_assinatura(self, fila):
+        with self._lock:
+            if fila in self._assinantes:
+                self._assinantes.remove(fila)
+
+    def iniciar_socket(self, host=None, porta=None):
+        """
+        Publica os eventos num socket TCP local (uma linha JSON por evento).
+
+        Returns:
+            Endereço (host, porta) efetivo
+        """
+        host = host or LIBRAS_RECOGNITION.get('server_host', '127.0.0.1')
+        porta = LIBRAS_RECOGNITION.get('server_port', 8765) if porta is None else porta
+        self._servidor_tcp = _ServidorTCP((host, porta), _ManipuladorEventos)
+        self._servidor_tcp.servidor_libras = self
+        threading.Thread(target=self._servidor_tcp.serve_forever,
+                         name="libras-socket", daemon=True).start()
+        endereco = self._servidor_tcp.server_address
+        print(f"🔌 Eventos de Libras em {endereco[0]}:{endereco[1]}")
+        return endereco
+
+    def obter_estatisticas(self):
+        processados = self.quadros_processados
+        return {
+            'lidos': list(self.quadros_lidos),
+            'processados': processados,
+            'descartados': self.descartados,
+            'deteccao_ms': round(self.tempo_deteccao / processados * 1000, 2) if processados else None,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de reconhecimento de Libras multi-quiosque")
+    parser.add_argument('--fontes', nargs='+', default=None,
+                        help="índices de câmera ou gravações (padrão: LIBRAS_RECOGNITION['camera_index'])")
+    parser.add_argument('--trabalhadores', type=int, default=None)
+    parser.add_argument('--host', default=None)
+    parser.add_argument('--porta', type=int, default=None)
+    args = parser.parse_args()
+
+    fontes = indices_cameras(args.fontes) if args.fontes else None
+    servidor = ServidorLibras(fontes, trabalhadores=args.trabalhadores)
+    servidor.iniciar()
+    servidor.iniciar_socket(args.host, args.porta)
+    try:
+        while True:
+            time.sleep(10)
+            print(f"📊 {servidor.obter_estatisticas()}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.parar()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
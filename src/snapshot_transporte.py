@@ -0,0 +1,425 @@
+"""
+Snapshot compacto e somente leitura das linhas, paradas e terminais.
+
+Pensado para os quiosques offline e de hardware modesto: o arquivo é gerado
+a partir de BancoDadosOnibusEnhanced e carregado via mmap, sem SQLite. As
+colunas numéricas ficam em arrays tipados (visões diretas sobre o mmap) e os
+textos numa única tabela de strings, decodificados e internados sob demanda.
+
+abrir_banco escolhe o backend: o snapshot, se o arquivo existir, ou
+BancoDadosOnibusEnhanced. O planejador de rotas e o índice espacial ainda
+consultam o SQLite diretamente e continuam usando o banco.
+
+Formato do arquivo:
+    MAGIA (8 bytes) | tamanho do cabeçalho (uint32) | cabeçalho JSON |
+    seções alinhadas em 8 bytes, cada uma um array de um único tipo
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import unicodedata
+from array import array
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config import SNAPSHOT_PATH
+except ImportError:
+    SNAPSHOT_PATH = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'database', 'onibus_manaus.snap'
+    )
+
+
+MAGIA = b'PIASNAP1'
+VERSAO = 2
+SEM_TEXTO = 0xFFFFFFFF
+SEM_INTERVALO = -1
+
+FLAG_ACESSIVEL = 1
+FLAG_AR_CONDICIONADO = 2
+
+
+def _normalizar(texto):
+    """Minúsculas e sem acentos, para buscas por substring"""
+    decomposto = unicodedata.normalize('NFKD', texto.lower())
+    return ''.join(c for c in decomposto if not unicodedata.combining(c))
+
+
+class _TabelaTextos:
+    """Acumula strings únicas durante a geração do snapshot"""
+
+    def __init__(self):
+        self.indices = {}
+        self.blob = bytearray()
+        self.offsets = array('I', [0])
+
+    def adicionar(self, texto):
+        if texto is None:
+            return SEM_TEXTO
+        indice = self.indices.get(texto)
+        if indice is None:
+            indice = len(self.indices)
+            self.indices[texto] = indice
+            self.blob += str(texto).encode('utf-8')
+            self.offsets.append(len(self.blob))
+        return indice
+
+
+def gerar_snapshot(banco, caminho):
+    """
+    Grava um snapshot do banco de dados.
+
+    Args:
+        banco: Instância conectada de BancoDadosOnibusEnhanced
+        caminho: Arquivo de saída (substituído atomicamente)
+
+    Returns:
+        Tamanho do arquivo gerado, em bytes
+    """
+    cursor = banco.conn.cursor()
+    textos = _TabelaTextos()
+
+    colunas = {
+        'l_numero': array('I'), 'l_nome': array('I'), 'l_origem': array('I'),
+        'l_destino': array('I'), 'l_inicio': array('I'), 'l_fim': array('I'),
+        'l_tipo': array('I'), 'l_intervalo': array('i'), 'l_tarifa': array('d'),
+        'l_flags': array('B'), 'l_busca': array('I'),
+        'l_paradas_inicio': array('I', [0]),
+        'p_nome': array('I'), 'p_endereco': array('I'), 'p_latitude': array('d'),
+        'p_longitude': array('d'), 'p_ordem': array('i'),
+        't_nome': array('I'), 't_endereco': array('I'), 't_latitude': array('d'),
+        't_longitude': array('d'), 't_linhas_inicio': array('I', [0]),
+        't_linhas': array('I'),
+    }
+
+    cursor.execute('''
+        SELECT numero, nome, origem, destino, horario_inicio, horario_fim,
+               intervalo_minutos, tarifa, acessivel, ar_condicionado, tipo
+        FROM linhas_onibus
+        ORDER BY numero
+    ''')
+    linhas = cursor.fetchall()
+
+    for (numero, nome, origem, destino, inicio, fim, intervalo,
+         tarifa, acessivel, ar_condicionado, tipo) in linhas:
+        colunas['l_numero'].append(textos.adicionar(numero))
+        colunas['l_nome'].append(textos.adicionar(nome))
+        colunas['l_origem'].append(textos.adicionar(origem))
+        colunas['l_destino'].append(textos.adicionar(destino))
+        colunas['l_inicio'].append(textos.adicionar(inicio))
+        colunas['l_fim'].append(textos.adicionar(fim))
+        colunas['l_tipo'].append(textos.adicionar(tipo))
+        colunas['l_intervalo'].append(SEM_INTERVALO if intervalo is None else intervalo)
+        colunas['l_tarifa'].append(float('nan') if tarifa is None else tarifa)
+        colunas['l_flags'].append(
+            (FLAG_ACESSIVEL if acessivel else 0)
+            | (FLAG_AR_CONDICIONADO if ar_condicionado else 0))
+        # Nome, origem e destino já normalizados para obter_onibus_para_destino
+        colunas['l_busca'].append(textos.adicionar('\0'.join(
+            _normalizar(texto or '') for texto in (nome, origem, destino))))
+
+        cursor.execute('''
+            SELECT nome_ponto, endereco, latitude, longitude, ordem
+            FROM pontos_parada
+            WHERE linha_numero = ?
+            ORDER BY ordem
+        ''', (numero,))
+        for nome_ponto, endereco, latitude, longitude, ordem in cursor.fetchall():
+            colunas['p_nome'].append(textos.adicionar(nome_ponto))
+            colunas['p_endereco'].append(textos.adicionar(endereco))
+            colunas['p_latitude'].append(float('nan') if latitude is None else latitude)
+            colunas['p_longitude'].append(float('nan') if longitude is None else longitude)
+            colunas['p_ordem'].append(ordem if ordem is not None else 0)
+        colunas['l_paradas_inicio'].append(len(colunas['p_nome']))
+
+    for terminal in banco.obter_todos_terminais():
+        colunas['t_nome'].append(textos.adicionar(terminal['nome']))
+        colunas['t_endereco'].append(textos.adicionar(terminal['endereco']))
+        latitude, longitude = terminal['latitude'], terminal['longitude']
+        colunas['t_latitude'].append(float('nan') if latitude is None else latitude)
+        colunas['t_longitude'].append(float('nan') if longitude is None else longitude)
+        colunas['t_linhas'].extend(textos.adicionar(l) for l in terminal['linhas'])
+        colunas['t_linhas_inicio'].append(len(colunas['t_linhas']))
+
+    colunas['texto'] = array('B', bytes(textos.blob))
+    colunas['texto_offsets'] = textos.offsets
+
+    # Posicionar as seções após o cabeçalho, alinhadas em 8 bytes
+    def alinhar(posicao):
+        return (posicao + 7) & ~7
+
+    secoes = {nome: [0, len(dados) * dados.itemsize, dados.typecode]
+              for nome, dados in colunas.items()}
+    cabecalho = {'versao': VERSAO, 'byteorder': sys.byteorder,
+                 'linhas': len(linhas), 'terminais': len(colunas['t_nome']),
+                 'textos': len(textos.indices), 'secoes': secoes}
+
+    # O tamanho do cabeçalho depende dos offsets: recalcular até estabilizar
+    tamanho_cabecalho = 0
+    while True:
+        posicao = alinhar(len(MAGIA) + 4 + tamanho_cabecalho)
+        for nome in colunas:
+            secoes[nome][0] = posicao
+            posicao = alinhar(posicao + secoes[nome][1])
+        dados_cabecalho = json.dumps(cabecalho, separators=(',', ':')).encode('utf-8')
+        if len(dados_cabecalho) == tamanho_cabecalho:
+            break
+        tamanho_cabecalho = len(dados_cabecalho)
+
+    temporario = f"{caminho}.tmp"
+    with open(temporario, 'wb') as arquivo:
+        arquivo.write(MAGIA)
+        arquivo.write(struct.pack('<I', tamanho_cabecalho))
+        arquivo.write(dados_cabecalho)
+        for nome, dados in colunas.items():
+            arquivo.write(b'\0' * (secoes[nome][0] - arquivo.tell()))
+            dados.tofile(arquivo)
+        arquivo.write(b'\0' * (posicao - arquivo.tell()))
+    os.replace(temporario, caminho)
+
+    return posicao
+
+
+class SnapshotTransporte:
+    """
+    Backend somente leitura com as mesmas consultas de BancoDadosOnibusEnhanced.
+    """
+
+    __slots__ = ('caminho', '_arquivo', '_mmap', '_secoes', '_textos',
+                 '_indice_linhas', 'total_linhas', 'total_terminais')
+
+    def __init__(self, caminho):
+        """
+        Abre o snapshot via mmap.
+
+        Args:
+            caminho: Arquivo gerado por gerar_snapshot
+        """
+        self.caminho = caminho
+        self._secoes = {}
+        self._mmap = None
+        self._arquivo = open(caminho, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError) as e:
+            # Ex.: arquivo vazio (mmap não mapeia 0 bytes)
+            self.fechar()
+            raise ValueError(f"Não foi possível mapear o snapshot {caminho}: {e}") from e
+
+        try:
+            self._carregar()
+        except ValueError:
+            self.fechar()
+            raise
+        except (KeyError, TypeError, IndexError, struct.error) as e:
+            # Cabeçalho ou seções truncados/corrompidos
+            self.fechar()
+            raise ValueError(f"Snapshot corrompido: {caminho}: {e!r}") from e
+
+    def _carregar(self):
+        """Lê o cabeçalho e mapeia as seções (erros sobem para __init__)"""
+        if self._mmap[:len(MAGIA)] != MAGIA:
+            raise ValueError(f"Arquivo não é um snapshot do PIA Manaus: {self.caminho}")
+
+        tamanho, = struct.unpack_from('<I', self._mmap, len(MAGIA))
+        inicio = len(MAGIA) + 4
+        cabecalho = json.loads(self._mmap[inicio:inicio + tamanho].decode('utf-8'))
+
+        if cabecalho['versao'] != VERSAO or cabecalho['byteorder'] != sys.byteorder:
+            raise ValueError("Snapshot gerado em versão ou arquitetura incompatível")
+
+        # Cada visão entra em _secoes assim que criada, para fechar() liberá-la
+        with memoryview(self._mmap) as visao:
+            for nome, (offset, tamanho, tipo) in cabecalho['secoes'].items():
+                if offset < 0 or offset + tamanho > len(visao):
+                    raise ValueError(f"Seção {nome} fora do arquivo: snapshot truncado")
+                self._secoes[nome] = visao[offset:offset + tamanho].cast(tipo)
+
+        self.total_linhas = cabecalho['linhas']
+        self.total_terminais = cabecalho['terminais']
+        self._textos = [None] * cabecalho['textos']
+
+        numeros = self._secoes['l_numero']
+        self._indice_linhas = {self._texto(numeros[i]): i for i in range(self.total_linhas)}
+
+    def _texto(self, indice):
+        """Decodifica (uma vez) e interna a string de índice dado"""
+        if indice == SEM_TEXTO:
+            return None
+        texto = self._textos[indice]
+        if texto is None:
+            offsets = self._secoes['texto_offsets']
+            bruto = self._secoes['texto'][offsets[indice]:offsets[indice + 1]]
+            texto = sys.intern(bytes(bruto).decode('utf-8'))
+            self._textos[indice] = texto
+        return texto
+
+    @staticmethod
+    def _coordenada(valor):
+        return None if valor != valor else valor
+
+    def _linha(self, i):
+        s = self._secoes
+        intervalo = s['l_intervalo'][i]
+        tarifa = s['l_tarifa'][i]
+        return {
+            'numero': self._texto(s['l_numero'][i]),
+            'nome': self._texto(s['l_nome'][i]),
+            'origem': self._texto(s['l_origem'][i]),
+            'destino': self._texto(s['l_destino'][i]),
+            'inicio': self._texto(s['l_inicio'][i]),
+            'fim': self._texto(s['l_fim'][i]),
+            'tarifa': None if tarifa != tarifa else tarifa,
+            'acessivel': bool(s['l_flags'][i] & FLAG_ACESSIVEL),
+            'ar_condicionado': bool(s['l_flags'][i] & FLAG_AR_CONDICIONADO),
+            'tipo': self._texto(s['l_tipo'][i]),
+            'intervalo': None if intervalo == SEM_INTERVALO else intervalo,
+        }
+
+    def obter_info_linha(self, numero):
+        """Informações completas de uma linha ou None se não encontrada"""
+        i = self._indice_linhas.get(numero)
+        if i is None:
+            return None
+
+        linha = self._linha(i)
+        horario = None
+        if linha['inicio'] is not None and linha['fim'] is not None:
+            horario = f"{linha['inicio']}-{linha['fim']}"
+        return {
+            'numero': linha['numero'],
+            'nome': linha['nome'],
+            'origem': linha['origem'],
+            'destino': linha['destino'],
+            'horario': horario,
+            'tarifa': linha['tarifa'],
+            'acessivel': linha['acessivel'],
+            'ar_condicionado': linha['ar_condicionado'],
+            'tipo': linha['tipo'],
+            'intervalo': linha['intervalo'],
+        }
+
+    def obter_onibus_para_destino(self, destino):
+        """Linhas cujo nome, origem ou destino contém o termo (sem acentos)"""
+        termo = _normalizar(destino)
+        busca = self._secoes['l_busca']
+        resultados = []
+        for i in range(self.total_linhas):
+            if termo in self._texto(busca[i]):
+                linha = self._linha(i)
+                resultados.append({
+                    'numero': linha['numero'],
+                    'nome': linha['nome'],
+                    'origem': linha['origem'],
+                    'destino': linha['destino'],
+                    'tarifa': linha['tarifa'],
+                    'acessivel': linha['acessivel'],
+                    'tipo': linha['tipo'],
+                })
+        return resultados
+
+    def obter_linhas_acessiveis(self):
+        """Retorna todas as linhas com acessibilidade"""
+        flags = self._secoes['l_flags']
+        return [
+            {k: linha[k] for k in ('numero', 'nome', 'origem', 'destino')}
+            for linha in (self._linha(i) for i in range(self.total_linhas)
+                          if flags[i] & FLAG_ACESSIVEL)
+        ]
+
+    def obter_pontos_parada(self, linha_numero):
+        """Retorna os pontos de parada de uma linha"""
+        i = self._indice_linhas.get(linha_numero)
+        if i is None:
+            return []
+
+        s = self._secoes
+        inicio, fim = s['l_paradas_inicio'][i], s['l_paradas_inicio'][i + 1]
+        return [
+            {
+                'nome': self._texto(s['p_nome'][j]),
+                'endereco': self._texto(s['p_endereco'][j]),
+                'latitude': self._coordenada(s['p_latitude'][j]),
+                'longitude': self._coordenada(s['p_longitude'][j]),
+                'ordem': s['p_ordem'][j],
+            }
+            for j in range(inicio, fim)
+        ]
+
+    def obter_todos_terminais(self):
+        """Retorna informações de todos os terminais"""
+        s = self._secoes
+        inicios = s['t_linhas_inicio']
+        return [
+            {
+                'nome': self._texto(s['t_nome'][i]),
+                'endereco': self._texto(s['t_endereco'][i]),
+                'latitude': self._coordenada(s['t_latitude'][i]),
+                'longitude': self._coordenada(s['t_longitude'][i]),
+                'linhas': [self._texto(s['t_linhas'][j])
+                           for j in range(inicios[i], inicios[i + 1])],
+            }
+            for i in range(self.total_terminais)
+        ]
+
+    def fechar(self):
+        """Libera o mmap e o arquivo"""
+        for secao in self._secoes.values():
+            secao.release()
+        self._secoes = {}
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+
+
+def abrir_banco(caminho_snapshot=SNAPSHOT_PATH, db_path=None):
+    """
+    Abre o snapshot se ele existir e for válido; senão, o banco SQLite.
+
+    Os dois respondem obter_info_linha, obter_onibus_para_destino,
+    obter_linhas_acessiveis, obter_pontos_parada, obter_todos_terminais e
+    fechar com os mesmos formatos.
+    """
+    if caminho_snapshot and os.path.exists(caminho_snapshot):
+        try:
+            return SnapshotTransporte(caminho_snapshot)
+        except ValueError as e:
+            print(f"⚠️ Snapshot ignorado, usando o banco SQLite: {e}")
+
+    from database_module_enhanced import BancoDadosOnibusEnhanced
+    return BancoDadosOnibusEnhanced(db_path)
+
+
+def main():
+    from database_module_enhanced import BancoDadosOnibusEnhanced
+
+    parser = argparse.ArgumentParser(
+        description="Gera o snapshot compacto do banco de dados do PIA Manaus")
+    parser.add_argument('saida', nargs='?', default=SNAPSHOT_PATH,
+                        help="Arquivo de snapshot a gerar (padrão: data/database/onibus_manaus.snap)")
+    parser.add_argument('--db', default=None,
+                        help="Caminho do banco SQLite (padrão: data/database/onibus_manaus.db)")
+    args = parser.parse_args()
+
+    banco = BancoDadosOnibusEnhanced(args.db)
+    if not banco.conn:
+        return 1
+
+    try:
+        tamanho = gerar_snapshot(banco, args.saida)
+    finally:
+        banco.fechar()
+
+    print(f"✅ Snapshot gerado: {args.saida} ({tamanho} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,33 +1,20 @@
-from gtts import gTTS
-import pygame
-import io
-import tempfile
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from motores_tts import criar_locutor
 
 class TextToSpeech:
-    def __init__(self):
-        pygame.mixer.init()
-    
+    def __init__(self, locutor=None):
+        self.locutor = locutor or criar_locutor()
+
     def speak(self, text):
         """Converte texto em fala"""
         try:
             print(f"🔊 Falando: {text}")
-            tts = gTTS(text=text, lang='pt-br')
-            
-            # Criar arquivo temporário
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_file:
-                tts.save(tmp_file.name)
-                
-                # Reproduzir áudio
-                pygame.mixer.music.load(tmp_file.name)
-                pygame.mixer.music.play()
-                
-                # Esperar terminar de tocar
-                while pygame.mixer.music.get_busy():
-                    pygame.time.wait(100)
-                
-                # Limpar arquivo temporário
-                os.unlink(tmp_file.name)
-                
+            if self.locutor.falar(text) is None:
+                print("⚠️  Erro na síntese de voz: nenhum motor disponível")
+
         except Exception as e:
-            print(f"⚠️  Erro na síntese de voz: {e}")
\ No newline at end of file
+            print(f"⚠️  Erro na síntese de voz: {e}")
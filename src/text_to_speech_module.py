@@ -1,53 +1,52 @@
-from gtts import gTTS
-import pygame
-import threading
 import os
-import tempfile
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from motores_tts import criar_locutor
+from fila_fala import FilaFala, PRIORIDADE_RESPOSTA, PRIORIDADE_AVISO
 
 class SinteseVoz:
-    def __init__(self):
-        pygame.mixer.init()
-        self.playing = False
-        
-    def falar(self, texto):
-        """Fala o texto usando gTTS em thread separada"""
-        if self.playing:
-            return
-            
-        thread = threading.Thread(target=self._falar_thread, args=(texto,), daemon=True)
-        thread.start()
-    
-    def _falar_thread(self, texto):
-        """Processa a fala em thread separada"""
-        try:
-            self.playing = True
-            
-            # Criar arquivo temporário
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_file:
-                temp_path = tmp_file.name
-            
-            # Gerar áudio com gTTS
-            tts = gTTS(text=texto, lang='pt-br', slow=False)
-            tts.save(temp_path)
-            
-            # Reproduzir com pygame
-            pygame.mixer.music.load(temp_path)
-            pygame.mixer.music.play()
-            
-            # Esperar terminar de tocar
-            while pygame.mixer.music.get_busy():
-                pygame.time.wait(100)
-                
-            # Limpar
-            pygame.mixer.music.unload()
-            os.unlink(temp_path)
-            self.playing = False
-            
-        except Exception as e:
-            print(f"❌ Erro na síntese de voz: {e}")
-            self.playing = False
+    def __init__(self, locutor=None):
+        # Clipes prontos, cache e motores (espeak-ng offline, gTTS) em fluxo
+        self.locutor = locutor or criar_locutor()
+        # Uma só thread de fala: respostas passam na frente dos avisos
+        self.fila = FilaFala(self._falar)
+
+    @property
+    def playing(self):
+        return self.fila.falando
+
+    def falar(self, texto, prioridade=PRIORIDADE_RESPOSTA):
+        """Enfileira o texto; respostas interrompem avisos em andamento"""
+        return self.fila.dizer(texto, prioridade)
+
+    def avisar(self, texto):
+        """Aviso de status: cede lugar às respostas e expira se esperar demais"""
+        return self.fila.dizer(texto, PRIORIDADE_AVISO)
+
+    def preparar(self, texto):
+        """Sintetiza agora para falar sem espera depois (prefetch)"""
+        return self.locutor.preparar(texto)
+
+    def pronto(self, texto):
+        return self.locutor.pronto(texto)
+
+    def interromper(self):
+        self.fila.cancelar_tudo()
+
+    def encerrar(self):
+        self.fila.parar()
+        self.locutor.interromper()
+
+    def _falar(self, texto, parar):
+        if self.locutor.falar(texto, parar) is None:
+            print(f"🔊 TTS: {texto}")
 
 # Fallback simples
 class SinteseVozFallback:
-    def falar(self, texto):
-        print(f"🔊 TTS: {texto}")
\ No newline at end of file
+    def falar(self, texto, prioridade=None):
+        print(f"🔊 TTS: {texto}")
+
+    def avisar(self, texto):
+        self.falar(texto)
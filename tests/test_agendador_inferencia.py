@@ -0,0 +1,137 @@
+"""
+Testes unitários para o agendador adaptativo da detecção de mãos
+"""
+import unittest
+import sys
+import os
+import types
+import numpy as np
+
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agendador_inferencia import AgendadorInferencia
+from deteccao_maos import DeteccaoMaos
+
+
+SEM_MAOS = np.empty((0, 21, 3), dtype=np.float32)
+
+
+def mao_na_caixa(x0, y0, x1, y1):
+    """Mão cujos landmarks ocupam exatamente a caixa dada"""
+    mao = np.zeros((1, 21, 3), dtype=np.float32)
+    mao[0, :, 0] = np.linspace(x0, x1, 21)
+    mao[0, :, 1] = np.linspace(y1, y0, 21)
+    return mao
+
+
+class TestAgendadorInferencia(unittest.TestCase):
+    """Testes para a classe AgendadorInferencia"""
+
+    def setUp(self):
+        self.agendador = AgendadorInferencia(intervalo_busca=3, escala_busca=0.5,
+                                             margem=0.5, tamanho_minimo=100)
+
+    def test_busca_espacada_e_reduzida(self):
+        """Testa que sem mão a detecção roda 1 a cada 3 frames, no quadro reduzido"""
+        planos = []
+        for _ in range(9):
+            plano = self.agendador.planejar(640, 480)
+            planos.append(plano)
+            self.agendador.registrar(plano, SEM_MAOS)
+
+        executados = [p for p in planos if p is not None]
+        self.assertEqual([p is not None for p in planos], [True, False, False] * 3)
+        for plano in executados:
+            self.assertEqual(plano['regiao'], (0, 0, 640, 480))
+            self.assertEqual(plano['escala'], 0.5)
+            self.assertFalse(plano['recorte'])
+        self.assertEqual(self.agendador.contadores['pulados'], 6)
+
+    def test_recorte_em_volta_da_mao(self):
+        """Testa que, achada a mão, o frame seguinte usa o recorte ampliado"""
+        plano = self.agendador.planejar(640, 480)
+        self.agendador.registrar(plano, mao_na_caixa(300, 200, 400, 300))
+
+        plano = self.agendador.planejar(640, 480)
+        self.assertTrue(self.agendador.acompanhando)
+        self.assertEqual(plano, {'regiao': (250, 150, 450, 350), 'escala': 1.0,
+                                 'recorte': True})
+
+    def test_recorte_limitado_ao_quadro(self):
+        """Testa que o recorte não sai do quadro e respeita o tamanho mínimo"""
+        plano = self.agendador.planejar(640, 480)
+        self.agendador.registrar(plano, mao_na_caixa(620, 470, 630, 475))
+
+        x0, y0, x1, y1 = self.agendador.planejar(640, 480)['regiao']
+        self.assertEqual((x1 - x0, y1 - y0), (100, 100))
+        self.assertEqual((x1, y1), (640, 480))
+
+    def test_perda_volta_a_busca_imediata(self):
+        """Testa que perder a mão no recorte busca no quadro inteiro logo em seguida"""
+        plano = self.agendador.planejar(640, 480)
+        self.agendador.registrar(plano, mao_na_caixa(300, 200, 400, 300))
+        plano = self.agendador.planejar(640, 480)
+        self.agendador.registrar(plano, SEM_MAOS)
+
+        self.assertFalse(self.agendador.acompanhando)
+        plano = self.agendador.planejar(640, 480)
+        self.assertEqual(plano['regiao'], (0, 0, 640, 480))
+        self.assertEqual(self.agendador.contadores['perdas'], 1)
+
+    def test_acompanha_todos_os_frames(self):
+        """Testa que com mão à vista nenhum frame é pulado"""
+        plano = self.agendador.planejar(640, 480)
+        for x in range(200, 400, 10):
+            self.agendador.registrar(plano, mao_na_caixa(x, 200, x + 80, 300))
+            plano = self.agendador.planejar(640, 480)
+            self.assertIsNotNone(plano)
+            x0, _, x1, _ = plano['regiao']
+            self.assertTrue(x0 <= x and x + 80 <= x1)
+
+
+
+class ModeloFalso:
+    """Imita o Hands: uma mão no centro da imagem, e guarda o que recebeu"""
+
+    def __init__(self):
+        self.entradas = []
+
+    def process(self, imagem):
+        self.entradas.append(imagem.shape)
+        pontos = [types.SimpleNamespace(x=0.5, y=0.5, z=0.0)] * 21
+        return types.SimpleNamespace(
+            multi_hand_landmarks=[types.SimpleNamespace(landmark=pontos)])
+
+
+class TestDeteccaoMaos(unittest.TestCase):
+    """Testes para a etapa de detecção comum à câmera e ao benchmark"""
+
+    def test_recortes_no_modelo_de_imagem(self):
+        """Testa que o modelo em modo vídeo só recebe o quadro inteiro"""
+        deteccao = DeteccaoMaos(AgendadorInferencia(escala_busca=1.0, tamanho_minimo=100))
+        video, imagem = ModeloFalso(), ModeloFalso()
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+        for _ in range(3):
+            landmarks, resultados, area = deteccao.detectar(frame, video, imagem)
+            self.assertIsNotNone(resultados)
+        self.assertEqual(video.entradas, [(480, 640, 3)])
+        self.assertEqual(imagem.entradas, [(100, 100, 3)] * 2)
+        self.assertEqual(area.shape, (100, 100, 3))
+        np.testing.assert_allclose(landmarks[0, 0], [320, 240, 0])
+
+    def test_quadro_pulado(self):
+        """Testa que quadro pulado pelo agendador não chama modelo nenhum"""
+        deteccao = DeteccaoMaos(AgendadorInferencia(intervalo_busca=2, escala_busca=1.0))
+        vazio = types.SimpleNamespace(process=lambda imagem: types.SimpleNamespace(
+            multi_hand_landmarks=None))
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+
+        deteccao.detectar(frame, vazio)
+        landmarks, resultados, area = deteccao.detectar(frame, vazio)
+        self.assertEqual((landmarks.shape, resultados, area), ((0, 21, 3), None, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+"""
+Testes unitários para as fontes gravadas e o benchmark sem tela
+"""
+import unittest
+import sys
+import os
+import json
+import tempfile
+import shutil
+
+import numpy as np
+
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from fontes_frames import FonteLandmarks, FonteQuadros, abrir_fonte, carregar_rotulos, salvar_fluxo_landmarks
+from benchmark_libras import executar_benchmark, montar_relatorio
+from modelo_gestos import GravadorDataset
+from test_classificador_gestos import MAO_ABERTA, POLEGAR_PARA_CIMA, INDICADOR_PARA_CIMA
+
+SEM_MAOS = np.empty((0, 21, 3), dtype=np.float32)
+
+
+def gravacao_exemplo():
+    """
+    Quadros e rótulos: 'onibus', 'qual' e 'onde' (mão aberta oscilando e
+    depois parada, ainda no quadro, até o sinal dinâmico ser concluído)
+    """
+    oscilacao = 0.6 * 90 * np.sin(2 * np.pi * np.arange(16) / 10)
+    quadros = ([SEM_MAOS] * 3 + [POLEGAR_PARA_CIMA[None]] * 6 + [SEM_MAOS] * 3 +
+               [INDICADOR_PARA_CIMA[None]] * 6 + [SEM_MAOS] * 3 +
+               [(MAO_ABERTA + [x, 0, 0])[None] for x in oscilacao] +
+               [MAO_ABERTA[None]] * 4 + [SEM_MAOS] * 3)
+    rotulos = ([None] * 3 + ['onibus'] * 6 + [None] * 3 + ['qual'] * 6 + [None] * 3 +
+               ['onde'] * 20 + [None] * 3)
+    return quadros, rotulos
+
+
+class TestFonteLandmarks(unittest.TestCase):
+    """Testes para a leitura de fluxos de landmarks"""
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio)
+
+    def test_fluxo_npz(self):
+        """Testa ida e volta do fluxo, com quadros sem mão e com duas mãos"""
+        quadros = [SEM_MAOS, np.stack([MAO_ABERTA, POLEGAR_PARA_CIMA]), SEM_MAOS]
+        caminho = os.path.join(self.diretorio, 'fluxo.npz')
+        salvar_fluxo_landmarks(caminho, quadros, [None, 'terminal', None])
+
+        fonte = abrir_fonte(caminho)
+        self.assertIsInstance(fonte, FonteLandmarks)
+        amostras = list(fonte.amostras())
+        self.assertEqual([len(a['landmarks']) for a in amostras], [0, 2, 0])
+        self.assertEqual([a['rotulo'] for a in amostras], [None, 'terminal', None])
+        np.testing.assert_array_equal(amostras[1]['landmarks'][1], POLEGAR_PARA_CIMA)
+
+    def test_fluxo_sem_rotulos_preserva_quadros_vazios(self):
+        """Testa que quadros finais sem mão não se perdem"""
+        caminho = os.path.join(self.diretorio, 'fluxo.npz')
+        salvar_fluxo_landmarks(caminho, [MAO_ABERTA[None], SEM_MAOS, SEM_MAOS])
+        self.assertEqual(len(FonteLandmarks(caminho)), 3)
+
+    def test_fluxo_json(self):
+        """Testa o formato JSON"""
+        caminho = os.path.join(self.diretorio, 'fluxo.json')
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump([{'maos': [], 'rotulo': None},
+                       {'maos': [POLEGAR_PARA_CIMA.tolist()], 'rotulo': 'onibus'}], arquivo)
+
+        amostras = list(abrir_fonte(caminho).amostras())
+        self.assertEqual([a['landmarks'].shape for a in amostras], [(0, 21, 3), (1, 21, 3)])
+        self.assertEqual(amostras[1]['rotulo'], 'onibus')
+
+    def test_dataset_do_gravador(self):
+        """Testa que as amostras do GravadorDataset viram um quadro por mão"""
+        gravador = GravadorDataset()
+        gravador.adicionar('qual', INDICADOR_PARA_CIMA[None])
+        gravador.adicionar('onibus', POLEGAR_PARA_CIMA[None])
+        caminho = os.path.join(self.diretorio, 'amostras.npz')
+        gravador.salvar(caminho)
+
+        self.assertEqual([a['rotulo'] for a in FonteLandmarks(caminho).amostras()],
+                         ['qual', 'onibus'])
+
+    def test_rotulos_por_intervalo(self):
+        """Testa rótulos de vídeo por quadro e por intervalo"""
+        caminho = os.path.join(self.diretorio, 'video.mp4.rotulos.json')
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump([[2, 4, 'onibus'], [7, 7, 'qual']], arquivo)
+        self.assertEqual(carregar_rotulos(caminho), {2: 'onibus', 3: 'onibus', 4: 'onibus', 7: 'qual'})
+
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump([None, 'onibus'], arquivo)
+        self.assertEqual(carregar_rotulos(caminho), {1: 'onibus'})
+
+
+class TestFonteQuadros(unittest.TestCase):
+    """Testes para a base das fontes de imagem"""
+
+    def test_metodos_abstratos(self):
+        """Testa que uma fonte sem _ler e _voltar_inicio não é criada"""
+        class SoLeitura(FonteQuadros):
+            def _ler(self):
+                return None
+
+        with self.assertRaises(TypeError):
+            SoLeitura()
+
+
+class TestBenchmark(unittest.TestCase):
+    """Testes para o benchmark sem tela"""
+
+    def test_benchmark_fluxo_rotulado(self):
+        """Testa o benchmark de ponta a ponta sobre um fluxo de landmarks"""
+        diretorio = tempfile.mkdtemp()
+        try:
+            caminho = os.path.join(diretorio, 'fluxo.npz')
+            salvar_fluxo_landmarks(caminho, *gravacao_exemplo())
+            relatorio = executar_benchmark(abrir_fonte(caminho))
+        finally:
+            shutil.rmtree(diretorio)
+
+        self.assertEqual(relatorio['quadros'], 44)
+        self.assertEqual(relatorio['segmentos'], 3)
+        self.assertEqual(relatorio['acuracia_segmentos'], 1.0)
+        self.assertEqual(relatorio['acuracia_quadros'], 1.0)
+        self.assertEqual(relatorio['falsos_positivos'], 0)
+        self.assertEqual(relatorio['por_sinal']['onde'], {'segmentos': 1, 'acertos': 1})
+        self.assertNotIn('deteccao', relatorio['latencias_ms'])
+        self.assertEqual(set(relatorio['latencias_ms']['total']), {'p50', 'p90', 'p99', 'max'})
+
+    def test_detector_injetado(self):
+        """Testa quadros de imagem passando por um detector sem MediaPipe"""
+        class FonteFalsa:
+            def amostras(self):
+                for rotulo in ('onibus', 'onibus', None):
+                    yield {'frame': np.zeros((4, 4, 3), np.uint8), 'landmarks': None,
+                           'rotulo': rotulo}
+
+        relatorio = executar_benchmark(FonteFalsa(), detector=lambda frame: POLEGAR_PARA_CIMA[None])
+        self.assertIn('deteccao', relatorio['latencias_ms'])
+        self.assertEqual(relatorio['acuracia_segmentos'], 1.0)
+        self.assertEqual(relatorio['falsos_positivos'], 1)
+
+    def test_relatorio_conta_erros(self):
+        """Testa segmentos perdidos e previsões fora de segmento"""
+        rotulos = [None, 'qual', 'qual', None, None, None, None, None, None, 'onibus', None]
+        previsoes = [None, 'terminal', None, None, None, None, None, 'centro', None, 'onibus', None]
+        relatorio = montar_relatorio(rotulos, previsoes, previsoes, {'total': [0.001] * 11}, 0.011)
+
+        self.assertEqual(relatorio['acuracia_segmentos'], 0.5)
+        self.assertAlmostEqual(relatorio['acuracia_quadros'], 1 / 3, places=4)
+        self.assertEqual(relatorio['falsos_positivos'], 1)
+        self.assertEqual(relatorio['fps'], 1000.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
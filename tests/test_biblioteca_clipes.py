@@ -0,0 +1,193 @@
+"""
+Testes unitários para a biblioteca de clipes de fala
+"""
+import unittest
+import sys
+import os
+import sqlite3
+import tempfile
+import shutil
+import types
+
+import numpy as np
+
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from biblioteca_clipes import (BibliotecaClipes, construir_biblioteca, cortar_silencio,
+                               fragmentos, segmentar, CROSSFADE, FRASES_FIXAS, PAUSAS, _MODELOS)
+
+TAXA = 8000
+
+
+def clipe(texto):
+    """PCM falso: 0,1 s de tom com amplitude própria de cada texto"""
+    return np.full(int(0.1 * TAXA), 100 + len(texto), dtype=np.int16)
+
+
+class SintetizadorFalso:
+    def __init__(self):
+        self.chamadas = []
+
+    def __call__(self, texto):
+        self.chamadas.append(texto)
+        silencio = np.zeros(int(0.2 * TAXA), dtype=np.int16)
+        return np.concatenate([silencio, clipe(texto), silencio])
+
+
+def criar_banco():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('''CREATE TABLE linhas_onibus (numero TEXT, nome TEXT, origem TEXT, destino TEXT,
+                    horario_inicio TEXT, horario_fim TEXT)''')
+    conn.execute("INSERT INTO linhas_onibus VALUES ('640', 'Terminal 1 ↔ Terminal 3', "
+                 "'Terminal 1', 'Terminal 3', '05:30', '23:00')")
+    conn.execute("INSERT INTO linhas_onibus VALUES ('010', 'Terminal 1 ↔ Centro', "
+                 "'Terminal 1', 'Centro', '05:00', '23:30')")
+    return conn
+
+
+RESPOSTA_LINHA = "Ônibus 640 - Terminal 1 ↔ Terminal 3. De Terminal 1 para Terminal 3. Horário: 05:30-23:00."
+
+
+class TestSegmentacao(unittest.TestCase):
+    """Testes para a quebra das respostas em trechos"""
+
+    def test_resposta_de_linha(self):
+        """Testa o modelo principal de gerar_resposta"""
+        self.assertEqual(segmentar(RESPOSTA_LINHA), [
+            ('clipe', 'Ônibus'), ('clipe', '640'), ('pausa', PAUSAS['-']),
+            ('clipe', 'Terminal 1 ↔ Terminal 3'), ('pausa', PAUSAS['.']), ('clipe', 'De'),
+            ('clipe', 'Terminal 1'), ('clipe', 'para'), ('clipe', 'Terminal 3'),
+            ('pausa', PAUSAS['.']), ('clipe', 'Horário'), ('pausa', PAUSAS[':']),
+            ('clipe', '05:30-23:00'),
+        ])
+
+    def test_lista_de_linhas(self):
+        """Testa a lista de números separada por vírgulas"""
+        self.assertEqual(segmentar("Para centro, pegue: 010, 640."), [
+            ('clipe', 'Para'), ('clipe', 'centro'), ('pausa', PAUSAS[',']), ('clipe', 'pegue'),
+            ('pausa', PAUSAS[':']), ('clipe', '010'), ('pausa', PAUSAS[',']), ('clipe', '640'),
+        ])
+
+    def test_frase_sem_modelo(self):
+        """Testa que uma frase fora dos modelos vira um único clipe"""
+        self.assertEqual(segmentar("Google Maps  aberto"), [('clipe', 'Google Maps aberto')])
+
+    def test_fragmentos_cobrem_respostas(self):
+        """Testa que os trechos do banco bastam para montar as respostas"""
+        textos = fragmentos(criar_banco())
+        biblioteca = BibliotecaClipes({texto: clipe(texto) for texto in textos}, taxa=TAXA)
+        for resposta in (RESPOSTA_LINHA, "Para centro, pegue: 010, 640.",
+                         "Ônibus 010 - Informações disponíveis.", "Ônibus para japiim disponíveis.",
+                         "Modo Avatar Libras ativado"):
+            self.assertEqual(biblioteca.faltantes(resposta), [], resposta)
+
+
+class BancoVazio:
+    """Banco sem resposta, para os modelos de reserva de gerar_resposta"""
+
+    def obter_info_linha(self, numero):
+        return None
+
+    def obter_onibus_para_destino(self, destino):
+        return []
+
+
+class TestModelosDaInterface(unittest.TestCase):
+    """Testa as respostas reais de PIAManaus.gerar_resposta contra a biblioteca"""
+
+    PERGUNTAS = ['ônibus 640', 'linha 306', '120', 'quero o 815', 'ônibus 611', 'para o terminal',
+                 'centro', 'linha aeroporto', 'flores', 'cidade nova', 'japiim', 'bom dia']
+
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        import main
+        from database_module import BancoDadosOnibus
+        cls.gerar_resposta = staticmethod(main.PIAManaus.gerar_resposta)
+        cls.banco = BancoDadosOnibus()
+
+    def respostas(self, banco):
+        app = types.SimpleNamespace(banco_dados=banco)
+        return [self.gerar_resposta(app, pergunta) for pergunta in self.PERGUNTAS]
+
+    def test_todos_os_modelos_cobertos(self):
+        """Cada resposta casa com um modelo ou frase fixa e é montada só com clipes"""
+        textos = fragmentos(self.banco.conn)
+        biblioteca = BibliotecaClipes({texto: clipe(texto) for texto in textos}, taxa=TAXA)
+        respostas = self.respostas(self.banco) + self.respostas(BancoVazio())
+
+        usados = set()
+        for resposta in respostas:
+            modelos = [i for i, (padrao, _) in enumerate(_MODELOS) if padrao.fullmatch(resposta)]
+            self.assertTrue(modelos or resposta in FRASES_FIXAS, resposta)
+            usados.update(modelos)
+            self.assertEqual(biblioteca.faltantes(resposta), [], resposta)
+            self.assertIsNotNone(biblioteca.montar(resposta), resposta)
+        self.assertEqual(usados, set(range(len(_MODELOS))))
+
+
+class TestBibliotecaClipes(unittest.TestCase):
+    """Testes para a montagem e a construção da biblioteca"""
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio)
+
+    def test_montagem_com_crossfade(self):
+        """Testa o tamanho final e a transição entre clipes"""
+        biblioteca = BibliotecaClipes({'Para': clipe('Para'), 'centro': clipe('centro'),
+                                       'pegue': clipe('pegue'), '640': clipe('640')}, taxa=TAXA)
+        pcm = biblioteca.montar("Para centro, pegue: 640.")
+        self.assertEqual(pcm.dtype, np.int16)
+
+        n_crossfade = int(CROSSFADE * TAXA)
+        esperado = (4 * len(clipe('x')) + int(PAUSAS[','] * TAXA) + int(PAUSAS[':'] * TAXA)
+                    - 5 * n_crossfade)
+        self.assertEqual(len(pcm), esperado)
+        # A emenda passa de um clipe ao outro sem salto
+        emenda = pcm[len(clipe('x')) - n_crossfade:len(clipe('x'))]
+        self.assertTrue(np.all(np.diff(emenda.astype(int)) >= 0))
+        self.assertEqual(pcm[0], 104)
+        self.assertEqual(pcm[-1], 103)
+
+    def test_trecho_faltando(self):
+        """Testa que a montagem desiste se faltar um trecho"""
+        biblioteca = BibliotecaClipes({'Google Maps aberto': clipe('g')}, taxa=TAXA)
+        self.assertIsNotNone(biblioteca.montar("Google Maps aberto"))
+        self.assertIsNone(biblioteca.montar("Para centro, pegue: 640."))
+        self.assertEqual(biblioteca.faltantes("Ônibus para flores disponíveis."),
+                         ['Ônibus para', 'flores', 'disponíveis'])
+
+    def test_cortar_silencio(self):
+        """Testa que o silêncio das pontas sai e a margem fica"""
+        pcm = SintetizadorFalso()('abc')
+        cortado = cortar_silencio(pcm, TAXA, margem=0.01)
+        self.assertEqual(len(cortado), len(clipe('abc')) + 2 * int(0.01 * TAXA))
+
+    def test_construcao_incremental(self):
+        """Testa gravar, recarregar e só sintetizar o que falta"""
+        sintetizar = SintetizadorFalso()
+        resultado = construir_biblioteca(self.diretorio, ['640', 'centro'], sintetizar, taxa=TAXA)
+        self.assertEqual(resultado['novos'], 2)
+
+        resultado = construir_biblioteca(self.diretorio, ['640', 'centro', 'japiim'], sintetizar, taxa=TAXA)
+        self.assertEqual((resultado['novos'], resultado['existentes']), (1, 2))
+        self.assertEqual(sintetizar.chamadas, ['640', 'centro', 'japiim'])
+
+        biblioteca = BibliotecaClipes.carregar(self.diretorio)
+        self.assertEqual(biblioteca.taxa, TAXA)
+        self.assertEqual(len(biblioteca), 3)
+        self.assertIn('Centro', biblioteca)
+        self.assertEqual(biblioteca.clipes['japiim'].max(), 100 + len('japiim'))
+
+    def test_sem_biblioteca(self):
+        """Testa diretório sem biblioteca construída"""
+        self.assertIsNone(BibliotecaClipes.carregar(self.diretorio))
+
+
+if __name__ == '__main__':
+    unittest.main()
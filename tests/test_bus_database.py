@@ -0,0 +1,190 @@
+"""
+Testes unitários para o módulo bus_database
+"""
+import unittest
+import sys
+import os
+import gc
+import sqlite3
+import shutil
+import tempfile
+import threading
+from unittest import mock
+
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bus_database import BusDatabase, SCHEMA_VERSION
+
+
+class TestBusDatabase(unittest.TestCase):
+    """Testes para a classe BusDatabase"""
+
+    def setUp(self):
+        """Cria banco em diretório temporário"""
+        self.diretorio = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.diretorio, 'bus_system.db')
+        self.db = BusDatabase(self.db_path)
+
+    def tearDown(self):
+        """Limpeza executada após cada teste"""
+        self.db.close()
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_consultas(self):
+        """Testa consultas básicas de linhas"""
+        info = self.db.get_bus_info('640')
+        self.assertEqual(info[0], '640')
+        self.assertEqual(info[1], 'Coroado/Alvorada')
+
+        linhas = self.db.get_buses_to_destination('Centro')
+        self.assertEqual(sorted(l[0] for l in linhas), ['002', '120'])
+
+    def test_conexao_reutilizada_na_mesma_thread(self):
+        """Testa que a mesma thread sempre recebe a mesma conexão"""
+        self.assertIs(self.db.pool.connection(), self.db.pool.connection())
+
+    def test_conexao_por_thread(self):
+        """Testa que cada thread recebe sua própria conexão"""
+        conexoes = []
+        resultados = []
+
+        def consultar():
+            conexoes.append(self.db.pool.connection())
+            resultados.append(self.db.get_bus_info('120'))
+
+        threads = [threading.Thread(target=consultar) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(set(map(id, conexoes))), 4)
+        self.assertTrue(all(r[0] == '120' for r in resultados))
+
+    def test_conexao_fechada_quando_thread_termina(self):
+        """Testa que threads descartadas não deixam conexões abertas"""
+        conexoes = []
+        abertas_antes = self.db.pool.open_connections()
+
+        def consultar():
+            conexoes.append(self.db.pool.connection())
+            self.db.get_bus_info('120')
+
+        for _ in range(5):
+            thread = threading.Thread(target=consultar)
+            thread.start()
+            thread.join()
+        gc.collect()
+
+        self.assertEqual(self.db.pool.open_connections(), abertas_antes)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conexoes[0].execute('SELECT 1')
+
+    def test_dados_iniciais_inseridos_uma_vez(self):
+        """Testa que o seed não roda de novo em bancos já versionados"""
+        conn = self.db.pool.connection()
+        self.assertEqual(conn.execute('PRAGMA user_version').fetchone()[0], SCHEMA_VERSION)
+
+        conn.execute("DELETE FROM bus_routes WHERE route_number = '815'")
+        conn.commit()
+        self.db.close()
+
+        self.db = BusDatabase(self.db_path)
+        self.assertIsNone(self.db.get_bus_info('815'))
+
+    def test_banco_em_memoria_compartilhado(self):
+        """Testa que ':memory:' é visto por todas as threads"""
+        db = BusDatabase(':memory:')
+        resultados = []
+
+        thread = threading.Thread(target=lambda: resultados.append(db.get_bus_info('640')))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(resultados[0][0], '640')
+        db.close()
+
+
+class TestRegistroAssincrono(unittest.TestCase):
+    """Testes para o registro de interações em segundo plano"""
+
+    def setUp(self):
+        """Cria banco com registro assíncrono e intervalo longo"""
+        self.diretorio = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.diretorio, 'bus_system.db')
+        self.db = BusDatabase(self.db_path, async_logging=True,
+                              flush_interval=60, max_pending=3)
+
+    def tearDown(self):
+        """Limpeza executada após cada teste"""
+        self.db.close()
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def contar_interacoes(self):
+        conn = self.db.pool.connection()
+        return conn.execute('SELECT COUNT(*) FROM user_interactions').fetchone()[0]
+
+    def test_interacoes_gravadas_em_lote(self):
+        """Testa que interações só são gravadas no flush"""
+        self.db.log_interaction('onibus 640', 'Ônibus 640', 'voz', True)
+        self.db.log_interaction('centro', 'Para centro, pegue: 120.', 'libras', True)
+        self.assertEqual(self.contar_interacoes(), 0)
+
+        self.assertEqual(self.db.flush_interactions(), 2)
+        self.assertEqual(self.contar_interacoes(), 2)
+
+    def test_fila_limitada_descarta(self):
+        """Testa que a fila cheia descarta sem bloquear"""
+        for i in range(5):
+            self.db.log_interaction(f'pergunta {i}', 'resposta', 'voz', True)
+
+        self.assertEqual(self.db.log_writer.dropped, 2)
+        self.assertEqual(self.db.flush_interactions(), 3)
+
+    def test_close_grava_pendentes(self):
+        """Testa que close grava o que ainda estiver na fila"""
+        self.db.log_interaction('aeroporto', 'Para aeroporto, pegue: 120.', 'voz', True)
+        self.db.close()
+
+        db = BusDatabase(self.db_path)
+        conn = db.pool.connection()
+        registro = conn.execute(
+            'SELECT user_input, timestamp FROM user_interactions').fetchone()
+        self.assertEqual(registro[0], 'aeroporto')
+        self.assertIsNotNone(registro[1])
+        db.close()
+
+    def test_falha_na_gravacao_tenta_de_novo(self):
+        """Testa que um lote que falhou volta para o próximo flush"""
+        self.db.log_interaction('640', 'Ônibus 640', 'voz', True)
+        self.db.log_interaction('centro', 'Para centro, pegue: 120.', 'libras', True)
+
+        travado = mock.MagicMock()
+        travado.executemany.side_effect = sqlite3.OperationalError("database is locked")
+        with mock.patch.object(self.db.pool, 'connection', return_value=travado):
+            self.assertEqual(self.db.flush_interactions(), 0)
+        self.assertEqual(self.db.log_writer.pending(), 2)
+
+        self.db.log_interaction('aeroporto', 'Para aeroporto, pegue: 120.', 'voz', True)
+        self.assertEqual(self.db.flush_interactions(), 3)
+        self.assertEqual(self.contar_interacoes(), 3)
+        self.assertEqual(self.db.log_writer.dropped, 0)
+
+    def test_gravacao_periodica(self):
+        """Testa a gravação automática pela thread de fundo"""
+        db = BusDatabase(':memory:', async_logging=True, flush_interval=0.01)
+        db.log_interaction('640', 'Ônibus 640', 'voz', True)
+
+        conn = db.pool.connection()
+        for _ in range(200):
+            if conn.execute('SELECT COUNT(*) FROM user_interactions').fetchone()[0]:
+                break
+            threading.Event().wait(0.01)
+
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM user_interactions').fetchone()[0], 1)
+        db.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
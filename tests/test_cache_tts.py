@@ -0,0 +1,142 @@
+"""
+Testes unitários para o cache de áudios sintetizados
+"""
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+import threading
+import time
+
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from cache_tts import CacheAudio, chave_audio
+
+
+class SintetizadorFalso:
+    """Conta as sínteses; o áudio tem tamanho fixo"""
+
+    def __init__(self, tamanho=100, demora=0.0):
+        self.tamanho = tamanho
+        self.demora = demora
+        self.chamadas = []
+
+    def __call__(self, texto, idioma, lento):
+        time.sleep(self.demora)
+        self.chamadas.append(texto)
+        return texto.encode('utf-8')[:1] * self.tamanho
+
+
+class TestCacheAudio(unittest.TestCase):
+    """Testes para a classe CacheAudio"""
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio)
+
+    def test_chave(self):
+        """Testa que a chave depende de texto, idioma e velocidade"""
+        self.assertEqual(chave_audio('Ônibus  640 '), chave_audio('Ônibus 640'))
+        self.assertNotEqual(chave_audio('Ônibus 640'), chave_audio('Ônibus 640', lento=True))
+        self.assertNotEqual(chave_audio('Ônibus 640'), chave_audio('Ônibus 640', idioma='en'))
+
+    def test_repeticao_nao_sintetiza(self):
+        """Testa que a segunda vez vem do cache"""
+        cache = CacheAudio(self.diretorio)
+        sintetizar = SintetizadorFalso()
+        primeiro = cache.obter_ou_sintetizar('Linha 640', sintetizar)
+        segundo = cache.obter_ou_sintetizar('Linha 640', sintetizar)
+
+        self.assertEqual(primeiro, segundo)
+        self.assertEqual(sintetizar.chamadas, ['Linha 640'])
+        with open(primeiro, 'rb') as arquivo:
+            self.assertEqual(arquivo.read(), b'L' * 100)
+        self.assertEqual(cache.estatisticas()['acertos'], 1)
+
+    def test_descarta_menos_usados(self):
+        """Testa o limite de tamanho com descarte LRU"""
+        cache = CacheAudio(self.diretorio, limite_bytes=250)
+        sintetizar = SintetizadorFalso()
+        cache.obter_ou_sintetizar('a', sintetizar)
+        cache.obter_ou_sintetizar('b', sintetizar)
+        cache.obter('a')                                    # 'b' vira o menos usado
+        cache.obter_ou_sintetizar('c', sintetizar)
+
+        self.assertIsNotNone(cache.obter('a'))
+        self.assertIsNone(cache.obter('b'))
+        self.assertFalse(os.path.exists(cache.caminho(chave_audio('b'))))
+        self.assertEqual(cache.total_bytes, 200)
+
+    def test_em_uso_nao_e_apagado(self):
+        """Testa que o descarte pula áudios em uso e os apaga depois de liberados"""
+        cache = CacheAudio(self.diretorio, limite_bytes=150)
+        sintetizar = SintetizadorFalso()
+        with cache.usando('a', sintetizar) as caminho:
+            cache.obter_ou_sintetizar('b', sintetizar)
+            cache.obter_ou_sintetizar('c', sintetizar)      # 'a' é o menos usado, mas está aberto
+            self.assertTrue(os.path.exists(caminho))
+            self.assertIsNone(cache.obter('b'))
+            with open(caminho, 'rb') as arquivo:
+                self.assertEqual(arquivo.read(), b'a' * 100)
+
+        # Liberado, volta a valer o limite
+        self.assertFalse(os.path.exists(caminho))
+        self.assertEqual(cache.total_bytes, 100)
+
+    def test_indice_sobrevive_reinicio(self):
+        """Testa que outro processo encontra os áudios e limpa temporários"""
+        cache = CacheAudio(self.diretorio)
+        cache.obter_ou_sintetizar('Terminal 1', SintetizadorFalso())
+        with open(os.path.join(self.diretorio, '.tmp-abc'), 'wb') as arquivo:
+            arquivo.write(b'incompleto')
+
+        reaberto = CacheAudio(self.diretorio)
+        self.assertEqual(len(reaberto), 1)
+        self.assertIsNotNone(reaberto.obter('Terminal 1'))
+        self.assertEqual(len(os.listdir(self.diretorio)), 1)
+
+    def test_arquivo_apagado_por_fora(self):
+        """Testa que um áudio sumido vira falha e é sintetizado de novo"""
+        cache = CacheAudio(self.diretorio)
+        sintetizar = SintetizadorFalso()
+        caminho = cache.obter_ou_sintetizar('Centro', sintetizar)
+        os.unlink(caminho)
+
+        self.assertEqual(cache.obter_ou_sintetizar('Centro', sintetizar), caminho)
+        self.assertEqual(len(sintetizar.chamadas), 2)
+        self.assertEqual(cache.total_bytes, 100)
+
+    def test_falha_na_sintese(self):
+        """Testa que uma falha não deixa lixo nem trava o próximo pedido"""
+        cache = CacheAudio(self.diretorio)
+
+        def falhar(texto, idioma, lento):
+            raise ConnectionError("sem internet")
+
+        with self.assertRaises(ConnectionError):
+            cache.obter_ou_sintetizar('Aeroporto', falhar)
+        self.assertEqual(os.listdir(self.diretorio), [])
+        self.assertIsNotNone(cache.obter_ou_sintetizar('Aeroporto', SintetizadorFalso()))
+
+    def test_pedidos_simultaneos(self):
+        """Testa que a mesma frase pedida ao mesmo tempo é sintetizada uma vez"""
+        cache = CacheAudio(self.diretorio)
+        sintetizar = SintetizadorFalso(demora=0.05)
+        caminhos = []
+        threads = [threading.Thread(target=lambda: caminhos.append(
+            cache.obter_ou_sintetizar('Qual ônibus?', sintetizar))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(sintetizar.chamadas), 1)
+        self.assertEqual(len(set(caminhos)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
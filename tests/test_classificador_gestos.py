@@ -0,0 +1,101 @@
+"""
+Testes unitários para o classificador vetorizado de gestos
+"""
+import unittest
+import sys
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from classificador_gestos import (
+    ClassificadorGestos, CARACTERISTICAS, calcular_caracteristicas, landmarks_para_array
+)
+
+
+def criar_mao(polegar, pontas, bases=((280, 320), (300, 315), (320, 320), (338, 330)),
+              punho=(300, 400)):
+    """Mão sintética (21, 3) em pixels com articulações interpoladas"""
+    pontos = np.zeros((21, 3), dtype=np.float32)
+    pontos[0, :2] = punho
+
+    # Polegar: CMC, MCP e IP entre o punho e a ponta
+    for i, t in enumerate((0.25, 0.5, 0.75, 1.0), start=1):
+        pontos[i, :2] = np.add(punho, np.multiply(t, np.subtract(polegar, punho)))
+
+    # Demais dedos: base, duas articulações e ponta
+    for dedo, (base, ponta) in enumerate(zip(bases, pontas)):
+        inicio = 5 + 4 * dedo
+        for j, t in enumerate((0.0, 1 / 3, 2 / 3, 1.0)):
+            pontos[inicio + j, :2] = np.add(base, np.multiply(t, np.subtract(ponta, base)))
+    return pontos
+
+
+MAO_ABERTA = criar_mao((200, 330), ((260, 220), (300, 200), (340, 215), (380, 250)),
+                       bases=((270, 315), (300, 310), (330, 315), (355, 325)))
+POLEGAR_PARA_CIMA = criar_mao((250, 260), ((285, 345), (303, 342), (320, 345), (335, 350)))
+INDICADOR_PARA_CIMA = criar_mao((270, 350), ((280, 200), (303, 342), (320, 345), (335, 350)))
+
+
+class TestClassificadorGestos(unittest.TestCase):
+    """Testes para a classe ClassificadorGestos"""
+
+    def setUp(self):
+        self.classificador = ClassificadorGestos()
+
+    def test_gestos_basicos(self):
+        """Testa os gestos da tabela padrão, todas as mãos de uma vez"""
+        maos = np.stack([MAO_ABERTA, POLEGAR_PARA_CIMA, INDICADOR_PARA_CIMA])
+        self.assertEqual(self.classificador.classificar(maos), ['terminal', 'onibus', 'qual'])
+
+    def test_invariante_a_escala_e_posicao(self):
+        """Testa que a mesma mão mais perto ou deslocada dá o mesmo gesto"""
+        maos = np.stack([MAO_ABERTA, POLEGAR_PARA_CIMA, INDICADOR_PARA_CIMA])
+        transformadas = maos * 0.4 + np.array([100, -50, 0], dtype=np.float32)
+
+        np.testing.assert_allclose(calcular_caracteristicas(transformadas)[:, :13],
+                                   calcular_caracteristicas(maos)[:, :13], rtol=1e-4, atol=1e-4)
+        self.assertEqual(self.classificador.classificar(transformadas),
+                         self.classificador.classificar(maos))
+
+    def test_caracteristicas(self):
+        """Testa formato e valores das características"""
+        caracteristicas = calcular_caracteristicas(POLEGAR_PARA_CIMA[None])
+        self.assertEqual(caracteristicas.shape, (1, len(CARACTERISTICAS)))
+        np.testing.assert_array_equal(caracteristicas[0, :5], [1, 0, 0, 0, 0])
+
+        # Dedos esticados em linha reta não têm flexão
+        aberta = calcular_caracteristicas(MAO_ABERTA[None])[0]
+        np.testing.assert_allclose(aberta[-4:], 0, atol=0.1)
+
+    def test_sem_maos(self):
+        """Testa lote vazio"""
+        self.assertEqual(self.classificador.classificar(np.empty((0, 21, 3))), [])
+
+    def test_regra_nova(self):
+        """Testa gesto acrescentado à tabela"""
+        classificador = ClassificadorGestos(regras=[])
+        self.assertEqual(classificador.classificar(MAO_ABERTA[None]), [None])
+
+        classificador.adicionar_regra('tchau', {'dist_polegar_indicador': (1.0, None)})
+        self.assertEqual(classificador.classificar(MAO_ABERTA[None]), ['tchau'])
+
+        with self.assertRaises(ValueError):
+            classificador.adicionar_regra('invalido', {'inexistente': (0, 1)})
+
+    def test_landmarks_para_array(self):
+        """Testa conversão dos landmarks do MediaPipe para pixels"""
+        ponto = SimpleNamespace(x=0.5, y=0.25, z=-0.1)
+        mao = SimpleNamespace(landmark=[ponto] * 21)
+
+        maos = landmarks_para_array([mao, mao], 640, 480)
+        self.assertEqual(maos.shape, (2, 21, 3))
+        np.testing.assert_allclose(maos[1, 0], [320, 120, -64])
+        self.assertEqual(landmarks_para_array(None, 640, 480).shape, (0, 21, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,6 +9,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from database_module_enhanced import BancoDadosOnibusEnhanced
+from database_module import BancoDadosOnibus as BancoDadosInterface
 
 
 class TestBancoDadosOnibus(unittest.TestCase):
@@ -64,7 +65,7 @@ class TestBancoDadosOnibus(unittest.TestCase):
         """Testa busca de ônibus por destino"""
         linhas = self.db.obter_onibus_para_destino('centro')
         
-        self.assertIsInstance(linhas, list)
+        self.assertIsInstance(linhas, tuple)
         self.assertGreater(len(linhas), 0)
         
         # Verificar estrutura dos resultados
@@ -112,6 +113,65 @@ class TestBancoDadosOnibus(unittest.TestCase):
             self.assertIn('linhas', terminal)
             self.assertIsInstance(terminal['linhas'], list)
     
+    def test_relacao_terminal_linhas(self):
+        """Testa a migração de linhas_atendidas para terminal_linhas"""
+        cursor = self.db.conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM terminal_linhas')
+        self.assertEqual(cursor.fetchone()[0], 11)
+        
+        terminais = {t['nome']: t['linhas'] for t in self.db.obter_todos_terminais()}
+        self.assertEqual(terminais['Terminal 1 - T1'], ['010', '640', '455', 'A001'])
+    
+    def test_obter_terminais_da_linha(self):
+        """Testa a busca reversa: terminais que atendem uma linha"""
+        terminais = self.db.obter_terminais_da_linha('640')
+        self.assertEqual([t['nome'] for t in terminais],
+                         ['Terminal 1 - T1', 'Terminal 3 - T3'])
+        self.assertEqual(self.db.obter_terminais_da_linha('999'), ())
+    
+    def test_obter_linhas_do_terminal(self):
+        """Testa a busca de linhas por nome de terminal"""
+        linhas = self.db.obter_linhas_do_terminal('Terminal 2')
+        self.assertEqual([l['numero'] for l in linhas], ['510', '670', 'A002'])
+        
+        linhas = self.db.obter_linhas_do_terminal('Terminal 4 - T4')
+        self.assertEqual([l['numero'] for l in linhas], ['201', '300'])
+    
+    def test_migracao_banco_antigo(self):
+        """Testa que bancos sem a relação são migrados ao abrir"""
+        import shutil
+        import tempfile
+        
+        diretorio = tempfile.mkdtemp()
+        caminho = os.path.join(diretorio, 'antigo.db')
+        try:
+            db = BancoDadosOnibusEnhanced(caminho)
+            db.conn.execute('DROP TABLE terminal_linhas')
+            db.conn.execute("UPDATE terminais SET linhas_atendidas = '201,300' "
+                            "WHERE nome = 'Terminal 4 - T4'")
+            db.conn.commit()
+            db.fechar()
+            
+            db = BancoDadosOnibusEnhanced(caminho)
+            self.assertEqual([t['nome'] for t in db.obter_terminais_da_linha('201')],
+                             ['Terminal 4 - T4'])
+            
+            # Lista gravada depois por uma versão antiga substitui a do terminal
+            db.conn.execute("UPDATE terminais SET linhas_atendidas = '418' "
+                            "WHERE nome = 'Terminal 4 - T4'")
+            db.conn.commit()
+            db.fechar()
+            
+            db = BancoDadosOnibusEnhanced(caminho)
+            self.assertEqual([l['numero'] for l in db.obter_linhas_do_terminal('Terminal 4')],
+                             ['418'])
+            restantes = db.conn.execute(
+                'SELECT COUNT(*) FROM terminais WHERE linhas_atendidas IS NOT NULL').fetchone()[0]
+            self.assertEqual(restantes, 0)
+            db.fechar()
+        finally:
+            shutil.rmtree(diretorio, ignore_errors=True)
+    
     def test_buscar_linhas(self):
         """Testa busca de linhas por termo"""
         # Buscar por número
@@ -170,6 +230,113 @@ class TestBancoDadosOnibus(unittest.TestCase):
             self.assertEqual(len(linhas[0]), 2)
         
         db_compat.fechar()
+    
+    def test_indice_busca_criado(self):
+        """Testa se o índice de texto completo é criado e populado"""
+        self.assertTrue(self.db.fts_ativo)
+        
+        cursor = self.db.conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM linhas_busca')
+        total_indice = cursor.fetchone()[0]
+        cursor.execute('SELECT COUNT(*) FROM linhas_onibus')
+        self.assertEqual(total_indice, cursor.fetchone()[0])
+    
+    def test_buscar_linhas_sem_acentos(self):
+        """Testa se a busca ignora acentos ("sao jose" encontra "São José")"""
+        linhas = self.db.buscar_linhas('sao jose')
+        numeros = [linha['numero'] for linha in linhas]
+        
+        self.assertIn('510', numeros)
+        self.assertIn('611', numeros)
+        
+        linhas = self.db.obter_onibus_para_destino('COLONIA terra')
+        self.assertEqual([linha['numero'] for linha in linhas], ['520'])
+    
+    def test_buscar_linhas_ranqueada(self):
+        """Testa se linhas com mais ocorrências do termo vêm primeiro"""
+        linhas = self.db.buscar_linhas('terminal 1')
+        self.assertGreater(len(linhas), 0)
+        # A circular do Terminal 1 cita o termo em todas as colunas
+        self.assertEqual(linhas[0]['numero'], 'A001')
+    
+    def test_indice_acompanha_alteracoes(self):
+        """Testa se os triggers mantêm o índice sincronizado"""
+        cursor = self.db.conn.cursor()
+        cursor.execute('''
+            INSERT INTO linhas_onibus VALUES
+            ('999', 'Manaquiri ↔ Centro', 'Manaquiri', 'Centro',
+             '06:00', '20:00', 60, 6.00, 0, 0, 'Intermunicipal')
+        ''')
+        self.assertEqual(
+            [l['numero'] for l in self.db.buscar_linhas('manaquiri')], ['999'])
+        
+        cursor.execute('''
+            UPDATE linhas_onibus SET nome = 'Iranduba ↔ Centro', origem = 'Iranduba'
+            WHERE numero = '999'
+        ''')
+        self.db.invalidar_cache()
+        self.assertEqual(self.db.buscar_linhas('manaquiri'), ())
+        self.assertEqual(
+            [l['numero'] for l in self.db.buscar_linhas('iranduba')], ['999'])
+        
+        cursor.execute("DELETE FROM linhas_onibus WHERE numero = '999'")
+        self.db.invalidar_cache()
+        self.assertEqual(self.db.buscar_linhas('iranduba'), ())
+    
+    def test_cache_consultas(self):
+        """Testa acertos do cache e invalidação explícita"""
+        primeira = self.db.obter_info_linha('640')
+        self.assertIs(self.db.obter_info_linha('640'), primeira)
+        with self.assertRaises(TypeError):
+            primeira['nome'] = 'alterado por quem chamou'
+        
+        self.assertIsNone(self.db.obter_info_linha('999'))
+        self.assertIsNone(self.db.obter_info_linha('999'))
+        
+        estatisticas = self.db.estatisticas_cache()
+        self.assertEqual(estatisticas['acertos'], 2)
+        self.assertEqual(estatisticas['falhas'], 2)
+        
+        cursor = self.db.conn.cursor()
+        cursor.execute("UPDATE linhas_onibus SET tarifa = 5.00 WHERE numero = '640'")
+        self.assertEqual(self.db.obter_info_linha('640')['tarifa'], 4.50)
+        
+        self.db.invalidar_cache()
+        self.assertEqual(self.db.obter_info_linha('640')['tarifa'], 5.00)
+    
+    def test_cache_desativado(self):
+        """Testa que usar_cache=False consulta sempre o banco"""
+        db = BancoDadosOnibusEnhanced(':memory:', usar_cache=False)
+        self.assertIsNot(db.obter_info_linha('640'), db.obter_info_linha('640'))
+        self.assertIsNone(db.estatisticas_cache())
+        db.fechar()
+    
+    def test_reconstruir_indice_busca(self):
+        """Testa a reconstrução do índice de texto completo"""
+        self.assertTrue(self.db.reconstruir_indice_busca())
+        self.assertGreater(len(self.db.buscar_linhas('aeroporto')), 0)
+
+
+class TestBancoDadosInterface(unittest.TestCase):
+    """Testes para o banco em memória consultado por PIAManaus.gerar_resposta"""
+    
+    def test_cache_na_consulta_da_interface(self):
+        """Testa que perguntas repetidas saem do cache, sem cópias"""
+        db = BancoDadosInterface()
+        
+        info = db.obter_info_linha('640')
+        self.assertEqual(info[1], 'Terminal 1 ↔ Terminal 3')
+        self.assertIs(db.obter_info_linha('640'), info)
+        self.assertIsInstance(info, tuple)
+        
+        onibus = db.obter_onibus_para_destino('centro')
+        self.assertIs(db.obter_onibus_para_destino('centro'), onibus)
+        self.assertEqual(db.estatisticas_cache()['acertos'], 2)
+        
+        db.conn.execute("UPDATE linhas_onibus SET horario = '06:00-22:00' WHERE numero = '640'")
+        self.assertEqual(db.obter_info_linha('640')[4], '05:30-23:00')
+        db.invalidar_cache()
+        self.assertEqual(db.obter_info_linha('640')[4], '06:00-22:00')
 
 
 class TestPerformanceBancoDados(unittest.TestCase):
@@ -210,6 +377,7 @@ def run_tests():
     
     # Adicionar testes
     suite.addTests(loader.loadTestsFromTestCase(TestBancoDadosOnibus))
+    suite.addTests(loader.loadTestsFromTestCase(TestBancoDadosInterface))
     suite.addTests(loader.loadTestsFromTestCase(TestPerformanceBancoDados))
     
     # Executar testes
@@ -0,0 +1,153 @@
+"""
+Testes unitários para a fila de fala com prioridade
+"""
+import unittest
+import sys
+import os
+import threading
+
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from fila_fala import FilaFala, PRIORIDADE_AVISO, PRIORIDADE_RESPOSTA
+
+
+class VozFalsa:
+    """Registra o que foi falado; cada fala dura até ser liberada ou interrompida"""
+
+    def __init__(self, automatica=False):
+        self.falados = []
+        self.interrompidos = []
+        self.comecou = threading.Event()
+        self.liberar = threading.Event()
+        if automatica:
+            self.liberar.set()
+
+    def __call__(self, texto, parar):
+        self.falados.append(texto)
+        self.comecou.set()
+        while not self.liberar.is_set():
+            if parar.wait(0.005):
+                self.interrompidos.append(texto)
+                return
+
+    def esperar_inicio(self):
+        comecou = self.comecou.wait(2.0)
+        self.comecou.clear()
+        return comecou
+
+
+class TestFilaFala(unittest.TestCase):
+    """Testes para a classe FilaFala"""
+
+    def setUp(self):
+        self.voz = VozFalsa()
+        self.fila = FilaFala(self.voz)
+
+    def tearDown(self):
+        self.fila.parar()
+
+    def test_nada_se_perde_quando_ocupada(self):
+        """Testa que falas pedidas durante outra fala são ditas depois, em ordem"""
+        self.fila.dizer("Linha 640")
+        self.assertTrue(self.voz.esperar_inicio())
+        self.fila.dizer("Linha 306")
+        self.fila.dizer("Linha 120")
+        self.voz.liberar.set()
+
+        self.assertTrue(self.fila.esperar(2.0))
+        self.assertEqual(self.voz.falados, ["Linha 640", "Linha 306", "Linha 120"])
+        self.assertEqual(self.fila.estatisticas()['falados'], 3)
+
+    def test_resposta_interrompe_aviso(self):
+        """Testa a preempção de um aviso por uma resposta"""
+        self.fila.dizer("Google Maps aberto", PRIORIDADE_AVISO)
+        self.assertTrue(self.voz.esperar_inicio())
+        self.fila.dizer("Ônibus 640", PRIORIDADE_RESPOSTA)
+        self.voz.liberar.set()
+
+        self.assertTrue(self.fila.esperar(2.0))
+        self.assertEqual(self.voz.interrompidos, ["Google Maps aberto"])
+        self.assertEqual(self.voz.falados, ["Google Maps aberto", "Ônibus 640"])
+        self.assertEqual(self.fila.estatisticas()['interrompidos'], 1)
+
+    def test_resposta_passa_na_frente(self):
+        """Testa a ordem por prioridade dos pendentes; aviso não interrompe resposta"""
+        self.fila.dizer("Ônibus 640")
+        self.assertTrue(self.voz.esperar_inicio())
+        self.fila.dizer("Modo Avatar Libras ativado", PRIORIDADE_AVISO)
+        self.fila.dizer("Ônibus 306")
+        self.voz.liberar.set()
+
+        self.assertTrue(self.fila.esperar(2.0))
+        self.assertEqual(self.voz.falados, ["Ônibus 640", "Ônibus 306", "Modo Avatar Libras ativado"])
+        self.assertEqual(self.voz.interrompidos, [])
+
+    def test_coalescencia(self):
+        """Testa que textos repetidos viram um só pedido"""
+        atual = self.fila.dizer("Ônibus 640")
+        self.assertTrue(self.voz.esperar_inicio())
+        self.assertIs(self.fila.dizer("Ônibus  640"), atual)
+
+        aviso = self.fila.dizer("Google Maps aberto", PRIORIDADE_AVISO)
+        self.fila.dizer("Ônibus 306")
+        # Repetido como resposta: o aviso sobe de prioridade (mantendo a ordem
+        # de chegada) em vez de duplicar
+        self.assertIs(self.fila.dizer("Google Maps aberto"), aviso)
+        self.assertEqual(len(self.fila), 2)
+        self.voz.liberar.set()
+
+        self.assertTrue(self.fila.esperar(2.0))
+        self.assertEqual(self.voz.falados, ["Ônibus 640", "Google Maps aberto", "Ônibus 306"])
+
+    def test_cancelamento(self):
+        """Testa cancelar um pedido pendente e o que está sendo falado"""
+        atual = self.fila.dizer("Ônibus 640")
+        self.assertTrue(self.voz.esperar_inicio())
+        pendente = self.fila.dizer("Ônibus 306")
+        self.fila.dizer("Ônibus 120")
+
+        pendente.cancelar()
+        atual.cancelar()
+        self.assertTrue(self.voz.esperar_inicio())
+        self.voz.liberar.set()
+
+        self.assertTrue(self.fila.esperar(2.0))
+        self.assertEqual(self.voz.falados, ["Ônibus 640", "Ônibus 120"])
+        self.assertEqual(self.voz.interrompidos, ["Ônibus 640"])
+
+    def test_aviso_expirado_e_pulado(self):
+        """Testa que um aviso velho não é falado fora de hora"""
+        self.fila.dizer("Ônibus 640")
+        self.assertTrue(self.voz.esperar_inicio())
+        self.fila.dizer("Google Maps aberto", PRIORIDADE_AVISO, validade=0.0)
+        self.fila.dizer("Modo Avatar Libras ativado", PRIORIDADE_AVISO)
+        self.voz.liberar.set()
+
+        self.assertTrue(self.fila.esperar(2.0))
+        self.assertEqual(self.voz.falados, ["Ônibus 640", "Modo Avatar Libras ativado"])
+        self.assertEqual(self.fila.estatisticas()['pulados'], 1)
+
+    def test_capacidade(self):
+        """Testa que, cheia, a fila descarta o aviso menos prioritário"""
+        self.fila.capacidade = 2
+        self.fila.dizer("Ônibus 640")
+        self.assertTrue(self.voz.esperar_inicio())
+        aviso = self.fila.dizer("Google Maps aberto", PRIORIDADE_AVISO)
+        self.fila.dizer("Ônibus 306")
+        self.fila.dizer("Ônibus 120")
+
+        self.assertTrue(aviso.cancelado)
+        self.assertEqual(len(self.fila), 2)
+
+    def test_parar_interrompe(self):
+        """Testa que parar corta a fala atual e encerra a thread"""
+        atual = self.fila.dizer("Ônibus 640")
+        self.assertTrue(self.voz.esperar_inicio())
+        self.fila.parar()
+        self.assertTrue(atual.cancelado)
+        self.assertFalse(self.fila._thread.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
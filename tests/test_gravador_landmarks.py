@@ -0,0 +1,175 @@
+"""
+Testes unitários para a gravação binária de landmarks
+"""
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+
+import numpy as np
+
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from gravador_landmarks import GravadorLandmarks, LeitorLandmarks, REGISTRO
+from fontes_frames import abrir_fonte, FonteGravacao
+from modelo_gestos import GravadorDataset
+
+
+def mao(deslocamento):
+    return (np.arange(63, dtype=np.float32).reshape(21, 3) + deslocamento)
+
+
+class TestGravadorLandmarks(unittest.TestCase):
+    """Testes para GravadorLandmarks e LeitorLandmarks"""
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.caminho = os.path.join(self.diretorio, 'captura.lmk')
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio)
+
+    def gravar(self, quadros, tamanho_bloco=4):
+        with GravadorLandmarks(self.caminho, tamanho_bloco=tamanho_bloco) as gravador:
+            for quadro in range(quadros):
+                gravador.adicionar(mao(quadro)[None], rotulo='onibus' if quadro % 2 else None,
+                                   previstos=['terminal'], quadro=quadro, tempo=100.0 + quadro)
+        return gravador
+
+    def test_ida_e_volta(self):
+        """Testa que todos os campos voltam iguais, atravessando blocos"""
+        gravador = self.gravar(10)
+        self.assertEqual(gravador.registros, 10)
+
+        leitor = LeitorLandmarks(self.caminho)
+        self.assertEqual(len(leitor.indice), 3)
+        self.assertEqual(len(leitor), 10)
+
+        registros = leitor.ler_tudo()
+        self.assertEqual(registros.dtype, REGISTRO)
+        np.testing.assert_array_equal(registros['quadro'], np.arange(10))
+        np.testing.assert_array_equal(registros['tempo'], 100.0 + np.arange(10))
+        np.testing.assert_array_equal(registros['landmarks'][7], mao(7))
+        self.assertEqual(registros['rotulo'][:2].tolist(), [b'', b'onibus'])
+        self.assertEqual(set(registros['previsto']), {b'terminal'})
+
+    def test_lotes_de_tamanho_fixo(self):
+        """Testa lotes que não coincidem com os blocos do arquivo"""
+        self.gravar(10)
+        lotes = list(LeitorLandmarks(self.caminho).lotes(tamanho=3))
+        self.assertEqual([len(lote) for lote in lotes], [3, 3, 3, 1])
+        np.testing.assert_array_equal(np.concatenate(lotes)['quadro'], np.arange(10))
+
+    def test_continua_arquivo_existente(self):
+        """Testa que reabrir o arquivo acrescenta sem perder o que havia"""
+        self.gravar(5)
+        with GravadorLandmarks(self.caminho) as gravador:
+            gravador.adicionar(np.stack([mao(50), mao(60)]), quadro=0)
+
+        registros = LeitorLandmarks(self.caminho).ler_tudo()
+        self.assertEqual(len(registros), 7)
+        self.assertEqual(registros['mao'][-2:].tolist(), [0, 1])
+
+    def test_ignora_bloco_incompleto(self):
+        """Testa que um bloco cortado no fim (queda de energia) é descartado"""
+        self.gravar(10)
+        tamanho = os.path.getsize(self.caminho)
+        with open(self.caminho, 'r+b') as arquivo:
+            arquivo.truncate(tamanho - 5)
+
+        leitor = LeitorLandmarks(self.caminho)
+        self.assertEqual(len(leitor), 8)
+        self.assertEqual(len(leitor.ler_tudo()), 8)
+
+    def test_continua_depois_de_bloco_cortado(self):
+        """Testa reabrir e gravar depois de uma queda de energia no meio de um bloco"""
+        self.gravar(8)
+        tamanho = os.path.getsize(self.caminho)
+        with open(self.caminho, 'r+b') as arquivo:
+            arquivo.truncate(tamanho - 10)
+
+        with GravadorLandmarks(self.caminho, tamanho_bloco=4) as gravador:
+            for quadro in range(100, 108):
+                gravador.adicionar(mao(quadro)[None], quadro=quadro)
+
+        leitor = LeitorLandmarks(self.caminho)
+        registros = leitor.ler_tudo()
+        self.assertEqual(len(leitor), 12)
+        self.assertEqual(len(registros), 12)
+        self.assertEqual(registros['quadro'].tolist(),
+                         list(range(4)) + list(range(100, 108)))
+
+    def test_crc_invalido_fora_da_contagem(self):
+        """Testa que len() conta só blocos com CRC válido"""
+        self.gravar(8)
+        with open(self.caminho, 'r+b') as arquivo:
+            arquivo.seek(-1, os.SEEK_END)
+            ultimo = arquivo.read(1)
+            arquivo.seek(-1, os.SEEK_END)
+            arquivo.write(bytes([ultimo[0] ^ 0xFF]))
+
+        leitor = LeitorLandmarks(self.caminho)
+        self.assertEqual(len(leitor), 4)
+        self.assertEqual(len(leitor.ler_tudo()), 4)
+
+    def test_rejeita_outro_formato(self):
+        """Testa arquivo que não é uma gravação de landmarks"""
+        with open(self.caminho, 'wb') as arquivo:
+            arquivo.write(b'nao sou lmk')
+        with self.assertRaises(ValueError):
+            LeitorLandmarks(self.caminho)
+        with self.assertRaises(ValueError):
+            GravadorLandmarks(self.caminho)
+
+    def test_adicionar_depois_de_fechar(self):
+        """Testa que a thread produtora não falha depois do fechamento"""
+        gravador = self.gravar(2)
+        gravador.adicionar(mao(0)[None])
+        self.assertEqual(len(LeitorLandmarks(self.caminho)), 2)
+
+    def test_amostras_para_treino(self):
+        """Testa a leitura das mãos rotuladas pelo GravadorDataset"""
+        self.gravar(10)
+        leitor = LeitorLandmarks(self.caminho)
+        landmarks, rotulos = leitor.amostras_rotuladas()
+        self.assertEqual(landmarks.shape, (5, 21, 3))
+        self.assertEqual(set(rotulos), {'onibus'})
+
+        _, rotulos = leitor.amostras_rotuladas(usar_previstos=True)
+        self.assertEqual(sorted(set(rotulos)), ['onibus', 'terminal'])
+
+        landmarks, rotulos = GravadorDataset.carregar(self.diretorio)
+        self.assertEqual(len(rotulos), 5)
+
+    def test_rotulo_acentuado_cortado(self):
+        """Testa que o corte em 16 bytes não parte um caractere acentuado"""
+        rotulo = 'próxima estação'
+        self.assertEqual(len(rotulo.encode('utf-8')), 18)       # 'ã' nos bytes 16 e 17
+        with GravadorLandmarks(self.caminho) as gravador:
+            gravador.adicionar(mao(0)[None], rotulo=rotulo, previstos=['informação'], quadro=0)
+
+        leitor = LeitorLandmarks(self.caminho)
+        self.assertEqual(leitor.ler_tudo()['rotulo'][0].decode('utf-8'), 'próxima estaç')
+        _, rotulos = leitor.amostras_rotuladas()
+        self.assertEqual(rotulos.tolist(), ['próxima estaç'])
+        amostra = next(abrir_fonte(self.caminho).amostras())
+        self.assertEqual(amostra['rotulo'], 'próxima estaç')
+
+    def test_fonte_para_benchmark(self):
+        """Testa o replay: mãos do mesmo quadro juntas e lacunas sem mão"""
+        with GravadorLandmarks(self.caminho, tamanho_bloco=3) as gravador:
+            gravador.adicionar(np.stack([mao(0), mao(1)]), rotulo='qual', quadro=0)
+            gravador.adicionar(np.stack([mao(2), mao(3)]), rotulo='qual', quadro=1)
+            gravador.adicionar(mao(4)[None], quadro=4)
+
+        fonte = abrir_fonte(self.caminho)
+        self.assertIsInstance(fonte, FonteGravacao)
+        amostras = list(fonte.amostras())
+        self.assertEqual([len(a['landmarks']) for a in amostras], [2, 2, 0, 0, 1])
+        self.assertEqual([a['rotulo'] for a in amostras], ['qual', 'qual', None, None, None])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Testes unitários para a previsão de próximas partidas
+"""
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import types
+from datetime import datetime, date
+
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database_module_enhanced import BancoDadosOnibusEnhanced
+from importador_gtfs import ImportadorGTFS
+from horarios_partida import MotorPartidas
+from libras_model import LibrasLibrary
+from test_importador_gtfs import FEED_EXEMPLO
+
+
+class TestMotorPartidas(unittest.TestCase):
+    """Testes com horários gerados a partir das linhas"""
+
+    def setUp(self):
+        self.db = BancoDadosOnibusEnhanced(':memory:')
+        self.motor = MotorPartidas(self.db)
+
+    def tearDown(self):
+        self.db.fechar()
+
+    def test_proximas_partidas(self):
+        """Testa partidas a partir do intervalo da linha"""
+        partidas = self.motor.proximas_partidas('640', 3, datetime(2026, 10, 19, 8, 5))
+        self.assertEqual([p['horario'] for p in partidas], ['08:10', '08:20', '08:30'])
+        self.assertEqual(partidas[0]['minutos'], 5)
+
+    def test_servico_ate_meia_noite(self):
+        """Testa linha com horario_fim '00:00'"""
+        partidas = self.motor.proximas_partidas('120', 2, datetime(2026, 10, 19, 23, 45))
+        self.assertEqual([p['horario'] for p in partidas], ['00:00', '05:00'])
+        self.assertEqual(partidas[0]['minutos'], 15)
+
+    def test_depois_da_ultima_partida(self):
+        """Testa que depois do fim do serviço vêm as partidas do dia seguinte"""
+        partidas = self.motor.proximas_partidas('640', 1, datetime(2026, 10, 19, 23, 30))
+        self.assertEqual(partidas, [{'horario': '05:30', 'minutos': 360}])
+
+    def test_tabela_calculada_uma_vez_por_dia(self):
+        """Testa o cache de tabelas por dia de serviço"""
+        agora = datetime(2026, 10, 19, 8, 0)
+        self.motor.proximas_partidas('640', 1, agora)
+        tabela = self.motor.tabela_do_dia(date(2026, 10, 19))
+        self.motor.proximas_partidas('306', 1, agora)
+        self.assertIs(self.motor.tabela_do_dia(date(2026, 10, 19)), tabela)
+
+    def test_linha_inexistente(self):
+        """Testa linha desconhecida"""
+        self.assertEqual(self.motor.proximas_partidas('999'), [])
+
+    def test_resposta_libras(self):
+        """Testa a resposta de horário da LibrasLibrary"""
+        biblioteca = LibrasLibrary(self.motor)
+        resposta = biblioteca.gerar_resposta_inteligente('que horas passa o 640')
+        self.assertIn('LINHA 640', resposta)
+        self.assertIn('Próximas partidas', resposta)
+
+        resposta = biblioteca.gerar_resposta_inteligente('que horas passa o onibus')
+        self.assertIn('PRÓXIMAS PARTIDAS', resposta)
+
+    def test_resposta_interface(self):
+        """Testa as perguntas de horário em PIAManaus.gerar_resposta"""
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        import main
+        app = types.SimpleNamespace(
+            banco_dados=None, motor_partidas=self.motor,
+            gerar_resposta_partidas=main.PIAManaus.gerar_resposta_partidas)
+
+        resposta = main.PIAManaus.gerar_resposta(app, 'que horas passa o 640')
+        self.assertRegex(resposta, r'^Ônibus 640: próximas partidas às '
+                                   r'\d\d:\d\d, \d\d:\d\d e \d\d:\d\d\.$')
+        resposta = main.PIAManaus.gerar_resposta(app, 'que horas chega o onibus')
+        self.assertRegex(resposta, r'^Próximas partidas: \w+ às \d\d:\d\d')
+
+
+class TestMotorPartidasGTFS(unittest.TestCase):
+    """Testes com horários de um feed GTFS importado"""
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        for nome, conteudo in FEED_EXEMPLO.items():
+            with open(os.path.join(self.diretorio, nome), 'w', encoding='utf-8') as arquivo:
+                arquivo.write(conteudo)
+        self.db = BancoDadosOnibusEnhanced(':memory:')
+        ImportadorGTFS(self.db).importar(self.diretorio)
+        self.motor = MotorPartidas(self.db)
+
+    def tearDown(self):
+        self.db.fechar()
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_partidas_gtfs(self):
+        """Testa partidas do feed, inclusive viagem que passa da meia-noite"""
+        segunda = datetime(2026, 10, 19, 5, 35)
+        partidas = self.motor.proximas_partidas('640', 3, segunda)
+        self.assertEqual([p['horario'] for p in partidas], ['05:40', '23:50', '05:30'])
+
+    def test_sentidos_separados(self):
+        """Testa que a volta (direction_id 1) não se mistura com a ida"""
+        segunda = datetime(2026, 10, 19, 5, 35)
+        self.assertEqual(self.motor.sentidos('640'), [0, 1])
+        partidas = self.motor.proximas_partidas('640', 2, segunda, sentido=1)
+        self.assertEqual([p['horario'] for p in partidas], ['06:30', '06:30'])
+        self.assertEqual(partidas[1]['minutos'], 24 * 60 + 55)
+
+    def test_calendario(self):
+        """Testa que o serviço de dias úteis não roda no fim de semana"""
+        sabado = datetime(2026, 10, 17, 12, 0)
+        partidas = self.motor.proximas_partidas('640', 1, sabado)
+        self.assertEqual(partidas, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+"""
+Testes unitários para o importador de feeds GTFS
+"""
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import zipfile
+
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database_module_enhanced import BancoDadosOnibusEnhanced
+from importador_gtfs import ImportadorGTFS, horario_para_segundos, segundos_para_horario
+
+
+FEED_EXEMPLO = {
+    'routes.txt': (
+        "route_id,agency_id,route_short_name,route_long_name,route_type\n"
+        "R1,SMTU,640,Terminal 1 - Terminal 3,3\n"
+        "R2,SMTU,120,Aeroporto - Centro,3\n"
+    ),
+    'stops.txt': (
+        "stop_id,stop_name,stop_desc,stop_lat,stop_lon,location_type,parent_station,wheelchair_boarding\n"
+        "T1,Terminal 1,Av. Constantino Nery,-3.0952,-60.0217,1,,1\n"
+        "T1A,Terminal 1 - Plataforma A,,-3.0952,-60.0217,0,T1,1\n"
+        "P14,Praça 14,Av. 7 de Setembro,-3.1319,-60.0217,0,,0\n"
+        "T3,Terminal 3,Av. Grande Circular,-3.0744,-60.0589,0,,1\n"
+        "AER,Aeroporto,Av. Santos Dumont,-3.0386,-60.0497,0,,1\n"
+        "CEN,Centro,Av. Eduardo Ribeiro,-3.1319,-60.0217,0,,1\n"
+    ),
+    'trips.txt': (
+        "route_id,service_id,trip_id,direction_id,wheelchair_accessible\n"
+        "R1,DU,640_1,0,1\n"
+        "R1,DU,640_2,0,1\n"
+        "R1,DU,640_3,0,1\n"
+        "R1,DU,640_V,1,1\n"
+        "R2,DU,120_1,0,0\n"
+    ),
+    'stop_times.txt': (
+        "trip_id,arrival_time,departure_time,stop_id,stop_sequence\n"
+        "640_1,05:30:00,05:30:00,T1A,1\n"
+        "640_1,05:45:00,05:46:00,P14,2\n"
+        "640_1,06:05:00,06:05:00,T3,3\n"
+        "640_2,05:40:00,05:40:00,T1A,1\n"
+        "640_2,,,P14,2\n"
+        "640_2,06:15:00,06:15:00,T3,3\n"
+        "640_3,23:50:00,23:50:00,T1A,1\n"
+        "640_3,24:05:00,24:06:00,P14,2\n"
+        "640_3,24:25:00,24:25:00,T3,3\n"
+        "640_V,06:30:00,06:30:00,T3,1\n"
+        "640_V,07:00:00,07:00:00,T1A,2\n"
+        "120_1,05:00:00,05:00:00,AER,1\n"
+        "120_1,05:40:00,05:40:00,CEN,2\n"
+    ),
+    'calendar.txt': (
+        "service_id,monday,tuesday,wednesday,thursday,friday,saturday,sunday,start_date,end_date\n"
+        "DU,1,1,1,1,1,0,0,20250101,20301231\n"
+    ),
+}
+
+
+class TestImportadorGTFS(unittest.TestCase):
+    """Testes para a classe ImportadorGTFS"""
+
+    def setUp(self):
+        """Cria um feed GTFS mínimo em diretório temporário"""
+        self.diretorio = tempfile.mkdtemp()
+        for nome, conteudo in FEED_EXEMPLO.items():
+            with open(os.path.join(self.diretorio, nome), 'w', encoding='utf-8') as arquivo:
+                arquivo.write(conteudo)
+        self.db = BancoDadosOnibusEnhanced(':memory:')
+
+    def tearDown(self):
+        """Limpeza executada após cada teste"""
+        if self.db and self.db.conn:
+            self.db.fechar()
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_conversao_horarios(self):
+        """Testa conversão de horários GTFS, inclusive após meia-noite"""
+        self.assertEqual(horario_para_segundos('05:30:00'), 19800)
+        self.assertEqual(horario_para_segundos('24:05:00'), 86700)
+        self.assertIsNone(horario_para_segundos(''))
+        self.assertEqual(segundos_para_horario(86700), '00:05')
+
+    def test_importar_diretorio(self):
+        """Testa importação completa a partir de um diretório"""
+        estatisticas = ImportadorGTFS(self.db, tamanho_lote=4).importar(self.diretorio)
+
+        self.assertEqual(estatisticas['stop_times.txt']['linhas'], 13)
+        self.assertGreater(estatisticas['total']['linhas_por_segundo'], 0)
+
+        info = self.db.obter_info_linha('640')
+        self.assertEqual(info['nome'], 'Terminal 1 - Terminal 3')
+        self.assertEqual(info['origem'], 'Terminal 1 - Plataforma A')
+        self.assertEqual(info['destino'], 'Terminal 3')
+        self.assertEqual(info['horario'], '05:30-23:50')
+        self.assertTrue(info['acessivel'])
+
+        # Linhas antigas foram substituídas
+        self.assertIsNone(self.db.obter_info_linha('306'))
+
+        pontos = self.db.obter_pontos_parada('640')
+        self.assertEqual([p['nome'] for p in pontos],
+                         ['Terminal 1 - Plataforma A', 'Praça 14', 'Terminal 3'])
+        self.assertEqual([p['ordem'] for p in pontos], [1, 2, 3])
+
+        terminais = self.db.obter_todos_terminais()
+        self.assertEqual(len(terminais), 1)
+        self.assertEqual(terminais[0]['nome'], 'Terminal 1')
+        self.assertEqual(terminais[0]['linhas'], ['640'])
+
+    def test_importar_zip(self):
+        """Testa importação a partir de arquivo .zip"""
+        caminho_zip = os.path.join(self.diretorio, 'feed.zip')
+        with zipfile.ZipFile(caminho_zip, 'w') as arquivo_zip:
+            for nome, conteudo in FEED_EXEMPLO.items():
+                arquivo_zip.writestr(nome, conteudo)
+
+        ImportadorGTFS(self.db).importar(caminho_zip)
+
+        linhas = self.db.buscar_linhas('aeroporto')
+        self.assertEqual([l['numero'] for l in linhas], ['120'])
+
+    def test_rotas_com_mesmo_numero(self):
+        """Testa que rotas de mesmo número viram uma linha com os pontos de uma só rota"""
+        with open(os.path.join(self.diretorio, 'routes.txt'), 'a', encoding='utf-8') as arquivo:
+            arquivo.write("R3,SMTU,640,Variante 640,3\n")
+        with open(os.path.join(self.diretorio, 'trips.txt'), 'a', encoding='utf-8') as arquivo:
+            arquivo.write("R3,DU,640_X,0,0\n")
+        with open(os.path.join(self.diretorio, 'stop_times.txt'), 'a', encoding='utf-8') as arquivo:
+            arquivo.write("640_X,08:00:00,08:00:00,AER,1\n640_X,08:30:00,08:30:00,CEN,2\n")
+
+        ImportadorGTFS(self.db).importar(self.diretorio)
+
+        self.assertEqual(self.db.obter_info_linha('640')['nome'], 'Terminal 1 - Terminal 3')
+        pontos = self.db.obter_pontos_parada('640')
+        self.assertEqual([p['nome'] for p in pontos],
+                         ['Terminal 1 - Plataforma A', 'Praça 14', 'Terminal 3'])
+
+    def test_registros_curtos_contados(self):
+        """Testa que registros com colunas faltando são contados, não engolidos"""
+        with open(os.path.join(self.diretorio, 'stop_times.txt'), 'a', encoding='utf-8') as arquivo:
+            arquivo.write("120_1,05:50:00\n\n")
+
+        estatisticas = ImportadorGTFS(self.db).importar(self.diretorio)
+
+        self.assertEqual(estatisticas['stop_times.txt']['linhas'], 13)
+        self.assertEqual(estatisticas['stop_times.txt']['descartadas'], 1)
+
+    def test_restaura_synchronous(self):
+        """Testa que o PRAGMA synchronous volta ao valor anterior"""
+        self.db.conn.execute('PRAGMA synchronous = FULL')
+        ImportadorGTFS(self.db).importar(self.diretorio)
+        self.assertEqual(self.db.conn.execute('PRAGMA synchronous').fetchone()[0], 2)
+
+    def test_restaura_journal_mode(self):
+        """Testa que o modo de journal de um banco em arquivo não fica em WAL"""
+        self.db.fechar()
+        self.db = BancoDadosOnibusEnhanced(os.path.join(self.diretorio, 'onibus.db'))
+        ImportadorGTFS(self.db).importar(self.diretorio)
+        self.assertEqual(self.db.conn.execute('PRAGMA journal_mode').fetchone()[0], 'delete')
+
+    def test_terminais_mantidos_sem_linhas_apagadas(self):
+        """Testa que um feed sem estações não deixa terminais ligados a linhas apagadas"""
+        paradas = FEED_EXEMPLO['stops.txt'].replace(',-60.0217,1,,1', ',-60.0217,0,,1')
+        with open(os.path.join(self.diretorio, 'stops.txt'), 'w', encoding='utf-8') as arquivo:
+            arquivo.write(paradas)
+
+        ImportadorGTFS(self.db).importar(self.diretorio)
+
+        linhas = {t['nome']: t['linhas'] for t in self.db.obter_todos_terminais()}
+        self.assertEqual(linhas['Terminal 1 - T1'], ['640'])
+        self.assertEqual(linhas['Terminal 2 - T2'], [])
+        orfas = self.db.conn.execute('''
+            SELECT COUNT(*) FROM terminal_linhas
+            WHERE linha_numero NOT IN (SELECT numero FROM linhas_onibus)
+        ''').fetchone()[0]
+        self.assertEqual(orfas, 0)
+
+    def test_arquivo_obrigatorio_ausente(self):
+        """Testa que feed incompleto não altera o banco"""
+        os.remove(os.path.join(self.diretorio, 'stop_times.txt'))
+
+        with self.assertRaises(FileNotFoundError):
+            ImportadorGTFS(self.db).importar(self.diretorio)
+
+        # Transação desfeita: dados iniciais continuam no banco
+        self.assertIsNotNone(self.db.obter_info_linha('306'))
+
+
+if __name__ == '__main__':
+    unittest.main()
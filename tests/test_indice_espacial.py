@@ -0,0 +1,130 @@
+"""
+Testes unitários para o índice espacial de paradas
+"""
+import unittest
+import sys
+import os
+import random
+
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from indice_espacial import IndiceEspacial, distancia_haversine
+from google_maps_integration import GoogleMapsIntegration
+
+
+class TestIndiceEspacial(unittest.TestCase):
+    """Testes para a classe IndiceEspacial"""
+
+    def setUp(self):
+        """Índice com paradas aleatórias em torno de Manaus"""
+        gerador = random.Random(42)
+        self.paradas = [
+            {'nome': f'Parada {i}',
+             'latitude': -3.1 + gerador.uniform(-0.1, 0.1),
+             'longitude': -60.0 + gerador.uniform(-0.1, 0.1)}
+            for i in range(2000)
+        ]
+        self.indice = IndiceEspacial()
+        self.indice.adicionar_varias(self.paradas)
+
+    def tearDown(self):
+        self.indice.fechar()
+
+    def forca_bruta(self, latitude, longitude):
+        return sorted(
+            (distancia_haversine(latitude, longitude, p['latitude'], p['longitude']), p['nome'])
+            for p in self.paradas
+        )
+
+    def test_haversine(self):
+        """Testa a distância entre Terminal 1 e Terminal 3"""
+        distancia = distancia_haversine(-3.1190, -60.0217, -3.0671, -60.0012)
+        self.assertAlmostEqual(distancia, 6.2, delta=0.1)
+        self.assertEqual(distancia_haversine(-3.1, -60.0, -3.1, -60.0), 0.0)
+
+    def test_mais_proximas_igual_forca_bruta(self):
+        """Testa k mais próximas contra a busca exaustiva"""
+        gerador = random.Random(7)
+        for _ in range(20):
+            latitude = -3.1 + gerador.uniform(-0.12, 0.12)
+            longitude = -60.0 + gerador.uniform(-0.12, 0.12)
+
+            resultado = self.indice.mais_proximas(latitude, longitude, k=5)
+            esperado = self.forca_bruta(latitude, longitude)[:5]
+
+            self.assertEqual([p['nome'] for p in resultado], [nome for _, nome in esperado])
+            for parada, (distancia, _) in zip(resultado, esperado):
+                self.assertAlmostEqual(parada['distancia_km'], distancia)
+
+    def test_dentro_do_raio_igual_forca_bruta(self):
+        """Testa a busca por raio contra a busca exaustiva"""
+        resultado = self.indice.dentro_do_raio(-3.1, -60.0, 1.5)
+        esperado = [nome for d, nome in self.forca_bruta(-3.1, -60.0) if d <= 1.5]
+
+        self.assertTrue(esperado)
+        self.assertEqual([p['nome'] for p in resultado], esperado)
+
+    def test_parada_na_borda_do_raio(self):
+        """Testa paradas logo dentro do raio nas bordas norte e leste da caixa"""
+        km_por_grau = distancia_haversine(0.0, 0.0, 1.0, 0.0)
+        for latitude in (-3.1, 60.0):
+            indice = IndiceEspacial()
+            norte = latitude + 0.9995 / km_por_grau
+            indice.adicionar('Norte', norte, -60.0)
+
+            # A leste, procurar a longitude a 0,9995 km por bisseção
+            baixo, alto = 0.0, 1.0
+            for _ in range(60):
+                meio = (baixo + alto) / 2
+                if distancia_haversine(latitude, -60.0, latitude, -60.0 + meio) < 0.9995:
+                    baixo = meio
+                else:
+                    alto = meio
+            indice.adicionar('Leste', latitude, -60.0 + baixo)
+
+            nomes = sorted(p['nome'] for p in indice.dentro_do_raio(latitude, -60.0, 1.0))
+            self.assertEqual(nomes, ['Leste', 'Norte'])
+            proximas = indice.mais_proximas(latitude, -60.0, k=2,
+                                            raio_inicial_km=1.0, raio_maximo_km=1.0)
+            self.assertEqual(len(proximas), 2)
+            indice.fechar()
+
+    def test_indice_vazio_e_ponto_distante(self):
+        """Testa consultas sem paradas ao alcance"""
+        vazio = IndiceEspacial()
+        self.assertEqual(vazio.mais_proximas(-3.1, -60.0), [])
+        vazio.fechar()
+
+        self.assertEqual(self.indice.mais_proximas(40.0, -3.0, raio_maximo_km=10), [])
+
+
+class TestParadasProximas(unittest.TestCase):
+    """Testes para GoogleMapsIntegration.obter_paradas_proximas"""
+
+    def setUp(self):
+        self.mapas = GoogleMapsIntegration()
+
+    def test_por_nome(self):
+        """Testa a busca a partir do nome de uma parada"""
+        paradas = self.mapas.obter_paradas_proximas('Terminal 3', quantidade=3)
+        self.assertEqual(paradas[0]['nome'], 'Terminal 3 (T3)')
+        self.assertEqual(paradas[0]['distancia_km'], 0.0)
+        self.assertIn('640', paradas[0]['linhas'])
+        self.assertEqual(len(paradas), 3)
+
+    def test_por_coordenadas(self):
+        """Testa a busca a partir de 'latitude,longitude'"""
+        paradas = self.mapas.obter_paradas_proximas('-3.1340,-60.0232', raio_km=1.0)
+        nomes = [p['nome'] for p in paradas]
+        self.assertEqual(nomes[0], 'Praça da Matriz')
+        self.assertIn('Av. Eduardo Ribeiro', nomes)
+        self.assertTrue(all(p['distancia_km'] <= 1.0 for p in paradas))
+
+    def test_localizacao_desconhecida(self):
+        """Testa localização não reconhecida"""
+        self.assertEqual(self.mapas.obter_paradas_proximas('Lugar Inexistente'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Testes unitários para o modelo treinável de gestos
+"""
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modelo_gestos import ModeloGestos, GravadorDataset, vetor_caracteristicas
+from test_classificador_gestos import MAO_ABERTA, POLEGAR_PARA_CIMA, INDICADOR_PARA_CIMA
+
+
+def gerar_amostras(quantidade_por_gesto, semente):
+    """Variações das mãos sintéticas com escala, posição e ruído aleatórios"""
+    gerador = np.random.default_rng(semente)
+    modelos = {'terminal': MAO_ABERTA, 'onibus': POLEGAR_PARA_CIMA, 'qual': INDICADOR_PARA_CIMA}
+
+    landmarks, rotulos = [], []
+    for rotulo, mao in modelos.items():
+        for _ in range(quantidade_por_gesto):
+            escala = gerador.uniform(0.5, 1.5)
+            deslocamento = np.append(gerador.uniform(-100, 100, 2), 0)
+            ruido = gerador.normal(0, 3, mao.shape)
+            landmarks.append((mao - mao[0]) * escala + mao[0] + deslocamento + ruido * escala)
+            rotulos.append(rotulo)
+    return np.array(landmarks, dtype=np.float32), np.array(rotulos)
+
+
+class TestModeloGestos(unittest.TestCase):
+    """Testes para a classe ModeloGestos"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.landmarks, cls.rotulos = gerar_amostras(60, semente=1)
+        cls.modelo = ModeloGestos(['onibus', 'qual', 'terminal'], camadas_ocultas=(32,))
+        cls.resultado = cls.modelo.treinar(cls.landmarks, cls.rotulos, epocas=40)
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_vetor_caracteristicas(self):
+        """Testa que o vetor de entrada não depende de escala e posição"""
+        mao = MAO_ABERTA[None]
+        np.testing.assert_allclose(vetor_caracteristicas(mao * 2 + 30)[:, :63],
+                                   vetor_caracteristicas(mao)[:, :63], atol=1e-4)
+
+    def test_treino_e_previsao(self):
+        """Testa acurácia em amostras novas"""
+        self.assertGreater(self.resultado['acuracia_validacao'], 0.95)
+
+        landmarks, rotulos = gerar_amostras(20, semente=2)
+        previstos = self.modelo.prever(landmarks, confianca_minima=0.0)
+        self.assertGreater(np.mean(np.array(previstos) == rotulos), 0.95)
+
+    def test_confianca_minima(self):
+        """Testa que nenhuma classe passa de confiança acima de 1"""
+        self.assertEqual(self.modelo.prever(MAO_ABERTA[None], confianca_minima=1.01), [None])
+
+    def test_salvar_e_carregar(self):
+        """Testa a serialização do modelo"""
+        caminho = os.path.join(self.diretorio, 'modelo.npz')
+        self.modelo.salvar(caminho)
+        carregado = ModeloGestos.carregar(caminho)
+
+        self.assertEqual(carregado.classes, self.modelo.classes)
+        np.testing.assert_allclose(carregado.prever_probabilidades(self.landmarks[:10]),
+                                   self.modelo.prever_probabilidades(self.landmarks[:10]), rtol=1e-5)
+
+    def test_inferencia_em_lote_rapida(self):
+        """Testa que a inferência fica abaixo de 1 ms por mão"""
+        lote = self.landmarks[:2]
+        self.modelo.prever(lote)
+        inicio = time.perf_counter()
+        for _ in range(100):
+            self.modelo.prever(lote)
+        self.assertLess((time.perf_counter() - inicio) / 200, 0.001)
+        self.assertEqual(self.modelo.prever(np.empty((0, 21, 3))), [])
+
+
+class TestGravadorDataset(unittest.TestCase):
+    """Testes para a classe GravadorDataset"""
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_gravar_e_carregar(self):
+        """Testa gravação de amostras e leitura de um diretório"""
+        gravador = GravadorDataset()
+        gravador.adicionar('onibus', np.stack([POLEGAR_PARA_CIMA, POLEGAR_PARA_CIMA]))
+        gravador.adicionar('qual', INDICADOR_PARA_CIMA[None])
+        self.assertEqual(gravador.contagem(), {'onibus': 2, 'qual': 1})
+
+        gravador.salvar(os.path.join(self.diretorio, 'a.npz'))
+        outro = GravadorDataset()
+        outro.adicionar('terminal', MAO_ABERTA[None])
+        outro.salvar(os.path.join(self.diretorio, 'b.npz'))
+
+        landmarks, rotulos = GravadorDataset.carregar(self.diretorio)
+        self.assertEqual(landmarks.shape, (4, 21, 3))
+        self.assertEqual(list(rotulos), ['onibus', 'onibus', 'qual', 'terminal'])
+
+    def test_sem_arquivos(self):
+        """Testa diretório sem amostras"""
+        landmarks, rotulos = GravadorDataset.carregar(self.diretorio)
+        self.assertEqual(len(landmarks), 0)
+        self.assertEqual(len(rotulos), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
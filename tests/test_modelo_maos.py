@@ -0,0 +1,142 @@
+"""
+Testes unitários para o gerenciador do modelo de mãos
+"""
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modelo_maos import GerenciadorModeloMaos
+
+
+class ModeloFalso:
+    """Imita mp.solutions.hands.Hands"""
+
+    def __init__(self):
+        self.processados = 0
+        self.fechado = False
+
+    def process(self, imagem):
+        self.processados += 1
+
+    def close(self):
+        self.fechado = True
+
+
+class FabricaFalsa:
+    """Conta os modelos criados; pode demorar ou falhar"""
+
+    def __init__(self, demora=0.0, falhas=0):
+        self.demora = demora
+        self.falhas = falhas
+        self.criados = []
+
+    def __call__(self):
+        time.sleep(self.demora)
+        if self.falhas:
+            self.falhas -= 1
+            raise ImportError("No module named 'mediapipe'")
+        modelo = ModeloFalso()
+        self.criados.append(modelo)
+        return modelo
+
+
+class TestGerenciadorModeloMaos(unittest.TestCase):
+    """Testes para a classe GerenciadorModeloMaos"""
+
+    def test_carrega_so_quando_pedido(self):
+        """Testa que criar o gerenciador não carrega nada"""
+        fabrica = FabricaFalsa()
+        gerenciador = GerenciadorModeloMaos(fabrica)
+        self.assertFalse(gerenciador.carregado)
+        self.assertEqual(fabrica.criados, [])
+
+        modelo = gerenciador.adquirir()
+        self.assertIs(modelo, fabrica.criados[0])
+        self.assertEqual(modelo.processados, 1)         # inferência de aquecimento
+
+    def test_mantem_modelo_entre_usos(self):
+        """Testa que desligar e religar a câmera reaproveita o mesmo modelo"""
+        fabrica = FabricaFalsa()
+        gerenciador = GerenciadorModeloMaos(fabrica)
+        primeiro = gerenciador.adquirir()
+        gerenciador.liberar()
+        segundo = gerenciador.adquirir()
+
+        self.assertIs(primeiro, segundo)
+        self.assertFalse(primeiro.fechado)
+        self.assertEqual(len(fabrica.criados), 1)
+        self.assertEqual(gerenciador.referencias, 1)
+
+    def test_aquecimento_em_segundo_plano(self):
+        """Testa que aquecer não bloqueia e adquirir espera o aquecimento"""
+        fabrica = FabricaFalsa(demora=0.2)
+        gerenciador = GerenciadorModeloMaos(fabrica)
+
+        inicio = time.perf_counter()
+        thread = gerenciador.aquecer()
+        self.assertLess(time.perf_counter() - inicio, 0.1)
+        self.assertIs(gerenciador.aquecer(), thread)
+
+        modelo = gerenciador.adquirir()
+        self.assertEqual(len(fabrica.criados), 1)
+        self.assertIs(modelo, fabrica.criados[0])
+        thread.join()
+        self.assertIsNone(gerenciador.aquecer())
+
+    def test_adquirir_concorrente(self):
+        """Testa várias threads pedindo o modelo ao mesmo tempo"""
+        fabrica = FabricaFalsa(demora=0.05)
+        gerenciador = GerenciadorModeloMaos(fabrica)
+        modelos = []
+        threads = [threading.Thread(target=lambda: modelos.append(gerenciador.adquirir()))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(fabrica.criados), 1)
+        self.assertEqual(gerenciador.referencias, 4)
+        self.assertTrue(all(m is fabrica.criados[0] for m in modelos))
+
+    def test_encerrar_respeita_referencias(self):
+        """Testa que o modelo só é fechado quando ninguém o usa"""
+        fabrica = FabricaFalsa()
+        gerenciador = GerenciadorModeloMaos(fabrica)
+        modelo = gerenciador.adquirir()
+
+        self.assertFalse(gerenciador.encerrar())
+        self.assertFalse(modelo.fechado)
+
+        gerenciador.liberar()
+        gerenciador.liberar()                               # liberar a mais não fica negativo
+        self.assertTrue(gerenciador.encerrar())
+        self.assertTrue(modelo.fechado)
+        self.assertFalse(gerenciador.carregado)
+
+        # Depois de encerrado, um novo uso cria outro modelo
+        self.assertIsNot(gerenciador.adquirir(), modelo)
+
+    def test_falha_no_aquecimento(self):
+        """Testa que a falha do aquecimento é guardada e adquirir tenta de novo"""
+        fabrica = FabricaFalsa(falhas=2)
+        gerenciador = GerenciadorModeloMaos(fabrica)
+        gerenciador.aquecer().join()
+        self.assertIsInstance(gerenciador.erro, ImportError)
+
+        with self.assertRaises(ImportError):
+            gerenciador.adquirir()
+        self.assertEqual(gerenciador.referencias, 0)
+
+        gerenciador.adquirir()
+        self.assertIsNone(gerenciador.erro)
+        self.assertEqual(gerenciador.referencias, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
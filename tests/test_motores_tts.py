@@ -0,0 +1,262 @@
+"""
+Testes unitários para os motores de síntese de voz e a reprodução em fluxo
+"""
+import unittest
+import sys
+import os
+import io
+import wave
+import tempfile
+import shutil
+import threading
+from unittest import mock
+
+import numpy as np
+
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import motores_tts
+from motores_tts import Locutor, MotorEspeak, MotorTTS, ReprodutorFluxo, ler_cabecalho_wav
+from biblioteca_clipes import BibliotecaClipes
+
+# Imita o espeak-ng --stdout: cabeçalho WAV de fluxo e o áudio em pedaços,
+# 100 amostras por caractere lido da entrada padrão
+ESPEAK_FALSO = r'''
+import struct, sys, time
+texto = sys.stdin.buffer.read().decode('utf-8')
+saida = sys.stdout.buffer
+saida.write(b'RIFF' + struct.pack('<I', 0x7fffffff) + b'WAVE')
+saida.write(b'fmt ' + struct.pack('<IHHIIHH', 16, 1, 1, 16000, 32000, 2, 16))
+saida.write(b'data' + struct.pack('<I', 0x7fffffff))
+for caractere in texto:
+    saida.write(struct.pack('<100h', *([ord(caractere)] * 100)))
+    saida.flush()
+    time.sleep(0.002)
+'''
+
+# Como o espeak-ng de verdade: fala enquanto lê, antes do fim da entrada
+ESPEAK_INTERCALADO = r'''
+import os, struct, sys
+saida = sys.stdout.buffer
+saida.write(b'RIFF' + struct.pack('<I', 0x7fffffff) + b'WAVE')
+saida.write(b'fmt ' + struct.pack('<IHHIIHH', 16, 1, 1, 16000, 32000, 2, 16))
+saida.write(b'data' + struct.pack('<I', 0x7fffffff))
+while True:
+    dados = os.read(0, 4096)
+    if not dados:
+        break
+    saida.write(b'\x01\x00' * len(dados))
+    saida.flush()
+'''
+
+
+class CanalFalso:
+    """Imita pygame.mixer.Channel: cada consulta termina o som atual"""
+
+    def __init__(self):
+        self.atual = None
+        self.fila = None
+        self.tocados = []
+        self.parado = False
+
+    def play(self, som):
+        self.atual = som
+        self.tocados.append(som)
+
+    def queue(self, som):
+        self.fila = som
+
+    def _avancar(self):
+        self.atual, self.fila = self.fila, None
+        if self.atual is not None:
+            self.tocados.append(self.atual)
+
+    def get_queue(self):
+        fila = self.fila
+        self._avancar()
+        return fila
+
+    def get_busy(self):
+        ocupado = self.atual is not None
+        self._avancar()
+        return ocupado
+
+    def stop(self):
+        self.parado = True
+        self.atual = self.fila = None
+
+
+def reprodutor_falso():
+    canal = CanalFalso()
+    return ReprodutorFluxo(canal=canal, criar_som=lambda pcm, taxa: (taxa, pcm.tolist())), canal
+
+
+class MotorFalso(MotorTTS):
+    def __init__(self, nome, falha=None, blocos=2):
+        super().__init__(taxa=16000)
+        self.nome = nome
+        self.falha = falha
+        self.blocos = blocos
+        self.textos = []
+
+    def sintetizar_fluxo(self, texto):
+        self.textos.append(texto)
+        if self.falha:
+            raise self.falha
+        for i in range(self.blocos):
+            yield np.full(10, i, dtype=np.int16)
+
+
+class TestMotorEspeak(unittest.TestCase):
+    """Testes para o motor em subprocesso"""
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.script = os.path.join(self.diretorio, 'espeak_falso.py')
+        with open(self.script, 'w') as arquivo:
+            arquivo.write(ESPEAK_FALSO)
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio)
+
+    def test_cabecalho_wav(self):
+        """Testa o cabeçalho com blocos extras antes dos dados"""
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as arquivo:
+            arquivo.setnchannels(2)
+            arquivo.setsampwidth(2)
+            arquivo.setframerate(22050)
+            arquivo.writeframes(b'\x01\x00' * 8)
+        dados = buffer.getvalue()
+        dados = dados[:36] + b'LIST' + (3).to_bytes(4, 'little') + b'abc\x00' + dados[36:]
+
+        leitor = io.BytesIO(dados)
+        self.assertEqual(ler_cabecalho_wav(leitor), (22050, 2, 16))
+        self.assertEqual(len(leitor.read()), 16)
+        with self.assertRaises(ValueError):
+            ler_cabecalho_wav(io.BytesIO(b'ID3' + b'\x00' * 40))
+
+    def test_fluxo_em_blocos(self):
+        """Testa que o áudio chega em vários blocos, na taxa do WAV"""
+        motor = MotorEspeak(comando=[sys.executable, self.script])
+        self.assertTrue(motor.disponivel())
+        blocos = list(motor.sintetizar_fluxo("-s ônibus 640"))
+
+        self.assertEqual(motor.taxa, 16000)
+        self.assertGreater(len(blocos), 1)
+        pcm = np.concatenate(blocos)
+        self.assertEqual(len(pcm), 100 * len("-s ônibus 640"))
+        self.assertEqual(pcm[0], ord('-'))
+        self.assertEqual(pcm[-1], ord('0'))
+
+    def test_texto_longo_nao_trava(self):
+        """Testa texto maior que o pipe com o motor respondendo enquanto lê"""
+        with open(self.script, 'w') as arquivo:
+            arquivo.write(ESPEAK_INTERCALADO)
+        motor = MotorEspeak(comando=[sys.executable, self.script])
+        texto = 'a' * 300000
+        amostras = []
+        thread = threading.Thread(target=lambda: amostras.extend(
+            len(bloco) for bloco in motor.sintetizar_fluxo(texto)), daemon=True)
+        thread.start()
+        thread.join(10.0)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(sum(amostras), len(texto))
+
+    def test_interface_abstrata(self):
+        """Testa que um motor sem sintetizar_fluxo não é instanciado"""
+        with self.assertRaises(TypeError):
+            MotorTTS()
+
+    def test_sem_executavel(self):
+        """Testa motor sem espeak instalado"""
+        motor = MotorEspeak()
+        motor.comando = None
+        self.assertFalse(motor.disponivel())
+        with self.assertRaises(RuntimeError):
+            list(motor.sintetizar_fluxo("oi"))
+
+
+class TestReprodutorFluxo(unittest.TestCase):
+    """Testes para a fila de blocos no canal do mixer"""
+
+    def test_toca_todos_os_blocos_em_ordem(self):
+        reprodutor, canal = reprodutor_falso()
+        blocos = [np.full(4, i, dtype=np.int16) for i in range(4)]
+        self.assertTrue(reprodutor.tocar(iter(blocos), 16000))
+        self.assertEqual([som[1][0] for som in canal.tocados], [0, 1, 2, 3])
+
+    def test_interrompe(self):
+        """Testa que o evento de parar corta a fala"""
+        reprodutor, canal = reprodutor_falso()
+        parar = threading.Event()
+        parar.set()
+        blocos = [np.zeros(4, dtype=np.int16)] * 3
+        self.assertFalse(reprodutor.tocar(blocos, 16000, parar))
+        self.assertTrue(canal.parado)
+
+
+class TestLocutor(unittest.TestCase):
+    """Testes para a escolha entre clipes e motores"""
+
+    def test_usa_proximo_motor_quando_falha(self):
+        """Testa o motor offline assumindo quando o online falha"""
+        reprodutor, canal = reprodutor_falso()
+        sem_rede = MotorFalso('gtts', falha=ConnectionError("sem internet"))
+        offline = MotorFalso('espeak', blocos=3)
+        locutor = Locutor([sem_rede, offline], reprodutor=reprodutor)
+
+        self.assertEqual(locutor.falar("Linha 640"), 'espeak')
+        self.assertEqual(sem_rede.textos, ["Linha 640"])
+        self.assertEqual(len(canal.tocados), 3)
+        self.assertEqual(canal.tocados[0][0], 16000)
+
+    def test_clipes_antes_dos_motores(self):
+        """Testa que uma resposta da biblioteca não chama motor nenhum"""
+        reprodutor, canal = reprodutor_falso()
+        motor = MotorFalso('espeak')
+        biblioteca = BibliotecaClipes({'Google Maps aberto': np.ones(50, dtype=np.int16)}, taxa=8000)
+        locutor = Locutor([motor], biblioteca, reprodutor)
+
+        self.assertEqual(locutor.falar("Google Maps aberto"), 'clipes')
+        self.assertEqual(motor.textos, [])
+        self.assertEqual(locutor.falar("Outra frase"), 'espeak')
+
+    def test_nenhum_motor(self):
+        reprodutor, canal = reprodutor_falso()
+        self.assertIsNone(Locutor([], reprodutor=reprodutor).falar("oi"))
+        self.assertEqual(canal.tocados, [])
+
+
+class TestCachePadrao(unittest.TestCase):
+    """Testes para o cache de áudio compartilhado pelos locutores"""
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        config = dict(motores_tts.TEXT_TO_SPEECH, cache_dir=self.diretorio, engines=[], clips_dir=None)
+        self.patches = [mock.patch.object(motores_tts, 'TEXT_TO_SPEECH', config),
+                        mock.patch.object(motores_tts, '_cache_padrao', motores_tts.AUSENTE)]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        shutil.rmtree(self.diretorio)
+
+    def test_um_cache_por_processo(self):
+        """Testa que dois locutores na mesma pasta usam o mesmo CacheAudio"""
+        cache = motores_tts.cache_padrao()
+        self.assertIsNotNone(cache)
+        self.assertIs(motores_tts.cache_padrao(), cache)
+
+        with mock.patch.object(motores_tts, 'criar_motores', return_value=[]) as criar:
+            motores_tts.criar_locutor()
+            motores_tts.criar_locutor()
+        self.assertEqual([chamada.kwargs['cache'] for chamada in criar.call_args_list], [cache, cache])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Testes unitários para as filas do pipeline da câmera
+"""
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline_frames import FilaDescarte, BufferTriplo
+
+
+class TestFilaDescarte(unittest.TestCase):
+    """Testes para a classe FilaDescarte"""
+
+    def test_descarta_mais_antigo(self):
+        """Testa que a fila cheia descarta o item mais antigo"""
+        fila = FilaDescarte(capacidade=2)
+        self.assertTrue(fila.colocar(1))
+        self.assertTrue(fila.colocar(2))
+        self.assertFalse(fila.colocar(3))
+
+        self.assertEqual(fila.descartados, 1)
+        self.assertEqual(fila.obter(timeout=0), 2)
+        self.assertEqual(fila.obter(timeout=0), 3)
+        self.assertIsNone(fila.obter(timeout=0))
+
+    def test_obter_mais_recente(self):
+        """Testa que a interface recebe sempre o item mais novo"""
+        fila = FilaDescarte(capacidade=3)
+        for i in range(3):
+            fila.colocar(i)
+
+        self.assertEqual(fila.obter_mais_recente(), 2)
+        self.assertEqual(len(fila), 0)
+        self.assertIsNone(fila.obter_mais_recente())
+
+    def test_obter_espera_produtor(self):
+        """Testa que obter acorda quando outra thread produz"""
+        fila = FilaDescarte()
+        threading.Timer(0.05, fila.colocar, args=('frame',)).start()
+
+        inicio = time.monotonic()
+        self.assertEqual(fila.obter(timeout=2), 'frame')
+        self.assertLess(time.monotonic() - inicio, 1)
+
+    def test_obter_timeout(self):
+        """Testa que obter devolve None após o timeout"""
+        self.assertIsNone(FilaDescarte().obter(timeout=0.01))
+
+
+class TestBufferTriplo(unittest.TestCase):
+    """Testes para a classe BufferTriplo"""
+
+    def setUp(self):
+        self.triplo = BufferTriplo(list)
+
+    def test_nunca_escreve_no_exibido(self):
+        """Testa que o buffer livre nunca é o publicado nem o exibido"""
+        indice, _ = self.triplo.livre()
+        self.triplo.publicar(indice)
+        exibido = self.triplo.obter_mais_recente()
+
+        for _ in range(10):
+            indice, buffer = self.triplo.livre()
+            self.assertIsNot(buffer, exibido)
+            self.triplo.publicar(indice)
+            _, proximo = self.triplo.livre()
+            self.assertIsNot(proximo, buffer)
+            self.assertIsNot(proximo, exibido)
+
+    def test_reutiliza_buffers(self):
+        """Testa que só os três buffers criados são usados"""
+        vistos = set()
+        for _ in range(20):
+            indice, buffer = self.triplo.livre()
+            self.triplo.publicar(indice)
+            vistos.add(id(self.triplo.obter_mais_recente()))
+        self.assertLessEqual(len(vistos), 3)
+
+    def test_descartados_e_vazio(self):
+        """Testa contagem de frames publicados e nunca exibidos"""
+        self.assertIsNone(self.triplo.obter_mais_recente())
+        for _ in range(3):
+            indice, _ = self.triplo.livre()
+            self.triplo.publicar(indice)
+        self.assertEqual(self.triplo.descartados, 2)
+        self.assertIsNotNone(self.triplo.obter_mais_recente())
+        self.assertIsNone(self.triplo.obter_mais_recente())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Testes unitários para o planejador de viagens
+"""
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import time
+from datetime import date
+
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database_module_enhanced import BancoDadosOnibusEnhanced
+from importador_gtfs import ImportadorGTFS
+from planejador_rotas import PlanejadorRotas, normalizar_nome, formatar_itinerario
+from test_importador_gtfs import FEED_EXEMPLO
+
+
+class TestPlanejadorLinhas(unittest.TestCase):
+    """Testes com conexões geradas a partir das linhas"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = BancoDadosOnibusEnhanced(':memory:')
+        cls.planejador = PlanejadorRotas(cls.db)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.fechar()
+
+    def test_normalizar_nome(self):
+        """Testa a chave de comparação de nomes"""
+        self.assertEqual(normalizar_nome('Terminal 1 - T1'), 'terminal 1')
+        self.assertEqual(normalizar_nome('  São   José '), 'sao jose')
+
+    def test_rota_direta(self):
+        """Testa viagem sem baldeação"""
+        itinerario = self.planejador.planejar('Terminal 1', 'Centro', '08:00')
+        self.assertEqual(itinerario['baldeacoes'], 0)
+        self.assertEqual(itinerario['trechos'][0]['linha'], '010')
+        self.assertEqual(itinerario['partida'], '08:00')
+
+    def test_rota_com_baldeacao_e_caminhada(self):
+        """Testa baldeação com caminhada entre paradas próximas"""
+        itinerario = self.planejador.planejar('aeroporto', 'terminal 3', '08:00')
+        tipos = [t['tipo'] for t in itinerario['trechos']]
+        self.assertEqual(tipos, ['onibus', 'caminhada', 'onibus'])
+        self.assertEqual([t.get('linha') for t in itinerario['trechos']], ['120', None, '640'])
+        self.assertEqual(itinerario['baldeacoes'], 1)
+        self.assertIn('Linha 640', formatar_itinerario(itinerario))
+
+    def test_somente_acessivel(self):
+        """Testa que o filtro evita linhas sem acessibilidade"""
+        direta = self.planejador.planejar('Novo Israel', 'São José', '07:00')
+        self.assertIn('510', [t.get('linha') for t in direta['trechos']])
+
+        acessivel = self.planejador.planejar('Novo Israel', 'São José', '07:00',
+                                             somente_acessivel=True)
+        self.assertTrue(acessivel is None or
+                        '510' not in [t.get('linha') for t in acessivel['trechos']])
+
+    def test_sem_rota(self):
+        """Testa paradas desconhecidas e horários sem serviço"""
+        self.assertIsNone(self.planejador.planejar('Lugar Inexistente', 'Centro', '08:00'))
+        self.assertIsNone(self.planejador.planejar('Terminal 1', 'Centro', '00:30'))
+
+    def test_desempenho(self):
+        """Testa que consultas ficam abaixo de 50 ms"""
+        inicio = time.perf_counter()
+        for _ in range(20):
+            self.planejador.planejar('Coroado', 'Ponta Negra', '09:00')
+        self.assertLess((time.perf_counter() - inicio) / 20, 0.05)
+
+
+class TestPlanejadorGTFS(unittest.TestCase):
+    """Testes com conexões de um feed GTFS importado"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.diretorio = tempfile.mkdtemp()
+        for nome, conteudo in FEED_EXEMPLO.items():
+            with open(os.path.join(cls.diretorio, nome), 'w', encoding='utf-8') as arquivo:
+                arquivo.write(conteudo)
+        cls.db = BancoDadosOnibusEnhanced(':memory:')
+        ImportadorGTFS(cls.db).importar(cls.diretorio)
+        cls.planejador = PlanejadorRotas(cls.db)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.fechar()
+        shutil.rmtree(cls.diretorio, ignore_errors=True)
+
+    def test_usa_horarios_gtfs(self):
+        """Testa rota com horários do feed, inclusive parada sem horário"""
+        self.assertEqual(self.planejador.fonte, 'gtfs')
+        itinerario = self.planejador.planejar('Terminal 1', 'Terminal 3', '05:35',
+                                              data=date(2026, 10, 19))
+        self.assertEqual(itinerario['partida'], '05:40')
+        self.assertEqual(itinerario['chegada'], '06:15')
+
+    def test_calendario(self):
+        """Testa que viagens fora do calendário são ignoradas"""
+        domingo = date(2026, 10, 18)
+        self.assertIsNone(self.planejador.planejar('Terminal 1', 'Terminal 3', '05:00',
+                                                   data=domingo))
+
+    def test_somente_acessivel(self):
+        """Testa viagem sem acessibilidade (wheelchair_accessible=0)"""
+        segunda = date(2026, 10, 19)
+        self.assertIsNotNone(self.planejador.planejar('Aeroporto', 'Centro', '04:50', data=segunda))
+        self.assertIsNone(self.planejador.planejar('Aeroporto', 'Centro', '04:50',
+                                                   somente_acessivel=True, data=segunda))
+
+
+if __name__ == '__main__':
+    unittest.main()
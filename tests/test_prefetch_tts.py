@@ -0,0 +1,174 @@
+"""
+Testes unitários para a preparação antecipada das respostas faladas
+"""
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from prefetch_tts import PrefetcherRespostas
+from motores_tts import Locutor
+from test_motores_tts import MotorFalso, reprodutor_falso
+
+
+class PreparadorFalso:
+    """Conta o que foi preparado; pode segurar a síntese até ser liberado"""
+
+    def __init__(self, bloquear=False):
+        self.preparados = []
+        self.prontos = set()
+        self.liberar = threading.Event()
+        if not bloquear:
+            self.liberar.set()
+
+    def __call__(self, texto):
+        self.liberar.wait(2.0)
+        self.preparados.append(texto)
+        self.prontos.add(texto)
+        return True
+
+    def pronto(self, texto):
+        return texto in self.prontos
+
+
+class TestPrefetcherRespostas(unittest.TestCase):
+    """Testes para a classe PrefetcherRespostas"""
+
+    def setUp(self):
+        self.preparar = PreparadorFalso()
+        self.prefetcher = PrefetcherRespostas(self.preparar, self.preparar.pronto, k=2, trabalhadores=1)
+
+    def tearDown(self):
+        self.prefetcher.encerrar()
+
+    def test_prepara_as_mais_provaveis(self):
+        """Testa que a resposta de mais continuações vem primeiro e só k vão ao pool"""
+        candidatas = ["Para centro, pegue: 010.", "Ônibus 640 - Informações disponíveis.",
+                      "Para centro, pegue: 010.", "Pergunte sobre linhas", "", "Para centro,  pegue: 010."]
+        enviados = self.prefetcher.antecipar(candidatas)
+        self.prefetcher.esperar(2.0)
+
+        self.assertEqual(enviados, ["Para centro, pegue: 010.", "Ônibus 640 - Informações disponíveis."])
+        self.assertEqual(sorted(self.preparar.preparados), sorted(enviados))
+
+    def test_historico_pesa_na_ordem(self):
+        """Testa que respostas já escolhidas antes sobem na ordem"""
+        self.prefetcher.registrar_escolha("Ônibus 306")
+        ordem = self.prefetcher.ordenar(["Ônibus 640", "Ônibus 640", "Ônibus 306", "Ônibus 120"])
+        self.assertEqual(ordem, ["Ônibus 306", "Ônibus 640", "Ônibus 120"])
+
+    def test_nao_repete_o_que_ja_esta_pronto(self):
+        self.preparar.prontos.add("Ônibus 640")
+        self.assertEqual(self.prefetcher.antecipar(["Ônibus 640", "Ônibus 306"]), ["Ônibus 306"])
+
+    def test_nova_rodada_cancela_pendentes(self):
+        """Testa que candidatas antigas que nem começaram são descartadas"""
+        self.preparar.liberar.clear()
+        self.prefetcher.antecipar(["a", "b"])        # 'a' ocupa a única thread
+        time.sleep(0.05)
+        self.prefetcher.antecipar(["c"])
+        self.preparar.liberar.set()
+        self.prefetcher.esperar(2.0)
+        time.sleep(0.05)
+        self.assertEqual(self.preparar.preparados, ["a", "c"])
+
+    def test_acertos(self):
+        """Testa a contagem de respostas que tinham sido antecipadas"""
+        self.prefetcher.antecipar(["Ônibus 640", "Ônibus 306"])
+        self.prefetcher.registrar_escolha("Ônibus 640")
+        self.prefetcher.registrar_escolha("Ônibus 120")
+        self.assertEqual(self.prefetcher.estatisticas(),
+                         {'acertos': 1, 'falhas': 1, 'taxa_acerto': 0.5})
+
+    def test_respostas_geradas_no_pool(self):
+        """Testa que as consultas de gerar_resposta saem da thread de quem chama"""
+        threads = []
+
+        def gerar_resposta(pergunta):
+            threads.append(threading.current_thread().name)
+            return f"Ônibus {pergunta}"
+
+        self.prefetcher.antecipar_perguntas(["640", "306", "120"], gerar_resposta,
+                                            descartar=["Ônibus  306"])
+        self.prefetcher.esperar(2.0)
+
+        self.assertEqual(len(threads), 3)
+        self.assertTrue(all(nome.startswith("prefetch-tts") for nome in threads))
+        self.assertEqual(self.preparar.preparados, ["Ônibus 640", "Ônibus 120"])
+        self.assertNotIn("Ônibus 306", self.prefetcher.antecipados)
+
+    def test_geracao_antiga_descartada(self):
+        """Testa que uma rodada nova descarta a geração que ainda não terminou"""
+        liberar = threading.Event()
+
+        def gerar_devagar(pergunta):
+            liberar.wait(2.0)
+            return f"Ônibus {pergunta}"
+
+        self.prefetcher.antecipar_perguntas(["640"], gerar_devagar)
+        time.sleep(0.05)
+        self.prefetcher.antecipar(["Ônibus 306"])
+        liberar.set()
+        self.prefetcher.esperar(2.0)
+        time.sleep(0.05)
+        self.assertEqual(self.preparar.preparados, ["Ônibus 306"])
+
+    def test_banco_da_interface_no_pool(self):
+        """Testa o banco em memória da interface consultado pelo pool"""
+        from database_module import BancoDadosOnibus
+
+        banco = BancoDadosOnibus()
+        self.prefetcher.antecipar_perguntas(["640"], lambda numero: banco.obter_info_linha(numero)[1])
+        self.prefetcher.esperar(2.0)
+        self.assertEqual(self.preparar.preparados, ["Terminal 1 ↔ Terminal 3"])
+
+
+class TestLocutorPreparado(unittest.TestCase):
+    """Testes para a fala preparada no Locutor"""
+
+    def test_fala_preparada_nao_sintetiza(self):
+        reprodutor, canal = reprodutor_falso()
+        motor = MotorFalso('espeak')
+        locutor = Locutor([motor], reprodutor=reprodutor)
+
+        self.assertFalse(locutor.pronto("Ônibus 640"))
+        self.assertTrue(locutor.preparar("Ônibus 640"))
+        self.assertTrue(locutor.pronto("Ônibus  640"))
+        self.assertEqual(locutor.falar("Ônibus 640"), 'espeak')
+        self.assertEqual(motor.textos, ["Ônibus 640"])
+        self.assertEqual(len(canal.tocados), 1)             # um só bloco, já pronto
+
+    def test_falar_espera_preparo_em_andamento(self):
+        """Testa que falar aproveita a síntese antecipada em vez de repetir"""
+        reprodutor, _ = reprodutor_falso()
+        liberar = threading.Event()
+
+        class MotorLento(MotorFalso):
+            def sintetizar_fluxo(self, texto):
+                liberar.wait(2.0)
+                return super().sintetizar_fluxo(texto)
+
+        motor = MotorLento('espeak')
+        locutor = Locutor([motor], reprodutor=reprodutor)
+        thread = threading.Thread(target=locutor.preparar, args=("Ônibus 640",))
+        thread.start()
+        time.sleep(0.05)
+        threading.Timer(0.05, liberar.set).start()
+
+        self.assertEqual(locutor.falar("Ônibus 640"), 'espeak')
+        thread.join()
+        self.assertEqual(motor.textos, ["Ônibus 640"])
+
+    def test_preparar_sem_motor(self):
+        reprodutor, _ = reprodutor_falso()
+        motor = MotorFalso('gtts', falha=ConnectionError("sem internet"))
+        self.assertFalse(Locutor([motor], reprodutor=reprodutor).preparar("Ônibus 640"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Testes unitários para o reconhecimento de sinais dinâmicos
+"""
+import unittest
+import sys
+import os
+import numpy as np
+
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sequencia_gestos import TrajetoriaCircular, CasadorSpring, ReconhecedorSequencias
+
+
+def mao_em(x, y=300.0, palma=100.0):
+    """Mão aberta e vertical com o punho em (x, y) e palma do tamanho dado"""
+    mao = np.zeros((21, 3), dtype=np.float32)
+    mao[:, 0] = x + np.linspace(-0.4, 0.4, 21) * palma
+    mao[:, 1] = y - np.linspace(0, 1.6, 21) * palma
+    mao[0, :2] = (x, y)
+    mao[9, :2] = (x, y - palma)
+    return mao
+
+
+def trajetoria(xs, palma=100.0):
+    return [mao_em(x, palma=palma) for x in xs]
+
+
+def oscilacao(frames=20, amplitude=60.0):
+    return list(amplitude * np.sin(2 * np.pi * np.arange(frames) / 10))
+
+
+class TestTrajetoriaCircular(unittest.TestCase):
+    """Testes para o buffer circular"""
+
+    def test_ultimos_em_ordem_cronologica(self):
+        """Testa que o buffer guarda só os mais recentes, em ordem"""
+        buffer = TrajetoriaCircular(capacidade=4, dimensao=1)
+        for i in range(6):
+            buffer.adicionar([i])
+
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(buffer.ultimos().ravel().tolist(), [2, 3, 4, 5])
+        self.assertEqual(buffer.ultimos(2).ravel().tolist(), [4, 5])
+
+
+class TestCasadorSpring(unittest.TestCase):
+    """Testes para o DTW em fluxo"""
+
+    def test_encontra_subsequencia_distorcida(self):
+        """Testa o casamento de uma versão esticada do modelo dentro do fluxo"""
+        modelo = np.array([[0], [1], [2], [1], [0]], dtype=np.float32)
+        casador = CasadorSpring('teste', modelo, limiar=0.1)
+        fluxo = [5, 5, 0, 1, 1, 2, 2, 1, 0, 5, 5, 5]
+
+        ocorrencias = [o for t, v in enumerate(fluxo) if (o := casador.atualizar([v], t))]
+        self.assertEqual(len(ocorrencias), 1)
+        inicio, fim, custo = ocorrencias[0]
+        self.assertEqual((inicio, fim), (2, 8))
+        self.assertAlmostEqual(custo, 0.0)
+
+    def test_reporta_cada_ocorrencia_uma_vez(self):
+        """Testa que duas repetições geram duas detecções"""
+        modelo = np.array([[0], [3], [0]], dtype=np.float32)
+        casador = CasadorSpring('teste', modelo, limiar=0.1)
+        fluxo = [9, 0, 3, 0, 9, 9, 0, 3, 0, 9]
+
+        ocorrencias = [o for t, v in enumerate(fluxo) if (o := casador.atualizar([v], t))]
+        self.assertEqual([(i, f) for i, f, _ in ocorrencias], [(1, 3), (6, 8)])
+
+
+class TestReconhecedorSequencias(unittest.TestCase):
+    """Testes para o reconhecedor de sinais dinâmicos"""
+
+    def processar(self, reconhecedor, maos):
+        return [s for mao in maos for s in reconhecedor.atualizar(mao)]
+
+    def test_reconhece_onde(self):
+        """Testa que a mão oscilando lateralmente é reconhecida como 'onde'"""
+        maos = trajetoria([300] * 5 + [300 + x for x in oscilacao()] + [300] * 10)
+        self.assertEqual(self.processar(ReconhecedorSequencias(), maos), ['onde'])
+
+    def test_independe_da_distancia(self):
+        """Testa o mesmo sinal feito com a mão mais longe da câmera"""
+        maos = trajetoria([300] * 5 + [300 + x / 2 for x in oscilacao()] + [300] * 10,
+                          palma=50.0)
+        self.assertEqual(self.processar(ReconhecedorSequencias(), maos), ['onde'])
+
+    def test_ignora_mao_parada_e_deslocamento(self):
+        """Testa que mão parada ou movida em linha reta não vira sinal"""
+        maos = trajetoria([300] * 20 + list(np.linspace(300, 500, 20)) + [500] * 20)
+        self.assertEqual(self.processar(ReconhecedorSequencias(), maos), [])
+
+    def test_mao_fora_do_quadro_reinicia(self):
+        """Testa que perder a mão descarta o movimento em andamento"""
+        xs = [300 + x for x in oscilacao()]
+        maos = trajetoria(xs[:10]) + [None] + trajetoria(xs[10:] + [300] * 10)
+        self.assertEqual(self.processar(ReconhecedorSequencias(), maos), [])
+
+    def test_modelo_gravado(self):
+        """Testa cadastrar um sinal a partir da própria trajetória gravada"""
+        reconhecedor = ReconhecedorSequencias(modelos={})
+        subida = [mao_em(300, y) for y in np.linspace(300, 150, 10)]
+        self.processar(reconhecedor, subida)
+        reconhecedor.adicionar_modelo('subir', reconhecedor.trajetoria.ultimos(9))
+        reconhecedor.reiniciar()
+
+        maos = [mao_em(300)] * 5 + subida + [mao_em(300, 150)] * 5
+        self.assertEqual(self.processar(reconhecedor, maos), ['subir'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+Testes unitários para o servidor de reconhecimento multi-quiosque
+"""
+import unittest
+import sys
+import os
+import json
+import socket
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from servidor_libras import EstadoQuiosque, ServidorLibras, indices_cameras
+from fontes_frames import FonteQuadros
+from test_classificador_gestos import POLEGAR_PARA_CIMA
+
+
+class ModeloFalso:
+    """Imita o Hands: vê o polegar para cima em quadros claros"""
+
+    def process(self, imagem):
+        altura, largura = imagem.shape[:2]
+        maos = None
+        if imagem.mean() > 0:
+            pontos = POLEGAR_PARA_CIMA / (largura, altura, largura)
+            maos = [SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z) for x, y, z in pontos])]
+        return SimpleNamespace(multi_hand_landmarks=maos)
+
+    def close(self):
+        pass
+
+
+def criar_modelo_falso():
+    return ModeloFalso()
+
+
+class FonteConstante(FonteQuadros):
+    """Sempre o mesmo quadro, no ritmo de uma câmera"""
+
+    def __init__(self, valor):
+        super().__init__(fps=60.0, tempo_real=True)
+        self.frame = np.full((480, 640, 3), valor, dtype=np.uint8)
+
+    def _ler(self):
+        return self.frame
+
+    def _voltar_inicio(self):
+        pass
+
+
+class TestEstadoQuiosque(unittest.TestCase):
+    """Testes para o filtro por quiosque"""
+
+    def test_confirma_depois_de_tres_iguais(self):
+        """Testa a confirmação e o intervalo mínimo entre sinais"""
+        estado = EstadoQuiosque(0, tempo_confirmacao=2.0)
+        vazio = np.empty((0, 21, 3), dtype=np.float32)
+        self.assertEqual(estado.processar(1, vazio, ['onibus'], agora=10.0), [])
+        self.assertEqual(estado.processar(2, vazio, ['onibus'], agora=10.1), [])
+        self.assertEqual(estado.processar(3, vazio, [None, 'onibus'], agora=10.2), ['onibus'])
+        self.assertEqual(estado.sinal_atual, 'onibus')
+
+        self.assertEqual(estado.processar(4, vazio, ['terminal'], agora=11.0), [])
+        self.assertEqual(estado.historico_gestos, ['onibus'] * 3)
+
+    def test_reordena_resultados(self):
+        """Testa que quadros fora de ordem esperam os anteriores"""
+        estado = EstadoQuiosque(0)
+        vazio = np.empty((0, 21, 3), dtype=np.float32)
+        self.assertEqual(estado.processar(2, vazio, ['qual'], agora=10.0), [])
+        self.assertEqual(estado.processar(3, vazio, ['onibus'], agora=10.0), [])
+        self.assertEqual(estado.historico_gestos, [])
+
+        estado.processar(1, vazio, ['terminal'], agora=10.0)
+        self.assertEqual(estado.historico_gestos, ['terminal', 'qual', 'onibus'])
+        self.assertEqual(estado.processar(1, vazio, ['qual'], agora=10.0), [])
+        self.assertEqual(len(estado.historico_gestos), 3)
+
+    def test_quadro_descartado_ou_perdido(self):
+        """Testa que um quadro sem resultado não segura os seguintes"""
+        estado = EstadoQuiosque(0, max_pendentes=3)
+        vazio = np.empty((0, 21, 3), dtype=np.float32)
+        estado.descartar(1)
+        estado.processar(2, vazio, ['qual'], agora=10.0)
+        self.assertEqual(estado.historico_gestos, ['qual'])
+
+        # Quadro 3 nunca chega: passado o limite, os seguintes seguem
+        confirmados = [estado.processar(quadro, vazio, ['onibus'], agora=10.0)
+                       for quadro in range(4, 8)]
+        self.assertEqual(confirmados, [[], [], [], ['onibus']])
+        self.assertEqual(estado.proximo_quadro, 8)
+
+    def test_indices_cameras(self):
+        """Testa índice único, lista e texto"""
+        self.assertEqual(indices_cameras(0), [0])
+        self.assertEqual(indices_cameras([0, 2]), [0, 2])
+        self.assertEqual(indices_cameras('0, 1,video.mp4'), [0, 1, 'video.mp4'])
+
+
+class TestServidorLibras(unittest.TestCase):
+    """Testes de ponta a ponta com processos reais e modelo falso"""
+
+    def setUp(self):
+        self.servidor = ServidorLibras([FonteConstante(0), FonteConstante(200)],
+                                       trabalhadores=2, fabrica=criar_modelo_falso,
+                                       tempo_confirmacao=0.5)
+
+    def tearDown(self):
+        self.servidor.parar()
+
+    def test_eventos_por_quiosque(self):
+        """Testa que cada quiosque tem seu estado e sua fila de eventos"""
+        self.servidor.iniciar()
+        evento = self.servidor.obter_evento(1, timeout=10.0)
+        self.assertEqual(evento['quiosque'], 1)
+        self.assertEqual(evento['sinal'], 'onibus')
+        self.assertEqual(self.servidor.sinal_atual(1), 'onibus')
+
+        self.assertIsNone(self.servidor.obter_evento(0))
+        self.assertIsNone(self.servidor.sinal_atual(0))
+        estatisticas = self.servidor.obter_estatisticas()
+        self.assertGreater(estatisticas['processados'], 0)
+        self.assertTrue(all(lidos > 0 for lidos in estatisticas['lidos']))
+
+    def test_despachar_depois_de_parar(self):
+        """Testa que uma captura atrasada não escreve na memória já liberada"""
+        self.servidor.iniciar()
+        self.servidor.parar()
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        self.assertFalse(self.servidor._despachar(0, 10 ** 6, frame))
+
+    def test_socket_local(self):
+        """Testa os eventos em JSON pelo socket, filtrados por quiosque"""
+        self.servidor.iniciar()
+        host, porta = self.servidor.iniciar_socket('127.0.0.1', 0)
+        with socket.create_connection((host, porta), timeout=10.0) as conexao:
+            conexao.sendall(b'1\n')
+            linha = conexao.makefile('r', encoding='utf-8').readline()
+        evento = json.loads(linha)
+        self.assertEqual((evento['quiosque'], evento['sinal']), (1, 'onibus'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Testes unitários para o snapshot compacto do banco de dados
+"""
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database_module_enhanced import BancoDadosOnibusEnhanced
+from snapshot_transporte import SnapshotTransporte, VERSAO, abrir_banco, gerar_snapshot
+
+
+class TestSnapshotTransporte(unittest.TestCase):
+    """Testes para gerar_snapshot e SnapshotTransporte"""
+
+    def setUp(self):
+        """Gera um snapshot a partir do banco em memória"""
+        self.diretorio = tempfile.mkdtemp()
+        self.caminho = os.path.join(self.diretorio, 'manaus.snap')
+        self.db = BancoDadosOnibusEnhanced(':memory:', usar_cache=False)
+        gerar_snapshot(self.db, self.caminho)
+        self.snapshot = SnapshotTransporte(self.caminho)
+
+    def tearDown(self):
+        """Limpeza executada após cada teste"""
+        self.snapshot.fechar()
+        self.db.fechar()
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_mesmas_respostas_do_banco(self):
+        """Testa que o snapshot responde igual ao banco SQLite"""
+        cursor = self.db.conn.cursor()
+        cursor.execute('SELECT numero FROM linhas_onibus')
+        for (numero,) in cursor.fetchall():
+            self.assertEqual(self.snapshot.obter_info_linha(numero),
+                             self.db.obter_info_linha(numero))
+            self.assertEqual(self.snapshot.obter_pontos_parada(numero),
+                             self.db.obter_pontos_parada(numero))
+
+        self.assertEqual(self.snapshot.obter_todos_terminais(),
+                         self.db.obter_todos_terminais())
+        self.assertEqual(self.snapshot.obter_linhas_acessiveis(),
+                         self.db.obter_linhas_acessiveis())
+
+    def test_linha_inexistente(self):
+        """Testa consultas a linhas que não existem"""
+        self.assertIsNone(self.snapshot.obter_info_linha('999'))
+        self.assertEqual(self.snapshot.obter_pontos_parada('999'), [])
+
+    def test_busca_destino_sem_acentos(self):
+        """Testa busca por destino ignorando acentos"""
+        numeros = [l['numero'] for l in self.snapshot.obter_onibus_para_destino('sao jose')]
+        self.assertEqual(numeros, ['510', '611'])
+
+    def test_textos_internados(self):
+        """Testa que textos repetidos viram o mesmo objeto"""
+        a = self.snapshot.obter_info_linha('201')['destino']
+        b = self.snapshot.obter_info_linha('418')['destino']
+        self.assertIs(a, b)
+
+    def test_arquivo_invalido(self):
+        """Testa que arquivos que não são snapshots são rejeitados"""
+        caminho = os.path.join(self.diretorio, 'invalido.snap')
+        with open(caminho, 'wb') as arquivo:
+            arquivo.write(b'nao e um snapshot')
+
+        with self.assertRaises(ValueError):
+            SnapshotTransporte(caminho)
+
+    def test_arquivo_vazio(self):
+        """Testa que um snapshot vazio é rejeitado sem deixar o arquivo aberto"""
+        caminho = os.path.join(self.diretorio, 'vazio.snap')
+        open(caminho, 'wb').close()
+
+        with self.assertRaises(ValueError):
+            SnapshotTransporte(caminho)
+
+    def test_arquivo_truncado(self):
+        """Testa que snapshots cortados ou com cabeçalho estragado viram ValueError"""
+        with open(self.caminho, 'rb') as arquivo:
+            dados = arquivo.read()
+        caminho = os.path.join(self.diretorio, 'truncado.snap')
+        tamanho_cabecalho = int.from_bytes(dados[8:12], 'little')
+        sem_secoes = f'{{"versao": {VERSAO}, "byteorder": "{sys.byteorder}"}}'.encode()
+        estragados = [
+            dados[:len(dados) // 2],                        # seções fora do arquivo
+            dados[:12 + tamanho_cabecalho // 2],            # JSON cortado
+            dados[:8] + len(sem_secoes).to_bytes(4, 'little') + sem_secoes,   # chaves faltando
+            dados[:10],                                     # tamanho do cabeçalho cortado
+        ]
+        for conteudo in estragados:
+            with open(caminho, 'wb') as arquivo:
+                arquivo.write(conteudo)
+            with self.assertRaises(ValueError):
+                SnapshotTransporte(caminho)
+
+        banco = abrir_banco(caminho, ':memory:')
+        self.assertIsInstance(banco, BancoDadosOnibusEnhanced)
+        banco.fechar()
+
+    def test_abrir_banco(self):
+        """Testa a escolha entre snapshot e banco SQLite"""
+        banco = abrir_banco(self.caminho)
+        self.assertIsInstance(banco, SnapshotTransporte)
+        banco.fechar()
+
+        banco = abrir_banco(os.path.join(self.diretorio, 'ausente.snap'), ':memory:')
+        self.assertIsInstance(banco, BancoDadosOnibusEnhanced)
+        self.assertEqual(banco.obter_info_linha('640')['numero'], '640')
+        banco.fechar()
+
+
+if __name__ == '__main__':
+    unittest.main()